@@ -9,6 +9,8 @@ from .elements import Element
 from .diagrams import Diagram
 from .connectors import Connector
 from .json_io import export_to_json, import_from_json
+from .qea import open_memory_repository, open_qea
+from .qea_writer import write_model_spec
 
 __version__ = "0.1.0"
 
@@ -17,6 +19,9 @@ __all__ = [
     "create_repository",
     "close_repository",
     "save",
+    "open_qea",
+    "open_memory_repository",
+    "write_model_spec",
     "Package",
     "Element",
     "Diagram",
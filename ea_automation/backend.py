@@ -0,0 +1,92 @@
+from typing import Any, Protocol
+from .utils import DeferredUpdateMixin
+
+
+# Verfügbare Backends für open_repository
+COM = "com"
+SQLITE = "sqlite"
+MEMORY = "memory"
+REPLAY = "replay"
+BACKENDS = (COM, SQLITE, MEMORY, REPLAY)
+
+
+class EACollection(Protocol):
+    """
+    Collection-Schnittstelle, die alle Backends bereitstellen.
+
+    Entspricht dem von ea_automation verwendeten Teil der COM-Collections
+    (Packages, Elements, Attributes, Methods, Connectors, Diagrams,
+    DiagramObjects, Models). AddNew liefert ein neues Objekt, das erst mit
+    Update() gespeichert und nach Refresh() in der Collection sichtbar wird.
+    """
+
+    @property
+    def Count(self) -> int: ...
+
+    def GetAt(self, index: int) -> Any: ...
+
+    def AddNew(self, name: str, type_: str) -> Any: ...
+
+    def DeleteAt(self, index: int, refresh: bool) -> None: ...
+
+    def Refresh(self) -> None: ...
+
+
+class EAObject(Protocol):
+    """Objekt eines Backends: Properties per Get/Put, Speichern mit Update()."""
+
+    def Update(self) -> bool: ...
+
+
+class EARepository(Protocol):
+    """
+    Repository-Schnittstelle: Collections, Lookup, Insert/Update und Abfragen.
+
+    - Collections: Models und die Collections der Packages/Elemente
+    - Lookup: Get*ByID / Get*ByGuid
+    - Insert/Update: AddNew + Update() auf den Collections bzw. Objekten
+    - Query: SQLQuery liefert das Ergebnis im XML-Format von EA (siehe sql.py)
+
+    Implementierungen: EA über COM (win32com), QeaRepository über sqlite3
+    (Datei oder In-Memory), ReplayRepository (aufgezeichnete COM-Aufrufe).
+    """
+
+    @property
+    def Models(self) -> EACollection: ...
+
+    def GetPackageByID(self, package_id: int) -> Any: ...
+
+    def GetPackageByGuid(self, guid: str) -> Any: ...
+
+    def GetElementByID(self, element_id: int) -> Any: ...
+
+    def GetElementByGuid(self, guid: str) -> Any: ...
+
+    def GetConnectorByID(self, connector_id: int) -> Any: ...
+
+    def GetDiagramByID(self, diagram_id: int) -> Any: ...
+
+    def GetAttributeByID(self, attribute_id: int) -> Any: ...
+
+    def GetMethodByID(self, method_id: int) -> Any: ...
+
+    def SQLQuery(self, sql: str) -> str: ...
+
+    def SaveFile(self) -> Any: ...
+
+    def CloseFile(self) -> Any: ...
+
+    def Exit(self) -> Any: ...
+
+
+def as_ea_object(obj: Any) -> EAObject:
+    """
+    Liefert das Backend-Objekt zu einem Wrapper (Package, Element, Diagram, Connector).
+
+    Backend-Objekte (COM, QeaObject, ...) werden unverändert zurückgegeben.
+    Die Unterscheidung erfolgt über den Wrapper-Typ, nicht über hasattr():
+    bei COM kostet jede fehlgeschlagene Attributprüfung einen Round-Trip.
+    """
+    if isinstance(obj, DeferredUpdateMixin):
+        return obj._ea_object()
+    return obj
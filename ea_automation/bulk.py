@@ -0,0 +1,184 @@
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Union
+from .exceptions import EAError
+from .logging_conf import logger
+from .records import ConnectorRecord, DiagramRecord, ElementRecord, PackageRecord, row_int
+from .sql import sql_query_rows
+
+
+PACKAGE_QUERY = (
+    "SELECT Package_ID, Parent_ID, Name, ea_guid, Notes, TPos FROM t_package"
+)
+ELEMENT_QUERY = (
+    "SELECT Object_ID, Package_ID, Name, Object_Type, Stereotype, Note, Status, ea_guid, TPos "
+    "FROM t_object WHERE Object_Type <> 'Package' AND ParentID = 0"
+)
+ATTRIBUTE_QUERY = (
+    "SELECT ID, Object_ID, Name, Type, Scope, Notes, Pos FROM t_attribute"
+)
+OPERATION_QUERY = (
+    "SELECT OperationID, Object_ID, Name, Type, Scope, Notes, Pos FROM t_operation"
+)
+CONNECTOR_QUERY = (
+    "SELECT Connector_ID, Name, Connector_Type, Stereotype, Notes, Direction, "
+    "Start_Object_ID, End_Object_ID, SourceRole, SourceCard, DestRole, DestCard, ea_guid "
+    "FROM t_connector"
+)
+DIAGRAM_QUERY = (
+    "SELECT Diagram_ID, Package_ID, Name, Diagram_Type, Notes, ea_guid, TPos FROM t_diagram"
+)
+DIAGRAM_OBJECT_QUERY = (
+    "SELECT Diagram_ID, Object_ID, RectLeft, RectRight, RectTop, RectBottom, Sequence "
+    "FROM t_diagramobjects"
+)
+
+
+# Typisierte ID- und Positionsspalten der Abfragen
+COLUMN_TYPES = {
+    name: int for name in (
+        'package_id', 'parent_id', 'object_id', 'id', 'operationid', 'connector_id',
+        'start_object_id', 'end_object_id', 'diagram_id', 'tpos', 'pos', 'sequence',
+        'rectleft', 'rectright', 'recttop', 'rectbottom'
+    )
+}
+
+
+def _position_key(row: Dict[str, str], pos_column: str = 'tpos'):
+    # EA sortiert Collections nach Position, dann Name
+    return (row_int(row.get(pos_column)), row.get('name', ''))
+
+
+def load_model_tables(repo: Any, include_contents: bool = True) -> Dict[str, List[Dict[str, str]]]:
+    """
+    Lädt die Repository-Tabellen mit je einer SQL-Abfrage.
+
+    Args:
+        repo: EA Repository Objekt
+        include_contents: Auch Elemente, Attribute, Operationen, Connectors und Diagramme laden
+
+    Returns:
+        Tabellenname -> Zeilen
+    """
+    tables = {"packages": sql_query_rows(repo, PACKAGE_QUERY, COLUMN_TYPES)}
+    if include_contents:
+        tables["elements"] = sql_query_rows(repo, ELEMENT_QUERY, COLUMN_TYPES)
+        tables["attributes"] = sql_query_rows(repo, ATTRIBUTE_QUERY, COLUMN_TYPES)
+        tables["operations"] = sql_query_rows(repo, OPERATION_QUERY, COLUMN_TYPES)
+        tables["connectors"] = sql_query_rows(repo, CONNECTOR_QUERY, COLUMN_TYPES)
+        tables["diagrams"] = sql_query_rows(repo, DIAGRAM_QUERY, COLUMN_TYPES)
+        tables["diagram_objects"] = sql_query_rows(repo, DIAGRAM_OBJECT_QUERY, COLUMN_TYPES)
+    logger.debug("Tabellen geladen: " + ", ".join(f"{k}={len(v)}" for k, v in tables.items()))
+    return tables
+
+
+def build_package_tree(tables: Dict[str, List[Dict[str, str]]],
+                       package_id: Optional[int] = None) -> List[Dict]:
+    """
+    Baut aus den Tabellenzeilen die verschachtelte Package-Struktur.
+
+    Die Dictionaries kommen aus den Records (from_row/to_dict) und haben
+    damit dieselben Schlüssel wie Package.to_dict(). Wurden die Inhalte geladen,
+    enthält jedes Package zusätzlich "elements", "diagrams" und "connectors"
+    (Connectors beim Package ihres Client-Elements) im Format von
+    Element.to_dict(), Diagram.to_dict() und Connector.to_dict().
+
+    Args:
+        tables: Ergebnis von load_model_tables
+        package_id: Wurzel-Package oder None für alle Root-Models
+
+    Returns:
+        Liste von Package-Dictionaries
+    """
+    include_contents = "elements" in tables
+
+    children = defaultdict(list)
+    packages_by_id = {}
+    for row in tables["packages"]:
+        packages_by_id[row_int(row.get('package_id'))] = row
+        children[row_int(row.get('parent_id'))].append(row)
+    for rows in children.values():
+        rows.sort(key=_position_key)
+
+    if include_contents:
+        attributes = defaultdict(list)
+        for row in sorted(tables["attributes"], key=lambda r: _position_key(r, 'pos')):
+            attributes[row_int(row.get('object_id'))].append({
+                "name": row.get('name', ''),
+                "type": row.get('type', ''),
+                "visibility": row.get('scope', ''),
+                "notes": row.get('notes', '')
+            })
+
+        methods = defaultdict(list)
+        for row in sorted(tables["operations"], key=lambda r: _position_key(r, 'pos')):
+            methods[row_int(row.get('object_id'))].append({
+                "name": row.get('name', ''),
+                "return_type": row.get('type', ''),
+                "visibility": row.get('scope', ''),
+                "notes": row.get('notes', '')
+            })
+
+        elements = defaultdict(list)
+        element_package = {}
+        for row in sorted(tables["elements"], key=_position_key):
+            element_id = row_int(row.get('object_id'))
+            element_package[element_id] = row_int(row.get('package_id'))
+            elements[element_package[element_id]].append(ElementRecord.from_row(
+                row, attributes.get(element_id), methods.get(element_id)).to_dict())
+
+        connectors = defaultdict(list)
+        for row in tables["connectors"]:
+            client_id = row_int(row.get('start_object_id'))
+            if client_id not in element_package:
+                continue
+            connectors[element_package[client_id]].append(ConnectorRecord.from_row(row).to_dict())
+
+        diagram_objects = defaultdict(list)
+        for row in sorted(tables["diagram_objects"], key=lambda r: row_int(r.get('sequence'))):
+            diagram_objects[row_int(row.get('diagram_id'))].append({
+                "element_id": row_int(row.get('object_id')),
+                "left": row_int(row.get('rectleft')),
+                "right": row_int(row.get('rectright')),
+                "top": row_int(row.get('recttop')),
+                "bottom": row_int(row.get('rectbottom'))
+            })
+
+        diagrams = defaultdict(list)
+        for row in sorted(tables["diagrams"], key=_position_key):
+            objects = diagram_objects.get(row_int(row.get('diagram_id')))
+            diagrams[row_int(row.get('package_id'))].append(
+                DiagramRecord.from_row(row, objects).to_dict())
+
+    def build(row: Dict[str, str]) -> Dict:
+        pkg_id = row_int(row.get('package_id'))
+        node = PackageRecord.from_row(row).to_dict()
+        node["packages"] = [build(child) for child in children.get(pkg_id, [])]
+        if include_contents:
+            node["elements"] = elements.get(pkg_id, [])
+            node["diagrams"] = diagrams.get(pkg_id, [])
+            node["connectors"] = connectors.get(pkg_id, [])
+        return node
+
+    if package_id is None:
+        return [build(row) for row in children.get(0, [])]
+    if package_id not in packages_by_id:
+        raise EAError(f"Package mit ID {package_id} nicht gefunden")
+    return [build(packages_by_id[package_id])]
+
+
+def export_model_tree(repo: Any, package_id: Optional[int] = None,
+                      include_contents: bool = True) -> Union[Dict, List[Dict]]:
+    """
+    Exportiert den Package-Baum mit wenigen SQL-Abfragen statt einem COM-Aufruf pro Property.
+
+    Args:
+        repo: EA Repository Objekt
+        package_id: Wurzel-Package oder None für alle Root-Models
+        include_contents: Elemente, Diagramme und Connectors mit exportieren
+
+    Returns:
+        Package-Dictionary (bei package_id) oder Liste aller Root-Models
+    """
+    tables = load_model_tables(repo, include_contents)
+    tree = build_package_tree(tables, package_id)
+    return tree[0] if package_id is not None else tree
@@ -1,73 +1,105 @@
 from typing import Any, Optional, Dict
+from .backend import as_ea_object
 from .exceptions import EAError
 from .logging_conf import logger
-from .utils import ensure_update_refresh
+from .utils import DeferredUpdateMixin, ensure_update_refresh
+from .records import ConnectorRecord, SnapshotMixin
+from .index import ConnectorIndex
 
 
-class Connector:
-    def __init__(self, ea_connector: Any):
+class Connector(SnapshotMixin, DeferredUpdateMixin):
+    _record_type = ConnectorRecord
+    
+    def __init__(self, ea_connector: Any, record: Optional[ConnectorRecord] = None):
         self.ea_connector = ea_connector
+        self._record = record
+    
+    def _ea_object(self) -> Any:
+        return self.ea_connector
     
     @property
     def name(self) -> str:
+        if self._record is not None:
+            return self._record.name
         return self.ea_connector.Name
     
     @name.setter
     def name(self, value: str) -> None:
-        self.ea_connector.Name = value
-        ensure_update_refresh(self.ea_connector)
+        self._set_field("Name", value)
+        if self._record is not None:
+            self._record.name = value
     
     @property
     def guid(self) -> str:
+        if self._record is not None:
+            return self._record.guid
         return self.ea_connector.ConnectorGUID
     
     @property
     def connector_id(self) -> int:
+        if self._record is not None:
+            return self._record.connector_id
         return self.ea_connector.ConnectorID
     
     @property
     def connector_type(self) -> str:
+        if self._record is not None:
+            return self._record.connector_type
         return self.ea_connector.Type
     
     @connector_type.setter
     def connector_type(self, value: str) -> None:
-        self.ea_connector.Type = value
-        ensure_update_refresh(self.ea_connector)
+        self._set_field("Type", value)
+        if self._record is not None:
+            self._record.connector_type = value
     
     @property
     def stereotype(self) -> str:
+        if self._record is not None:
+            return self._record.stereotype
         return self.ea_connector.Stereotype
     
     @stereotype.setter
     def stereotype(self, value: str) -> None:
-        self.ea_connector.Stereotype = value
-        ensure_update_refresh(self.ea_connector)
+        self._set_field("Stereotype", value)
+        if self._record is not None:
+            self._record.stereotype = value
     
     @property
     def notes(self) -> str:
+        if self._record is not None:
+            return self._record.notes
         return self.ea_connector.Notes
     
     @notes.setter
     def notes(self, value: str) -> None:
-        self.ea_connector.Notes = value
-        ensure_update_refresh(self.ea_connector)
+        self._set_field("Notes", value)
+        if self._record is not None:
+            self._record.notes = value
     
     @property
     def source_element_id(self) -> int:
+        if self._record is not None:
+            return self._record.source_element_id
         return self.ea_connector.ClientID
     
     @property
     def target_element_id(self) -> int:
+        if self._record is not None:
+            return self._record.target_element_id
         return self.ea_connector.SupplierID
     
     @property
     def direction(self) -> str:
+        if self._record is not None:
+            return self._record.direction
         return self.ea_connector.Direction
     
     @direction.setter
     def direction(self, value: str) -> None:
-        self.ea_connector.Direction = value
-        ensure_update_refresh(self.ea_connector)
+        self._set_field("Direction", value)
+        if self._record is not None:
+            self._record.direction = value
     
     def set_source_role(self, name: str = "", multiplicity: str = "") -> None:
         try:
@@ -77,7 +109,12 @@ class Connector:
             if multiplicity:
                 client_end.Cardinality = multiplicity
             client_end.Update()
-            self.ea_connector.Update()
+            self._mark_changed("ClientEnd")
+            if self._record is not None:
+                if name:
+                    self._record.source_role = name
+                if multiplicity:
+                    self._record.source_multiplicity = multiplicity
             logger.info(f"Source-Rolle gesetzt: {name} [{multiplicity}]")
         except Exception as e:
             logger.error(f"Fehler beim Setzen der Source-Rolle: {e}")
@@ -91,47 +128,66 @@ class Connector:
             if multiplicity:
                 supplier_end.Cardinality = multiplicity
             supplier_end.Update()
-            self.ea_connector.Update()
+            self._mark_changed("SupplierEnd")
+            if self._record is not None:
+                if name:
+                    self._record.target_role = name
+                if multiplicity:
+                    self._record.target_multiplicity = multiplicity
             logger.info(f"Target-Rolle gesetzt: {name} [{multiplicity}]")
         except Exception as e:
             logger.error(f"Fehler beim Setzen der Target-Rolle: {e}")
             raise EAError(f"Fehler beim Setzen der Target-Rolle: {e}")
     
     def to_dict(self) -> Dict:
-        return {
-            "name": self.name,
-            "guid": self.guid,
-            "connector_id": self.connector_id,
-            "type": self.connector_type,
-            "stereotype": self.stereotype,
-            "notes": self.notes,
-            "source_element_id": self.source_element_id,
-            "target_element_id": self.target_element_id,
-            "direction": self.direction,
-            "source_role": {
-                "name": self.ea_connector.ClientEnd.Role,
-                "multiplicity": self.ea_connector.ClientEnd.Cardinality
-            },
-            "target_role": {
-                "name": self.ea_connector.SupplierEnd.Role,
-                "multiplicity": self.ea_connector.SupplierEnd.Cardinality
-            }
-        }
+        return self._current_record().to_dict()
 
 
 def create_connector(source_element: Any, target_element: Any, 
-                     connector_type: str = "Association") -> Connector:
+                     connector_type: str = "Association",
+                     name: Optional[str] = None,
+                     connector_index: Optional[ConnectorIndex] = None) -> Connector:
+    """
+    Erstellt einen Connector zwischen zwei Elementen.
+    
+    Mit connector_index (siehe get_connector_index) ist die Erstellung
+    idempotent: existiert bereits ein Connector mit gleichem Source, Target,
+    Typ und - falls angegeben - Namen, wird dieser zurückgegeben.
+    
+    Args:
+        source_element: Client-Element (EA Element oder Element-Wrapper)
+        target_element: Supplier-Element (EA Element oder Element-Wrapper)
+        connector_type: Connector-Typ (z.B. 'Association')
+        name: Optionaler Name des Connectors
+        connector_index: Optionaler ConnectorIndex für die Existenzprüfung
+    
+    Returns:
+        Connector (neu erstellt oder existierend)
+    """
     try:
-        source = source_element.ea_element if hasattr(source_element, 'ea_element') else source_element
-        target = target_element.ea_element if hasattr(target_element, 'ea_element') else target_element
+        source = as_ea_object(source_element)
+        target = as_ea_object(target_element)
+        
+        if connector_index is not None:
+            client_id = source.ElementID
+            supplier_id = target.ElementID
+            existing = connector_index.find(client_id, supplier_id, connector_type, name)
+            if existing is not None:
+                logger.info(f"Connector existiert bereits: {source.Name} -> {target.Name} (Typ: {connector_type})")
+                return Connector(existing)
+        else:
+            supplier_id = target.ElementID
         
         connectors = source.Connectors
-        new_connector = connectors.AddNew("", connector_type)
-        new_connector.SupplierID = target.ElementID
-        ensure_update_refresh(new_connector, connectors)
+        new_connector = connectors.AddNew(name or "", connector_type)
+        new_connector.SupplierID = supplier_id
+        ensure_update_refresh(new_connector, connectors, lambda: (source.ElementGUID, "Connectors"))
+        
+        if connector_index is not None:
+            connector_index.add(new_connector, client_id, supplier_id, connector_type, name or "")
         
         logger.info(f"Connector erstellt: {source.Name} -> {target.Name} (Typ: {connector_type})")
         return Connector(new_connector)
     except Exception as e:
         logger.error(f"Fehler beim Erstellen des Connectors: {e}")
-        raise EAError(f"Fehler beim Erstellen des Connectors: {e}")
\ No newline at end of file
+        raise EAError(f"Fehler beim Erstellen des Connectors: {e}")
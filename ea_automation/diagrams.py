@@ -1,42 +1,62 @@
-from typing import Any, Optional, List, Dict
+from typing import Any, Optional, List, Dict, Tuple
+from .backend import as_ea_object
 from .exceptions import EAError
 from .logging_conf import logger
-from .utils import ensure_update_refresh
+from .utils import DeferredUpdateMixin, batch_refresh, ensure_update_refresh, refresh_collection
+from .records import DiagramRecord, SnapshotMixin
 
 
-class Diagram:
-    def __init__(self, ea_diagram: Any):
+class Diagram(SnapshotMixin, DeferredUpdateMixin):
+    _record_type = DiagramRecord
+    
+    def __init__(self, ea_diagram: Any, record: Optional[DiagramRecord] = None):
         self.ea_diagram = ea_diagram
+        self._record = record
+    
+    def _ea_object(self) -> Any:
+        return self.ea_diagram
     
     @property
     def name(self) -> str:
+        if self._record is not None:
+            return self._record.name
         return self.ea_diagram.Name
     
     @name.setter
     def name(self, value: str) -> None:
-        self.ea_diagram.Name = value
-        ensure_update_refresh(self.ea_diagram)
+        self._set_field("Name", value)
+        if self._record is not None:
+            self._record.name = value
     
     @property
     def guid(self) -> str:
+        if self._record is not None:
+            return self._record.guid
         return self.ea_diagram.DiagramGUID
     
     @property
     def diagram_id(self) -> int:
+        if self._record is not None:
+            return self._record.diagram_id
         return self.ea_diagram.DiagramID
     
     @property
     def diagram_type(self) -> str:
+        if self._record is not None:
+            return self._record.diagram_type
         return self.ea_diagram.Type
     
     @property
     def notes(self) -> str:
+        if self._record is not None:
+            return self._record.notes
         return self.ea_diagram.Notes
     
     @notes.setter
     def notes(self, value: str) -> None:
-        self.ea_diagram.Notes = value
-        ensure_update_refresh(self.ea_diagram)
+        self._set_field("Notes", value)
+        if self._record is not None:
+            self._record.notes = value
     
     def add_diagram_object(self, element: Any, left: int = 10, top: int = 10, 
                           right: int = 100, bottom: int = 100) -> Any:
@@ -44,13 +64,35 @@ class Diagram:
             diagram_objects = self.ea_diagram.DiagramObjects
             new_obj = diagram_objects.AddNew(f"l={left};r={right};t={top};b={bottom};", "")
             new_obj.ElementID = element.ElementID if hasattr(element, 'ElementID') else element.element_id
-            ensure_update_refresh(new_obj, diagram_objects)
+            ensure_update_refresh(new_obj, diagram_objects, lambda: (self.ea_diagram.DiagramGUID, "DiagramObjects"))
+            if self._record is not None:
+                self._record.objects = None
             logger.info(f"Element zum Diagramm hinzugefügt: {element.Name if hasattr(element, 'Name') else element.name}")
             return new_obj
         except Exception as e:
             logger.error(f"Fehler beim Hinzufügen des Elements zum Diagramm: {e}")
             raise EAError(f"Fehler beim Hinzufügen des Elements zum Diagramm: {e}")
     
+    def add_diagram_objects(self, placements: List[Tuple[Any, int, int, int, int]]) -> List[Any]:
+        """Fügt mehrere Elemente (Element, left, top, right, bottom) hinzu; ein Refresh am Ende."""
+        try:
+            diagram_objects = self.ea_diagram.DiagramObjects
+            key = (self.ea_diagram.DiagramGUID, "DiagramObjects")
+            created = []
+            with batch_refresh():
+                for element, left, top, right, bottom in placements:
+                    new_obj = diagram_objects.AddNew(f"l={left};r={right};t={top};b={bottom};", "")
+                    new_obj.ElementID = element.ElementID if hasattr(element, 'ElementID') else element.element_id
+                    ensure_update_refresh(new_obj, diagram_objects, key)
+                    created.append(new_obj)
+            if self._record is not None:
+                self._record.objects = None
+            logger.info(f"{len(created)} Elemente zum Diagramm hinzugefügt")
+            return created
+        except Exception as e:
+            logger.error(f"Fehler beim Hinzufügen der Elemente zum Diagramm: {e}")
+            raise EAError(f"Fehler beim Hinzufügen der Elemente zum Diagramm: {e}")
+    
     def remove_diagram_object(self, element_id: int) -> bool:
         try:
             diagram_objects = self.ea_diagram.DiagramObjects
@@ -59,6 +101,8 @@ class Diagram:
                 if obj.ElementID == element_id:
                     diagram_objects.DeleteAt(i, True)
                     diagram_objects.Refresh()
+                    if self._record is not None:
+                        self._record.objects = None
                     logger.info(f"Element aus Diagramm entfernt: {element_id}")
                     return True
             return False
@@ -67,9 +111,12 @@ class Diagram:
             raise EAError(f"Fehler beim Entfernen des Elements aus dem Diagramm: {e}")
     
     def get_diagram_objects(self) -> List[Dict]:
+        if self._record is not None and self._record.objects is not None:
+            return list(self._record.objects)
         objects = []
-        for i in range(self.ea_diagram.DiagramObjects.Count):
-            obj = self.ea_diagram.DiagramObjects.GetAt(i)
+        collection = self.ea_diagram.DiagramObjects
+        for i in range(collection.Count):
+            obj = collection.GetAt(i)
             objects.append({
                 "element_id": obj.ElementID,
                 "left": obj.left,
@@ -77,7 +124,9 @@ class Diagram:
                 "top": obj.top,
                 "bottom": obj.bottom
             })
-        return objects
+        if self._record is not None:
+            self._record.objects = objects
+        return list(objects)
     
     def save_as_image(self, filepath: str) -> bool:
         try:
@@ -90,22 +139,17 @@ class Diagram:
             raise EAError(f"Fehler beim Speichern des Diagramms als Bild: {e}")
     
     def to_dict(self) -> Dict:
-        return {
-            "name": self.name,
-            "guid": self.guid,
-            "diagram_id": self.diagram_id,
-            "type": self.diagram_type,
-            "notes": self.notes,
-            "objects": self.get_diagram_objects()
-        }
+        data = self._current_record().to_dict()
+        data["objects"] = self.get_diagram_objects()
+        return data
 
 
 def create_diagram_in_package(package: Any, name: str, diagram_type: str = "Class") -> Diagram:
     try:
-        ea_package = package.ea_package if hasattr(package, 'ea_package') else package
+        ea_package = as_ea_object(package)
         diagrams = ea_package.Diagrams
         new_diagram = diagrams.AddNew(name, diagram_type)
-        ensure_update_refresh(new_diagram, diagrams)
+        ensure_update_refresh(new_diagram, diagrams, lambda: (ea_package.PackageGUID, "Diagrams"))
         logger.info(f"Diagramm erstellt: {name} (Typ: {diagram_type})")
         return Diagram(new_diagram)
     except Exception as e:
@@ -115,7 +159,7 @@ def create_diagram_in_package(package: Any, name: str, diagram_type: str = "Clas
 
 def get_diagrams_from_package(package: Any) -> List[Diagram]:
     diagrams = []
-    ea_package = package.ea_package if hasattr(package, 'ea_package') else package
+    ea_package = as_ea_object(package)
     for i in range(ea_package.Diagrams.Count):
         diagrams.append(Diagram(ea_package.Diagrams.GetAt(i)))
     return diagrams
@@ -135,7 +179,7 @@ def create_diagram(package: Any, name: str, diagram_type: str) -> Any:
     """
     try:
         # Hole Package-Objekt
-        ea_package = package.ea_package if hasattr(package, 'ea_package') else package
+        ea_package = as_ea_object(package)
         diagrams_collection = ea_package.Diagrams
         
         # Prüfe ob Diagramm bereits existiert
@@ -166,7 +210,7 @@ def create_diagram(package: Any, name: str, diagram_type: str) -> Any:
         
         # Update und Refresh
         new_diagram.Update()
-        diagrams_collection.Refresh()
+        refresh_collection(diagrams_collection, lambda: (ea_package.PackageGUID, "Diagrams"))
         
         logger.info(f"Diagramm erfolgreich erstellt: {name} (ID: {new_diagram.DiagramID})")
         return new_diagram
@@ -194,7 +238,8 @@ def place_on_diagram(diagram: Any, element: Any, left: int, top: int, right: int
     """
     try:
         # Hole DiagramObjects Collection
-        diagram_objects = diagram.DiagramObjects if hasattr(diagram, 'DiagramObjects') else diagram.ea_diagram.DiagramObjects
+        ea_diagram = as_ea_object(diagram)
+        diagram_objects = ea_diagram.DiagramObjects
         
         # Hole Element ID
         element_id = element.ElementID if hasattr(element, 'ElementID') else element.element_id
@@ -226,7 +271,7 @@ def place_on_diagram(diagram: Any, element: Any, left: int, top: int, right: int
         
         # Update und Refresh
         new_obj.Update()
-        diagram_objects.Refresh()
+        refresh_collection(diagram_objects, lambda: (ea_diagram.DiagramGUID, "DiagramObjects"))
         
         logger.info(f"Element '{element_name}' auf Diagramm platziert: [{left},{top}]->[{right},{bottom}]")
         return new_obj
@@ -237,6 +282,74 @@ def place_on_diagram(diagram: Any, element: Any, left: int, top: int, right: int
         raise EAError(error_msg)
 
 
+def place_many_on_diagram(diagram: Any, placements: List[Tuple[Any, int, int, int, int]]) -> List[Any]:
+    """
+    Platziert viele Elemente in einem Durchgang auf einem Diagramm.
+    
+    Die DiagramObjects-Collection wird einmal in eine ElementID-Map gelesen;
+    vorhandene Objekte erhalten die neue Position, fehlende werden eingefügt.
+    Danach folgen ein einziges Refresh() der Collection und ein einziges
+    Update() des Diagramms.
+    
+    Args:
+        diagram: EA Diagram Objekt oder Diagram-Wrapper
+        placements: Liste von (Element, left, top, right, bottom)
+    
+    Returns:
+        Liste der DiagramObjects (ohne Elemente, die nicht platziert werden konnten)
+    """
+    try:
+        ea_diagram = as_ea_object(diagram)
+        diagram_objects = ea_diagram.DiagramObjects
+        
+        # Vorhandene Objekte einmal einlesen (wie beim Scan gewinnt das erste)
+        by_element_id = {}
+        for i in range(diagram_objects.Count):
+            obj = diagram_objects.GetAt(i)
+            by_element_id.setdefault(obj.ElementID, obj)
+        
+        placed = []
+        inserted = 0
+        with batch_refresh():
+            for idx, (element, left, top, right, bottom) in enumerate(placements):
+                element_name = element.Name if hasattr(element, 'Name') else getattr(element, 'name', f"Element_{idx}")
+                try:
+                    element_id = element.ElementID if hasattr(element, 'ElementID') else element.element_id
+                    obj = by_element_id.get(element_id)
+                    if obj is not None:
+                        logger.debug(f"Element '{element_name}' bereits auf Diagramm, aktualisiere Position")
+                        obj.left = left
+                        obj.top = top
+                        obj.right = right
+                        obj.bottom = bottom
+                        obj.Update()
+                    else:
+                        coords = f"l={left};r={right};t={top};b={bottom};"
+                        logger.debug(f"Platziere Element '{element_name}' mit Koordinaten: {coords}")
+                        obj = diagram_objects.AddNew(coords, "")
+                        obj.ElementID = element_id
+                        obj.ShowPublicAttributes = True
+                        obj.ShowPublicOperations = True
+                        obj.Update()
+                        by_element_id[element_id] = obj
+                        inserted += 1
+                    placed.append(obj)
+                except Exception as e:
+                    logger.warning(f"Konnte Element '{element_name}' nicht platzieren: {e}")
+            
+            if inserted:
+                refresh_collection(diagram_objects, lambda: (ea_diagram.DiagramGUID, "DiagramObjects"))
+        
+        ea_diagram.Update()
+        logger.info(f"{len(placed)} Elemente auf Diagramm platziert ({inserted} neu)")
+        return placed
+        
+    except Exception as e:
+        error_msg = f"Fehler beim Platzieren der Elemente auf dem Diagramm: {str(e)}"
+        logger.error(error_msg)
+        raise EAError(error_msg)
+
+
 def auto_place_grid(
     diagram: Any, 
     elements: List[Any], 
@@ -262,7 +375,7 @@ def auto_place_grid(
     try:
         logger.info(f"Auto-Platzierung von {len(elements)} Elementen im {cols}-Spalten-Raster")
         
-        diagram_objects = []
+        placements = []
         
         # Berechne Element-Größe (abzüglich Margin)
         elem_width = cell_w - margin
@@ -280,22 +393,11 @@ def auto_place_grid(
             right = left + elem_width
             bottom = top - elem_height  # Bottom ist kleiner als Top in EA
             
-            element_name = element.Name if hasattr(element, 'Name') else element.name if hasattr(element, 'name') else f"Element_{idx}"
-            logger.debug(f"Platziere '{element_name}' in Raster [{col},{row}]")
-            
-            # Platziere Element auf Diagramm
-            try:
-                diag_obj = place_on_diagram(diagram, element, left, top, right, bottom)
-                diagram_objects.append(diag_obj)
-            except Exception as e:
-                logger.warning(f"Konnte Element '{element_name}' nicht platzieren: {e}")
-                continue
+            logger.debug(f"Raster-Position [{col},{row}] für Element {idx}")
+            placements.append((element, left, top, right, bottom))
         
-        # Refresh Diagramm
-        if hasattr(diagram, 'Update'):
-            diagram.Update()
-        elif hasattr(diagram, 'ea_diagram'):
-            diagram.ea_diagram.Update()
+        # Ein Durchgang: Map lesen, aktualisieren/einfügen, ein Refresh, ein Diagramm-Update
+        diagram_objects = place_many_on_diagram(diagram, placements)
         
         logger.info(f"[OK] {len(diagram_objects)} Elemente erfolgreich platziert")
         
@@ -1,66 +1,98 @@
-from typing import Any, Optional, List, Dict
+from typing import Any, Optional, List, Dict, Tuple
+from .backend import as_ea_object
 from .exceptions import EAError, EATypeError
 from .logging_conf import logger
-from .utils import ensure_update_refresh
+from .utils import DeferredUpdateMixin, EditSession, batch_refresh, ensure_update_refresh, refresh_collection
+from .index import get_element_index, get_feature_index, note_element_created
+from .records import ElementRecord, SnapshotMixin
+from .connectors import Connector
 
 
-class Element:
-    def __init__(self, ea_element: Any):
+class Element(SnapshotMixin, DeferredUpdateMixin):
+    _record_type = ElementRecord
+    
+    def __init__(self, ea_element: Any, record: Optional[ElementRecord] = None):
         self.ea_element = ea_element
+        self._record = record
+    
+    def _ea_object(self) -> Any:
+        return self.ea_element
     
     @property
     def name(self) -> str:
+        if self._record is not None:
+            return self._record.name
         return self.ea_element.Name
     
     @name.setter
     def name(self, value: str) -> None:
-        self.ea_element.Name = value
-        ensure_update_refresh(self.ea_element)
+        self._set_field("Name", value)
+        if self._record is not None:
+            self._record.name = value
     
     @property
     def guid(self) -> str:
+        if self._record is not None:
+            return self._record.guid
         return self.ea_element.ElementGUID
     
     @property
     def element_id(self) -> int:
+        if self._record is not None:
+            return self._record.element_id
         return self.ea_element.ElementID
     
     @property
     def element_type(self) -> str:
+        if self._record is not None:
+            return self._record.element_type
         return self.ea_element.Type
     
     @property
     def stereotype(self) -> str:
+        if self._record is not None:
+            return self._record.stereotype
         return self.ea_element.Stereotype
     
     @stereotype.setter
     def stereotype(self, value: str) -> None:
-        self.ea_element.Stereotype = value
-        ensure_update_refresh(self.ea_element)
+        self._set_field("Stereotype", value)
+        if self._record is not None:
+            self._record.stereotype = value
     
     @property
     def notes(self) -> str:
+        if self._record is not None:
+            return self._record.notes
         return self.ea_element.Notes
     
     @notes.setter
     def notes(self, value: str) -> None:
-        self.ea_element.Notes = value
-        ensure_update_refresh(self.ea_element)
+        self._set_field("Notes", value)
+        if self._record is not None:
+            self._record.notes = value
     
     @property
     def status(self) -> str:
+        if self._record is not None:
+            return self._record.status
         return self.ea_element.Status
     
     @status.setter
     def status(self, value: str) -> None:
-        self.ea_element.Status = value
-        ensure_update_refresh(self.ea_element)
+        self._set_field("Status", value)
+        if self._record is not None:
+            self._record.status = value
     
     def add_attribute(self, name: str, attr_type: str = "String") -> Any:
         try:
+            feature_index = get_feature_index(self.ea_element)
             attributes = self.ea_element.Attributes
             new_attr = attributes.AddNew(name, attr_type)
-            ensure_update_refresh(new_attr, attributes)
+            ensure_update_refresh(new_attr, attributes, (feature_index.guid, "Attributes"))
+            feature_index.add_attribute(name, new_attr, attr_type)
+            if self._record is not None:
+                self._record.attributes = None
             logger.info(f"Attribut erstellt: {name}")
             return new_attr
         except Exception as e:
@@ -69,58 +101,128 @@ class Element:
     
     def add_method(self, name: str, return_type: str = "void") -> Any:
         try:
+            feature_index = get_feature_index(self.ea_element)
             methods = self.ea_element.Methods
             new_method = methods.AddNew(name, return_type)
-            ensure_update_refresh(new_method, methods)
+            ensure_update_refresh(new_method, methods, (feature_index.guid, "Methods"))
+            feature_index.add_operation(name, new_method, return_type)
+            if self._record is not None:
+                self._record.methods = None
             logger.info(f"Methode erstellt: {name}")
             return new_method
         except Exception as e:
             logger.error(f"Fehler beim Erstellen der Methode: {e}")
             raise EAError(f"Fehler beim Erstellen der Methode: {e}")
     
+    def add_attributes(self, attributes: List[Tuple[str, str]]) -> List[Any]:
+        """Fügt mehrere Attribute (Name, Typ) hinzu; die Collection wird einmal am Ende aktualisiert."""
+        try:
+            feature_index = get_feature_index(self.ea_element)
+            collection = self.ea_element.Attributes
+            key = (feature_index.guid, "Attributes")
+            created = []
+            with batch_refresh():
+                for name, attr_type in attributes:
+                    new_attr = collection.AddNew(name, attr_type)
+                    ensure_update_refresh(new_attr, collection, key)
+                    feature_index.add_attribute(name, new_attr, attr_type)
+                    created.append(new_attr)
+            if self._record is not None:
+                self._record.attributes = None
+            logger.info(f"{len(created)} Attribute erstellt")
+            return created
+        except Exception as e:
+            logger.error(f"Fehler beim Erstellen der Attribute: {e}")
+            raise EAError(f"Fehler beim Erstellen der Attribute: {e}")
+    
+    def add_methods(self, methods: List[Tuple[str, str]]) -> List[Any]:
+        """Fügt mehrere Methoden (Name, Rückgabetyp) hinzu; die Collection wird einmal am Ende aktualisiert."""
+        try:
+            feature_index = get_feature_index(self.ea_element)
+            collection = self.ea_element.Methods
+            key = (feature_index.guid, "Methods")
+            created = []
+            with batch_refresh():
+                for name, return_type in methods:
+                    new_method = collection.AddNew(name, return_type)
+                    ensure_update_refresh(new_method, collection, key)
+                    feature_index.add_operation(name, new_method, return_type)
+                    created.append(new_method)
+            if self._record is not None:
+                self._record.methods = None
+            logger.info(f"{len(created)} Methoden erstellt")
+            return created
+        except Exception as e:
+            logger.error(f"Fehler beim Erstellen der Methoden: {e}")
+            raise EAError(f"Fehler beim Erstellen der Methoden: {e}")
+    
+    def add_connectors(self, targets: List[Tuple[Any, str]]) -> List[Connector]:
+        """Erstellt mehrere Connectors (Ziel-Element, Typ) ausgehend von diesem Element."""
+        try:
+            collection = self.ea_element.Connectors
+            key = (self.ea_element.ElementGUID, "Connectors")
+            created = []
+            with batch_refresh():
+                for target, connector_type in targets:
+                    target_element = as_ea_object(target)
+                    new_connector = collection.AddNew("", connector_type)
+                    new_connector.SupplierID = target_element.ElementID
+                    ensure_update_refresh(new_connector, collection, key)
+                    created.append(Connector(new_connector))
+            logger.info(f"{len(created)} Connectors erstellt")
+            return created
+        except Exception as e:
+            logger.error(f"Fehler beim Erstellen der Connectors: {e}")
+            raise EAError(f"Fehler beim Erstellen der Connectors: {e}")
+    
     def get_attributes(self) -> List[Dict]:
+        if self._record is not None and self._record.attributes is not None:
+            return list(self._record.attributes)
         attributes = []
-        for i in range(self.ea_element.Attributes.Count):
-            attr = self.ea_element.Attributes.GetAt(i)
+        collection = self.ea_element.Attributes
+        for i in range(collection.Count):
+            attr = collection.GetAt(i)
             attributes.append({
                 "name": attr.Name,
                 "type": attr.Type,
                 "visibility": attr.Visibility,
                 "notes": attr.Notes
             })
-        return attributes
+        if self._record is not None:
+            self._record.attributes = attributes
+        return list(attributes)
     
     def get_methods(self) -> List[Dict]:
+        if self._record is not None and self._record.methods is not None:
+            return list(self._record.methods)
         methods = []
-        for i in range(self.ea_element.Methods.Count):
-            method = self.ea_element.Methods.GetAt(i)
+        collection = self.ea_element.Methods
+        for i in range(collection.Count):
+            method = collection.GetAt(i)
             methods.append({
                 "name": method.Name,
                 "return_type": method.ReturnType,
                 "visibility": method.Visibility,
                 "notes": method.Notes
             })
-        return methods
+        if self._record is not None:
+            self._record.methods = methods
+        return list(methods)
     
     def to_dict(self) -> Dict:
-        return {
-            "name": self.name,
-            "guid": self.guid,
-            "element_id": self.element_id,
-            "type": self.element_type,
-            "stereotype": self.stereotype,
-            "notes": self.notes,
-            "status": self.status,
-            "attributes": self.get_attributes(),
-            "methods": self.get_methods()
-        }
+        data = self._current_record().to_dict()
+        data["attributes"] = self.get_attributes()
+        data["methods"] = self.get_methods()
+        return data
 
 
 def create_element_in_package(package: Any, name: str, element_type: str = "Class") -> Element:
     try:
-        elements = package.Elements if hasattr(package, 'Elements') else package.ea_package.Elements
+        ea_package = as_ea_object(package)
+        elements = ea_package.Elements
         new_element = elements.AddNew(name, element_type)
-        ensure_update_refresh(new_element, elements)
+        ensure_update_refresh(new_element, elements, lambda: (ea_package.PackageGUID, "Elements"))
+        note_element_created(ea_package, new_element, name, element_type, "")
         logger.info(f"Element erstellt: {name} (Typ: {element_type})")
         return Element(new_element)
     except Exception as e:
@@ -130,12 +232,34 @@ def create_element_in_package(package: Any, name: str, element_type: str = "Clas
 
 def get_elements_from_package(package: Any) -> List[Element]:
     elements = []
-    ea_package = package.ea_package if hasattr(package, 'ea_package') else package
+    ea_package = as_ea_object(package)
     for i in range(ea_package.Elements.Count):
         elements.append(Element(ea_package.Elements.GetAt(i)))
     return elements
 
 
+def resolve_element_type(uml_or_mdg_type: str, stereotype: Optional[str] = None) -> Tuple[str, str]:
+    """
+    Ermittelt Basis-Typ und Stereotype, mit denen ein Element angelegt wird.
+    
+    Args:
+        uml_or_mdg_type: UML-Typ (z.B. 'Class') oder MDG-Typ (z.B. 'SysML1.4::Block')
+        stereotype: Optionales Stereotype
+    
+    Returns:
+        (Basis-Typ, Stereotype), z.B. ('Class', 'block') für 'SysML1.4::Block'
+    """
+    if '::' in uml_or_mdg_type:
+        # MDG-Typ (z.B. 'SysML1.4::Block')
+        base_type = uml_or_mdg_type.split('::')[-1]
+        # Für SysML Blocks verwende Class als Basis-Typ mit block Stereotype
+        if base_type.lower() == "block":
+            return "Class", "block"
+        return base_type, stereotype if stereotype else base_type
+    # Standard UML-Typ
+    return uml_or_mdg_type, stereotype or ""
+
+
 def create_element(
     package: Any, 
     name: str, 
@@ -159,74 +283,45 @@ def create_element(
     """
     try:
         # Hole Package-Objekt
-        ea_package = package.ea_package if hasattr(package, 'ea_package') else package
+        ea_package = as_ea_object(package)
         elements_collection = ea_package.Elements
         
-        # Prüfe ob Element bereits existiert (Idempotenz)
+        # Prüfe ob Element bereits existiert (Idempotenz) - Hash-Lookup statt COM-Scan
         logger.debug(f"Suche existierendes Element: {name} (Typ: {uml_or_mdg_type})")
-        for i in range(elements_collection.Count):
-            elem = elements_collection.GetAt(i)
-            # Vergleiche Name und Typ/Stereotype
-            if elem.Name == name:
-                # Prüfe ob es der richtige Typ ist
-                if '::' in uml_or_mdg_type:
-                    # MDG-Typ: Prüfe Stereotype
-                    expected_stereotype = uml_or_mdg_type.split('::')[-1].lower()
-                    if elem.Stereotype.lower() == expected_stereotype or elem.Stereotype.lower() == stereotype.lower() if stereotype else False:
-                        logger.info(f"Element existiert bereits: {name} (ID: {elem.ElementID})")
-                        # Update Notes wenn angegeben
-                        if notes and elem.Notes != notes:
-                            elem.Notes = notes
-                            elem.Update()
-                            logger.debug(f"Notes aktualisiert für: {name}")
-                        return elem
-                else:
-                    # Standard UML-Typ
-                    if elem.Type == uml_or_mdg_type:
-                        logger.info(f"Element existiert bereits: {name} (ID: {elem.ElementID})")
-                        # Update Notes wenn angegeben
-                        if notes and elem.Notes != notes:
-                            elem.Notes = notes
-                            elem.Update()
-                            logger.debug(f"Notes aktualisiert für: {name}")
-                        return elem
+        element_index = get_element_index(ea_package)
+        elem = element_index.find(name, uml_or_mdg_type, stereotype)
+        if elem is not None:
+            logger.info(f"Element existiert bereits: {name} (ID: {elem.ElementID})")
+            # Update Notes wenn angegeben
+            if notes and elem.Notes != notes:
+                with EditSession(elem) as session:
+                    session.set("Notes", notes)
+                logger.debug(f"Notes aktualisiert für: {name}")
+            return elem
         
         # Element existiert nicht - neu erstellen
         logger.info(f"Erstelle neues Element: {name} (Typ: {uml_or_mdg_type})")
         
-        # Unterscheide zwischen Standard UML und MDG-Typen
-        if '::' in uml_or_mdg_type:
-            # MDG-Typ (z.B. 'SysML1.4::Block')
-            mdg_parts = uml_or_mdg_type.split('::')
-            base_type = mdg_parts[-1]  # z.B. 'Block'
-            mdg_tech = mdg_parts[0]     # z.B. 'SysML1.4'
-            
-            # Für SysML Blocks verwende Class als Basis-Typ mit block Stereotype
-            if base_type.lower() == "block":
-                new_element = elements_collection.AddNew(name, "Class")
-                new_element.Stereotype = "block"
-            else:
-                # Erstelle Element mit Basis-Typ
-                new_element = elements_collection.AddNew(name, base_type)
-                new_element.Stereotype = stereotype if stereotype else base_type
-            
-            # Setze MetaType für MDG-Erkennung
-            new_element.MetaType = uml_or_mdg_type
-            
-            logger.debug(f"MDG-Element erstellt: {mdg_tech}::{base_type}")
-        else:
-            # Standard UML-Typ
-            new_element = elements_collection.AddNew(name, uml_or_mdg_type)
-            if stereotype:
-                new_element.Stereotype = stereotype
+        created_type, created_stereotype = resolve_element_type(uml_or_mdg_type, stereotype)
+        
+        new_element = elements_collection.AddNew(name, created_type)
         
-        # Setze Notes wenn angegeben
-        if notes:
-            new_element.Notes = notes
+        # Stereotype, MetaType und Notes setzen, dann ein einziges Update()
+        with EditSession(new_element, is_new=True) as session:
+            if '::' in uml_or_mdg_type:
+                session.set("Stereotype", created_stereotype)
+                # Setze MetaType für MDG-Erkennung
+                session.set("MetaType", uml_or_mdg_type)
+                logger.debug(f"MDG-Element erstellt: {uml_or_mdg_type}")
+            elif stereotype:
+                session.set("Stereotype", stereotype)
+            
+            # Setze Notes wenn angegeben
+            if notes:
+                session.set("Notes", notes)
         
-        # Update und Refresh
-        new_element.Update()
-        elements_collection.Refresh()
+        refresh_collection(elements_collection, (element_index.guid, "Elements"))
+        note_element_created(ea_package, new_element, name, created_type, created_stereotype)
         
         logger.info(f"Element erfolgreich erstellt: {name} (ID: {new_element.ElementID}, GUID: {new_element.ElementGUID})")
         return new_element
@@ -250,22 +345,25 @@ def add_attribute(element: Any, name: str, type_: str = "") -> Any:
         EA Attribute Objekt
     """
     try:
-        # Prüfe ob Attribut bereits existiert
-        attributes = element.Attributes
-        for i in range(attributes.Count):
-            attr = attributes.GetAt(i)
-            if attr.Name == name:
-                logger.info(f"Attribut existiert bereits: {name}")
-                if type_ and attr.Type != type_:
-                    attr.Type = type_
-                    attr.Update()
-                    logger.debug(f"Attribut-Typ aktualisiert: {name} -> {type_}")
-                return attr
+        # Prüfe ob Attribut bereits existiert (Name-Index statt Collection-Scan)
+        feature_index = get_feature_index(element)
+        entry = feature_index.find_attribute(name)
+        if entry is not None:
+            logger.info(f"Attribut existiert bereits: {name}")
+            attr = feature_index.attribute_object(entry)
+            if type_ and entry.type != type_:
+                attr.Type = type_
+                attr.Update()
+                entry.type = type_
+                logger.debug(f"Attribut-Typ aktualisiert: {name} -> {type_}")
+            return attr
         
         # Erstelle neues Attribut
+        attributes = element.Attributes
         new_attr = attributes.AddNew(name, type_)
         new_attr.Update()
-        attributes.Refresh()
+        refresh_collection(attributes, (feature_index.guid, "Attributes"))
+        feature_index.add_attribute(name, new_attr, type_)
         
         logger.info(f"Attribut erstellt: {name} (Typ: {type_}) für Element {element.Name}")
         return new_attr
@@ -289,22 +387,25 @@ def add_operation(element: Any, name: str, return_type: str = "void") -> Any:
         EA Method Objekt
     """
     try:
-        # Prüfe ob Operation bereits existiert
-        methods = element.Methods
-        for i in range(methods.Count):
-            method = methods.GetAt(i)
-            if method.Name == name:
-                logger.info(f"Operation existiert bereits: {name}")
-                if method.ReturnType != return_type:
-                    method.ReturnType = return_type
-                    method.Update()
-                    logger.debug(f"Rückgabetyp aktualisiert: {name} -> {return_type}")
-                return method
+        # Prüfe ob Operation bereits existiert (Name-Index statt Collection-Scan)
+        feature_index = get_feature_index(element)
+        entry = feature_index.find_operation(name)
+        if entry is not None:
+            logger.info(f"Operation existiert bereits: {name}")
+            method = feature_index.operation_object(entry)
+            if entry.type != return_type:
+                method.ReturnType = return_type
+                method.Update()
+                entry.type = return_type
+                logger.debug(f"Rückgabetyp aktualisiert: {name} -> {return_type}")
+            return method
         
         # Erstelle neue Operation
+        methods = element.Methods
         new_method = methods.AddNew(name, return_type)
         new_method.Update()
-        methods.Refresh()
+        refresh_collection(methods, (feature_index.guid, "Methods"))
+        feature_index.add_operation(name, new_method, return_type)
         
         logger.info(f"Operation erstellt: {name} (Return: {return_type}) für Element {element.Name}")
         return new_method
@@ -7,4 +7,8 @@ class EAConnectionError(EAError):
 
 
 class EATypeError(EAError):
-    pass
\ No newline at end of file
+    pass
+
+
+class EAReplayError(EAError):
+    pass
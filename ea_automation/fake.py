@@ -0,0 +1,124 @@
+import time
+from collections import Counter
+from typing import Any, Optional
+from .qea import QeaCollection, QeaConnectorEnd, QeaObject, QeaRepository, open_memory_repository
+
+
+# Objekte, die als eigene COM-Objekte gelten und deshalb umhüllt werden
+_WRAPPED_TYPES = (QeaRepository, QeaObject, QeaCollection, QeaConnectorEnd)
+
+
+class CallStats:
+    """
+    Zähler der simulierten COM-Aufrufe.
+
+    Schlüssel in calls: "Element.Name" (Property lesen), "Element.Name="
+    (Property schreiben), "Collection.AddNew()" (Methode aufrufen). Jeder
+    Eintrag entspricht einem Round-Trip zu EA.
+    """
+
+    def __init__(self):
+        self.calls: Counter = Counter()
+
+    @property
+    def total(self) -> int:
+        return sum(self.calls.values())
+
+    def count(self, prefix: str) -> int:
+        """Summe aller Aufrufe, deren Schlüssel mit prefix beginnt (z.B. "Element." oder "Repository.SQLQuery")."""
+        return sum(n for key, n in self.calls.items() if key.startswith(prefix))
+
+    def reset(self) -> None:
+        self.calls.clear()
+
+    def summary(self, limit: int = 20) -> str:
+        """Text mit den häufigsten Aufrufen."""
+        lines = [f"{count:8d}  {key}" for key, count in self.calls.most_common(limit)]
+        lines.append(f"{self.total:8d}  gesamt")
+        return "\n".join(lines)
+
+
+class FakeObject:
+    """
+    Hülle um ein Objekt des In-Memory-Backends, die sich wie ein COM-Objekt verhält.
+
+    Jeder Property-Zugriff und jeder Methodenaufruf zählt als Round-Trip
+    und wartet die eingestellte Latenz ab; Rückgabewerte (Collections,
+    Elemente, ...) werden wieder umhüllt.
+    """
+
+    __slots__ = ("_target", "_root", "_name")
+
+    def __init__(self, target: Any, root: Optional['FakeRepository'] = None):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_root", root if root is not None else self)
+        object.__setattr__(self, "_name", type(target).__name__.replace("Qea", "", 1))
+
+    def _round_trip(self, key: str) -> None:
+        root = self._root
+        root.stats.calls[key] += 1
+        if root.latency:
+            time.sleep(root.latency)
+
+    def _wrap(self, value: Any) -> Any:
+        if isinstance(value, _WRAPPED_TYPES):
+            if value is self._root._target:
+                return self._root
+            return FakeObject(value, self._root)
+        return value
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self._target, name)
+        if callable(value):
+            key = f"{self._name}.{name}()"
+
+            def invoke(*args: Any, **kwargs: Any) -> Any:
+                self._round_trip(key)
+                return self._wrap(value(*args, **kwargs))
+            return invoke
+        self._round_trip(f"{self._name}.{name}")
+        return self._wrap(value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        self._round_trip(f"{self._name}.{name}=")
+        setattr(self._target, name, value)
+
+    def __repr__(self) -> str:
+        return f"<Fake {self._target!r}>"
+
+
+class FakeRepository(FakeObject):
+    """
+    In-Memory EA-Repository mit Latenz pro Aufruf und Aufrufzählung.
+
+    Basis ist das In-Memory-Backend (QeaRepository über sqlite3), das die
+    von ea_automation verwendete EA-API implementiert; darüber liegt
+    FakeObject. Damit laufen ModelBuilder, create_element, auto_place_grid
+    & Co. ohne EA und die Zahl der COM-Round-Trips wird messbar.
+    """
+
+    __slots__ = ("stats", "latency")
+
+    def __init__(self, repository: QeaRepository, latency: float = 0.0):
+        object.__setattr__(self, "stats", CallStats())
+        object.__setattr__(self, "latency", latency)
+        super().__init__(repository)
+
+    @property
+    def simulated_seconds(self) -> float:
+        """Summe der Latenz aller bisherigen Aufrufe."""
+        return self.stats.total * self.latency
+
+
+def open_fake_repository(path: Optional[str] = None, latency: float = 0.0) -> FakeRepository:
+    """
+    Öffnet ein simuliertes EA-Repository für Tests und Benchmarks unter Linux.
+
+    Args:
+        path: Optionale .qea-Datei als Ausgangsstand (wird in den Speicher kopiert)
+        latency: Wartezeit in Sekunden pro COM-Aufruf (z.B. 0.0002 für 200 µs)
+
+    Returns:
+        FakeRepository; Aufrufzähler unter .stats
+    """
+    return FakeRepository(open_memory_repository(path), latency)
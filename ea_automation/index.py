@@ -0,0 +1,744 @@
+from typing import Any, Dict, List, Optional, Tuple
+from .backend import as_ea_object
+from .logging_conf import logger
+from .sql import sql_query_rows
+
+
+class PackageElementIndex:
+    """
+    Hash-Index über die Elemente eines Packages.
+
+    Die Elements-Collection wird genau einmal gelesen; danach ist jede
+    Idempotenz-Prüfung in create_element ein Dictionary-Zugriff statt eines
+    linearen Scans über COM.
+    """
+
+    def __init__(self, ea_package: Any, guid: Optional[str] = None):
+        self.ea_package = ea_package
+        self.guid = ea_package.PackageGUID if guid is None else guid
+        self.by_type: Dict[Tuple[str, str], Any] = {}
+        self.by_stereotype: Dict[Tuple[str, str], Any] = {}
+        self.load()
+
+    def load(self) -> None:
+        """Liest die Elements-Collection des Packages einmalig ein."""
+        self.by_type.clear()
+        self.by_stereotype.clear()
+        elements = self.ea_package.Elements
+        count = elements.Count
+        for i in range(count):
+            self.add(elements.GetAt(i))
+        logger.debug(f"Element-Index geladen: {count} Elemente")
+
+    def add(self, element: Any, name: Optional[str] = None,
+            element_type: Optional[str] = None, stereotype: Optional[str] = None) -> None:
+        """
+        Nimmt ein Element in den Index auf.
+
+        Bereits bekannte Werte können übergeben werden, um die COM-Reads
+        für Name/Type/Stereotype zu sparen. Wie beim linearen Scan gewinnt
+        bei Namensgleichheit das zuerst aufgenommene Element.
+        """
+        name = element.Name if name is None else name
+        element_type = element.Type if element_type is None else element_type
+        stereotype = element.Stereotype if stereotype is None else stereotype
+
+        self.by_type.setdefault((name, element_type), element)
+        if stereotype:
+            self.by_stereotype.setdefault((name, stereotype.lower()), element)
+
+    def find(self, name: str, uml_or_mdg_type: str,
+             stereotype: Optional[str] = None) -> Optional[Any]:
+        """
+        Sucht ein Element nach Name und Typ bzw. Stereotype.
+
+        Args:
+            name: Name des Elements
+            uml_or_mdg_type: UML-Typ (z.B. 'Class') oder MDG-Typ (z.B. 'SysML1.4::Block')
+            stereotype: Optionales Stereotype (nur für MDG-Typen relevant)
+
+        Returns:
+            EA Element Objekt oder None
+        """
+        if '::' in uml_or_mdg_type:
+            # MDG-Typ: Vergleich über Stereotype
+            expected_stereotype = uml_or_mdg_type.split('::')[-1].lower()
+            element = self.by_stereotype.get((name, expected_stereotype))
+            if element is None and stereotype:
+                element = self.by_stereotype.get((name, stereotype.lower()))
+            return element
+
+        return self.by_type.get((name, uml_or_mdg_type))
+
+
+# Package-GUID -> Element-Index (GUIDs sind repository-übergreifend eindeutig)
+_element_indexes: Dict[str, PackageElementIndex] = {}
+
+
+def get_element_index(ea_package: Any) -> PackageElementIndex:
+    """
+    Liefert den Element-Index eines Packages und baut ihn beim ersten Zugriff auf.
+
+    Args:
+        ea_package: EA Package Objekt
+
+    Returns:
+        PackageElementIndex des Packages
+    """
+    key = ea_package.PackageGUID
+    index = _element_indexes.get(key)
+    if index is None:
+        index = PackageElementIndex(ea_package, key)
+        _element_indexes[key] = index
+    return index
+
+
+def note_element_created(ea_package: Any, element: Any, name: Optional[str] = None,
+                         element_type: Optional[str] = None,
+                         stereotype: Optional[str] = None) -> None:
+    """
+    Trägt ein neu erstelltes Element in bereits geladene Indizes ein.
+
+    Ist für das Package noch kein Index vorhanden, passiert nichts: Er wird
+    beim ersten Zugriff ohnehin vollständig aus der Collection geladen.
+    """
+    package_guid = ea_package.PackageGUID
+    index = _element_indexes.get(package_guid)
+    if index is not None:
+        index.add(element, name, element_type, stereotype)
+    for repo_index in _repository_indexes.values():
+        package = repo_index.packages_by_guid.get(package_guid)
+        if package is not None:
+            repo_index.add_element(element, package.object_id, name, element_type, stereotype)
+
+
+def note_package_created(parent_package: Any, ea_package: Any, name: Optional[str] = None) -> None:
+    """
+    Trägt ein neu erstelltes Package in die geladenen Repository-Indizes ein.
+
+    Args:
+        parent_package: EA Package Objekt, unter dem erstellt wurde
+        ea_package: Neues EA Package Objekt
+        name: Name des Packages (spart den COM-Read)
+    """
+    if not _repository_indexes:
+        return
+    parent_guid = parent_package.PackageGUID
+    for repo_index in _repository_indexes.values():
+        parent = repo_index.packages_by_guid.get(parent_guid)
+        if parent is not None:
+            repo_index.add_package(ea_package, parent.object_id, name)
+
+
+def invalidate_element_index(ea_package: Optional[Any] = None) -> None:
+    """
+    Verwirft den Element-Index eines Packages oder alle Indizes.
+
+    Muss aufgerufen werden, wenn Elemente außerhalb dieser Bibliothek
+    (z.B. in der EA-GUI) angelegt oder gelöscht wurden.
+
+    Args:
+        ea_package: EA Package Objekt oder None für alle Packages
+    """
+    if ea_package is None:
+        _element_indexes.clear()
+    else:
+        _element_indexes.pop(ea_package.PackageGUID, None)
+
+
+PACKAGE_INDEX_QUERY = "SELECT Package_ID, Parent_ID, Name, ea_guid FROM t_package"
+ELEMENT_INDEX_QUERY = (
+    "SELECT Object_ID, Package_ID, Name, Object_Type, Stereotype, ea_guid "
+    "FROM t_object WHERE Object_Type <> 'Package'"
+)
+INDEX_COLUMN_TYPES = {"package_id": int, "parent_id": int, "object_id": int}
+
+# Trennzeichen qualifizierter Namen, z.B. "Model/02_Architecture/Pump"
+PATH_SEPARATOR = "/"
+
+
+class IndexEntry:
+    """Index-Eintrag für ein Package oder Element; das COM-Objekt wird erst bei Bedarf geholt."""
+
+    __slots__ = ('object_id', 'guid', 'name', 'parent_id', 'element_type', 'stereotype',
+                 'qualified_name', 'depth', 'ea_object')
+
+    def __init__(self, object_id: int, guid: str, name: str, parent_id: int,
+                 element_type: str = "Package", stereotype: str = "", ea_object: Any = None):
+        self.object_id = object_id
+        self.guid = guid
+        self.name = name
+        self.parent_id = parent_id
+        self.element_type = element_type
+        self.stereotype = stereotype
+        self.qualified_name = name
+        self.depth = 0
+        self.ea_object = ea_object
+
+
+class RepositoryIndex:
+    """
+    Repository-weiter Index über Packages und Elemente.
+
+    Wird mit zwei SQL-Abfragen (t_package, t_object) aufgebaut und bildet
+    qualifizierte Namen, einfache Namen, GUIDs und IDs auf Packages bzw.
+    Elemente ab. COM-Objekte werden erst beim ersten Zugriff über
+    GetPackageByID/GetElementByID geholt und dann zwischengespeichert.
+
+    Qualifizierte Namen bestehen aus den Package-Namen ab dem Root-Model,
+    getrennt durch "/", z.B. "Model/02_Architecture" oder
+    "Model/02_Architecture/Pump".
+    """
+
+    def __init__(self, repo: Any):
+        self.repo = repo
+        self.packages_by_id: Dict[int, IndexEntry] = {}
+        self.packages_by_guid: Dict[str, IndexEntry] = {}
+        self.packages_by_path: Dict[str, IndexEntry] = {}
+        self.packages_by_name: Dict[str, List[IndexEntry]] = {}
+        self.elements_by_id: Dict[int, IndexEntry] = {}
+        self.elements_by_guid: Dict[str, IndexEntry] = {}
+        self.elements_by_path: Dict[str, IndexEntry] = {}
+        self.elements_by_name: Dict[str, List[IndexEntry]] = {}
+        self.load()
+
+    def load(self) -> None:
+        """Liest Packages und Elemente mit je einer SQL-Abfrage ein."""
+        for mapping in (self.packages_by_id, self.packages_by_guid, self.packages_by_path,
+                        self.packages_by_name, self.elements_by_id, self.elements_by_guid,
+                        self.elements_by_path, self.elements_by_name):
+            mapping.clear()
+
+        package_rows = sql_query_rows(self.repo, PACKAGE_INDEX_QUERY, INDEX_COLUMN_TYPES)
+        for row in package_rows:
+            entry = IndexEntry(row.get('package_id') or 0, row.get('ea_guid', ''),
+                               row.get('name', ''), row.get('parent_id') or 0)
+            self.packages_by_id[entry.object_id] = entry
+
+        # Qualifizierte Namen erst bilden, wenn alle Parents bekannt sind;
+        # nach ID sortiert, damit bei Namensgleichheit das ältere Package gewinnt
+        for entry in sorted(self.packages_by_id.values(), key=lambda e: e.object_id):
+            self._qualify(entry)
+            self._register_package(entry)
+
+        element_rows = sql_query_rows(self.repo, ELEMENT_INDEX_QUERY, INDEX_COLUMN_TYPES)
+        element_rows.sort(key=lambda r: r.get('object_id') or 0)
+        for row in element_rows:
+            entry = IndexEntry(row.get('object_id') or 0, row.get('ea_guid', ''),
+                               row.get('name', ''), row.get('package_id') or 0,
+                               row.get('object_type', ''), row.get('stereotype') or '')
+            self._register_element(entry)
+
+        logger.debug(f"Repository-Index geladen: {len(self.packages_by_id)} Packages, "
+                     f"{len(self.elements_by_id)} Elemente")
+
+    def _qualify(self, entry: IndexEntry) -> None:
+        # Pfad über die Parent-Kette; Parents werden dabei selbst qualifiziert
+        names = [entry.name]
+        parent = self.packages_by_id.get(entry.parent_id)
+        seen = {entry.object_id}
+        while parent is not None and parent.object_id not in seen:
+            seen.add(parent.object_id)
+            names.append(parent.name)
+            parent = self.packages_by_id.get(parent.parent_id)
+        names.reverse()
+        entry.qualified_name = PATH_SEPARATOR.join(names)
+        entry.depth = len(names) - 1
+
+    def _register_package(self, entry: IndexEntry) -> None:
+        self.packages_by_id[entry.object_id] = entry
+        if entry.guid:
+            self.packages_by_guid[entry.guid] = entry
+        self.packages_by_path.setdefault(entry.qualified_name, entry)
+        candidates = self.packages_by_name.setdefault(entry.name, [])
+        candidates.append(entry)
+        # Flachere Packages zuerst (Root-Models, dann deren Kinder, ...)
+        candidates.sort(key=lambda e: (e.depth, e.object_id))
+
+    def _register_element(self, entry: IndexEntry) -> None:
+        package = self.packages_by_id.get(entry.parent_id)
+        if package is not None:
+            entry.qualified_name = package.qualified_name + PATH_SEPARATOR + entry.name
+            entry.depth = package.depth + 1
+        self.elements_by_id[entry.object_id] = entry
+        if entry.guid:
+            self.elements_by_guid[entry.guid] = entry
+        self.elements_by_path.setdefault(entry.qualified_name, entry)
+        self.elements_by_name.setdefault(entry.name, []).append(entry)
+
+    def add_package(self, ea_package: Any, parent_id: Optional[int] = None,
+                    name: Optional[str] = None) -> IndexEntry:
+        """
+        Nimmt ein (neu erstelltes) Package in den Index auf.
+
+        Args:
+            ea_package: EA Package Objekt
+            parent_id: ID des Parent-Packages (0 für Root-Models, None = vom Objekt lesen)
+            name: Name des Packages (None = vom Objekt lesen)
+
+        Returns:
+            Index-Eintrag des Packages
+        """
+        entry = IndexEntry(ea_package.PackageID, ea_package.PackageGUID,
+                           ea_package.Name if name is None else name,
+                           ea_package.ParentID if parent_id is None else parent_id,
+                           ea_object=ea_package)
+        self._qualify(entry)
+        self._register_package(entry)
+        return entry
+
+    def add_element(self, ea_element: Any, package_id: Optional[int] = None,
+                    name: Optional[str] = None, element_type: Optional[str] = None,
+                    stereotype: Optional[str] = None) -> IndexEntry:
+        """
+        Nimmt ein (neu erstelltes) Element in den Index auf.
+
+        Args:
+            ea_element: EA Element Objekt
+            package_id: ID des Packages (None = vom Objekt lesen)
+            name, element_type, stereotype: Bekannte Werte (None = vom Objekt lesen)
+
+        Returns:
+            Index-Eintrag des Elements
+        """
+        entry = IndexEntry(ea_element.ElementID, ea_element.ElementGUID,
+                           ea_element.Name if name is None else name,
+                           ea_element.PackageID if package_id is None else package_id,
+                           ea_element.Type if element_type is None else element_type,
+                           (ea_element.Stereotype if stereotype is None else stereotype) or "",
+                           ea_object=ea_element)
+        self._register_element(entry)
+        return entry
+
+    def _package_object(self, entry: Optional[IndexEntry]) -> Optional[Any]:
+        if entry is None:
+            return None
+        if entry.ea_object is None:
+            entry.ea_object = self.repo.GetPackageByID(entry.object_id)
+        return entry.ea_object
+
+    def _element_object(self, entry: Optional[IndexEntry]) -> Optional[Any]:
+        if entry is None:
+            return None
+        if entry.ea_object is None:
+            entry.ea_object = self.repo.GetElementByID(entry.object_id)
+        return entry.ea_object
+
+    def _package_entry(self, package: Any) -> Optional[IndexEntry]:
+        if isinstance(package, str):
+            return self.find_package_entry(package)
+        ea_package = as_ea_object(package)
+        return self.packages_by_guid.get(ea_package.PackageGUID)
+
+    def find_package_entry(self, name_or_path: str) -> Optional[IndexEntry]:
+        """Sucht den Index-Eintrag eines Packages nach qualifiziertem oder einfachem Namen."""
+        if PATH_SEPARATOR in name_or_path:
+            return self.packages_by_path.get(name_or_path.strip(PATH_SEPARATOR))
+        candidates = self.packages_by_name.get(name_or_path)
+        return candidates[0] if candidates else None
+
+    def find_package(self, name_or_path: str) -> Optional[Any]:
+        """
+        Sucht ein Package in beliebiger Tiefe.
+
+        Args:
+            name_or_path: Qualifizierter Name ("Model/02_Architecture") oder einfacher Name;
+                          bei mehreren gleichnamigen Packages gewinnt das flachste
+
+        Returns:
+            EA Package Objekt oder None
+        """
+        return self._package_object(self.find_package_entry(name_or_path))
+
+    def find_child_package(self, parent_id: int, name: str) -> Optional[Any]:
+        """
+        Sucht ein direktes Unter-Package.
+
+        Args:
+            parent_id: ID des Parent-Packages (0 für Root-Models)
+            name: Name des Unter-Packages
+
+        Returns:
+            EA Package Objekt oder None
+        """
+        for entry in self.packages_by_name.get(name, ()):
+            if entry.parent_id == parent_id:
+                return self._package_object(entry)
+        return None
+
+    def find_element(self, name_or_path: str, package: Optional[Any] = None,
+                     element_type: Optional[str] = None) -> Optional[Any]:
+        """
+        Sucht ein Element nach qualifiziertem oder einfachem Namen.
+
+        Args:
+            name_or_path: Qualifizierter Name ("Model/02_Architecture/Pump") oder einfacher Name
+            package: Optional - nur direkt in diesem Package suchen
+                     (EA Package, Package-Wrapper oder Package-Name/-Pfad)
+            element_type: Optional - nur Elemente dieses Typs (z.B. 'Class')
+
+        Returns:
+            EA Element Objekt oder None
+        """
+        if PATH_SEPARATOR in name_or_path:
+            entry = self.elements_by_path.get(name_or_path.strip(PATH_SEPARATOR))
+            if entry is not None and element_type and entry.element_type != element_type:
+                entry = None
+            return self._element_object(entry)
+
+        package_id = None
+        if package is not None:
+            package_entry = self._package_entry(package)
+            if package_entry is None:
+                return None
+            package_id = package_entry.object_id
+
+        for entry in self.elements_by_name.get(name_or_path, ()):
+            if package_id is not None and entry.parent_id != package_id:
+                continue
+            if element_type and entry.element_type != element_type:
+                continue
+            return self._element_object(entry)
+        return None
+
+    def package_by_guid(self, guid: str) -> Optional[Any]:
+        return self._package_object(self.packages_by_guid.get(guid))
+
+    def package_by_id(self, package_id: int) -> Optional[Any]:
+        return self._package_object(self.packages_by_id.get(package_id))
+
+    def element_by_guid(self, guid: str) -> Optional[Any]:
+        return self._element_object(self.elements_by_guid.get(guid))
+
+    def element_by_id(self, element_id: int) -> Optional[Any]:
+        return self._element_object(self.elements_by_id.get(element_id))
+
+    def qualified_name(self, package_or_element_id: int, is_element: bool = False) -> Optional[str]:
+        """Liefert den qualifizierten Namen zu einer Package- oder Element-ID."""
+        mapping = self.elements_by_id if is_element else self.packages_by_id
+        entry = mapping.get(package_or_element_id)
+        return entry.qualified_name if entry is not None else None
+
+
+# id(Repository) -> Repository-Index (der Index hält das Repository, die id bleibt eindeutig)
+_repository_indexes: Dict[int, RepositoryIndex] = {}
+
+
+def get_repository_index(repo: Any, reload: bool = False) -> RepositoryIndex:
+    """
+    Liefert den Repository-Index und baut ihn beim ersten Zugriff auf.
+
+    Solange der Index existiert, tragen create_element, create_element_in_package,
+    Package.add_package und Package.add_elements neue Objekte selbst ein.
+
+    Args:
+        repo: EA Repository Objekt
+        reload: Index neu aus der Datenbank laden
+
+    Returns:
+        RepositoryIndex des Repositories
+    """
+    index = _repository_indexes.get(id(repo))
+    if index is None:
+        index = RepositoryIndex(repo)
+        _repository_indexes[id(repo)] = index
+    elif reload:
+        index.load()
+    return index
+
+
+def invalidate_repository_index(repo: Optional[Any] = None) -> None:
+    """
+    Verwirft den Repository-Index eines Repositories oder alle Indizes.
+
+    Args:
+        repo: EA Repository Objekt oder None für alle Repositories
+    """
+    if repo is None:
+        _repository_indexes.clear()
+    else:
+        _repository_indexes.pop(id(repo), None)
+
+
+CONNECTOR_INDEX_QUERY = (
+    "SELECT Connector_ID, Start_Object_ID, End_Object_ID, Connector_Type, Name FROM t_connector"
+)
+CONNECTOR_COLUMN_TYPES = {"connector_id": int, "start_object_id": int, "end_object_id": int}
+
+ConnectorKey = Tuple[int, int, str]
+
+
+class ConnectorEntry:
+    """Index-Eintrag für einen Connector; das COM-Objekt wird erst bei Bedarf geholt."""
+
+    __slots__ = ('connector_id', 'name', 'ea_object')
+
+    def __init__(self, connector_id: int, name: str, ea_object: Any = None):
+        self.connector_id = connector_id
+        self.name = name
+        self.ea_object = ea_object
+
+
+class ConnectorIndex:
+    """
+    Index der vorhandenen Connectors nach (Client-ID, Supplier-ID, Typ, Name).
+
+    Wird mit einer SQL-Abfrage auf t_connector geladen. Eine Existenzprüfung
+    ist damit ein Dictionary-Zugriff statt eines Scans über die
+    Connectors-Collection des Client-Elements mit je zwei COM-Reads.
+    """
+
+    def __init__(self, repo: Any):
+        self.repo = repo
+        self.by_key: Dict[ConnectorKey, List[ConnectorEntry]] = {}
+        self.load()
+
+    def load(self) -> None:
+        """Liest alle Connectors mit einer SQL-Abfrage ein."""
+        self.by_key.clear()
+        rows = sql_query_rows(self.repo, CONNECTOR_INDEX_QUERY, CONNECTOR_COLUMN_TYPES)
+        rows.sort(key=lambda r: r.get('connector_id') or 0)
+        for row in rows:
+            key = (row.get('start_object_id') or 0, row.get('end_object_id') or 0,
+                   row.get('connector_type', ''))
+            self.by_key.setdefault(key, []).append(
+                ConnectorEntry(row.get('connector_id') or 0, row.get('name') or ''))
+        logger.debug(f"Connector-Index geladen: {len(rows)} Connectors")
+
+    def _lookup(self, client_id: int, supplier_id: int, connector_type: str,
+                name: Optional[str] = None) -> Optional[ConnectorEntry]:
+        for entry in self.by_key.get((client_id, supplier_id, connector_type), ()):
+            if name is None or entry.name == name:
+                return entry
+        return None
+
+    def exists(self, client_id: int, supplier_id: int, connector_type: str,
+               name: Optional[str] = None) -> bool:
+        """
+        Prüft ohne COM-Zugriff, ob ein Connector existiert.
+
+        Args:
+            client_id: ElementID des Client-(Source-)Elements
+            supplier_id: ElementID des Supplier-(Target-)Elements
+            connector_type: Connector-Typ (z.B. 'Association')
+            name: Optional - nur Connectors mit diesem Namen
+
+        Returns:
+            True wenn ein passender Connector existiert
+        """
+        return self._lookup(client_id, supplier_id, connector_type, name) is not None
+
+    def find(self, client_id: int, supplier_id: int, connector_type: str,
+             name: Optional[str] = None) -> Optional[Any]:
+        """
+        Sucht einen Connector; Argumente wie exists().
+
+        Returns:
+            EA Connector Objekt oder None
+        """
+        entry = self._lookup(client_id, supplier_id, connector_type, name)
+        if entry is None:
+            return None
+        if entry.ea_object is None:
+            entry.ea_object = self.repo.GetConnectorByID(entry.connector_id)
+        return entry.ea_object
+
+    def add(self, ea_connector: Any, client_id: int, supplier_id: int,
+            connector_type: str, name: str = "") -> None:
+        """Nimmt einen neu erstellten Connector in den Index auf."""
+        self.by_key.setdefault((client_id, supplier_id, connector_type), []).append(
+            ConnectorEntry(ea_connector.ConnectorID, name or "", ea_connector))
+
+
+# id(Repository) -> Connector-Index
+_connector_indexes: Dict[int, ConnectorIndex] = {}
+
+
+def get_connector_index(repo: Any, reload: bool = False) -> ConnectorIndex:
+    """
+    Liefert den Connector-Index und baut ihn beim ersten Zugriff auf.
+
+    Args:
+        repo: EA Repository Objekt
+        reload: Index neu aus der Datenbank laden
+
+    Returns:
+        ConnectorIndex des Repositories
+    """
+    index = _connector_indexes.get(id(repo))
+    if index is None:
+        index = ConnectorIndex(repo)
+        _connector_indexes[id(repo)] = index
+    elif reload:
+        index.load()
+    return index
+
+
+def invalidate_connector_index(repo: Optional[Any] = None) -> None:
+    """
+    Verwirft den Connector-Index eines Repositories oder alle Indizes.
+
+    Args:
+        repo: EA Repository Objekt oder None für alle Repositories
+    """
+    if repo is None:
+        _connector_indexes.clear()
+    else:
+        _connector_indexes.pop(id(repo), None)
+
+
+ATTRIBUTE_FEATURE_QUERY = "SELECT ID, Object_ID, Name, Type, Pos FROM t_attribute WHERE Object_ID IN ({ids})"
+OPERATION_FEATURE_QUERY = (
+    "SELECT OperationID, Object_ID, Name, Type, Pos FROM t_operation WHERE Object_ID IN ({ids})"
+)
+FEATURE_COLUMN_TYPES = {"id": int, "operationid": int, "object_id": int, "pos": int}
+
+# Maximale Anzahl IDs pro IN-Liste
+PREFETCH_CHUNK_SIZE = 500
+
+
+class FeatureEntry:
+    """Index-Eintrag für ein Attribut oder eine Operation."""
+
+    __slots__ = ('feature_id', 'type', 'ea_object')
+
+    def __init__(self, feature_id: int, feature_type: str, ea_object: Any = None):
+        self.feature_id = feature_id
+        self.type = feature_type
+        self.ea_object = ea_object
+
+
+class ElementFeatureIndex:
+    """
+    Name -> Attribut bzw. Name -> Operation für ein Element.
+
+    Ohne Vorabladen wird jede Collection beim ersten Zugriff einmal
+    durchlaufen; mit prefetch_features() kommen die Einträge für viele
+    Elemente aus je einer SQL-Abfrage auf t_attribute und t_operation.
+    Wie beim linearen Scan gewinnt bei Namensgleichheit der erste Eintrag.
+    """
+
+    def __init__(self, ea_element: Any, repo: Optional[Any] = None, guid: Optional[str] = None):
+        self.ea_element = ea_element
+        self.repo = repo
+        self.guid = ea_element.ElementGUID if guid is None else guid
+        self.attributes: Optional[Dict[str, FeatureEntry]] = None
+        self.operations: Optional[Dict[str, FeatureEntry]] = None
+
+    @staticmethod
+    def _scan(collection: Any, type_field: str) -> Dict[str, FeatureEntry]:
+        features: Dict[str, FeatureEntry] = {}
+        for i in range(collection.Count):
+            feature = collection.GetAt(i)
+            name = feature.Name
+            if name not in features:
+                features[name] = FeatureEntry(0, getattr(feature, type_field), feature)
+        return features
+
+    def find_attribute(self, name: str) -> Optional[FeatureEntry]:
+        if self.attributes is None:
+            self.attributes = self._scan(self.ea_element.Attributes, 'Type')
+            logger.debug(f"Attribut-Index geladen: {len(self.attributes)} Attribute")
+        return self.attributes.get(name)
+
+    def find_operation(self, name: str) -> Optional[FeatureEntry]:
+        if self.operations is None:
+            self.operations = self._scan(self.ea_element.Methods, 'ReturnType')
+            logger.debug(f"Operations-Index geladen: {len(self.operations)} Operationen")
+        return self.operations.get(name)
+
+    def attribute_object(self, entry: FeatureEntry) -> Any:
+        """Liefert das EA Attribute Objekt eines Eintrags."""
+        if entry.ea_object is None:
+            entry.ea_object = self.repo.GetAttributeByID(entry.feature_id)
+        return entry.ea_object
+
+    def operation_object(self, entry: FeatureEntry) -> Any:
+        """Liefert das EA Method Objekt eines Eintrags."""
+        if entry.ea_object is None:
+            entry.ea_object = self.repo.GetMethodByID(entry.feature_id)
+        return entry.ea_object
+
+    def add_attribute(self, name: str, ea_attribute: Any, attr_type: str) -> None:
+        if self.attributes is not None:
+            self.attributes.setdefault(name, FeatureEntry(0, attr_type, ea_attribute))
+
+    def add_operation(self, name: str, ea_method: Any, return_type: str) -> None:
+        if self.operations is not None:
+            self.operations.setdefault(name, FeatureEntry(0, return_type, ea_method))
+
+
+# Element-GUID -> Feature-Index
+_feature_indexes: Dict[str, ElementFeatureIndex] = {}
+
+
+def get_feature_index(ea_element: Any) -> ElementFeatureIndex:
+    """
+    Liefert den Attribut-/Operations-Index eines Elements.
+
+    Args:
+        ea_element: EA Element Objekt
+
+    Returns:
+        ElementFeatureIndex des Elements (ggf. von prefetch_features geladen)
+    """
+    key = ea_element.ElementGUID
+    index = _feature_indexes.get(key)
+    if index is None:
+        index = ElementFeatureIndex(ea_element, guid=key)
+        _feature_indexes[key] = index
+    return index
+
+
+def prefetch_features(repo: Any, elements: List[Any]) -> Dict[int, ElementFeatureIndex]:
+    """
+    Lädt die vorhandenen Attribute und Operationen vieler Elemente vorab.
+
+    Pro Tabelle wird eine SQL-Abfrage (je PREFETCH_CHUNK_SIZE Elemente)
+    ausgeführt; danach prüfen add_attribute/add_operation ohne Collection-Scan.
+
+    Args:
+        repo: EA Repository Objekt
+        elements: EA Element Objekte
+
+    Returns:
+        ElementID -> ElementFeatureIndex
+    """
+    indexes: Dict[int, ElementFeatureIndex] = {}
+    for ea_element in elements:
+        index = ElementFeatureIndex(ea_element, repo)
+        index.attributes = {}
+        index.operations = {}
+        indexes[ea_element.ElementID] = index
+
+    ids = sorted(indexes)
+    for start in range(0, len(ids), PREFETCH_CHUNK_SIZE):
+        id_list = ",".join(str(i) for i in ids[start:start + PREFETCH_CHUNK_SIZE])
+        for query, id_column, target in ((ATTRIBUTE_FEATURE_QUERY, 'id', 'attributes'),
+                                         (OPERATION_FEATURE_QUERY, 'operationid', 'operations')):
+            rows = sql_query_rows(repo, query.format(ids=id_list), FEATURE_COLUMN_TYPES)
+            rows.sort(key=lambda r: (r.get('pos') or 0, r.get(id_column) or 0))
+            for row in rows:
+                index = indexes.get(row.get('object_id'))
+                if index is not None:
+                    getattr(index, target).setdefault(
+                        row.get('name', ''),
+                        FeatureEntry(row.get(id_column) or 0, row.get('type') or ''))
+
+    for index in indexes.values():
+        _feature_indexes[index.guid] = index
+    logger.debug(f"Attribute und Operationen für {len(indexes)} Elemente vorab geladen")
+    return indexes
+
+
+def invalidate_feature_index(ea_element: Optional[Any] = None) -> None:
+    """
+    Verwirft den Attribut-/Operations-Index eines Elements oder alle Indizes.
+
+    Args:
+        ea_element: EA Element Objekt oder None für alle Elemente
+    """
+    if ea_element is None:
+        _feature_indexes.clear()
+    else:
+        _feature_indexes.pop(ea_element.ElementGUID, None)
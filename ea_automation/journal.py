@@ -0,0 +1,135 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from .exceptions import EAError
+from .logging_conf import logger
+from .state import SPEC_LISTS, entry_hash, iter_spec_entries
+
+
+JOURNAL_VERSION = 1
+BATCH_SIZE = 50
+
+
+class BuildJournal:
+    """
+    Append-only Journal der angewendeten Operationen eines Builds.
+
+    Jede Zeile ist ein JSON-Objekt. Die erste Zeile beschreibt den Build
+    (Repository, Hash der Spezifikation), jede weitere eine abgeschlossene
+    Operation (Package, Element samt Attributen und Operationen, Connector,
+    Diagramm) mit der GUID des EA-Objekts. Operationen werden gepuffert und
+    in Batches mit fsync geschrieben; was nach dem letzten Flush angewendet
+    wurde, prüft --resume erneut (alle Phasen sind idempotent).
+    """
+
+    def __init__(self, path: str, batch_size: int = BATCH_SIZE):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.completed: Dict[Tuple[str, str], Optional[str]] = {}
+        self._buffer: List[str] = []
+        self._file = None
+
+    @staticmethod
+    def _read(path: Path) -> List[Dict[str, Any]]:
+        records = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    # Abgebrochener Schreibvorgang: der Rest ist unvollständig
+                    logger.warning(f"Journal endet mit unvollständiger Zeile: {path}")
+                    break
+        return records
+
+    def open(self, repository: str, spec: Dict, resume: bool = False) -> int:
+        """
+        Öffnet das Journal für einen Build.
+
+        Args:
+            repository: Pfad des Repository
+            spec: Vollständige Model-Spezifikation
+            resume: Vorhandenes Journal fortsetzen statt neu zu beginnen
+
+        Returns:
+            Anzahl bereits abgeschlossener Operationen (bei resume)
+        """
+        header = {"journal": JOURNAL_VERSION, "repository": repository, "spec": entry_hash(spec)}
+        self.completed.clear()
+        if resume and self.path.exists():
+            records = self._read(self.path)
+            if records and {k: records[0].get(k) for k in header} == header:
+                for record in records[1:]:
+                    self.completed[(record['kind'], record['key'])] = record.get('guid')
+                logger.info(f"Journal fortgesetzt: {len(self.completed)} Operationen bereits angewendet")
+            else:
+                logger.warning("Journal gehört zu anderem Repository oder anderer Spezifikation - "
+                               "Build beginnt von vorn")
+                resume = False
+        elif resume:
+            logger.warning(f"Kein Journal gefunden, Build beginnt von vorn: {self.path}")
+            resume = False
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+            if not resume:
+                self._buffer.append(json.dumps(header))
+                self.flush()
+        except OSError as e:
+            logger.error(f"Fehler beim Öffnen des Journals: {e}")
+            raise EAError(f"Fehler beim Öffnen des Journals: {e}")
+        return len(self.completed)
+
+    def is_done(self, kind: str, key: str) -> bool:
+        return (kind, key) in self.completed
+
+    def record(self, kind: str, key: str, guid: Optional[str] = None) -> None:
+        """Merkt eine abgeschlossene Operation; geschrieben wird im Batch."""
+        self.completed[(kind, key)] = guid
+        self._buffer.append(json.dumps({"kind": kind, "key": key, "guid": guid}, ensure_ascii=False))
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Schreibt gepufferte Operationen und synchronisiert die Datei."""
+        if not self._buffer or self._file is None:
+            return
+        try:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._buffer.clear()
+        except OSError as e:
+            logger.error(f"Fehler beim Schreiben des Journals: {e}")
+            raise EAError(f"Fehler beim Schreiben des Journals: {e}")
+
+    def pending_spec(self, spec: Dict) -> Dict:
+        """Spezifikation ohne die bereits im Journal stehenden Einträge."""
+        pending: Dict[str, Any] = {key: value for key, value in spec.items() if key not in SPEC_LISTS.values()}
+        for name in SPEC_LISTS.values():
+            pending[name] = []
+        for kind, key, entry in iter_spec_entries(spec):
+            if not self.is_done(kind, key):
+                pending[SPEC_LISTS[kind]].append(entry)
+        return pending
+
+    def close(self, completed: bool = False) -> None:
+        """
+        Schließt das Journal.
+
+        Args:
+            completed: Build vollständig abgeschlossen - Journal wird gelöscht
+        """
+        if self._file is None:
+            return
+        self.flush()
+        self._file.close()
+        self._file = None
+        if completed:
+            self.path.unlink()
+            logger.debug(f"Journal gelöscht: {self.path}")
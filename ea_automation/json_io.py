@@ -1,9 +1,12 @@
 import json
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-from jsonschema import validate, ValidationError, Draft7Validator
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from jsonschema import ValidationError
+from .backend import as_ea_object
+from .bulk import export_model_tree
 from .exceptions import EAError
 from .logging_conf import logger
+from .validation import get_validator
 
 
 def export_to_json(data: Any, filepath: str, indent: int = 2) -> None:
@@ -42,15 +45,43 @@ def import_from_json(filepath: str) -> Dict:
         raise EAError(f"Fehler beim Importieren von JSON: {e}")
 
 
-def export_package_structure(package: Any, filepath: str) -> None:
+def export_package_structure(package: Any, filepath: str, repo: Optional[Any] = None) -> None:
+    """
+    Exportiert ein Package mit allen Unter-Packages als JSON.
+    
+    Mit repo wird der Teilbaum in einer SQL-Abfrage gelesen (bulk.export_model_tree),
+    sonst über Package.to_dict().
+    """
     try:
-        package_dict = package.to_dict() if hasattr(package, 'to_dict') else {}
+        if repo is not None:
+            package_id = as_ea_object(package).PackageID
+            package_dict = export_model_tree(repo, package_id, include_contents=False)
+        else:
+            package_dict = package.to_dict() if hasattr(package, 'to_dict') else {}
         export_to_json(package_dict, filepath)
     except Exception as e:
         logger.error(f"Fehler beim Exportieren der Package-Struktur: {e}")
         raise EAError(f"Fehler beim Exportieren der Package-Struktur: {e}")
 
 
+def export_package_structure_sql(repo: Any, filepath: str, package_id: Optional[int] = None,
+                                 include_contents: bool = True) -> None:
+    """
+    Exportiert die Package-Struktur über wenige SQL-Abfragen statt rekursiver COM-Aufrufe.
+    
+    Args:
+        repo: EA Repository Objekt
+        filepath: Ziel-Datei
+        package_id: Wurzel-Package oder None für alle Root-Models
+        include_contents: Elemente, Diagramme und Connectors mit exportieren
+    """
+    try:
+        export_to_json(export_model_tree(repo, package_id, include_contents), filepath)
+    except Exception as e:
+        logger.error(f"Fehler beim Exportieren der Package-Struktur: {e}")
+        raise EAError(f"Fehler beim Exportieren der Package-Struktur: {e}")
+
+
 def export_elements(elements: List[Any], filepath: str) -> None:
     try:
         elements_data = [elem.to_dict() if hasattr(elem, 'to_dict') else {} for elem in elements]
@@ -241,23 +272,10 @@ def load_model_spec(filepath: str) -> Dict:
         # Validiere gegen Schema
         logger.debug("Validiere Model-Spezifikation gegen Schema...")
         try:
-            validate(instance=spec_data, schema=MODEL_SPEC_SCHEMA)
+            get_validator(MODEL_SPEC_SCHEMA).validate(spec_data)
             logger.info("[OK] Model-Spezifikation ist valide")
         except ValidationError as ve:
-            # Erstelle aussagekräftige Fehlermeldung
-            error_path = " -> ".join(str(p) for p in ve.absolute_path) if ve.absolute_path else "root"
-            error_msg = f"Validierungsfehler in '{error_path}': {ve.message}"
-            
-            # Füge Kontext hinzu
-            if ve.validator == "required":
-                error_msg = f"Pflichtfeld fehlt in '{error_path}': {ve.message}"
-            elif ve.validator == "enum":
-                error_msg = f"Ungültiger Wert in '{error_path}': {ve.instance} ist nicht erlaubt. Erlaubte Werte: {ve.validator_value}"
-            elif ve.validator == "type":
-                error_msg = f"Falscher Typ in '{error_path}': Erwartet {ve.validator_value}, erhalten {type(ve.instance).__name__}"
-            elif ve.validator == "minLength":
-                error_msg = f"Wert zu kurz in '{error_path}': Mindestlänge ist {ve.validator_value}"
-            
+            error_msg = _validation_error_message(ve)
             logger.error(error_msg)
             raise EAError(error_msg)
         
@@ -283,69 +301,361 @@ def load_model_spec(filepath: str) -> Dict:
         raise EAError(error_msg)
 
 
-def _validate_model_spec_logic(spec: Dict) -> None:
+def _validation_error_message(ve: ValidationError, prefix: Tuple = ()) -> str:
+    """Aussagekräftige Fehlermeldung zu einem ValidationError (prefix: Pfad des Teildokuments)."""
+    path = list(prefix) + list(ve.absolute_path)
+    error_path = " -> ".join(str(p) for p in path) if path else "root"
+    error_msg = f"Validierungsfehler in '{error_path}': {ve.message}"
+    
+    # Füge Kontext hinzu
+    if ve.validator == "required":
+        error_msg = f"Pflichtfeld fehlt in '{error_path}': {ve.message}"
+    elif ve.validator == "enum":
+        error_msg = f"Ungültiger Wert in '{error_path}': {ve.instance} ist nicht erlaubt. Erlaubte Werte: {ve.validator_value}"
+    elif ve.validator == "type":
+        error_msg = f"Falscher Typ in '{error_path}': Erwartet {ve.validator_value}, erhalten {type(ve.instance).__name__}"
+    elif ve.validator == "minLength":
+        error_msg = f"Wert zu kurz in '{error_path}': Mindestlänge ist {ve.validator_value}"
+    return error_msg
+
+
+# Lesegröße für iter_model_spec
+STREAM_CHUNK_SIZE = 1 << 20
+
+# Abschnitte, deren Einträge einzeln geliefert werden
+STREAM_SECTIONS = ("packages", "elements", "connectors", "diagrams")
+
+
+class _JsonStream:
+    """Liest ein JSON-Dokument blockweise; Werte werden einzeln mit raw_decode geparst."""
+
+    _WHITESPACE = " \t\n\r"
+
+    def __init__(self, f: Any, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.line = 1  # Zeile und Spalte (0-basiert) von buffer[0]
+        self.column = 0
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        # Verarbeiteten Teil verwerfen: Speicher bleibt durch die Eintragsgröße begrenzt
+        self.line += self.buffer.count("\n", 0, self.pos)
+        newline = self.buffer.rfind("\n", 0, self.pos)
+        self.column = self.pos - newline - 1 if newline >= 0 else self.column + self.pos
+        self.buffer = self.buffer[self.pos:]
+        self.pos = 0
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer += chunk
+        return True
+
+    def error(self, msg: str, pos: Optional[int] = None) -> EAError:
+        pos = self.pos if pos is None else pos
+        line = self.line + self.buffer.count("\n", 0, pos)
+        newline = self.buffer.rfind("\n", 0, pos)
+        column = pos - newline if newline >= 0 else self.column + pos + 1
+        error_msg = f"JSON-Syntaxfehler in Zeile {line}, Spalte {column}: {msg}"
+        logger.error(error_msg)
+        return EAError(error_msg)
+
+    def peek(self) -> str:
+        """Nächstes Zeichen nach Leerraum ('' am Dateiende)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in self._WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise self.error(f"'{char}' erwartet")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Parst den nächsten vollständigen JSON-Wert."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # Zahl am Pufferende könnte noch weitergehen
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError as je:
+                if self.eof:
+                    raise self.error(je.msg, je.pos)
+            if not self._fill():
+                continue
+
+    def array(self) -> Iterator[Any]:
+        """Liefert die Einträge eines Arrays einzeln."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            separator = self.peek()
+            self.pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise self.error("',' oder ']' erwartet", self.pos - 1)
+
+
+def iter_model_spec(filepath: str, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Tuple[str, Any]]:
     """
-    Zusätzliche logische Validierungen der Model-Spezifikation.
+    Liest eine Model-Spezifikation inkrementell (Streaming-Modus).
+    
+    Statt das Dokument komplett zu laden, werden die Einträge von packages,
+    elements, connectors und diagrams einzeln geparst, gegen ihr Teilschema
+    validiert und sofort geliefert. Der Speicherbedarf hängt nur von der
+    Größe eines Eintrags ab. "model" muss vor den Listen stehen.
+    
+    Logische Prüfungen wie in load_model_spec: doppelte Elemente sofort,
+    Connector-Referenzen sofort bzw. - stehen Connectors vor den Elementen -
+    am Dateiende.
     
     Args:
-        spec: Model-Spezifikation
+        filepath: Pfad zur JSON-Datei
+        chunk_size: Lesegröße in Zeichen
+    
+    Yields:
+        (Abschnitt, Wert): ("model", Name), dann ("packages", Name),
+        ("elements", Element-Spec), ("connectors", ...), ("diagrams", ...)
     
     Raises:
-        EAError: Bei logischen Inkonsistenzen
+        EAError: Bei Syntax-, Validierungs- oder logischen Fehlern
     """
-    # Sammle alle definierten Package-Namen
-    defined_packages = set(spec.get('packages', []))
+    spec_path = Path(filepath)
+    if not spec_path.exists():
+        error_msg = f"Model-Spezifikation nicht gefunden: {spec_path.absolute()}"
+        logger.error(error_msg)
+        raise EAError(error_msg)
+    
+    properties = MODEL_SPEC_SCHEMA["properties"]
+    validators = {section: get_validator(properties[section]["items"]) for section in STREAM_SECTIONS}
+    
+    def check(validator: Any, instance: Any, prefix: Tuple) -> None:
+        error = next(iter(validator.iter_errors(instance)), None)
+        if error is not None:
+            error_msg = _validation_error_message(error, prefix)
+            logger.error(error_msg)
+            raise EAError(error_msg)
+    
+    def fail(error_msg: str) -> EAError:
+        logger.error(error_msg)
+        return EAError(error_msg)
+    
+    logger.info(f"Lade Model-Spezifikation (Streaming): {spec_path}")
+    model_name = None
+    seen_sections: Set[str] = set()
+    packages: Set[str] = set()
+    elements: Set[str] = set()
+    element_keys: Set[str] = set()
+    unresolved: List[Tuple[str, str]] = []  # Connector-Referenzen vor den Elementen
+    counts = {section: 0 for section in STREAM_SECTIONS}
+    
+    with open(spec_path, 'r', encoding='utf-8') as f:
+        stream = _JsonStream(f, chunk_size)
+        stream.expect("{")
+        if stream.peek() == "}":
+            stream.pos += 1
+        else:
+            while True:
+                key = stream.value()
+                if not isinstance(key, str):
+                    raise stream.error("Schlüssel erwartet")
+                stream.expect(":")
+                if key in seen_sections:
+                    raise fail(f"Abschnitt '{key}' ist doppelt vorhanden")
+                seen_sections.add(key)
+                
+                if key == "model":
+                    model_name = stream.value()
+                    check(get_validator(properties["model"]), model_name, ("model",))
+                    yield "model", model_name
+                elif key in STREAM_SECTIONS:
+                    if model_name is None:
+                        raise fail(f"Streaming-Modus: 'model' muss vor '{key}' stehen")
+                    if stream.peek() != "[":
+                        raise fail(f"Falscher Typ in '{key}': Erwartet array")
+                    for index, item in enumerate(stream.array()):
+                        check(validators[key], item, (key, index))
+                        counts[key] += 1
+                        if key == "packages":
+                            if item in packages:
+                                raise fail(f"Validierungsfehler in 'packages -> {index}': "
+                                           f"'{item}' ist doppelt vorhanden")
+                            packages.add(item)
+                        elif key == "elements":
+                            elem_key = f"{item['package']}::{item['name']}"
+                            if elem_key in element_keys:
+                                raise fail(f"Doppeltes Element '{item['name']}' in Package '{item['package']}'")
+                            element_keys.add(elem_key)
+                            elements.add(item['name'])
+                            if item['package'] not in packages:
+                                logger.warning(f"Element '{item['name']}' referenziert undefiniertes "
+                                               f"Package '{item['package']}'")
+                        elif key == "connectors":
+                            for role, label in (('client', 'Client'), ('supplier', 'Supplier')):
+                                if item[role] in elements:
+                                    continue
+                                if "elements" in seen_sections:
+                                    raise fail(f"Connector referenziert undefiniertes {label}-Element "
+                                               f"'{item[role]}'")
+                                unresolved.append((label, item[role]))
+                        yield key, item
+                else:
+                    raise fail(f"Validierungsfehler in 'root': Additional properties are not allowed "
+                               f"('{key}' was unexpected)")
+                
+                separator = stream.peek()
+                stream.pos += 1
+                if separator == "}":
+                    break
+                if separator != ",":
+                    raise stream.error("',' oder '}' erwartet", stream.pos - 1)
+        if stream.peek() != "":
+            raise stream.error("Zusätzliche Daten nach dem Dokument")
     
-    # Sammle alle definierten Element-Namen
-    defined_elements = set()
-    element_packages = {}
+    if model_name is None:
+        raise fail("Pflichtfeld fehlt in 'root': 'model' is a required property")
+    for label, name in unresolved:
+        if name not in elements:
+            raise fail(f"Connector referenziert undefiniertes {label}-Element '{name}'")
     
-    # Prüfe Elements
-    for elem in spec.get('elements', []):
+    logger.info(f"Model-Spezifikation gestreamt: {model_name}")
+    logger.info(f"  - Packages: {counts['packages']}")
+    logger.info(f"  - Elements: {counts['elements']}")
+    logger.info(f"  - Connectors: {counts['connectors']}")
+
+
+# Schweregrade von SpecIssue
+ERROR = "error"
+WARNING = "warning"
+
+# Maximal einzeln geloggte Warnungen in _validate_model_spec_logic
+MAX_LOGGED_WARNINGS = 20
+
+
+class SpecIssue:
+    """Ein Problem der logischen Validierung (Fehler oder Warnung) mit Pfad in der Spezifikation."""
+    
+    __slots__ = ("severity", "path", "message")
+    
+    def __init__(self, severity: str, path: str, message: str):
+        self.severity = severity
+        self.path = path
+        self.message = message
+    
+    def __str__(self) -> str:
+        return f"[{self.severity.upper()}] {self.path}: {self.message}"
+    
+    def __repr__(self) -> str:
+        return f"<SpecIssue {self}>"
+
+
+def check_model_spec_logic(spec: Dict) -> List[SpecIssue]:
+    """
+    Prüft alle Referenzen der Model-Spezifikation in einem Durchlauf.
+    
+    Package- und Element-Index werden einmal aufgebaut; danach wird jedes
+    Element, jeder Connector und jedes Diagramm in linearer Zeit geprüft.
+    Im Gegensatz zu einem Abbruch beim ersten Problem werden alle gemeldet.
+    
+    Fehler: doppelte Elemente in einem Package, Connectors mit undefiniertem
+    Client/Supplier. Warnungen: undefinierte Packages (werden automatisch
+    erstellt) und undefinierte Elemente in Diagrammen.
+    
+    Args:
+        spec: Model-Spezifikation
+    
+    Returns:
+        Liste aller Probleme in Dokument-Reihenfolge (leer wenn konsistent)
+    """
+    issues: List[SpecIssue] = []
+    defined_packages = set(spec.get('packages', []))
+    first_index: Dict[Tuple[str, str], int] = {}  # (Package, Name) -> erster Index
+    defined_elements: Set[str] = set()
+    
+    for index, elem in enumerate(spec.get('elements', [])):
         elem_name = elem['name']
         elem_package = elem['package']
+        path = f"elements -> {index}"
         
-        # Prüfe ob Package definiert ist
         if elem_package not in defined_packages:
-            logger.warning(f"Element '{elem_name}' referenziert undefiniertes Package '{elem_package}'")
             # Kein Fehler, da Package automatisch erstellt werden kann
+            issues.append(SpecIssue(WARNING, path, f"Element '{elem_name}' referenziert undefiniertes "
+                                                   f"Package '{elem_package}'"))
         
-        # Prüfe auf doppelte Element-Namen im gleichen Package
-        elem_key = f"{elem_package}::{elem_name}"
-        if elem_key in element_packages:
-            error_msg = f"Doppeltes Element '{elem_name}' in Package '{elem_package}'"
-            logger.error(error_msg)
-            raise EAError(error_msg)
-        
+        key = (elem_package, elem_name)
+        if key in first_index:
+            issues.append(SpecIssue(ERROR, path, f"Doppeltes Element '{elem_name}' in Package "
+                                                 f"'{elem_package}' (bereits in elements -> {first_index[key]})"))
+        else:
+            first_index[key] = index
         defined_elements.add(elem_name)
-        element_packages[elem_key] = elem
     
-    # Prüfe Connectors
-    for conn in spec.get('connectors', []):
-        client = conn['client']
-        supplier = conn['supplier']
-        
-        # Prüfe ob referenzierte Elemente existieren
-        if client not in defined_elements:
-            error_msg = f"Connector referenziert undefiniertes Client-Element '{client}'"
-            logger.error(error_msg)
-            raise EAError(error_msg)
-        
-        if supplier not in defined_elements:
-            error_msg = f"Connector referenziert undefiniertes Supplier-Element '{supplier}'"
-            logger.error(error_msg)
-            raise EAError(error_msg)
+    for index, conn in enumerate(spec.get('connectors', [])):
+        for role, label in (('client', 'Client'), ('supplier', 'Supplier')):
+            if conn[role] not in defined_elements:
+                issues.append(SpecIssue(ERROR, f"connectors -> {index} -> {role}",
+                                        f"Connector referenziert undefiniertes {label}-Element '{conn[role]}'"))
     
-    # Prüfe Diagramme
-    for diag in spec.get('diagrams', []):
-        diag_package = diag['package']
-        if diag_package not in defined_packages:
-            logger.warning(f"Diagramm '{diag['name']}' referenziert undefiniertes Package '{diag_package}'")
-        
-        # Prüfe referenzierte Elemente
-        for elem_name in diag.get('elements', []):
+    for index, diag in enumerate(spec.get('diagrams', [])):
+        path = f"diagrams -> {index}"
+        if diag['package'] not in defined_packages:
+            issues.append(SpecIssue(WARNING, path, f"Diagramm '{diag['name']}' referenziert undefiniertes "
+                                                   f"Package '{diag['package']}'"))
+        for elem_index, elem_name in enumerate(diag.get('elements', [])):
             if elem_name not in defined_elements:
-                logger.warning(f"Diagramm '{diag['name']}' referenziert undefiniertes Element '{elem_name}'")
+                issues.append(SpecIssue(WARNING, f"{path} -> elements -> {elem_index}",
+                                        f"Diagramm '{diag['name']}' referenziert undefiniertes "
+                                        f"Element '{elem_name}'"))
+    
+    return issues
+
+
+def _validate_model_spec_logic(spec: Dict) -> None:
+    """
+    Zusätzliche logische Validierungen der Model-Spezifikation.
+    
+    Alle Probleme werden mit check_model_spec_logic in einem Durchlauf
+    gesammelt; Fehler werden gemeinsam gemeldet.
+    
+    Args:
+        spec: Model-Spezifikation
+    
+    Raises:
+        EAError: Bei logischen Inkonsistenzen (Meldung enthält alle Fehler)
+    """
+    issues = check_model_spec_logic(spec)
+    warnings = [issue for issue in issues if issue.severity == WARNING]
+    errors = [issue for issue in issues if issue.severity == ERROR]
+    
+    for issue in warnings[:MAX_LOGGED_WARNINGS]:
+        logger.warning(f"{issue.path}: {issue.message}")
+    if len(warnings) > MAX_LOGGED_WARNINGS:
+        logger.warning(f"... und {len(warnings) - MAX_LOGGED_WARNINGS} weitere Warnungen")
+    
+    if errors:
+        for issue in errors:
+            logger.error(f"{issue.path}: {issue.message}")
+        error_msg = errors[0].message
+        if len(errors) > 1:
+            error_msg += f" (und {len(errors) - 1} weitere Fehler)\n" + "\n".join(str(e) for e in errors)
+        raise EAError(error_msg)
 
 
 def validate_json_against_schema(json_data: Dict, schema: Dict) -> List[str]:
@@ -359,10 +669,10 @@ def validate_json_against_schema(json_data: Dict, schema: Dict) -> List[str]:
     Returns:
         Liste von Fehlermeldungen (leer wenn valide)
     """
-    validator = Draft7Validator(schema)
     errors = []
     
-    for error in validator.iter_errors(json_data):
+    # Kompilierter, gecachter Validator (siehe validation.py)
+    for error in get_validator(schema).iter_errors(json_data):
         error_path = " -> ".join(str(p) for p in error.absolute_path) if error.absolute_path else "root"
         errors.append(f"{error_path}: {error.message}")
     
@@ -1,54 +1,96 @@
-from typing import Any, Optional, List, Dict
+from typing import Any, Optional, List, Dict, Tuple
 from .exceptions import EAError, EATypeError
 from .logging_conf import logger
-from .utils import ensure_update_refresh
+from .utils import DeferredUpdateMixin, batch_refresh, ensure_update_refresh
+from .records import PackageRecord, SnapshotMixin
+from .elements import Element
+from .index import note_element_created, note_package_created
+from .bulk import export_model_tree
 
 
-class Package:
-    def __init__(self, ea_package: Any):
+class Package(SnapshotMixin, DeferredUpdateMixin):
+    _record_type = PackageRecord
+    
+    def __init__(self, ea_package: Any, record: Optional[PackageRecord] = None,
+                 repo: Optional[Any] = None):
         self.ea_package = ea_package
+        self._record = record
+        self._repo = repo  # Optional: Repository für SQL-Exporte in to_dict()
+    
+    def _ea_object(self) -> Any:
+        return self.ea_package
     
     @property
     def name(self) -> str:
+        if self._record is not None:
+            return self._record.name
         return self.ea_package.Name
     
     @name.setter
     def name(self, value: str) -> None:
-        self.ea_package.Name = value
-        ensure_update_refresh(self.ea_package)
+        self._set_field("Name", value)
+        if self._record is not None:
+            self._record.name = value
     
     @property
     def guid(self) -> str:
+        if self._record is not None:
+            return self._record.guid
         return self.ea_package.PackageGUID
     
     @property
     def package_id(self) -> int:
+        if self._record is not None:
+            return self._record.package_id
         return self.ea_package.PackageID
     
     @property
     def notes(self) -> str:
+        if self._record is not None:
+            return self._record.notes
         return self.ea_package.Notes
     
     @notes.setter
     def notes(self, value: str) -> None:
-        self.ea_package.Notes = value
-        ensure_update_refresh(self.ea_package)
+        self._set_field("Notes", value)
+        if self._record is not None:
+            self._record.notes = value
     
     def add_package(self, name: str, package_type: str = "Package") -> 'Package':
         try:
             packages = self.ea_package.Packages
             new_package = packages.AddNew(name, package_type)
-            ensure_update_refresh(new_package, packages)
+            ensure_update_refresh(new_package, packages, lambda: (self.ea_package.PackageGUID, "Packages"))
+            note_package_created(self.ea_package, new_package, name)
             logger.info(f"Package erstellt: {name}")
-            return Package(new_package)
+            return Package(new_package, repo=self._repo)
         except Exception as e:
             logger.error(f"Fehler beim Erstellen des Package: {e}")
             raise EAError(f"Fehler beim Erstellen des Package: {e}")
     
+    def add_elements(self, elements: List[Tuple[str, str]]) -> List[Element]:
+        """Erstellt mehrere Elemente (Name, Typ); die Collection wird einmal am Ende aktualisiert."""
+        try:
+            collection = self.ea_package.Elements
+            key = (self.ea_package.PackageGUID, "Elements")
+            created = []
+            with batch_refresh():
+                for name, element_type in elements:
+                    new_element = collection.AddNew(name, element_type)
+                    ensure_update_refresh(new_element, collection, key)
+                    note_element_created(self.ea_package, new_element, name, element_type, "")
+                    created.append(Element(new_element))
+            logger.info(f"{len(created)} Elemente erstellt")
+            return created
+        except Exception as e:
+            logger.error(f"Fehler beim Erstellen der Elemente: {e}")
+            raise EAError(f"Fehler beim Erstellen der Elemente: {e}")
+    
     def get_packages(self) -> List['Package']:
         packages = []
-        for i in range(self.ea_package.Packages.Count):
-            packages.append(Package(self.ea_package.Packages.GetAt(i)))
+        collection = self.ea_package.Packages
+        for i in range(collection.Count):
+            packages.append(Package(collection.GetAt(i), repo=self._repo))
         return packages
     
     def find_package(self, name: str) -> Optional['Package']:
@@ -72,20 +114,25 @@ class Package:
             raise EAError(f"Fehler beim Löschen des Package: {e}")
     
     def to_dict(self) -> Dict:
-        return {
-            "name": self.name,
-            "guid": self.guid,
-            "package_id": self.package_id,
-            "notes": self.notes,
-            "packages": [pkg.to_dict() for pkg in self.get_packages()]
-        }
+        """
+        Package mit allen Unter-Packages als Dictionary.
+        
+        Mit Repository (siehe get_model_root) liest eine SQL-Abfrage auf
+        t_package den ganzen Teilbaum (bulk.export_model_tree); ohne
+        Repository wird rekursiv über COM gelesen.
+        """
+        if self._repo is not None:
+            return export_model_tree(self._repo, self.package_id, include_contents=False)
+        data = self._current_record().to_dict()
+        data["packages"] = [pkg.to_dict() for pkg in self.get_packages()]
+        return data
 
 
 def get_model_root(repo: Any) -> Package:
     try:
         models = repo.Models
         if models.Count > 0:
-            return Package(models.GetAt(0))
+            return Package(models.GetAt(0), repo=repo)
         else:
             raise EAError("Kein Root-Model gefunden")
     except Exception as e:
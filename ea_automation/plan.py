@@ -0,0 +1,286 @@
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+from .bulk import load_model_tables
+from .elements import resolve_element_type
+from .logging_conf import logger
+
+
+# Aktionen eines Change-Sets
+CREATE = "create"
+UPDATE = "update"
+NOOP = "noop"
+
+_SYMBOLS = {CREATE: "+", UPDATE: "~", NOOP: "="}
+
+
+class Change:
+    """Eine geplante Änderung (oder ein No-op) an einem Modellobjekt."""
+
+    __slots__ = ("action", "kind", "name", "details")
+
+    def __init__(self, action: str, kind: str, name: str, details: str = ""):
+        self.action = action
+        self.kind = kind
+        self.name = name
+        self.details = details
+
+    def __str__(self) -> str:
+        text = f"{_SYMBOLS[self.action]} {self.kind} {self.name}"
+        return f"{text} ({self.details})" if self.details else text
+
+    def __repr__(self) -> str:
+        return f"<Change {self}>"
+
+
+class ChangeSet:
+    """
+    Ergebnis von plan_model_spec: alle Änderungen plus die Delta-Spezifikation.
+
+    delta enthält nur die Teile der Spezifikation, für die etwas zu tun ist,
+    im Format von load_model_spec. ModelBuilder führt damit nur das Delta aus.
+    """
+
+    def __init__(self, model: str):
+        self.changes: List[Change] = []
+        self.delta: Dict[str, Any] = {"model": model, "packages": [], "elements": [],
+                                      "connectors": [], "diagrams": []}
+
+    def add(self, action: str, kind: str, name: str, details: str = "") -> None:
+        self.changes.append(Change(action, kind, name, details))
+
+    @property
+    def has_changes(self) -> bool:
+        return any(change.action != NOOP for change in self.changes)
+
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        """Anzahl der Änderungen je Objektart und Aktion."""
+        counts: Dict[str, Dict[str, int]] = defaultdict(lambda: {CREATE: 0, UPDATE: 0, NOOP: 0})
+        for change in self.changes:
+            counts[change.kind][change.action] += 1
+        return dict(counts)
+
+    def format(self, include_noops: bool = False) -> str:
+        """Text für --plan: eine Zeile pro Änderung und eine Zusammenfassung."""
+        lines = [str(c) for c in self.changes if include_noops or c.action != NOOP]
+        total = {action: sum(1 for c in self.changes if c.action == action)
+                 for action in (CREATE, UPDATE, NOOP)}
+        lines.append(f"Plan: {total[CREATE]} zu erstellen, {total[UPDATE]} zu ändern, "
+                     f"{total[NOOP]} unverändert")
+        return "\n".join(lines)
+
+
+def _depth(package_id: int, parents: Dict[int, int]) -> int:
+    depth = 0
+    seen = set()
+    while package_id in parents and package_id not in seen:
+        seen.add(package_id)
+        package_id = parents[package_id]
+        depth += 1
+    return depth
+
+
+def plan_model_spec(repo: Any, spec: Dict) -> ChangeSet:
+    """
+    Vergleicht eine Model-Spezifikation mit dem Repository.
+
+    Der Ist-Stand wird mit load_model_tables (eine SQL-Abfrage je Tabelle)
+    geladen; Packages und Elemente werden wie von ModelBuilder aufgelöst
+    (Packages des Models, sonst das flachste Package gleichen Namens,
+    Elemente nach Name und Typ bzw. Stereotype wie in create_element).
+
+    Args:
+        repo: EA Repository Objekt
+        spec: Model-Spezifikation aus load_model_spec
+
+    Returns:
+        ChangeSet mit allen Änderungen und der Delta-Spezifikation
+    """
+    tables = load_model_tables(repo)
+    model_name = spec.get('model', 'Model')
+    plan = ChangeSet(model_name)
+    delta = plan.delta
+
+    # --- Ist-Stand indizieren ---
+    parents = {row['package_id']: row.get('parent_id') or 0 for row in tables['packages']}
+    child_packages: Dict[Tuple[int, str], int] = {}
+    packages_by_name: Dict[str, int] = {}
+    names = {row['package_id']: row.get('name', '') for row in tables['packages']}
+    for package_id in sorted(parents, key=lambda i: (_depth(i, parents), i)):
+        child_packages.setdefault((parents[package_id], names[package_id]), package_id)
+        packages_by_name.setdefault(names[package_id], package_id)
+
+    elements_by_type: Dict[Tuple[int, str, str], Dict] = {}
+    elements_by_stereotype: Dict[Tuple[int, str, str], Dict] = {}
+    elements_by_name: Dict[str, Dict] = {}
+    for row in sorted(tables['elements'], key=lambda r: r['object_id']):
+        key = (row.get('package_id') or 0, row.get('name', ''))
+        elements_by_type.setdefault(key + (row.get('object_type', ''),), row)
+        if row.get('stereotype'):
+            elements_by_stereotype.setdefault(key + (row['stereotype'].lower(),), row)
+        elements_by_name.setdefault(row.get('name', ''), row)
+
+    attributes: Dict[Tuple[int, str], Dict] = {}
+    for row in sorted(tables['attributes'], key=lambda r: (r.get('pos') or 0, r['id'])):
+        attributes.setdefault((row['object_id'], row.get('name', '')), row)
+    operations: Dict[Tuple[int, str], Dict] = {}
+    for row in sorted(tables['operations'], key=lambda r: (r.get('pos') or 0, r['operationid'])):
+        operations.setdefault((row['object_id'], row.get('name', '')), row)
+    connectors = {(row.get('start_object_id'), row.get('end_object_id'), row.get('connector_type'))
+                  for row in tables['connectors']}
+    # (Package, Name) -> Element-IDs auf dem Diagramm (erstes gleichnamiges Diagramm)
+    diagram_ids: Dict[Tuple[int, str], int] = {}
+    for row in sorted(tables['diagrams'], key=lambda r: r['diagram_id']):
+        diagram_ids.setdefault((row.get('package_id'), row.get('name', '')), row['diagram_id'])
+    diagram_objects: Dict[int, set] = defaultdict(set)
+    for row in tables['diagram_objects']:
+        diagram_objects[row.get('diagram_id')].add(row.get('object_id'))
+
+    # --- Model und Packages ---
+    model_id = child_packages.get((0, model_name))
+    plan.add(NOOP if model_id is not None else CREATE, "model", model_name)
+
+    spec_packages: Dict[str, Optional[int]] = {}
+    for package_name in spec.get('packages', []):
+        package_id = child_packages.get((model_id, package_name)) if model_id is not None else None
+        spec_packages[package_name] = package_id
+        if package_id is None:
+            plan.add(CREATE, "package", package_name)
+            delta['packages'].append(package_name)
+        else:
+            plan.add(NOOP, "package", package_name)
+
+    def resolve_package(package_name: str) -> Optional[int]:
+        # None: Package wird erst beim Anwenden erstellt
+        if package_name in spec_packages:
+            return spec_packages[package_name]
+        package_id = child_packages.get((model_id, package_name)) if model_id is not None else None
+        if package_id is None:
+            package_id = packages_by_name.get(package_name)
+        if package_id is None:
+            plan.add(CREATE, "package", package_name, "automatisch im Model")
+        spec_packages[package_name] = package_id
+        return package_id
+
+    # --- Elemente, Attribute, Operationen ---
+    element_ids: Dict[str, Optional[int]] = {}
+    for elem_spec in spec.get('elements', []):
+        name = elem_spec['name']
+        uml_or_mdg_type = elem_spec['type']
+        stereotype = elem_spec.get('stereotype')
+        package_id = resolve_package(elem_spec['package'])
+        qualified = f"{elem_spec['package']}/{name}"
+
+        existing = None
+        if package_id is not None:
+            if '::' in uml_or_mdg_type:
+                expected = uml_or_mdg_type.split('::')[-1].lower()
+                existing = elements_by_stereotype.get((package_id, name, expected))
+                if existing is None and stereotype:
+                    existing = elements_by_stereotype.get((package_id, name, stereotype.lower()))
+            else:
+                existing = elements_by_type.get((package_id, name, uml_or_mdg_type))
+
+        if existing is None:
+            created_type, created_stereotype = resolve_element_type(uml_or_mdg_type, stereotype)
+            plan.add(CREATE, "element", qualified,
+                     created_type + (f" «{created_stereotype}»" if created_stereotype else ""))
+            for attr in elem_spec.get('attributes', []):
+                plan.add(CREATE, "attribute", f"{name}.{attr['name']}", attr.get('type', 'String'))
+            for op in elem_spec.get('operations', []):
+                plan.add(CREATE, "operation", f"{name}.{op['name']}()", op.get('returnType', 'void'))
+            delta['elements'].append(elem_spec)
+            element_ids.setdefault(name, None)
+            continue
+
+        object_id = existing['object_id']
+        element_ids.setdefault(name, object_id)
+        elem_delta = {key: value for key, value in elem_spec.items()
+                      if key not in ('notes', 'attributes', 'operations')}
+        changed = False
+
+        notes = elem_spec.get('notes')
+        if notes and (existing.get('note') or '') != notes:
+            plan.add(UPDATE, "element", qualified, "Notes")
+            elem_delta['notes'] = notes
+            changed = True
+        else:
+            plan.add(NOOP, "element", qualified)
+
+        for attr in elem_spec.get('attributes', []):
+            attr_type = attr.get('type', 'String')
+            row = attributes.get((object_id, attr['name']))
+            if row is None:
+                plan.add(CREATE, "attribute", f"{name}.{attr['name']}", attr_type)
+            elif (row.get('type') or '') != attr_type:
+                plan.add(UPDATE, "attribute", f"{name}.{attr['name']}",
+                         f"{row.get('type') or ''} -> {attr_type}")
+            else:
+                plan.add(NOOP, "attribute", f"{name}.{attr['name']}")
+                continue
+            elem_delta.setdefault('attributes', []).append(attr)
+            changed = True
+
+        for op in elem_spec.get('operations', []):
+            return_type = op.get('returnType', 'void')
+            row = operations.get((object_id, op['name']))
+            if row is None:
+                plan.add(CREATE, "operation", f"{name}.{op['name']}()", return_type)
+            elif (row.get('type') or '') != return_type:
+                plan.add(UPDATE, "operation", f"{name}.{op['name']}()",
+                         f"{row.get('type') or ''} -> {return_type}")
+            else:
+                plan.add(NOOP, "operation", f"{name}.{op['name']}()")
+                continue
+            elem_delta.setdefault('operations', []).append(op)
+            changed = True
+
+        if changed:
+            delta['elements'].append(elem_delta)
+
+    # --- Connectors ---
+    def element_id(element_name: str) -> Optional[int]:
+        if element_name in element_ids:
+            return element_ids[element_name]
+        row = elements_by_name.get(element_name)
+        return row['object_id'] if row is not None else None
+
+    for conn_spec in spec.get('connectors', []):
+        conn_type = conn_spec['type']
+        label = f"{conn_spec['client']} --{conn_type}--> {conn_spec['supplier']}"
+        client_id = element_id(conn_spec['client'])
+        supplier_id = element_id(conn_spec['supplier'])
+        if client_id is not None and supplier_id is not None \
+                and (client_id, supplier_id, conn_type) in connectors:
+            plan.add(NOOP, "connector", label)
+        else:
+            plan.add(CREATE, "connector", label)
+            delta['connectors'].append(conn_spec)
+
+    # --- Diagramme ---
+    for diag_spec in spec.get('diagrams', []):
+        package_id = resolve_package(diag_spec['package'])
+        label = f"{diag_spec['package']}/{diag_spec['name']}"
+        diagram_id = diagram_ids.get((package_id, diag_spec['name'])) if package_id is not None else None
+        if diagram_id is None:
+            plan.add(CREATE, "diagram", label, diag_spec['type'])
+            delta['diagrams'].append(diag_spec)
+            continue
+
+        # Fehlende Elemente: nicht auf dem Diagramm oder erst noch zu erstellen;
+        # unbekannte Namen überspringt der Build ohnehin
+        present = diagram_objects[diagram_id]
+        missing = []
+        for elem_name in diag_spec.get('elements', []):
+            object_id = element_id(elem_name)
+            if object_id is None and elem_name not in element_ids:
+                continue
+            if object_id is None or object_id not in present:
+                missing.append(elem_name)
+        if missing:
+            plan.add(UPDATE, "diagram", label, "+ " + ", ".join(missing))
+            delta['diagrams'].append(dict(diag_spec, elements=missing))
+        else:
+            plan.add(NOOP, "diagram", label)
+
+    logger.info(plan.format().splitlines()[-1])
+    return plan
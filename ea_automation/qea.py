@@ -0,0 +1,794 @@
+import sqlite3
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+from xml.sax.saxutils import escape
+from .exceptions import EAConnectionError, EAError
+from .logging_conf import logger
+
+
+# Teilmenge des EA-Schemas, die von dieser Bibliothek gelesen und geschrieben wird.
+# Echte .qea-Dateien enthalten weitere Tabellen und Spalten; für Tests und
+# In-Memory-Repositories reicht diese Teilmenge.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS t_package (
+    Package_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Name TEXT,
+    Parent_ID INTEGER DEFAULT 0,
+    CreatedDate TEXT,
+    ModifiedDate TEXT,
+    Notes TEXT,
+    ea_guid TEXT,
+    IsControlled INTEGER DEFAULT 0,
+    TPos INTEGER DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS t_object (
+    Object_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Object_Type TEXT,
+    Diagram_ID INTEGER DEFAULT 0,
+    Name TEXT,
+    Alias TEXT,
+    Author TEXT,
+    Version TEXT DEFAULT '1.0',
+    Note TEXT,
+    Package_ID INTEGER DEFAULT 0,
+    Stereotype TEXT,
+    NType INTEGER DEFAULT 0,
+    Complexity TEXT DEFAULT '1',
+    Status TEXT,
+    CreatedDate TEXT,
+    ModifiedDate TEXT,
+    Scope TEXT DEFAULT 'Public',
+    ea_guid TEXT,
+    ParentID INTEGER DEFAULT 0,
+    Classifier INTEGER DEFAULT 0,
+    PDATA1 TEXT,
+    TPos INTEGER DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS t_attribute (
+    ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Object_ID INTEGER DEFAULT 0,
+    Name TEXT,
+    Scope TEXT,
+    Stereotype TEXT,
+    Type TEXT,
+    Notes TEXT,
+    Pos INTEGER DEFAULT 0,
+    Classifier TEXT DEFAULT '0',
+    ea_guid TEXT
+);
+CREATE TABLE IF NOT EXISTS t_operation (
+    OperationID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Object_ID INTEGER DEFAULT 0,
+    Name TEXT,
+    Scope TEXT,
+    Type TEXT,
+    Stereotype TEXT,
+    Notes TEXT,
+    Pos INTEGER DEFAULT 0,
+    Classifier TEXT DEFAULT '0',
+    ea_guid TEXT
+);
+CREATE TABLE IF NOT EXISTS t_connector (
+    Connector_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Name TEXT,
+    Direction TEXT,
+    Notes TEXT,
+    Connector_Type TEXT,
+    SubType TEXT,
+    SourceCard TEXT,
+    SourceRole TEXT,
+    DestCard TEXT,
+    DestRole TEXT,
+    Start_Object_ID INTEGER DEFAULT 0,
+    End_Object_ID INTEGER DEFAULT 0,
+    Stereotype TEXT,
+    ea_guid TEXT
+);
+CREATE TABLE IF NOT EXISTS t_diagram (
+    Diagram_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Package_ID INTEGER DEFAULT 0,
+    ParentID INTEGER DEFAULT 0,
+    Diagram_Type TEXT,
+    Name TEXT,
+    Version TEXT DEFAULT '1.0',
+    Author TEXT,
+    Notes TEXT,
+    Stereotype TEXT,
+    CreatedDate TEXT,
+    ModifiedDate TEXT,
+    StyleEx TEXT,
+    ea_guid TEXT,
+    TPos INTEGER DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS t_diagramobjects (
+    Diagram_ID INTEGER DEFAULT 0,
+    Object_ID INTEGER DEFAULT 0,
+    RectTop INTEGER DEFAULT 0,
+    RectLeft INTEGER DEFAULT 0,
+    RectRight INTEGER DEFAULT 0,
+    RectBottom INTEGER DEFAULT 0,
+    Sequence INTEGER DEFAULT 0,
+    ObjectStyle TEXT,
+    Instance_ID INTEGER PRIMARY KEY AUTOINCREMENT
+);
+CREATE TABLE IF NOT EXISTS t_xref (
+    XrefID TEXT,
+    Name TEXT,
+    Type TEXT,
+    Visibility TEXT,
+    Namespace TEXT,
+    Requirement TEXT,
+    [Constraint] TEXT,
+    Behavior TEXT,
+    Partition TEXT,
+    Description TEXT,
+    Client TEXT,
+    Supplier TEXT,
+    Link TEXT
+);
+"""
+
+
+# Diagrammtypen der Spezifikation -> Diagram_Type in t_diagram
+DIAGRAM_TYPES = {
+    "Class": "Logical",
+    "Component": "Component",
+    "Deployment": "Deployment",
+    "UseCase": "Use Case",
+    "Activity": "Activity",
+    "StateMachine": "Statechart",
+    "Sequence": "Sequence",
+    "Communication": "Collaboration",
+    "Package": "Package",
+    "Object": "Object",
+    "Composite": "CompositeStructure",
+    "Timing": "Timing",
+}
+
+
+def create_schema(connection: sqlite3.Connection) -> None:
+    """Legt die Tabellen aus SCHEMA an (für Tests und In-Memory-Repositories)."""
+    connection.executescript(SCHEMA)
+
+
+def new_guid() -> str:
+    """Erzeugt eine GUID im EA-Format, z.B. {6A1B...-...}."""
+    return "{" + str(uuid.uuid4()).upper() + "}"
+
+
+def stereotype_description(stereotype: str, fq_name: Optional[str] = None) -> str:
+    """
+    Beschreibung der t_xref-Zeile, in der EA Stereotype und MetaType speichert.
+
+    Args:
+        stereotype: Stereotype-Name (z.B. 'block')
+        fq_name: Vollqualifizierter MDG-Typ (z.B. 'SysML1.4::Block')
+    """
+    description = f"@STEREO;Name={stereotype};"
+    if fq_name:
+        description += f"FQName={fq_name};"
+    return description + "@ENDSTEREO;"
+
+
+class QeaObject:
+    """
+    Basis der COM-kompatiblen Objekte.
+
+    Die Properties werden über FIELDS (COM-Name -> Spalte) aus der
+    Tabellenzeile gelesen. NULL wird wie bei COM zu "" bzw. 0. Ist das
+    Repository schreibbar, setzen Property-Puts die Spalte und Update()
+    schreibt neue Objekte per INSERT bzw. geänderte Spalten per UPDATE.
+    """
+
+    TABLE = ""
+    KEY = ""
+    FIELDS: Dict[str, str] = {}
+    INT_FIELDS = frozenset()
+    # Spalte, in die der Typ-Parameter von AddNew geschrieben wird
+    TYPE_COLUMN = ""
+    # Darstellungs-Properties ohne eigene Spalte; werden nur am Objekt gehalten
+    EXTRA_FIELDS = frozenset()
+
+    def __init__(self, repository: 'QeaRepository', row: Dict[str, Any], is_new: bool = False):
+        object.__setattr__(self, '_repository', repository)
+        object.__setattr__(self, '_row', row)
+        object.__setattr__(self, '_dirty', set())
+        object.__setattr__(self, '_is_new', is_new)
+
+    @classmethod
+    def new(cls, repository: 'QeaRepository', row: Dict[str, Any], name: str, type_: str) -> 'QeaObject':
+        """Neues, noch nicht gespeichertes Objekt für Collection.AddNew()."""
+        row['Name'] = name
+        if cls.TYPE_COLUMN:
+            row[cls.TYPE_COLUMN] = type_
+        return cls(repository, row, is_new=True)
+
+    def __getattr__(self, name: str) -> Any:
+        column = self.FIELDS.get(name)
+        if column is None:
+            if name in self.EXTRA_FIELDS:
+                return None
+            raise AttributeError(f"{type(self).__name__} hat keine Property '{name}'")
+        value = self._row.get(column)
+        if value is None:
+            return 0 if name in self.INT_FIELDS else ""
+        return value
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        self._repository._check_writable(f"{name} kann nicht gesetzt werden")
+        if name in self.EXTRA_FIELDS:
+            object.__setattr__(self, name, value)
+            return
+        column = self.FIELDS.get(name)
+        if column is None or column == self.KEY:
+            raise AttributeError(f"{type(self).__name__}.{name} kann nicht gesetzt werden")
+        self._row[column] = value
+        self._dirty.add(column)
+
+    def _collection(self, key: str, item_class: type, sql: str, params: Sequence[Any],
+                    defaults: Optional[Dict[str, Any]] = None) -> 'QeaCollection':
+        # Wie bei COM liefert jede Property dieselbe Collection (bis Refresh zwischengespeichert)
+        collection = self.__dict__.get(key)
+        if collection is None:
+            collection = QeaCollection(self._repository, item_class, sql, params, defaults)
+            object.__setattr__(self, key, collection)
+        return collection
+
+    def _insert(self) -> None:
+        row = self._row
+        if 'ea_guid' in self.FIELDS.values() and not row.get('ea_guid'):
+            row['ea_guid'] = new_guid()
+        columns = [c for c, v in row.items() if v is not None and c != self.KEY]
+        cursor = self._repository._execute(
+            f"INSERT INTO {self.TABLE} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+            [row[c] for c in columns]
+        )
+        row[self.KEY] = cursor.lastrowid
+        object.__setattr__(self, '_is_new', False)
+
+    def _update_columns(self, columns: Sequence[str]) -> None:
+        self._repository._execute(
+            f"UPDATE {self.TABLE} SET {', '.join(f'{c} = ?' for c in columns)} WHERE {self.KEY} = ?",
+            [self._row.get(c) for c in columns] + [self._row[self.KEY]]
+        )
+
+    def Update(self) -> bool:
+        self._repository._check_writable("Update() nicht möglich")
+        if self._is_new:
+            self._insert()
+        elif self._dirty:
+            self._update_columns(sorted(self._dirty))
+        self._dirty.clear()
+        return True
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self._row.get(self.KEY)} {self._row.get('Name', '')!r}>"
+
+
+class QeaCollection:
+    """
+    COM-kompatible Collection (Count, GetAt, GetByName, AddNew, DeleteAt, Refresh).
+
+    Die Zeilen werden beim ersten Zugriff mit einer Abfrage geladen und bis
+    zum nächsten Refresh() zwischengespeichert. Wie bei COM erscheinen mit
+    AddNew angelegte Objekte erst nach Update() und Refresh() in der Collection.
+    """
+
+    def __init__(self, repository: 'QeaRepository', item_class: type, sql: str,
+                 params: Sequence[Any] = (), defaults: Optional[Dict[str, Any]] = None):
+        self._repository = repository
+        self._item_class = item_class
+        self._sql = sql
+        self._params = tuple(params)
+        self._defaults = defaults or {}
+        self._items: Optional[List[Any]] = None
+
+    def _load(self) -> List[Any]:
+        if self._items is None:
+            rows = self._repository._fetch(self._sql, self._params)
+            self._items = [self._item_class(self._repository, row) for row in rows]
+        return self._items
+
+    @property
+    def Count(self) -> int:
+        return len(self._load())
+
+    def GetAt(self, index: int) -> Any:
+        items = self._load()
+        if not 0 <= index < len(items):
+            raise EAError(f"Index {index} außerhalb der Collection (Count={len(items)})")
+        return items[index]
+
+    def GetByName(self, name: str) -> Any:
+        for item in self._load():
+            if item.Name == name:
+                return item
+        raise EAError(f"Kein Eintrag mit Namen '{name}'")
+
+    def Refresh(self) -> None:
+        self._items = None
+
+    def AddNew(self, name: str, type_: str) -> Any:
+        self._repository._check_writable("AddNew() nicht möglich")
+        return self._item_class.new(self._repository, dict(self._defaults), name, type_)
+
+    def DeleteAt(self, index: int, refresh: bool = False) -> None:
+        self._repository._check_writable("DeleteAt() nicht möglich")
+        item = self.GetAt(index)
+        self._repository._execute(f"DELETE FROM {item.TABLE} WHERE {item.KEY} = ?",
+                                  (item._row[item.KEY],))
+        if refresh:
+            self.Refresh()
+
+    def __len__(self) -> int:
+        return self.Count
+
+    def __iter__(self):
+        return iter(list(self._load()))
+
+
+class QeaPackage(QeaObject):
+    TABLE = "t_package"
+    KEY = "Package_ID"
+    FIELDS = {
+        "PackageID": "Package_ID", "PackageGUID": "ea_guid", "Name": "Name",
+        "Notes": "Notes", "ParentID": "Parent_ID", "TreePos": "TPos"
+    }
+    INT_FIELDS = frozenset({"PackageID", "ParentID", "TreePos"})
+
+    @property
+    def IsModel(self) -> bool:
+        return not self._row.get("Parent_ID")
+
+    def _insert(self) -> None:
+        super()._insert()
+        if self._row.get("Parent_ID"):
+            # Packages unterhalb eines Models haben zusätzlich eine t_object-Zeile
+            self._repository._execute(
+                "INSERT INTO t_object (Object_Type, Name, Package_ID, ea_guid, PDATA1) "
+                "VALUES ('Package', ?, ?, ?, ?)",
+                (self._row["Name"], self._row["Parent_ID"], self._row["ea_guid"],
+                 str(self._row["Package_ID"]))
+            )
+
+    @property
+    def Packages(self) -> QeaCollection:
+        return self._collection('_packages', QeaPackage,
+                                "SELECT * FROM t_package WHERE Parent_ID = ? ORDER BY TPos, Name",
+                                (self._row["Package_ID"],),
+                                {"Parent_ID": self._row["Package_ID"]})
+
+    @property
+    def Elements(self) -> QeaCollection:
+        return self._collection('_elements', QeaElement,
+                                "SELECT * FROM t_object WHERE Package_ID = ? AND Object_Type <> 'Package' "
+                                "AND COALESCE(ParentID, 0) = 0 ORDER BY TPos, Name",
+                                (self._row["Package_ID"],),
+                                {"Package_ID": self._row["Package_ID"], "Status": "Proposed"})
+
+    @property
+    def Diagrams(self) -> QeaCollection:
+        return self._collection('_diagrams', QeaDiagram,
+                                "SELECT * FROM t_diagram WHERE Package_ID = ? AND COALESCE(ParentID, 0) = 0 "
+                                "ORDER BY TPos, Name",
+                                (self._row["Package_ID"],),
+                                {"Package_ID": self._row["Package_ID"]})
+
+
+class QeaElement(QeaObject):
+    TABLE = "t_object"
+    KEY = "Object_ID"
+    FIELDS = {
+        "ElementID": "Object_ID", "ElementGUID": "ea_guid", "Name": "Name",
+        "Type": "Object_Type", "Stereotype": "Stereotype", "Notes": "Note",
+        "Status": "Status", "PackageID": "Package_ID", "ParentID": "ParentID",
+        "Alias": "Alias", "Author": "Author", "Version": "Version", "TreePos": "TPos"
+    }
+    INT_FIELDS = frozenset({"ElementID", "PackageID", "ParentID", "TreePos"})
+    TYPE_COLUMN = "Object_Type"
+
+    @property
+    def MetaType(self) -> str:
+        meta_type = self.__dict__.get('_meta_type')
+        if meta_type is None:
+            rows = self._repository._fetch(
+                "SELECT Description FROM t_xref WHERE Client = ? AND Name = 'Stereotypes'",
+                (self._row.get("ea_guid"),)
+            )
+            description = rows[0]["Description"] if rows else ""
+            meta_type = ""
+            for part in (description or "").split(";"):
+                if part.startswith("FQName="):
+                    meta_type = part[len("FQName="):]
+            object.__setattr__(self, '_meta_type', meta_type)
+        return meta_type or self.Type
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == "MetaType":
+            self._repository._check_writable(f"{name} kann nicht gesetzt werden")
+            object.__setattr__(self, '_meta_type', value)
+            self._dirty.add("MetaType")
+            return
+        super().__setattr__(name, value)
+
+    def Update(self) -> bool:
+        stereotype_changed = self._is_new or bool(self._dirty & {"Stereotype", "MetaType"})
+        self._dirty.discard("MetaType")
+        super().Update()
+        if stereotype_changed:
+            self._write_stereotype()
+        return True
+
+    def _write_stereotype(self) -> None:
+        # Stereotype und MetaType stehen bei EA in t_xref
+        guid = self._row["ea_guid"]
+        self._repository._execute("DELETE FROM t_xref WHERE Client = ? AND Name = 'Stereotypes'", (guid,))
+        stereotype = self._row.get("Stereotype")
+        if stereotype:
+            meta_type = self.__dict__.get('_meta_type')
+            self._repository._execute(
+                "INSERT INTO t_xref (XrefID, Name, Type, Visibility, Description, Client) "
+                "VALUES (?, 'Stereotypes', 'element property', 'Public', ?, ?)",
+                (new_guid(), stereotype_description(stereotype, meta_type if meta_type and '::' in meta_type else None),
+                 guid)
+            )
+
+    @property
+    def Attributes(self) -> QeaCollection:
+        return self._collection('_attributes', QeaAttribute,
+                                "SELECT * FROM t_attribute WHERE Object_ID = ? ORDER BY Pos, ID",
+                                (self._row["Object_ID"],),
+                                {"Object_ID": self._row["Object_ID"], "Scope": "Private"})
+
+    @property
+    def Methods(self) -> QeaCollection:
+        return self._collection('_methods', QeaMethod,
+                                "SELECT * FROM t_operation WHERE Object_ID = ? ORDER BY Pos, OperationID",
+                                (self._row["Object_ID"],),
+                                {"Object_ID": self._row["Object_ID"], "Scope": "Public"})
+
+    @property
+    def Connectors(self) -> QeaCollection:
+        # Wie in EA: Connectors an beiden Enden
+        return self._collection('_connectors', QeaConnector,
+                                "SELECT * FROM t_connector WHERE Start_Object_ID = ? OR End_Object_ID = ? "
+                                "ORDER BY Connector_ID",
+                                (self._row["Object_ID"], self._row["Object_ID"]),
+                                {"Start_Object_ID": self._row["Object_ID"],
+                                 "Direction": "Source -> Destination"})
+
+    @property
+    def Elements(self) -> QeaCollection:
+        return self._collection('_elements', QeaElement,
+                                "SELECT * FROM t_object WHERE ParentID = ? ORDER BY TPos, Name",
+                                (self._row["Object_ID"],),
+                                {"ParentID": self._row["Object_ID"], "Package_ID": self._row.get("Package_ID")})
+
+
+class QeaAttribute(QeaObject):
+    TABLE = "t_attribute"
+    KEY = "ID"
+    FIELDS = {
+        "AttributeID": "ID", "AttributeGUID": "ea_guid", "Name": "Name", "Type": "Type",
+        "Visibility": "Scope", "Notes": "Notes", "Stereotype": "Stereotype",
+        "ParentID": "Object_ID", "Pos": "Pos"
+    }
+    INT_FIELDS = frozenset({"AttributeID", "ParentID", "Pos"})
+    TYPE_COLUMN = "Type"
+
+
+class QeaMethod(QeaObject):
+    TABLE = "t_operation"
+    KEY = "OperationID"
+    FIELDS = {
+        "MethodID": "OperationID", "MethodGUID": "ea_guid", "Name": "Name",
+        "ReturnType": "Type", "Visibility": "Scope", "Notes": "Notes",
+        "Stereotype": "Stereotype", "ParentID": "Object_ID", "Pos": "Pos"
+    }
+    INT_FIELDS = frozenset({"MethodID", "ParentID", "Pos"})
+    TYPE_COLUMN = "Type"
+
+
+class QeaConnectorEnd:
+    """Client- bzw. Supplier-Ende eines Connectors (Spalten Source*/Dest* des Connectors)."""
+
+    __slots__ = ("_connector", "_prefix")
+
+    def __init__(self, connector: 'QeaConnector', prefix: str):
+        self._connector = connector
+        self._prefix = prefix
+
+    @property
+    def Role(self) -> str:
+        return self._connector._row.get(self._prefix + "Role") or ""
+
+    @Role.setter
+    def Role(self, value: str) -> None:
+        self._set(self._prefix + "Role", value)
+
+    @property
+    def Cardinality(self) -> str:
+        return self._connector._row.get(self._prefix + "Card") or ""
+
+    @Cardinality.setter
+    def Cardinality(self, value: str) -> None:
+        self._set(self._prefix + "Card", value)
+
+    def _set(self, column: str, value: str) -> None:
+        connector = self._connector
+        connector._repository._check_writable(f"{column} kann nicht gesetzt werden")
+        connector._row[column] = value
+        connector._dirty.add(column)
+
+    def Update(self) -> bool:
+        return self._connector.Update()
+
+
+class QeaConnector(QeaObject):
+    TABLE = "t_connector"
+    KEY = "Connector_ID"
+    FIELDS = {
+        "ConnectorID": "Connector_ID", "ConnectorGUID": "ea_guid", "Name": "Name",
+        "Type": "Connector_Type", "Subtype": "SubType", "Stereotype": "Stereotype",
+        "Notes": "Notes", "Direction": "Direction", "ClientID": "Start_Object_ID",
+        "SupplierID": "End_Object_ID"
+    }
+    INT_FIELDS = frozenset({"ConnectorID", "ClientID", "SupplierID"})
+    TYPE_COLUMN = "Connector_Type"
+
+    @property
+    def ClientEnd(self) -> QeaConnectorEnd:
+        return QeaConnectorEnd(self, "Source")
+
+    @property
+    def SupplierEnd(self) -> QeaConnectorEnd:
+        return QeaConnectorEnd(self, "Dest")
+
+
+class QeaDiagram(QeaObject):
+    TABLE = "t_diagram"
+    KEY = "Diagram_ID"
+    FIELDS = {
+        "DiagramID": "Diagram_ID", "DiagramGUID": "ea_guid", "Name": "Name",
+        "Type": "Diagram_Type", "Notes": "Notes", "Stereotype": "Stereotype",
+        "PackageID": "Package_ID", "ParentID": "ParentID", "TreePos": "TPos"
+    }
+    INT_FIELDS = frozenset({"DiagramID", "PackageID", "ParentID", "TreePos"})
+    TYPE_COLUMN = "Diagram_Type"
+
+    @classmethod
+    def new(cls, repository: 'QeaRepository', row: Dict[str, Any], name: str, type_: str) -> 'QeaDiagram':
+        return super().new(repository, row, name, DIAGRAM_TYPES.get(type_, type_))
+
+    @property
+    def Repository(self) -> 'QeaRepository':
+        return self._repository
+
+    @property
+    def DiagramObjects(self) -> QeaCollection:
+        return self._collection('_diagramobjects', QeaDiagramObject,
+                                "SELECT * FROM t_diagramobjects WHERE Diagram_ID = ? ORDER BY Sequence, Instance_ID",
+                                (self._row["Diagram_ID"],),
+                                {"Diagram_ID": self._row["Diagram_ID"]})
+
+
+class QeaDiagramObject(QeaObject):
+    TABLE = "t_diagramobjects"
+    KEY = "Instance_ID"
+    FIELDS = {
+        "InstanceID": "Instance_ID", "DiagramID": "Diagram_ID", "ElementID": "Object_ID",
+        "left": "RectLeft", "right": "RectRight", "top": "RectTop", "bottom": "RectBottom",
+        "Sequence": "Sequence", "Style": "ObjectStyle"
+    }
+    INT_FIELDS = frozenset({"InstanceID", "DiagramID", "ElementID", "left", "right",
+                            "top", "bottom", "Sequence"})
+    EXTRA_FIELDS = frozenset({"ShowPublicAttributes", "ShowPublicOperations"})
+    # Koordinaten-String von AddNew, z.B. "l=10;r=100;t=10;b=100;"
+    COORDINATES = {"l": "RectLeft", "r": "RectRight", "t": "RectTop", "b": "RectBottom"}
+
+    @classmethod
+    def new(cls, repository: 'QeaRepository', row: Dict[str, Any], name: str,
+            type_: str) -> 'QeaDiagramObject':
+        for part in (name or "").split(";"):
+            key, _, value = part.partition("=")
+            column = cls.COORDINATES.get(key.strip())
+            if column is not None and value.strip():
+                row[column] = int(value)
+        return cls(repository, row, is_new=True)
+
+
+class QeaRepository:
+    """
+    Zugriff auf eine .qea-Datei (SQLite) ohne Enterprise Architect.
+
+    Bietet die Teile der EA-Repository-API, die ea_automation verwendet
+    (Models, Get*ByID, Get*ByGuid, SQLQuery sowie AddNew/Update/DeleteAt
+    auf den Collections), sodass Package, Element, Connector, Diagram,
+    create_element & Co., der Repository-Index und der SQL-Export
+    unverändert darauf arbeiten.
+
+    Lesend geöffnete Dateien (mode=ro) können von beliebig vielen Prozessen
+    gleichzeitig gelesen werden. Schreibend geöffnete Repositories sammeln
+    alle Änderungen in einer Transaktion, die SaveFile() bzw. CloseFile()
+    festschreibt.
+    """
+
+    def __init__(self, connection: sqlite3.Connection, path: Optional[str] = None,
+                 read_only: bool = True):
+        connection.row_factory = sqlite3.Row
+        self._connection = connection
+        self.path = path
+        self.read_only = read_only
+        self._models: Optional[QeaCollection] = None
+
+    def _check_writable(self, action: str) -> None:
+        if self.read_only:
+            raise EAError(f"Repository ist schreibgeschützt: {action}")
+
+    def _execute(self, sql: str, params: Sequence[Any] = ()) -> sqlite3.Cursor:
+        try:
+            return self._connection.execute(sql, params)
+        except sqlite3.Error as e:
+            raise EAError(f"Fehler beim Schreiben in {self.path or 'Repository'}: {e}")
+
+    def _fetch(self, sql: str, params: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+        try:
+            return [dict(row) for row in self._connection.execute(sql, params)]
+        except sqlite3.Error as e:
+            raise EAError(f"Fehler bei der Abfrage auf {self.path or 'Repository'}: {e}")
+
+    def _get(self, item_class: type, column: str, value: Any) -> Any:
+        rows = self._fetch(f"SELECT * FROM {item_class.TABLE} WHERE {column} = ?", (value,))
+        if not rows:
+            raise EAError(f"{item_class.__name__[3:]} mit {column}={value!r} nicht gefunden")
+        return item_class(self, rows[0])
+
+    @property
+    def Models(self) -> QeaCollection:
+        if self._models is None:
+            self._models = QeaCollection(self, QeaPackage,
+                                         "SELECT * FROM t_package WHERE Parent_ID = 0 ORDER BY TPos, Name",
+                                         defaults={"Parent_ID": 0})
+        return self._models
+
+    def GetPackageByID(self, package_id: int) -> QeaPackage:
+        return self._get(QeaPackage, "Package_ID", package_id)
+
+    def GetPackageByGuid(self, guid: str) -> QeaPackage:
+        return self._get(QeaPackage, "ea_guid", guid)
+
+    def GetElementByID(self, element_id: int) -> QeaElement:
+        return self._get(QeaElement, "Object_ID", element_id)
+
+    def GetElementByGuid(self, guid: str) -> QeaElement:
+        return self._get(QeaElement, "ea_guid", guid)
+
+    def GetConnectorByID(self, connector_id: int) -> QeaConnector:
+        return self._get(QeaConnector, "Connector_ID", connector_id)
+
+    def GetConnectorByGuid(self, guid: str) -> QeaConnector:
+        return self._get(QeaConnector, "ea_guid", guid)
+
+    def GetDiagramByID(self, diagram_id: int) -> QeaDiagram:
+        return self._get(QeaDiagram, "Diagram_ID", diagram_id)
+
+    def GetDiagramByGuid(self, guid: str) -> QeaDiagram:
+        return self._get(QeaDiagram, "ea_guid", guid)
+
+    def GetAttributeByID(self, attribute_id: int) -> QeaAttribute:
+        return self._get(QeaAttribute, "ID", attribute_id)
+
+    def GetMethodByID(self, method_id: int) -> QeaMethod:
+        return self._get(QeaMethod, "OperationID", method_id)
+
+    def SQLQuery(self, sql: str) -> str:
+        """
+        Führt eine Abfrage aus und liefert das Ergebnis im XML-Format von EA.
+
+        NULL-Werte werden wie bei EA weggelassen.
+        """
+        try:
+            cursor = self._connection.execute(sql)
+        except sqlite3.Error as e:
+            raise EAError(f"Fehler bei SQLQuery: {e}")
+        columns = [escape(d[0]) for d in cursor.description or ()]
+        parts = ['<?xml version="1.0"?><EADATA version="1.0" exporter="Enterprise Architect">'
+                 '<Dataset_0><Data>']
+        append = parts.append
+        for row in cursor:
+            append("<Row>")
+            for column, value in zip(columns, row):
+                if value is None:
+                    continue
+                if not isinstance(value, str):
+                    value = str(value)
+                append(f"<{column}>{escape(value)}</{column}>")
+            append("</Row>")
+        append("</Data></Dataset_0></EADATA>")
+        return "".join(parts)
+
+    def GetLastError(self) -> str:
+        return ""
+
+    def SaveFile(self) -> None:
+        # Lesend geöffnet: nichts zu speichern
+        if not self.read_only and self._connection is not None:
+            self._connection.commit()
+
+    def CloseFile(self) -> None:
+        if self._connection is not None:
+            self.SaveFile()
+            self._connection.close()
+            self._connection = None
+            logger.debug(f"QEA-Datei geschlossen: {self.path}")
+
+    def Exit(self) -> None:
+        self.CloseFile()
+
+
+def open_qea(path: str, read_only: bool = True) -> QeaRepository:
+    """
+    Öffnet eine .qea-Datei direkt über sqlite3 (ohne EA/COM).
+
+    Args:
+        path: Pfad zur .qea-Datei
+        read_only: Nur lesend öffnen (mode=ro); sonst schreibbar, solange
+                   die Datei nicht gleichzeitig in EA geöffnet ist
+
+    Returns:
+        QeaRepository mit der EA-Repository-API
+
+    Raises:
+        EAConnectionError: Wenn die Datei fehlt oder keine EA-Datenbank ist
+    """
+    try:
+        repo_path = Path(path).resolve()
+        if not repo_path.exists():
+            raise FileNotFoundError(f"Repository nicht gefunden: {repo_path}")
+        if repo_path.suffix.lower() != '.qea':
+            raise ValueError(f"Nur .qea-Dateien können direkt geöffnet werden: {repo_path.suffix}")
+
+        mode = "ro" if read_only else "rw"
+        connection = sqlite3.connect(f"{repo_path.as_uri()}?mode={mode}", uri=True)
+        try:
+            connection.execute("SELECT 1 FROM t_package LIMIT 1")
+        except sqlite3.Error:
+            connection.close()
+            raise
+        logger.info(f"QEA-Datei {'lesend' if read_only else 'schreibend'} geöffnet: {repo_path}")
+        return QeaRepository(connection, str(repo_path), read_only)
+
+    except Exception as e:
+        logger.error(f"Fehler beim Öffnen der QEA-Datei: {e}")
+        raise EAConnectionError(f"Fehler beim Öffnen der QEA-Datei: {e}")
+
+
+def open_memory_repository(path: Optional[str] = None) -> QeaRepository:
+    """
+    Erzeugt ein schreibbares Repository im Arbeitsspeicher.
+
+    Ohne Pfad ist das Repository leer (Schema aus SCHEMA); mit Pfad wird der
+    Inhalt der .qea-Datei als Kopie geladen. Änderungen werden nie in die
+    Datei zurückgeschrieben.
+
+    Args:
+        path: Optionale .qea-Datei als Ausgangsstand
+
+    Returns:
+        QeaRepository über einer In-Memory-Datenbank
+    """
+    try:
+        connection = sqlite3.connect(":memory:")
+        if path:
+            source = open_qea(path)
+            source._connection.backup(connection)
+            source.CloseFile()
+        else:
+            create_schema(connection)
+        logger.info(f"In-Memory-Repository erstellt{f' aus {path}' if path else ''}")
+        return QeaRepository(connection, path, read_only=False)
+
+    except Exception as e:
+        logger.error(f"Fehler beim Erstellen des In-Memory-Repository: {e}")
+        raise EAConnectionError(f"Fehler beim Erstellen des In-Memory-Repository: {e}")
@@ -0,0 +1,390 @@
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from .elements import resolve_element_type
+from .exceptions import EAError
+from .logging_conf import logger
+from .qea import DIAGRAM_TYPES, new_guid, stereotype_description
+
+
+# Raster wie bei auto_place_grid
+GRID_COLS = 3
+GRID_CELL_W = 300
+GRID_CELL_H = 220
+GRID_MARGIN = 50
+
+
+def stereotype_xref(guid: str, stereotype: str, fq_name: Optional[str] = None) -> Tuple:
+    """
+    Erzeugt die t_xref-Zeile, über die EA Stereotype und MetaType eines Objekts speichert.
+
+    Args:
+        guid: GUID des Elements
+        stereotype: Stereotype-Name (z.B. 'block')
+        fq_name: Vollqualifizierter MDG-Typ (z.B. 'SysML1.4::Block')
+    """
+    return (new_guid(), "Stereotypes", "element property", "Public",
+            stereotype_description(stereotype, fq_name), guid)
+
+
+class QeaWriter:
+    """
+    Schreibt eine Model-Spezifikation (load_model_spec) direkt in eine .qea-Datei.
+
+    Statt eines COM-Aufrufs pro AddNew/Update werden alle Zeilen in einer
+    einzigen SQLite-Transaktion mit executemany eingefügt bzw. aktualisiert.
+    IDs werden fortlaufend ab dem höchsten vorhandenen Wert vergeben, GUIDs
+    im EA-Format erzeugt. Die Auflösung von Packages und Elementen entspricht
+    ModelBuilder: Vorhandenes wird wiederverwendet (geänderte Notes, Attribut-
+    und Rückgabetypen werden wie bei create_element/add_attribute/add_operation
+    übernommen), fehlende Packages werden im Root-Model angelegt.
+
+    Die Datei darf während des Schreibens nicht in EA geöffnet sein.
+    """
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+        self.now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.rows: Dict[str, List[Tuple]] = {
+            "t_package": [], "t_object": [], "t_attribute": [], "t_operation": [],
+            "t_connector": [], "t_diagram": [], "t_diagramobjects": [], "t_xref": []
+        }
+        self.updates: Dict[str, List[Tuple]] = {"t_object": [], "t_attribute": [], "t_operation": []}
+        self.created = {"packages": 0, "elements": 0, "attributes": 0, "operations": 0,
+                        "connectors": 0, "diagrams": 0}
+        self.updated = {"elements": 0, "attributes": 0, "operations": 0}
+        self._next_ids: Dict[str, int] = {}
+        self._load_existing()
+
+    def _next_id(self, table: str, column: str) -> int:
+        if table not in self._next_ids:
+            row = self.connection.execute(f"SELECT MAX({column}) FROM {table}").fetchone()
+            self._next_ids[table] = (row[0] or 0) + 1
+        value = self._next_ids[table]
+        self._next_ids[table] = value + 1
+        return value
+
+    def _load_existing(self) -> None:
+        execute = self.connection.execute
+        self.packages: Dict[int, Tuple[int, str, str]] = {}  # ID -> (Parent, Name, GUID)
+        for package_id, parent_id, name, guid in execute(
+                "SELECT Package_ID, Parent_ID, Name, ea_guid FROM t_package"):
+            self.packages[package_id] = (parent_id or 0, name, guid)
+        self.child_packages: Dict[Tuple[int, str], int] = {}
+        self.packages_by_name: Dict[str, int] = {}
+        # Bei Namensgleichheit gewinnt das flachste, dann das ältere Package
+        for package_id in sorted(self.packages, key=lambda i: (self._depth(i), i)):
+            parent_id, name, _ = self.packages[package_id]
+            self.child_packages.setdefault((parent_id, name), package_id)
+            self.packages_by_name.setdefault(name, package_id)
+
+        # Wie create_element: (Package, Name, Typ) bzw. (Package, Name, Stereotype) bei MDG-Typen
+        self.elements_by_type: Dict[Tuple[int, str, str], int] = {}
+        self.elements_by_stereotype: Dict[Tuple[int, str, str], int] = {}
+        self.elements_by_name: Dict[str, int] = {}
+        self.notes: Dict[int, str] = {}  # Object_ID -> Note
+        for object_id, package_id, name, object_type, stereotype, note in execute(
+                "SELECT Object_ID, Package_ID, Name, Object_Type, Stereotype, Note FROM t_object "
+                "WHERE Object_Type <> 'Package' ORDER BY Object_ID"):
+            self._note_element(object_id, package_id, name, object_type, stereotype)
+            self.elements_by_name.setdefault(name, object_id)
+            self.notes[object_id] = note or ""
+
+        # (Object_ID, Name) -> Typ; wie plan_model_spec zählt der erste Eintrag nach Pos
+        self.attributes: Dict[Tuple[int, str], str] = {}
+        for object_id, name, type_ in execute(
+                "SELECT Object_ID, Name, Type FROM t_attribute ORDER BY Pos, ID"):
+            self.attributes.setdefault((object_id, name), type_ or "")
+        self.operations: Dict[Tuple[int, str], str] = {}
+        for object_id, name, type_ in execute(
+                "SELECT Object_ID, Name, Type FROM t_operation ORDER BY Pos, OperationID"):
+            self.operations.setdefault((object_id, name), type_ or "")
+        self.connectors = set(execute(
+            "SELECT Start_Object_ID, End_Object_ID, Connector_Type FROM t_connector"))
+        self.diagrams = set(execute("SELECT Package_ID, Name FROM t_diagram"))
+
+        # Anzahl vorhandener Einträge je Owner für die TreePos neuer Einträge
+        self._tpos: Dict[Tuple[str, int], int] = {}
+        for kind, sql in (
+                ("package", "SELECT Parent_ID, COUNT(*) FROM t_package GROUP BY Parent_ID"),
+                ("element", "SELECT Package_ID, COUNT(*) FROM t_object "
+                            "WHERE Object_Type <> 'Package' GROUP BY Package_ID"),
+                ("attribute", "SELECT Object_ID, COUNT(*) FROM t_attribute GROUP BY Object_ID"),
+                ("operation", "SELECT Object_ID, COUNT(*) FROM t_operation GROUP BY Object_ID"),
+                ("diagram", "SELECT Package_ID, COUNT(*) FROM t_diagram GROUP BY Package_ID")):
+            for owner_id, count in execute(sql):
+                self._tpos[(kind, owner_id)] = count
+
+    def _note_element(self, object_id: int, package_id: int, name: str, object_type: str,
+                      stereotype: Optional[str]) -> None:
+        self.elements_by_type.setdefault((package_id, name, object_type or ""), object_id)
+        if stereotype:
+            self.elements_by_stereotype.setdefault((package_id, name, stereotype.lower()), object_id)
+
+    def find_element(self, package_id: int, name: str, uml_or_mdg_type: str,
+                     stereotype: Optional[str] = None) -> Optional[int]:
+        """Vorhandenes Element nach Name und Typ bzw. Stereotype (wie PackageElementIndex.find)."""
+        if '::' in uml_or_mdg_type:
+            expected = uml_or_mdg_type.split('::')[-1].lower()
+            object_id = self.elements_by_stereotype.get((package_id, name, expected))
+            if object_id is None and stereotype:
+                object_id = self.elements_by_stereotype.get((package_id, name, stereotype.lower()))
+            return object_id
+        return self.elements_by_type.get((package_id, name, uml_or_mdg_type))
+
+    def _depth(self, package_id: int) -> int:
+        depth = 0
+        seen = set()
+        while package_id in self.packages and package_id not in seen:
+            seen.add(package_id)
+            package_id = self.packages[package_id][0]
+            depth += 1
+        return depth
+
+    def _position(self, kind: str, owner_id: int) -> int:
+        # Neue Einträge hinter die vorhandenen sortieren (EA-TreePos)
+        key = (kind, owner_id)
+        position = self._tpos.get(key, 0)
+        self._tpos[key] = position + 1
+        return position
+
+    def ensure_package(self, parent_id: int, name: str) -> int:
+        """Liefert die ID eines Packages unter parent_id und legt es bei Bedarf an."""
+        package_id = self.child_packages.get((parent_id, name))
+        if package_id is not None:
+            return package_id
+
+        package_id = self._next_id("t_package", "Package_ID")
+        guid = new_guid()
+        self.rows["t_package"].append(
+            (package_id, name, parent_id, self.now, self.now, guid, self._position("package", parent_id))
+        )
+        if parent_id:
+            # Packages unterhalb eines Models haben zusätzlich eine t_object-Zeile
+            object_id = self._next_id("t_object", "Object_ID")
+            self.rows["t_object"].append(
+                (object_id, "Package", name, None, parent_id, None, None, self.now, self.now,
+                 guid, str(package_id), 0)
+            )
+        self.packages[package_id] = (parent_id, name, guid)
+        self.child_packages[(parent_id, name)] = package_id
+        self.packages_by_name.setdefault(name, package_id)
+        self.created["packages"] += 1
+        return package_id
+
+    def find_package(self, model_id: int, name: str) -> int:
+        """Package nach Name wie ModelBuilder: Model-Kind, sonst beliebige Tiefe, sonst neu im Model."""
+        package_id = self.child_packages.get((model_id, name))
+        if package_id is None:
+            package_id = self.packages_by_name.get(name)
+        if package_id is None:
+            logger.info(f"  [AUTO-CREATE] Package: {name}")
+            package_id = self.ensure_package(model_id, name)
+        return package_id
+
+    def add_element(self, package_id: int, spec: Dict) -> int:
+        """Legt ein Element samt Attributen und Operationen an bzw. aktualisiert vorhandene."""
+        name = spec['name']
+        uml_or_mdg_type = spec['type']
+        stereotype = spec.get('stereotype')
+        object_id = self.find_element(package_id, name, uml_or_mdg_type, stereotype)
+        if object_id is None:
+            created_type, created_stereotype = resolve_element_type(uml_or_mdg_type, stereotype)
+            object_id = self._next_id("t_object", "Object_ID")
+            guid = new_guid()
+            self.rows["t_object"].append(
+                (object_id, created_type, name, spec.get('notes'), package_id,
+                 created_stereotype or None, "Proposed", self.now, self.now, guid, None,
+                 self._position("element", package_id))
+            )
+            if created_stereotype:
+                fq_name = uml_or_mdg_type if '::' in uml_or_mdg_type else None
+                self.rows["t_xref"].append(stereotype_xref(guid, created_stereotype, fq_name))
+            self._note_element(object_id, package_id, name, created_type, created_stereotype)
+            self.notes[object_id] = spec.get('notes') or ""
+            self.created["elements"] += 1
+        elif spec.get('notes') and self.notes.get(object_id) != spec['notes']:
+            # Wie create_element: Notes nur überschreiben, wenn angegeben
+            self.notes[object_id] = spec['notes']
+            self.updates["t_object"].append((spec['notes'], self.now, object_id))
+            self.updated["elements"] += 1
+        self.elements_by_name.setdefault(name, object_id)
+
+        for attr in spec.get('attributes', []):
+            key = (object_id, attr['name'])
+            attr_type = attr.get('type', 'String')
+            if key in self.attributes:
+                if self.attributes[key] != attr_type:
+                    self.attributes[key] = attr_type
+                    self.updates["t_attribute"].append((attr_type,) + key)
+                    self.updated["attributes"] += 1
+                continue
+            self.attributes[key] = attr_type
+            self.rows["t_attribute"].append(
+                (object_id, attr['name'], "Private", attr_type,
+                 self._position("attribute", object_id), new_guid())
+            )
+            self.created["attributes"] += 1
+
+        for op in spec.get('operations', []):
+            key = (object_id, op['name'])
+            return_type = op.get('returnType', 'void')
+            if key in self.operations:
+                if self.operations[key] != return_type:
+                    self.operations[key] = return_type
+                    self.updates["t_operation"].append((return_type,) + key)
+                    self.updated["operations"] += 1
+                continue
+            self.operations[key] = return_type
+            self.rows["t_operation"].append(
+                (object_id, op['name'], "Public", return_type,
+                 self._position("operation", object_id), new_guid())
+            )
+            self.created["operations"] += 1
+        return object_id
+
+    def add_connector(self, spec: Dict) -> Optional[int]:
+        """Legt einen Connector zwischen zwei Elementen (nach Name) an."""
+        client_id = self.elements_by_name.get(spec['client'])
+        supplier_id = self.elements_by_name.get(spec['supplier'])
+        if client_id is None or supplier_id is None:
+            missing = spec['client'] if client_id is None else spec['supplier']
+            logger.error(f"  Element '{missing}' nicht gefunden")
+            return None
+        key = (client_id, supplier_id, spec['type'])
+        if key in self.connectors:
+            return None
+        self.connectors.add(key)
+
+        connector_id = self._next_id("t_connector", "Connector_ID")
+        guid = new_guid()
+        stereotype = spec.get('stereotype')
+        self.rows["t_connector"].append(
+            (connector_id, spec.get('name', ''), "Source -> Destination", spec.get('notes'),
+             spec['type'], client_id, supplier_id, stereotype, guid)
+        )
+        if stereotype:
+            self.rows["t_xref"].append(stereotype_xref(guid, stereotype))
+        self.created["connectors"] += 1
+        return connector_id
+
+    def add_diagram(self, package_id: int, spec: Dict) -> Optional[int]:
+        """Legt ein Diagramm an und platziert die Elemente im Raster von auto_place_grid."""
+        name = spec['name']
+        if (package_id, name) in self.diagrams:
+            logger.info(f"  [EXISTS] Diagramm: {name}")
+            return None
+        self.diagrams.add((package_id, name))
+
+        diagram_id = self._next_id("t_diagram", "Diagram_ID")
+        self.rows["t_diagram"].append(
+            (diagram_id, package_id, DIAGRAM_TYPES.get(spec['type'], spec['type']), name,
+             self.now, self.now, new_guid(), self._position("diagram", package_id))
+        )
+        sequence = 0
+        for elem_name in spec.get('elements', []):
+            object_id = self.elements_by_name.get(elem_name)
+            if object_id is None:
+                logger.warning(f"  [SKIP] Element nicht gefunden: {elem_name}")
+                continue
+            row, col = divmod(sequence, GRID_COLS)
+            left = GRID_MARGIN + col * GRID_CELL_W
+            top = -GRID_MARGIN - row * GRID_CELL_H
+            sequence += 1
+            self.rows["t_diagramobjects"].append(
+                (diagram_id, object_id, top, left, left + GRID_CELL_W - GRID_MARGIN,
+                 top - (GRID_CELL_H - GRID_MARGIN), sequence)
+            )
+        self.created["diagrams"] += 1
+        return diagram_id
+
+    def write_spec(self, spec: Dict) -> None:
+        """Sammelt die Zeilen für die komplette Spezifikation."""
+        model_id = self.ensure_package(0, spec.get('model', 'Model'))
+        for package_name in spec.get('packages', []):
+            self.ensure_package(model_id, package_name)
+        for elem_spec in spec.get('elements', []):
+            self.add_element(self.find_package(model_id, elem_spec['package']), elem_spec)
+        for conn_spec in spec.get('connectors', []):
+            self.add_connector(conn_spec)
+        for diag_spec in spec.get('diagrams', []):
+            self.add_diagram(self.find_package(model_id, diag_spec['package']), diag_spec)
+
+    def flush(self) -> None:
+        """Fügt alle gesammelten Zeilen ein und aktualisiert geänderte (ein executemany pro Tabelle)."""
+        executemany = self.connection.executemany
+        executemany("INSERT INTO t_package (Package_ID, Name, Parent_ID, CreatedDate, ModifiedDate, "
+                    "ea_guid, TPos) VALUES (?, ?, ?, ?, ?, ?, ?)", self.rows["t_package"])
+        executemany("INSERT INTO t_object (Object_ID, Object_Type, Name, Note, Package_ID, Stereotype, "
+                    "Status, CreatedDate, ModifiedDate, ea_guid, PDATA1, TPos) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", self.rows["t_object"])
+        executemany("INSERT INTO t_attribute (Object_ID, Name, Scope, Type, Pos, ea_guid) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", self.rows["t_attribute"])
+        executemany("INSERT INTO t_operation (Object_ID, Name, Scope, Type, Pos, ea_guid) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", self.rows["t_operation"])
+        executemany("INSERT INTO t_connector (Connector_ID, Name, Direction, Notes, Connector_Type, "
+                    "Start_Object_ID, End_Object_ID, Stereotype, ea_guid) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", self.rows["t_connector"])
+        executemany("INSERT INTO t_diagram (Diagram_ID, Package_ID, Diagram_Type, Name, CreatedDate, "
+                    "ModifiedDate, ea_guid, TPos) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", self.rows["t_diagram"])
+        executemany("INSERT INTO t_diagramobjects (Diagram_ID, Object_ID, RectTop, RectLeft, RectRight, "
+                    "RectBottom, Sequence) VALUES (?, ?, ?, ?, ?, ?, ?)", self.rows["t_diagramobjects"])
+        executemany("INSERT INTO t_xref (XrefID, Name, Type, Visibility, Description, Client) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", self.rows["t_xref"])
+        executemany("UPDATE t_object SET Note = ?, ModifiedDate = ? WHERE Object_ID = ?",
+                    self.updates["t_object"])
+        executemany("UPDATE t_attribute SET Type = ? WHERE Object_ID = ? AND Name = ?",
+                    self.updates["t_attribute"])
+        executemany("UPDATE t_operation SET Type = ? WHERE Object_ID = ? AND Name = ?",
+                    self.updates["t_operation"])
+        for rows in list(self.rows.values()) + list(self.updates.values()):
+            rows.clear()
+
+
+def write_model_spec(path: str, spec: Dict) -> Dict[str, int]:
+    """
+    Schreibt eine validierte Model-Spezifikation offline in eine .qea-Datei.
+
+    Alle Packages, Elemente, Attribute, Operationen, Connectors und Diagramme
+    werden in einer Transaktion eingefügt, geänderte Notes und Typen
+    vorhandener Einträge aktualisiert; bei einem Fehler bleibt die Datei
+    unverändert. Die Datei darf nicht gleichzeitig in EA geöffnet sein.
+
+    Args:
+        path: Pfad zur vorhandenen .qea-Datei
+        spec: Model-Spezifikation aus load_model_spec
+
+    Returns:
+        Anzahl der neu angelegten Objekte je Art
+
+    Raises:
+        EAError: Wenn die Datei fehlt, keine EA-Datenbank ist oder gesperrt ist
+    """
+    repo_path = Path(path)
+    if not repo_path.exists():
+        error_msg = f"Repository nicht gefunden: {repo_path.absolute()}"
+        logger.error(error_msg)
+        raise EAError(error_msg)
+
+    connection = sqlite3.connect(str(repo_path), isolation_level=None, timeout=0)
+    try:
+        # Schreibsperre sofort holen: schlägt fehl, solange ein anderer Prozess schreibt
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            writer = QeaWriter(connection)
+            writer.write_spec(spec)
+            writer.flush()
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        logger.info(f"Model-Spezifikation offline geschrieben: {repo_path} "
+                    + ", ".join(f"{k}={v}" for k, v in writer.created.items())
+                    + "; aktualisiert: " + ", ".join(f"{k}={v}" for k, v in writer.updated.items()))
+        return writer.created
+    except sqlite3.Error as e:
+        logger.error(f"Fehler beim Schreiben der QEA-Datei: {e}")
+        raise EAError(f"Fehler beim Schreiben der QEA-Datei: {e}")
+    finally:
+        connection.close()
@@ -0,0 +1,225 @@
+from typing import Any, Dict, List, Optional
+
+
+def row_int(value: Optional[Any], default: int = 0) -> int:
+    """ID- oder Positionswert einer SQL-Zeile (fehlende Werte werden default)."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class SnapshotMixin:
+    """
+    Snapshot-Modus für die Wrapper (Package, Element, Connector, Diagram).
+
+    snapshot() liest alle skalaren Felder des COM-Objekts einmal in einen
+    Record vom Typ _record_type; Properties und to_dict() lesen danach aus
+    dem Record, Setter schreiben durch. Für viele Objekte füllt from_row die
+    Records aus den Zeilen von bulk.load_model_tables ohne COM-Aufrufe.
+    """
+
+    _record_type: Any = None
+    _record: Any = None
+
+    def snapshot(self):
+        self._record = self._record_type.from_com(self._ea_object())
+        return self
+
+    def clear_snapshot(self) -> None:
+        self._record = None
+
+    def _current_record(self) -> Any:
+        # Ohne Snapshot: ein Lesedurchgang, jedes Feld genau einmal per COM
+        if self._record is not None:
+            return self._record
+        return self._record_type.from_com(self._ea_object())
+
+
+class PackageRecord:
+    """Snapshot der skalaren Felder eines EA Packages."""
+
+    __slots__ = ("name", "guid", "package_id", "notes")
+
+    def __init__(self, name: str, guid: str, package_id: int, notes: str):
+        self.name = name
+        self.guid = guid
+        self.package_id = package_id
+        self.notes = notes
+
+    @classmethod
+    def from_com(cls, ea_package: Any) -> 'PackageRecord':
+        return cls(
+            ea_package.Name,
+            ea_package.PackageGUID,
+            ea_package.PackageID,
+            ea_package.Notes
+        )
+
+    @classmethod
+    def from_row(cls, row: Dict) -> 'PackageRecord':
+        return cls(row.get('name', ''), row.get('ea_guid', ''), row_int(row.get('package_id')),
+                   row.get('notes', ''))
+
+    def to_dict(self) -> Dict:
+        return {"name": self.name, "guid": self.guid, "package_id": self.package_id,
+                "notes": self.notes}
+
+
+class ElementRecord:
+    """
+    Snapshot der skalaren Felder eines EA Elements.
+
+    attributes/methods bleiben None, bis sie das erste Mal gelesen werden.
+    """
+
+    __slots__ = ("name", "guid", "element_id", "element_type", "stereotype",
+                 "notes", "status", "attributes", "methods")
+
+    def __init__(self, name: str, guid: str, element_id: int, element_type: str,
+                 stereotype: str, notes: str, status: str,
+                 attributes: Optional[List[Dict]] = None,
+                 methods: Optional[List[Dict]] = None):
+        self.name = name
+        self.guid = guid
+        self.element_id = element_id
+        self.element_type = element_type
+        self.stereotype = stereotype
+        self.notes = notes
+        self.status = status
+        self.attributes = attributes
+        self.methods = methods
+
+    @classmethod
+    def from_com(cls, ea_element: Any) -> 'ElementRecord':
+        return cls(
+            ea_element.Name,
+            ea_element.ElementGUID,
+            ea_element.ElementID,
+            ea_element.Type,
+            ea_element.Stereotype,
+            ea_element.Notes,
+            ea_element.Status
+        )
+
+    @classmethod
+    def from_row(cls, row: Dict, attributes: Optional[List[Dict]] = None,
+                 methods: Optional[List[Dict]] = None) -> 'ElementRecord':
+        return cls(row.get('name', ''), row.get('ea_guid', ''), row_int(row.get('object_id')),
+                   row.get('object_type', ''), row.get('stereotype', ''), row.get('note', ''),
+                   row.get('status', ''), attributes, methods)
+
+    def to_dict(self) -> Dict:
+        return {"name": self.name, "guid": self.guid, "element_id": self.element_id,
+                "type": self.element_type, "stereotype": self.stereotype, "notes": self.notes,
+                "status": self.status, "attributes": list(self.attributes or []),
+                "methods": list(self.methods or [])}
+
+
+class ConnectorRecord:
+    """Snapshot der skalaren Felder eines EA Connectors inklusive beider Enden."""
+
+    __slots__ = ("name", "guid", "connector_id", "connector_type", "stereotype",
+                 "notes", "source_element_id", "target_element_id", "direction",
+                 "source_role", "source_multiplicity", "target_role",
+                 "target_multiplicity")
+
+    def __init__(self, name: str, guid: str, connector_id: int, connector_type: str,
+                 stereotype: str, notes: str, source_element_id: int,
+                 target_element_id: int, direction: str, source_role: str,
+                 source_multiplicity: str, target_role: str, target_multiplicity: str):
+        self.name = name
+        self.guid = guid
+        self.connector_id = connector_id
+        self.connector_type = connector_type
+        self.stereotype = stereotype
+        self.notes = notes
+        self.source_element_id = source_element_id
+        self.target_element_id = target_element_id
+        self.direction = direction
+        self.source_role = source_role
+        self.source_multiplicity = source_multiplicity
+        self.target_role = target_role
+        self.target_multiplicity = target_multiplicity
+
+    @classmethod
+    def from_com(cls, ea_connector: Any) -> 'ConnectorRecord':
+        # ClientEnd/SupplierEnd nur je einmal holen
+        client_end = ea_connector.ClientEnd
+        supplier_end = ea_connector.SupplierEnd
+        return cls(
+            ea_connector.Name,
+            ea_connector.ConnectorGUID,
+            ea_connector.ConnectorID,
+            ea_connector.Type,
+            ea_connector.Stereotype,
+            ea_connector.Notes,
+            ea_connector.ClientID,
+            ea_connector.SupplierID,
+            ea_connector.Direction,
+            client_end.Role,
+            client_end.Cardinality,
+            supplier_end.Role,
+            supplier_end.Cardinality
+        )
+
+    @classmethod
+    def from_row(cls, row: Dict) -> 'ConnectorRecord':
+        return cls(row.get('name', ''), row.get('ea_guid', ''), row_int(row.get('connector_id')),
+                   row.get('connector_type', ''), row.get('stereotype', ''), row.get('notes', ''),
+                   row_int(row.get('start_object_id')), row_int(row.get('end_object_id')),
+                   row.get('direction', ''), row.get('sourcerole', ''), row.get('sourcecard', ''),
+                   row.get('destrole', ''), row.get('destcard', ''))
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "guid": self.guid,
+            "connector_id": self.connector_id,
+            "type": self.connector_type,
+            "stereotype": self.stereotype,
+            "notes": self.notes,
+            "source_element_id": self.source_element_id,
+            "target_element_id": self.target_element_id,
+            "direction": self.direction,
+            "source_role": {"name": self.source_role, "multiplicity": self.source_multiplicity},
+            "target_role": {"name": self.target_role, "multiplicity": self.target_multiplicity}
+        }
+
+
+class DiagramRecord:
+    """
+    Snapshot der skalaren Felder eines EA Diagramms.
+
+    objects bleibt None, bis die DiagramObjects das erste Mal gelesen werden.
+    """
+
+    __slots__ = ("name", "guid", "diagram_id", "diagram_type", "notes", "objects")
+
+    def __init__(self, name: str, guid: str, diagram_id: int, diagram_type: str,
+                 notes: str, objects: Optional[List[Dict]] = None):
+        self.name = name
+        self.guid = guid
+        self.diagram_id = diagram_id
+        self.diagram_type = diagram_type
+        self.notes = notes
+        self.objects = objects
+
+    @classmethod
+    def from_com(cls, ea_diagram: Any) -> 'DiagramRecord':
+        return cls(
+            ea_diagram.Name,
+            ea_diagram.DiagramGUID,
+            ea_diagram.DiagramID,
+            ea_diagram.Type,
+            ea_diagram.Notes
+        )
+
+    @classmethod
+    def from_row(cls, row: Dict, objects: Optional[List[Dict]] = None) -> 'DiagramRecord':
+        return cls(row.get('name', ''), row.get('ea_guid', ''), row_int(row.get('diagram_id')),
+                   row.get('diagram_type', ''), row.get('notes', ''), objects)
+
+    def to_dict(self) -> Dict:
+        return {"name": self.name, "guid": self.guid, "diagram_id": self.diagram_id,
+                "type": self.diagram_type, "notes": self.notes, "objects": list(self.objects or [])}
@@ -0,0 +1,408 @@
+import atexit
+import builtins
+import gzip
+import json
+import os
+import platform
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from .exceptions import EAReplayError
+from .fake import FakeObject
+from .logging_conf import logger
+from .qea import QeaCollection, QeaConnectorEnd, QeaObject, QeaRepository
+
+
+# Umgebungsvariable: Pfad der Aufzeichnung (.gz = komprimiert)
+RECORD_ENV = "EA_RECORD"
+
+# Umgebungsvariable: Faktor für die aufgezeichneten Dauern beim Abspielen (0 = ohne Wartezeit)
+REPLAY_SPEED_ENV = "EA_REPLAY_SPEED"
+
+FORMAT_VERSION = 1
+
+# Ereignisarten: Property lesen, Property schreiben, Methode aufrufen, Repository geöffnet
+GET = "g"
+SET = "s"
+CALL = "c"
+OPEN = "r"
+
+# Objekte, deren Rückgabewerte als eigene COM-Objekte aufgezeichnet werden
+_RECORDED_TYPES = (QeaRepository, QeaObject, QeaCollection, QeaConnectorEnd, FakeObject)
+
+# Kürzere Wartezeiten werden gesammelt, time.sleep ist darunter zu ungenau
+_MIN_SLEEP = 0.001
+
+
+def _is_ea_object(value: Any) -> bool:
+    return isinstance(value, _RECORDED_TYPES) or hasattr(value, "_oleobj_")
+
+
+def _encode_exception(error: BaseException) -> Dict:
+    return {"x": type(error).__name__, "m": str(error)}
+
+
+def _encode_args(args: Sequence[Any]) -> List:
+    """Argumente wie Ergebnisse kodieren; aufgezeichnete Objekte als Handle."""
+    encoded = []
+    for arg in args:
+        if isinstance(arg, (RecordingObject, ReplayObject)):
+            encoded.append({"o": arg._handle})
+        elif isinstance(arg, (str, int, float, bool, type(None))):
+            encoded.append(arg)
+        elif isinstance(arg, (list, tuple)):
+            encoded.append({"l" if isinstance(arg, list) else "t": _encode_args(arg)})
+        else:
+            encoded.append({"r": repr(arg)})
+    return encoded
+
+
+class ComRecorder:
+    """
+    Schreibt die Folge der COM-Aufrufe mit Ergebnis und Dauer in eine Datei.
+
+    Format: JSON-Lines (mit .gz-Endung gzip-komprimiert). Erste Zeile ist der
+    Kopf, danach je Aufruf [Handle, Art, Name, Argumente, Ergebnis, Dauer µs].
+    Zurückgegebene EA-Objekte erhalten fortlaufende Handles ({"o": n}),
+    Exceptions werden als {"x": Klasse, "m": Meldung} gespeichert.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.events = 0
+        self._next_handle = 0
+        opener = gzip.open if self.path.suffix == ".gz" else open
+        self._file = opener(self.path, "wt", encoding="utf-8")
+        self._write({"recording": FORMAT_VERSION,
+                     "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                     "platform": platform.platform(),
+                     "python": platform.python_version()})
+
+    def _write(self, line: Any) -> None:
+        self._file.write(json.dumps(line, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    def new_handle(self) -> int:
+        handle = self._next_handle
+        self._next_handle += 1
+        return handle
+
+    def record(self, handle: int, kind: str, name: str, args: Sequence[Any], result: Any,
+               seconds: float) -> None:
+        if self._file.closed:
+            return
+        self._write([handle, kind, name, _encode_args(args), result, round(seconds * 1e6)])
+        self.events += 1
+
+    def encode_result(self, value: Any) -> Tuple[Any, Any]:
+        """Kodiert ein Ergebnis; EA-Objekte werden mit neuem Handle umhüllt. Gibt (kodiert, Rückgabewert) zurück."""
+        if isinstance(value, (str, int, float, bool, type(None))):
+            return value, value
+        if _is_ea_object(value):
+            handle = self.new_handle()
+            return {"o": handle}, RecordingObject(value, self, handle)
+        if isinstance(value, (list, tuple)):
+            pairs = [self.encode_result(item) for item in value]
+            values = [item for _, item in pairs]
+            if isinstance(value, list):
+                return {"l": [code for code, _ in pairs]}, values
+            return {"t": [code for code, _ in pairs]}, tuple(values)
+        return {"r": repr(value)}, value
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+            logger.info(f"COM-Aufzeichnung geschrieben: {self.path} ({self.events} Aufrufe)")
+
+
+class RecordingObject:
+    """Hülle um ein EA-Objekt, die jeden Zugriff mit Ergebnis und Dauer an einen ComRecorder gibt."""
+
+    __slots__ = ("_target", "_recorder", "_handle")
+
+    def __init__(self, target: Any, recorder: ComRecorder, handle: int):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_recorder", recorder)
+        object.__setattr__(self, "_handle", handle)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        recorder = self._recorder
+        start = time.perf_counter()
+        try:
+            value = getattr(self._target, name)
+        except Exception as e:
+            recorder.record(self._handle, GET, name, (), _encode_exception(e), time.perf_counter() - start)
+            raise
+        elapsed = time.perf_counter() - start
+        if callable(value) and not hasattr(value, "_oleobj_"):
+            def invoke(*args: Any) -> Any:
+                start = time.perf_counter()
+                try:
+                    result = value(*args)
+                except Exception as e:
+                    recorder.record(self._handle, CALL, name, args, _encode_exception(e),
+                                    time.perf_counter() - start)
+                    raise
+                elapsed = time.perf_counter() - start
+                code, result = recorder.encode_result(result)
+                recorder.record(self._handle, CALL, name, args, code, elapsed)
+                return result
+            return invoke
+        code, value = recorder.encode_result(value)
+        recorder.record(self._handle, GET, name, (), code, elapsed)
+        return value
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        start = time.perf_counter()
+        try:
+            setattr(self._target, name, value)
+        except Exception as e:
+            self._recorder.record(self._handle, SET, name, (value,), _encode_exception(e),
+                                  time.perf_counter() - start)
+            raise
+        self._recorder.record(self._handle, SET, name, (value,), None, time.perf_counter() - start)
+
+    def __repr__(self) -> str:
+        return f"<Recording #{self._handle} {self._target!r}>"
+
+
+class RecordedComError(Exception):
+    """Beim Abspielen ausgelöste Exception, deren Klasse (z.B. pywintypes.com_error) nicht verfügbar ist."""
+
+    def __init__(self, class_name: str, message: str):
+        super().__init__(f"{class_name}: {message}")
+        self.class_name = class_name
+
+
+def _args_match(recorded: List, actual: List) -> bool:
+    if len(recorded) != len(actual):
+        return False
+    for expected, value in zip(recorded, actual):
+        # repr()-kodierte Werte sind nicht reproduzierbar und werden nicht verglichen
+        if isinstance(expected, dict) and "r" in expected:
+            continue
+        if isinstance(expected, dict) and isinstance(value, dict) and expected.keys() == value.keys() \
+                and ("l" in expected or "t" in expected):
+            if not _args_match(next(iter(expected.values())), next(iter(value.values()))):
+                return False
+        elif expected != value:
+            return False
+    return True
+
+
+def _describe(handle: Any, kind: str, name: str) -> str:
+    label = {GET: name, SET: f"{name}=", CALL: f"{name}()", OPEN: "Repository"}[kind]
+    return f"#{handle}.{label}"
+
+
+class ReplayPlayer:
+    """
+    Spielt eine Aufzeichnung ab: liefert die aufgezeichneten Ergebnisse in derselben Reihenfolge.
+
+    Jeder Aufruf muss dem nächsten aufgezeichneten entsprechen (Objekt,
+    Art, Name, Argumente), sonst EAReplayError. Die aufgezeichnete Dauer
+    wird mit speed multipliziert abgewartet.
+    """
+
+    def __init__(self, events: List[List], speed: float = 1.0, header: Optional[Dict] = None):
+        self.events = events
+        self.speed = speed
+        self.header = header or {}
+        self.position = 0
+        self.simulated_seconds = 0.0
+        self._debt = 0.0
+
+    @property
+    def remaining(self) -> int:
+        return len(self.events) - self.position
+
+    @property
+    def recorded_seconds(self) -> float:
+        """Summe der aufgezeichneten Dauern aller Aufrufe."""
+        return sum(event[5] for event in self.events) / 1e6
+
+    def peek(self) -> Optional[List]:
+        return self.events[self.position] if self.position < len(self.events) else None
+
+    def take(self, handle: Any, kind: str, name: str, args: Sequence[Any]) -> Any:
+        """Verbraucht das nächste Ereignis und liefert dessen Ergebnis (bzw. löst dessen Exception aus)."""
+        event = self.peek()
+        actual = _describe(handle, kind, name)
+        if event is None:
+            error_msg = f"Aufzeichnung zu Ende nach {self.position} Aufrufen, erwartet wurde kein {actual}"
+            logger.error(error_msg)
+            raise EAReplayError(error_msg)
+        if (event[0], event[1], event[2]) != (handle, kind, name) or not _args_match(event[3], _encode_args(args)):
+            error_msg = (f"Abweichung bei Aufruf {self.position}: aufgezeichnet "
+                         f"{_describe(event[0], event[1], event[2])}{event[3]}, ausgeführt {actual}{_encode_args(args)}")
+            logger.error(error_msg)
+            raise EAReplayError(error_msg)
+        self.position += 1
+        self._wait(event[5] / 1e6)
+        return self._decode(event[4])
+
+    def _wait(self, seconds: float) -> None:
+        if self.speed <= 0:
+            return
+        seconds *= self.speed
+        self.simulated_seconds += seconds
+        self._debt += seconds
+        if self._debt >= _MIN_SLEEP:
+            start = time.perf_counter()
+            time.sleep(self._debt)
+            self._debt -= time.perf_counter() - start
+
+    def _decode(self, code: Any) -> Any:
+        if not isinstance(code, dict):
+            return code
+        if "o" in code:
+            return ReplayObject(code["o"], self)
+        if "l" in code:
+            return [self._decode(item) for item in code["l"]]
+        if "t" in code:
+            return tuple(self._decode(item) for item in code["t"])
+        if "x" in code:
+            error_class = getattr(builtins, code["x"], None)
+            if isinstance(error_class, type) and issubclass(error_class, Exception):
+                raise error_class(code["m"])
+            raise RecordedComError(code["x"], code["m"])
+        return code["r"]
+
+
+class ReplayObject:
+    """Platzhalter für ein aufgezeichnetes EA-Objekt; jeder Zugriff wird vom ReplayPlayer bedient."""
+
+    __slots__ = ("_handle", "_player")
+
+    def __init__(self, handle: int, player: ReplayPlayer):
+        object.__setattr__(self, "_handle", handle)
+        object.__setattr__(self, "_player", player)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        player = self._player
+        event = player.peek()
+        if event is not None and event[0] == self._handle and event[1] == CALL and event[2] == name:
+            def invoke(*args: Any) -> Any:
+                return player.take(self._handle, CALL, name, args)
+            return invoke
+        return player.take(self._handle, GET, name, ())
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        self._player.take(self._handle, SET, name, (value,))
+
+    def __repr__(self) -> str:
+        return f"<Replay #{self._handle}>"
+
+
+class ReplayRepository(ReplayObject):
+    """Repository einer Aufzeichnung; Fortschritt und Zeiten unter .player."""
+
+    __slots__ = ()
+
+    @property
+    def player(self) -> ReplayPlayer:
+        return self._player
+
+
+def load_recording(path: str) -> Tuple[Dict, List[List]]:
+    """
+    Liest eine mit ComRecorder geschriebene Aufzeichnung.
+
+    Returns:
+        (Kopf, Ereignisse); eine abgebrochene Aufzeichnung wird bis zum
+        letzten vollständigen Ereignis gelesen
+    """
+    source = Path(path)
+    opener = gzip.open if source.suffix == ".gz" else open
+    events = []
+    try:
+        with opener(source, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline() or "{}")
+            if header.get("recording") != FORMAT_VERSION:
+                raise EAReplayError(f"Keine COM-Aufzeichnung (Format {FORMAT_VERSION}): {source}")
+            try:
+                for line in f:
+                    events.append(json.loads(line))
+            except (EOFError, json.JSONDecodeError):
+                logger.warning(f"Aufzeichnung unvollständig, abgespielt werden {len(events)} Aufrufe: {source}")
+    except EAReplayError as e:
+        logger.error(str(e))
+        raise
+    except (OSError, json.JSONDecodeError) as e:
+        logger.error(f"Fehler beim Lesen der Aufzeichnung: {e}")
+        raise EAReplayError(f"Fehler beim Lesen der Aufzeichnung: {e}")
+    return header, events
+
+
+def open_replay_repository(path: str, speed: Optional[float] = None) -> ReplayRepository:
+    """
+    Öffnet eine Aufzeichnung als Repository (z.B. unter Linux zum Profilieren der Python-Seite).
+
+    Args:
+        path: Aufzeichnung (siehe enable_recording)
+        speed: Faktor für die aufgezeichneten Dauern (1.0 = Originalzeiten,
+               0 = ohne Wartezeit); default aus EA_REPLAY_SPEED bzw. 1.0
+
+    Returns:
+        ReplayRepository für das erste in der Aufzeichnung geöffnete Repository
+    """
+    if speed is None:
+        speed = float(os.environ.get(REPLAY_SPEED_ENV) or 1.0)
+    header, events = load_recording(path)
+    player = ReplayPlayer(events, speed, header)
+    first = player.peek()
+    if first is None or first[1] != OPEN:
+        error_msg = f"Aufzeichnung enthält kein geöffnetes Repository: {path}"
+        logger.error(error_msg)
+        raise EAReplayError(error_msg)
+    player.take(first[0], OPEN, "", ())
+    logger.info(f"Aufzeichnung geöffnet: {path} ({len(events)} Aufrufe, "
+                f"aufgezeichnet {player.recorded_seconds:.1f} s)")
+    return ReplayRepository(first[0], player)
+
+
+_recorder: Optional[ComRecorder] = None
+
+
+def enable_recording(path: str) -> ComRecorder:
+    """
+    Zeichnet alle danach geöffneten Repositories in path auf (.gz = komprimiert).
+
+    Die Datei wird mit stop_recording bzw. beim Programmende geschlossen.
+    """
+    global _recorder
+    stop_recording()
+    _recorder = ComRecorder(path)
+    atexit.unregister(stop_recording)
+    atexit.register(stop_recording)
+    return _recorder
+
+
+def stop_recording() -> None:
+    """Schließt die laufende Aufzeichnung."""
+    global _recorder
+    if _recorder is not None:
+        _recorder.close()
+    _recorder = None
+
+
+def record_repository(repo: Any) -> Any:
+    """
+    Umhüllt ein Repository, wenn eine Aufzeichnung läuft (enable_recording oder EA_RECORD).
+
+    Ohne Aufzeichnung wird repo unverändert zurückgegeben.
+    """
+    if _recorder is None:
+        setting = os.environ.get(RECORD_ENV, "")
+        if setting in ("", "0"):
+            return repo
+        enable_recording(setting)
+    if isinstance(repo, RecordingObject):
+        return repo
+    handle = _recorder.new_handle()
+    _recorder.record(handle, OPEN, "", (), None, 0.0)
+    return RecordingObject(repo, _recorder, handle)
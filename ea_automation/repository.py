@@ -1,13 +1,64 @@
 import os
 from pathlib import Path
 from typing import Any, Optional
-import win32com.client
 
+from .backend import BACKENDS, COM, MEMORY, REPLAY, SQLITE, EARepository
 from .exceptions import EAConnectionError, EAError
+from .index import (
+    invalidate_connector_index,
+    invalidate_element_index,
+    invalidate_feature_index,
+    invalidate_repository_index
+)
 from .logging_conf import logger
+from .qea import open_memory_repository, open_qea
+from .replay import open_replay_repository, record_repository
+from .tracing import trace_repository
 
 
-def open_repository(path: str) -> Any:
+def _dispatch_repository() -> Any:
+    # win32com erst hier importieren: ohne pywin32 (z.B. Linux) bleibt das Paket
+    # importierbar und .qea-Dateien können über open_qea gelesen werden
+    import win32com.client
+    return win32com.client.Dispatch("EA.Repository")
+
+
+def _instrument(repo: Any) -> Any:
+    # Aufzeichnung direkt am Backend, damit sie unabhängig vom Tracing abspielbar bleibt
+    return trace_repository(record_repository(repo))
+
+
+def open_repository(path: str, backend: str = COM) -> EARepository:
+    """
+    Öffnet ein Repository mit dem gewählten Backend.
+    
+    Alle Backends bieten dieselbe Schnittstelle (siehe backend.EARepository),
+    sodass create_element, add_attribute, create_connector, create_diagram,
+    place_on_diagram usw. unverändert darauf arbeiten.
+    
+    Args:
+        path: Pfad zur Repository-Datei (bei "memory" optional als Ausgangsstand,
+              bei "replay" die Aufzeichnung)
+        backend: "com" (Enterprise Architect), "sqlite" (.qea direkt, EA muss
+                 geschlossen sein), "memory" (Kopie im Arbeitsspeicher) oder
+                 "replay" (mit EA_RECORD aufgezeichnete COM-Aufrufe abspielen)
+    
+    Returns:
+        Repository-Objekt des Backends (mit EA_TRACE bzw. enable_tracing
+        umhüllt von tracing.TracedObject, mit EA_RECORD bzw. enable_recording
+        von replay.RecordingObject)
+    """
+    if backend not in BACKENDS:
+        error_msg = f"Unbekanntes Backend '{backend}'. Erlaubt: {', '.join(BACKENDS)}"
+        logger.error(error_msg)
+        raise EAConnectionError(error_msg)
+    if backend == SQLITE:
+        return _instrument(open_qea(path, read_only=False))
+    if backend == MEMORY:
+        return _instrument(open_memory_repository(path))
+    if backend == REPLAY:
+        return trace_repository(open_replay_repository(path))
+    
     try:
         repo_path = Path(path).resolve()
         
@@ -17,20 +68,20 @@ def open_repository(path: str) -> Any:
         if repo_path.suffix not in ['.eap', '.eapx', '.qea', '.feap']:
             raise ValueError(f"Nicht unterstütztes Repository-Format: {repo_path.suffix}")
         
-        ea = win32com.client.Dispatch("EA.Repository")
+        ea = _dispatch_repository()
         
         if not ea.OpenFile(str(repo_path)):
             raise EAConnectionError(f"Konnte Repository nicht öffnen: {repo_path}")
         
         logger.info(f"Repository geöffnet: {repo_path}")
-        return ea
+        return _instrument(ea)
         
     except Exception as e:
         logger.error(f"Fehler beim Öffnen des Repository: {e}")
         raise EAConnectionError(f"Fehler beim Öffnen des Repository: {e}")
 
 
-def create_repository(path: str) -> Any:
+def create_repository(path: str) -> EARepository:
     try:
         repo_path = Path(path).resolve()
         
@@ -40,13 +91,13 @@ def create_repository(path: str) -> Any:
         
         repo_path.parent.mkdir(parents=True, exist_ok=True)
         
-        ea = win32com.client.Dispatch("EA.Repository")
+        ea = _dispatch_repository()
         
         if not ea.CreateModel(str(repo_path)):
             raise EAError(f"Konnte Repository nicht erstellen: {repo_path}")
         
         logger.info(f"Repository erstellt: {repo_path}")
-        return ea
+        return _instrument(ea)
         
     except Exception as e:
         logger.error(f"Fehler beim Erstellen des Repository: {e}")
@@ -58,6 +109,10 @@ def close_repository(repo: Any) -> None:
         if repo:
             repo.CloseFile()
             repo.Exit()
+            invalidate_element_index()
+            invalidate_feature_index()
+            invalidate_repository_index(repo)
+            invalidate_connector_index(repo)
             logger.info("Repository geschlossen")
     except Exception as e:
         logger.error(f"Fehler beim Schließen des Repository: {e}")
@@ -0,0 +1,181 @@
+import xml.parsers.expat as expat
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Union
+from .exceptions import EAError
+from .logging_conf import logger
+
+
+# Größe der Blöcke, in denen das XML an den Parser gegeben wird
+CHUNK_SIZE = 1 << 20
+
+Converters = Optional[Mapping[str, Callable[[str], Any]]]
+
+
+def iter_query_rows(source: Union[str, bytes, Any], types: Converters = None,
+                    chunk_size: int = CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Liest ein SQLQuery-Ergebnis inkrementell und liefert die Zeilen einzeln.
+
+    Es wird kein DOM aufgebaut: der Expat-Parser verarbeitet das XML blockweise,
+    und jede <Row> wird als Dictionary weitergegeben, sobald sie vollständig ist.
+    Der Speicherbedarf hängt damit nur von der Blockgröße ab, nicht von der
+    Anzahl der Zeilen.
+
+    Spaltennamen werden kleingeschrieben, da EA sie je nach DBMS in
+    unterschiedlicher Schreibweise liefert. NULL-Spalten fehlen im XML und
+    fehlen daher auch im Dictionary.
+
+    Args:
+        source: XML als str/bytes oder Datei-Objekt mit read()
+        types: Spaltenname (klein) -> Konverter, z.B. {"object_id": int};
+               leere Werte typisierter Spalten werden zu None
+        chunk_size: Blockgröße für das inkrementelle Parsen
+
+    Yields:
+        Zeilen (Spaltenname -> Wert)
+
+    Raises:
+        EAError: Bei ungültigem XML oder fehlgeschlagener Typumwandlung
+    """
+    converters = dict(types) if types else {}
+    rows: List[Dict[str, Any]] = []
+    lower_names: Dict[str, str] = {}
+    text: List[str] = []
+    row: Optional[Dict[str, Any]] = None
+    column: Optional[str] = None
+
+    def start(name, attributes):
+        nonlocal row, column
+        if row is None:
+            if name == 'Row':
+                row = {}
+        else:
+            column = lower_names.get(name)
+            if column is None:
+                column = lower_names.setdefault(name, name.lower())
+            text.clear()
+
+    def end(name):
+        nonlocal row, column
+        if column is not None:
+            value = ''.join(text)
+            converter = converters.get(column)
+            if converter is not None:
+                value = converter(value) if value else None
+            row[column] = value
+            column = None
+        elif row is not None and name == 'Row':
+            rows.append(row)
+            row = None
+
+    def characters(data):
+        if column is not None:
+            text.append(data)
+
+    parser = expat.ParserCreate()
+    parser.buffer_text = True
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.CharacterDataHandler = characters
+
+    if hasattr(source, 'read'):
+        read = source.read
+        chunks = iter(lambda: read(chunk_size), source.read(0))
+    else:
+        if not source or not source.strip():
+            return
+        chunks = (source[i:i + chunk_size] for i in range(0, len(source), chunk_size))
+
+    try:
+        for chunk in chunks:
+            parser.Parse(chunk, False)
+            if rows:
+                yield from rows
+                rows.clear()
+        parser.Parse(b'' if isinstance(source, bytes) else '', True)
+    except expat.ExpatError as e:
+        raise EAError(f"Ungültiges SQLQuery-Ergebnis: {e}")
+    except (TypeError, ValueError) as e:
+        raise EAError(f"Typumwandlung im SQLQuery-Ergebnis fehlgeschlagen: {e}")
+    yield from rows
+
+
+def parse_query_result(source: Union[str, bytes, Any], types: Converters = None) -> List[Dict[str, Any]]:
+    """
+    Wandelt ein SQLQuery-Ergebnis in eine Liste von Zeilen um.
+
+    Args:
+        source: XML als str/bytes oder Datei-Objekt mit read()
+        types: Spaltenname (klein) -> Konverter
+
+    Returns:
+        Liste von Zeilen (Spaltenname -> Wert)
+    """
+    return list(iter_query_rows(source, types))
+
+
+def query_columns(source: Union[str, bytes, Any], types: Converters = None) -> Dict[str, List[Any]]:
+    """
+    Wandelt ein SQLQuery-Ergebnis in Spalten-Arrays um.
+
+    Alle Listen haben die Länge der Zeilenanzahl; fehlende (NULL-)Werte sind None.
+
+    Args:
+        source: XML als str/bytes oder Datei-Objekt mit read()
+        types: Spaltenname (klein) -> Konverter
+
+    Returns:
+        Spaltenname -> Werte in Zeilenreihenfolge
+    """
+    columns: Dict[str, List[Any]] = {}
+    count = 0
+    for row in iter_query_rows(source, types):
+        for name, value in row.items():
+            values = columns.get(name)
+            if values is None:
+                # Spalte taucht erst jetzt auf: bisherige Zeilen sind NULL
+                values = columns[name] = [None] * count
+            values.append(value)
+        count += 1
+        for values in columns.values():
+            if len(values) < count:
+                values.append(None)
+    return columns
+
+
+def _run_query(repo: Any, sql: str) -> str:
+    try:
+        logger.debug(f"SQLQuery: {sql}")
+        return repo.SQLQuery(sql)
+    except Exception as e:
+        logger.error(f"Fehler bei SQLQuery: {e}")
+        raise EAError(f"Fehler bei SQLQuery: {e}")
+
+
+def sql_query_rows(repo: Any, sql: str, types: Converters = None) -> List[Dict[str, Any]]:
+    """
+    Führt eine SQL-Abfrage über Repository.SQLQuery aus.
+
+    Args:
+        repo: EA Repository Objekt
+        sql: SELECT-Anweisung
+        types: Spaltenname (klein) -> Konverter
+
+    Returns:
+        Liste von Zeilen (Spaltenname in Kleinbuchstaben -> Wert)
+    """
+    return parse_query_result(_run_query(repo, sql), types)
+
+
+def sql_query_columns(repo: Any, sql: str, types: Converters = None) -> Dict[str, List[Any]]:
+    """
+    Führt eine SQL-Abfrage aus und liefert das Ergebnis als Spalten-Arrays.
+
+    Args:
+        repo: EA Repository Objekt
+        sql: SELECT-Anweisung
+        types: Spaltenname (klein) -> Konverter
+
+    Returns:
+        Spaltenname in Kleinbuchstaben -> Werte in Zeilenreihenfolge
+    """
+    return query_columns(_run_query(repo, sql), types)
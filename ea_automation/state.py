@@ -0,0 +1,163 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from .exceptions import EAError
+from .logging_conf import logger
+from .sql import sql_query_rows
+
+
+STATE_VERSION = 1
+
+# Objektart der Spezifikation -> Tabelle mit den GUIDs
+GUID_TABLES = {
+    "package": "t_package",
+    "element": "t_object",
+    "connector": "t_connector",
+    "diagram": "t_diagram",
+}
+
+
+def entry_hash(entry: Any) -> str:
+    """Inhalts-Hash eines Spezifikations-Eintrags (unabhängig von der Schlüsselreihenfolge)."""
+    data = json.dumps(entry, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def connector_key(conn_spec: Dict) -> str:
+    return f"{conn_spec['client']}|{conn_spec['type']}|{conn_spec['supplier']}|{conn_spec.get('name', '')}"
+
+
+def iter_spec_entries(spec: Dict) -> Iterator[Tuple[str, str, Any]]:
+    """
+    Liefert alle Einträge einer Spezifikation als (Art, Schlüssel, Eintrag).
+
+    Attribute und Operationen gehören zum Hash ihres Elements.
+    """
+    for package_name in spec.get('packages', []):
+        yield "package", package_name, package_name
+    for elem_spec in spec.get('elements', []):
+        yield "element", f"{elem_spec['package']}/{elem_spec['name']}", elem_spec
+    for conn_spec in spec.get('connectors', []):
+        yield "connector", connector_key(conn_spec), conn_spec
+    for diag_spec in spec.get('diagrams', []):
+        yield "diagram", f"{diag_spec['package']}/{diag_spec['name']}", diag_spec
+
+
+# Objektart -> Liste in der Spezifikation
+SPEC_LISTS = {"package": "packages", "element": "elements", "connector": "connectors",
+              "diagram": "diagrams"}
+
+
+class BuildState:
+    """
+    Zustandsdatei für inkrementelle Builds.
+
+    Speichert je Spezifikations-Eintrag (Package, Element samt Attributen und
+    Operationen, Connector, Diagramm) den Inhalts-Hash und die GUID des
+    zugehörigen EA-Objekts. Ein erneuter Build überspringt Einträge, deren
+    Hash unverändert ist und deren GUID noch im Repository existiert; alle
+    anderen werden vollständig geprüft.
+    """
+
+    def __init__(self, path: str, repository: str, model: str):
+        self.path = Path(path)
+        self.repository = repository
+        self.model = model
+        self.entries: Dict[str, Dict[str, Dict[str, str]]] = {kind: {} for kind in GUID_TABLES}
+
+    @classmethod
+    def load(cls, path: str, repository: str, model: str) -> 'BuildState':
+        """
+        Lädt die Zustandsdatei; fehlt sie oder gehört zu einem anderen Repository/Model, ist sie leer.
+        """
+        state = cls(path, repository, model)
+        if not state.path.exists():
+            return state
+        try:
+            with open(state.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Zustandsdatei nicht lesbar, vollständiger Build: {e}")
+            return state
+        if data.get('version') != STATE_VERSION or data.get('repository') != repository \
+                or data.get('model') != model:
+            logger.warning(f"Zustandsdatei gehört zu anderem Repository/Model, wird ignoriert: {state.path}")
+            return state
+        for kind in GUID_TABLES:
+            state.entries[kind] = dict(data.get('entries', {}).get(kind, {}))
+        return state
+
+    def save(self) -> None:
+        data = {
+            "version": STATE_VERSION,
+            "repository": self.repository,
+            "model": self.model,
+            "entries": self.entries
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False, sort_keys=True)
+            tmp_path.replace(self.path)
+            logger.debug(f"Zustandsdatei gespeichert: {self.path}")
+        except OSError as e:
+            logger.error(f"Fehler beim Speichern der Zustandsdatei: {e}")
+            raise EAError(f"Fehler beim Speichern der Zustandsdatei: {e}")
+
+    def _existing_guids(self, repo: Any) -> Dict[str, Set[str]]:
+        # Eine Abfrage pro Tabelle statt eines Lookups pro Eintrag
+        return {kind: {row.get('ea_guid') for row in sql_query_rows(repo, f"SELECT ea_guid FROM {table}")}
+                for kind, table in GUID_TABLES.items()}
+
+    def dirty_spec(self, repo: Any, spec: Dict) -> Tuple[Dict, int]:
+        """
+        Reduziert die Spezifikation auf geänderte bzw. nicht verifizierbare Einträge.
+
+        Args:
+            repo: EA Repository Objekt
+            spec: Vollständige Model-Spezifikation
+
+        Returns:
+            (Spezifikation mit den schmutzigen Einträgen, Anzahl übersprungener Einträge)
+        """
+        dirty: Dict[str, Any] = {key: value for key, value in spec.items() if key not in SPEC_LISTS.values()}
+        for name in SPEC_LISTS.values():
+            dirty[name] = []
+        if not any(self.entries.values()):
+            for kind, _, entry in iter_spec_entries(spec):
+                dirty[SPEC_LISTS[kind]].append(entry)
+            return dirty, 0
+
+        guids = self._existing_guids(repo)
+        skipped = 0
+        for kind, key, entry in iter_spec_entries(spec):
+            known = self.entries[kind].get(key)
+            if known is not None and known.get('hash') == entry_hash(entry) \
+                    and known.get('guid') in guids[kind]:
+                skipped += 1
+                continue
+            if known is not None and known.get('hash') == entry_hash(entry):
+                logger.debug(f"GUID von {kind} '{key}' nicht mehr im Repository, prüfe erneut")
+            dirty[SPEC_LISTS[kind]].append(entry)
+        logger.info(f"Zustandsdatei: {skipped} unveränderte Einträge übersprungen")
+        return dirty, skipped
+
+    def record(self, kind: str, key: str, entry: Any, guid: Optional[str]) -> None:
+        """Merkt Hash und GUID eines erfolgreich verarbeiteten Eintrags."""
+        if guid:
+            self.entries[kind][key] = {"hash": entry_hash(entry), "guid": guid}
+        else:
+            self.entries[kind].pop(key, None)
+
+    def prune(self, spec: Dict) -> None:
+        """Entfernt Einträge, die nicht mehr in der Spezifikation stehen."""
+        current: Dict[str, List[str]] = {kind: [] for kind in GUID_TABLES}
+        for kind, key, _ in iter_spec_entries(spec):
+            current[kind].append(key)
+        for kind, keys in current.items():
+            keep = set(keys)
+            for key in list(self.entries[kind]):
+                if key not in keep:
+                    del self.entries[kind][key]
@@ -0,0 +1,222 @@
+import atexit
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from .logging_conf import logger
+from .qea import QeaCollection, QeaConnectorEnd, QeaObject, QeaRepository
+from .replay import RecordingObject, ReplayObject
+
+
+# Umgebungsvariable: "1" = Bericht ins Log, sonst Pfad der Berichtsdatei (.json = JSON)
+TRACE_ENV = "EA_TRACE"
+
+# Rückgabewerte, die nie umhüllt werden
+_PLAIN_TYPES = (str, int, float, bool, type(None), bytes, tuple, list, dict)
+
+# Objekte der SQLite-/In-Memory-/Replay-Backends, die wie COM-Objekte umhüllt werden
+_BACKEND_TYPES = (QeaRepository, QeaObject, QeaCollection, QeaConnectorEnd, RecordingObject, ReplayObject)
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))]
+
+
+class TraceRecorder:
+    """
+    Sammelt die Dauer jedes COM-Aufrufs je (Aufruf, Python-Aufrufstelle).
+
+    Aufrufe heißen wie in fake.CallStats: "Element.Name" (lesen),
+    "Element.Name=" (schreiben), "Collection.AddNew()" (Methode).
+    """
+
+    def __init__(self):
+        self.samples: Dict[Tuple[str, str], List[float]] = {}
+
+    def record(self, call: str, site: str, seconds: float) -> None:
+        samples = self.samples.get((call, site))
+        if samples is None:
+            samples = self.samples[(call, site)] = []
+        samples.append(seconds)
+
+    @property
+    def total_calls(self) -> int:
+        return sum(len(samples) for samples in self.samples.values())
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """Auswertung je Aufrufstelle, absteigend nach Gesamtzeit."""
+        rows = []
+        for (call, site), samples in self.samples.items():
+            ordered = sorted(samples)
+            rows.append({
+                "call": call,
+                "site": site,
+                "count": len(ordered),
+                "total_ms": sum(ordered) * 1000,
+                "p50_us": _percentile(ordered, 0.5) * 1e6,
+                "p99_us": _percentile(ordered, 0.99) * 1e6,
+            })
+        rows.sort(key=lambda row: row["total_ms"], reverse=True)
+        return rows
+
+    def report(self, limit: int = 30) -> str:
+        """Rangliste als Text: Anzahl, Gesamtzeit, p50/p99 je Aufrufstelle."""
+        rows = self.rows()
+        total_ms = sum(row["total_ms"] for row in rows)
+        lines = [f"COM-Trace: {self.total_calls} Aufrufe, {total_ms:.1f} ms",
+                 f"{'Anzahl':>8} {'Gesamt ms':>10} {'p50 µs':>8} {'p99 µs':>8}  Aufruf @ Stelle"]
+        for row in rows[:limit]:
+            lines.append(f"{row['count']:8d} {row['total_ms']:10.1f} {row['p50_us']:8.1f} "
+                         f"{row['p99_us']:8.1f}  {row['call']} @ {row['site']}")
+        if len(rows) > limit:
+            lines.append(f"... {len(rows) - limit} weitere Aufrufstellen")
+        return "\n".join(lines)
+
+    def dump(self, path: Optional[str] = None) -> None:
+        """Schreibt den Bericht nach path (.json als JSON) bzw. ins Log."""
+        if not self.samples:
+            return
+        if path is None:
+            logger.info("\n" + self.report())
+            return
+        try:
+            target = Path(path)
+            if target.suffix == ".json":
+                target.write_text(json.dumps({"calls": self.total_calls, "sites": self.rows()}, indent=2),
+                                  encoding="utf-8")
+            else:
+                target.write_text(self.report(limit=len(self.samples)) + "\n", encoding="utf-8")
+            logger.info(f"COM-Trace geschrieben: {target}")
+        except OSError as e:
+            logger.error(f"Fehler beim Schreiben des COM-Trace: {e}")
+
+    def clear(self) -> None:
+        self.samples.clear()
+
+
+def _call_site(frame: Any) -> str:
+    code = frame.f_code
+    path = Path(code.co_filename)
+    return f"{path.parent.name}/{path.name}:{frame.f_lineno} ({code.co_name})"
+
+
+class TracedObject:
+    """
+    Hülle um ein EA-Objekt (COM oder Backend), die jeden Zugriff mit Dauer und Aufrufstelle aufzeichnet.
+
+    Rückgabewerte, die selbst EA-Objekte sind, werden wieder umhüllt.
+    """
+
+    __slots__ = ("_target", "_recorder", "_name")
+
+    def __init__(self, target: Any, recorder: TraceRecorder):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_recorder", recorder)
+        object.__setattr__(self, "_name", _object_name(target))
+
+    def _wrap(self, value: Any) -> Any:
+        if isinstance(value, _PLAIN_TYPES):
+            return value
+        if isinstance(value, _BACKEND_TYPES) or hasattr(value, "_oleobj_"):
+            return TracedObject(value, self._recorder)
+        return value
+
+    def __getattr__(self, name: str) -> Any:
+        start = time.perf_counter()
+        value = getattr(self._target, name)
+        elapsed = time.perf_counter() - start
+        if callable(value) and not hasattr(value, "_oleobj_"):
+            key = f"{self._name}.{name}()"
+
+            def invoke(*args: Any, **kwargs: Any) -> Any:
+                start = time.perf_counter()
+                try:
+                    return self._wrap(value(*args, **kwargs))
+                finally:
+                    self._recorder.record(key, _call_site(sys._getframe(1)), time.perf_counter() - start)
+            return invoke
+        self._recorder.record(f"{self._name}.{name}", _call_site(sys._getframe(1)), elapsed)
+        return self._wrap(value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        start = time.perf_counter()
+        try:
+            setattr(self._target, name, value)
+        finally:
+            self._recorder.record(f"{self._name}.{name}=", _call_site(sys._getframe(1)),
+                                  time.perf_counter() - start)
+
+    def __repr__(self) -> str:
+        return f"<Traced {self._target!r}>"
+
+
+def _object_name(target: Any) -> str:
+    if isinstance(target, (RecordingObject, ReplayObject)):
+        return "Object"
+    if isinstance(target, _BACKEND_TYPES):
+        return type(target).__name__.replace("Qea", "", 1)
+    # COM: ObjectType ist bei EA-Objekten z.B. otElement; Fallback auf den Klassennamen
+    try:
+        object_type = target.ObjectType
+        return str(_OBJECT_TYPES.get(object_type, object_type))
+    except Exception:
+        return type(target).__name__
+
+
+# EA ObjectType-Konstanten -> Namen wie bei den Backends
+_OBJECT_TYPES = {2: "Repository", 3: "Collection", 4: "Element", 5: "Package", 7: "Connector",
+                 8: "Diagram", 16: "Attribute", 20: "Method", 22: "ConnectorEnd", 23: "DiagramObject"}
+
+
+_recorder: Optional[TraceRecorder] = None
+_report_path: Optional[str] = None
+
+
+def enable_tracing(report_path: Optional[str] = None) -> TraceRecorder:
+    """
+    Aktiviert das Tracing für alle danach geöffneten Repositories.
+
+    Args:
+        report_path: Berichtsdatei beim Programmende (.json = JSON), None = ins Log
+
+    Returns:
+        TraceRecorder, in dem die Aufrufe gesammelt werden
+    """
+    global _recorder, _report_path
+    if _recorder is None:
+        _recorder = TraceRecorder()
+        atexit.register(_dump_at_exit)
+    _report_path = report_path
+    return _recorder
+
+
+def disable_tracing() -> None:
+    """Deaktiviert das Tracing für danach geöffnete Repositories (ohne Bericht)."""
+    global _recorder
+    if _recorder is not None:
+        _recorder.clear()
+    _recorder = None
+
+
+def _dump_at_exit() -> None:
+    if _recorder is not None:
+        _recorder.dump(_report_path)
+
+
+def trace_repository(repo: Any) -> Any:
+    """
+    Umhüllt ein Repository, wenn das Tracing aktiv ist (enable_tracing oder EA_TRACE).
+
+    Ohne Tracing wird repo unverändert zurückgegeben; die Aufrufe selbst
+    haben dann keinerlei Zusatzkosten.
+    """
+    if _recorder is None:
+        setting = os.environ.get(TRACE_ENV, "")
+        if setting in ("", "0"):
+            return repo
+        enable_tracing(None if setting == "1" else setting)
+    if isinstance(repo, TracedObject):
+        return repo
+    return TracedObject(repo, _recorder)
@@ -1,7 +1,188 @@
-def ensure_update_refresh(obj, collection=None):
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Union
+
+
+_batch_state = threading.local()
+
+
+# Schlüssel einer Collection im Batch, z.B. (Package-GUID, "Elements"), oder
+# eine Funktion, die ihn liefert (wird nur innerhalb eines Batches aufgerufen)
+CollectionKey = Union[Hashable, Callable[[], Hashable]]
+
+
+class RefreshBatch:
+    """
+    Sammelt Collections, deren Refresh() bis zum Ende eines Batches
+    aufgeschoben wird. Jede Collection wird dann genau einmal aktualisiert.
+
+    COM liefert bei jedem Zugriff auf z.B. package.Elements ein neues
+    Collection-Objekt; Collections werden deshalb über (Besitzer-GUID,
+    Collection-Name) zusammengefasst, ohne Schlüssel über die Identität
+    des Objekts.
+    """
+
+    def __init__(self):
+        self._collections: Dict[Hashable, Any] = {}
+
+    def add(self, collection: Any, key: Optional[CollectionKey] = None) -> None:
+        if key is None:
+            key = id(collection)
+        elif callable(key):
+            key = key()
+        self._collections.setdefault(key, collection)
+
+    def flush(self) -> int:
+        """
+        Führt Refresh() für alle gesammelten Collections aus.
+
+        Returns:
+            Anzahl aktualisierter Collections
+        """
+        collections = list(self._collections.values())
+        self._collections.clear()
+        for collection in collections:
+            collection.Refresh()
+        return len(collections)
+
+
+@contextmanager
+def batch_refresh() -> Iterator[RefreshBatch]:
+    """
+    Schiebt alle Collection-Refreshes bis zum Verlassen des Blocks auf.
+
+    Refresh() lädt die gesamte Collection neu aus der Datenbank; bei vielen
+    AddNew-Aufrufen auf derselben Collection reicht einer am Ende. Die
+    Bibliotheksfunktionen übergeben dafür einen Schlüssel aus Besitzer-GUID
+    und Collection-Name (siehe refresh_collection); ohne Schlüssel zählt die
+    Identität des Collection-Objekts. Verschachtelte Batches werden vom äußersten Batch geflusht.
+    """
+    batch = getattr(_batch_state, 'batch', None)
+    if batch is not None:
+        yield batch
+        return
+    batch = RefreshBatch()
+    _batch_state.batch = batch
+    try:
+        yield batch
+    finally:
+        _batch_state.batch = None
+        # Auch bei Fehlern: bereits eingefügte Objekte sichtbar machen
+        batch.flush()
+
+
+def refresh_collection(collection: Any, key: Optional[CollectionKey] = None) -> None:
+    """
+    Refresh() sofort oder - innerhalb von batch_refresh() - am Ende des Batches.
+
+    Args:
+        collection: EA Collection
+        key: Schlüssel der Collection im Batch, z.B. (Package-GUID, "Elements"),
+             oder Funktion, die ihn liefert; None = Identität des Objekts
+    """
+    batch = getattr(_batch_state, 'batch', None)
+    if batch is not None:
+        batch.add(collection, key)
+    elif hasattr(collection, 'Refresh'):
+        collection.Refresh()
+
+
+def ensure_update_refresh(obj, collection=None, key: Optional[CollectionKey] = None):
     if hasattr(obj, 'Update'):
         obj.Update()
-    
+
     if collection is not None:
-        if hasattr(collection, 'Refresh'):
-            collection.Refresh()
\ No newline at end of file
+        refresh_collection(collection, key)
+
+
+class EditSession:
+    """
+    Sammelt Feldänderungen an einem EA-Objekt und schreibt sie mit einem
+    einzigen Update() in die Datenbank.
+
+    Die Werte werden sofort auf das COM-Objekt gesetzt (Property-Put ist
+    billig), nur der Update()-Aufruf wird bis zum commit() aufgeschoben.
+    Für frisch mit AddNew erzeugte Objekte (is_new=True) wird Update() in
+    jedem Fall ausgeführt, da sie sonst nicht gespeichert werden.
+    """
+
+    def __init__(self, obj: Any, is_new: bool = False):
+        self.obj = obj
+        self.is_new = is_new
+        self.dirty: Dict[str, Any] = {}
+
+    def set(self, field: str, value: Any) -> None:
+        setattr(self.obj, field, value)
+        self.dirty[field] = value
+
+    def mark_dirty(self, field: str) -> None:
+        """Markiert ein Feld als geändert, das auf anderem Weg gesetzt wurde."""
+        self.dirty[field] = None
+
+    def commit(self) -> bool:
+        """
+        Schreibt alle gesammelten Änderungen mit einem Update().
+
+        Returns:
+            True wenn Update() aufgerufen wurde, False wenn nichts zu tun war
+        """
+        if not self.dirty and not self.is_new:
+            return False
+        ensure_update_refresh(self.obj)
+        self.dirty.clear()
+        self.is_new = False
+        return True
+
+    def __enter__(self) -> 'EditSession':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        # Bei Fehlern kein Update: Änderungen werden nicht persistiert
+        if exc_type is None:
+            self.commit()
+
+
+class DeferredUpdateMixin(ABC):
+    """
+    Stellt editing() für die Wrapper-Klassen bereit.
+
+    Außerhalb einer Session schreibt jeder Setter sofort mit Update(); innerhalb
+    von ``with wrapper.editing():`` wird nur ein Update() beim Verlassen ausgeführt.
+    Wrapper müssen _ea_object() implementieren, sonst schlägt bereits die
+    Instanziierung fehl.
+    """
+
+    _edit_session: Optional[EditSession] = None
+
+    @abstractmethod
+    def _ea_object(self) -> Any:
+        """Das EA-Objekt, auf das Setter schreiben und Update() aufrufen."""
+
+    @contextmanager
+    def editing(self) -> Iterator[Any]:
+        if self._edit_session is not None:
+            # Verschachtelte Session: die äußere schreibt
+            yield self
+            return
+        session = EditSession(self._ea_object())
+        self._edit_session = session
+        try:
+            yield self
+        finally:
+            self._edit_session = None
+        session.commit()
+
+    def _set_field(self, field: str, value: Any) -> None:
+        if self._edit_session is not None:
+            self._edit_session.set(field, value)
+        else:
+            obj = self._ea_object()
+            setattr(obj, field, value)
+            ensure_update_refresh(obj)
+
+    def _mark_changed(self, field: str) -> None:
+        if self._edit_session is not None:
+            self._edit_session.mark_dirty(field)
+        else:
+            ensure_update_refresh(self._ea_object())
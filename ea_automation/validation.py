@@ -0,0 +1,197 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from jsonschema import Draft7Validator, ValidationError
+from jsonschema.exceptions import best_match
+
+
+# JSON-Typen -> Python-Prüfung (wie der Type-Checker von Draft 7)
+_TYPE_CHECKS = {
+    "string": "isinstance({v}, str)",
+    "object": "isinstance({v}, dict)",
+    "array": "isinstance({v}, list)",
+    "boolean": "isinstance({v}, bool)",
+    "null": "{v} is None",
+    "number": "(isinstance({v}, (int, float)) and not isinstance({v}, bool))",
+    "integer": "((isinstance({v}, int) and not isinstance({v}, bool)) "
+               "or (isinstance({v}, float) and {v}.is_integer()))",
+}
+
+# Schlüsselwörter ohne Einfluss auf die Validierung
+_ANNOTATIONS = {"$schema", "title", "description", "default"}
+
+
+class _Unsupported(Exception):
+    """Schema nutzt Schlüsselwörter, die compile_schema nicht übersetzt."""
+
+
+def _unique(items: List[Any]) -> bool:
+    # Konservativ: nicht hashbare Einträge gelten als "nicht sicher eindeutig"
+    try:
+        return len(set(items)) == len(items)
+    except TypeError:
+        return False
+
+
+class _Compiler:
+    """Übersetzt ein JSON-Schema in Python-Quelltext mit einer Funktion je Schema-Knoten."""
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self.constants: Dict[str, Any] = {"_unique": _unique}
+        self.count = 0
+
+    def constant(self, value: Any) -> str:
+        name = f"_c{len(self.constants)}"
+        self.constants[name] = value
+        return name
+
+    def node(self, schema: Dict) -> str:
+        """Erzeugt die Prüffunktion für einen Schema-Knoten und liefert ihren Namen."""
+        unknown = set(schema) - _ANNOTATIONS - {"type", "required", "properties",
+                                                 "additionalProperties", "minLength",
+                                                 "enum", "items", "uniqueItems"}
+        if unknown:
+            raise _Unsupported(", ".join(sorted(unknown)))
+
+        self.count += 1
+        name = f"_check{self.count}"
+        body: List[str] = []
+        schema_type = schema.get("type")
+        if schema_type is not None:
+            if schema_type not in _TYPE_CHECKS:
+                raise _Unsupported(f"type {schema_type!r}")
+            body.append(f"if not {_TYPE_CHECKS[schema_type].format(v='v')}: return False")
+
+        if "minLength" in schema:
+            if schema_type != "string":
+                raise _Unsupported("minLength ohne type string")
+            body.append(f"if len(v) < {int(schema['minLength'])}: return False")
+
+        if "enum" in schema:
+            values = schema["enum"]
+            if not all(isinstance(value, str) for value in values):
+                raise _Unsupported("enum mit Nicht-String-Werten")
+            allowed = self.constant(frozenset(values))
+            body.append(f"if not (isinstance(v, str) and v in {allowed}): return False")
+
+        object_keys = {"required", "properties", "additionalProperties"} & set(schema)
+        if object_keys:
+            if schema_type != "object":
+                raise _Unsupported("Objekt-Schlüsselwörter ohne type object")
+            for key in schema.get("required", []):
+                body.append(f"if {key!r} not in v: return False")
+            properties = schema.get("properties", {})
+            if schema.get("additionalProperties", True) is False:
+                allowed = self.constant(frozenset(properties))
+                body.append(f"if not v.keys() <= {allowed}: return False")
+            elif schema.get("additionalProperties", True) is not True:
+                raise _Unsupported("additionalProperties als Schema")
+            for key, sub_schema in properties.items():
+                check = self.node(sub_schema)
+                body.append(f"if {key!r} in v and not {check}(v[{key!r}]): return False")
+
+        if "items" in schema or "uniqueItems" in schema:
+            if schema_type != "array":
+                raise _Unsupported("Array-Schlüsselwörter ohne type array")
+            if "items" in schema:
+                if not isinstance(schema["items"], dict):
+                    raise _Unsupported("items als Liste")
+                check = self.node(schema["items"])
+                body.append("for item in v:")
+                body.append(f"    if not {check}(item): return False")
+            if schema.get("uniqueItems"):
+                body.append("if not _unique(v): return False")
+
+        self.lines.append(f"def {name}(v):")
+        self.lines.extend(f"    {line}" for line in body)
+        self.lines.append("    return True")
+        self.lines.append("")
+        return name
+
+
+def compile_schema(schema: Dict) -> Optional[Callable[[Any], bool]]:
+    """
+    Übersetzt ein JSON-Schema (Draft 7, Teilmenge) in eine Python-Prüffunktion.
+
+    Unterstützt werden die Schlüsselwörter von MODEL_SPEC_SCHEMA: type,
+    required, properties, additionalProperties: false, minLength, enum
+    (Strings), items und uniqueItems. Die Funktion liefert nur True/False;
+    sie ist konservativ, d.h. True bedeutet sicher valide.
+
+    Args:
+        schema: JSON-Schema
+
+    Returns:
+        Prüffunktion oder None, wenn das Schema nicht übersetzbar ist
+    """
+    compiler = _Compiler()
+    try:
+        entry = compiler.node(schema)
+    except _Unsupported:
+        return None
+    namespace = dict(compiler.constants)
+    exec(compile("\n".join(compiler.lines), "<compiled-schema>", "exec"), namespace)
+    return namespace[entry]
+
+
+class SchemaValidator:
+    """
+    Kompilierter Validator für ein JSON-Schema.
+
+    Gültige Dokumente prüft die generierte Funktion aus compile_schema; nur
+    bei ungültigen (bzw. nicht übersetzbaren Schemas) wird der Draft7Validator
+    von jsonschema verwendet, damit Fehlermeldungen unverändert bleiben.
+    """
+
+    def __init__(self, schema: Dict):
+        self.schema = schema
+        self.validator = Draft7Validator(schema)
+        self.check = compile_schema(schema)
+
+    def is_valid(self, instance: Any) -> bool:
+        if self.check is not None and self.check(instance):
+            return True
+        return self.validator.is_valid(instance)
+
+    def iter_errors(self, instance: Any) -> Iterator[ValidationError]:
+        if self.check is not None and self.check(instance):
+            return iter(())
+        return self.validator.iter_errors(instance)
+
+    def validate(self, instance: Any) -> None:
+        """Wie jsonschema.validate (ohne erneute Schema-Prüfung): wirft den relevantesten Fehler."""
+        error = best_match(self.iter_errors(instance))
+        if error is not None:
+            raise error
+
+
+# Obergrenze für gecachte Validatoren (MODEL_SPEC_SCHEMA samt Teilschemas plus Reserve)
+VALIDATOR_CACHE_SIZE = 16
+
+# id(Schema) -> (Schema, Validator); das Schema wird gehalten, damit die id eindeutig bleibt.
+# LRU: beliebige Schemas von validate_json_against_schema verdrängen sich gegenseitig
+_validators: "OrderedDict[int, Tuple[Dict, SchemaValidator]]" = OrderedDict()
+
+
+def get_validator(schema: Dict) -> SchemaValidator:
+    """
+    Liefert den gecachten SchemaValidator für ein Schema (Schemas gelten als unveränderlich).
+
+    Es werden höchstens VALIDATOR_CACHE_SIZE Validatoren gehalten, die zuletzt
+    benutzten bleiben erhalten.
+
+    Args:
+        schema: JSON-Schema
+
+    Returns:
+        SchemaValidator, der bei jedem Aufruf mit demselben Schema wiederverwendet wird
+    """
+    key = id(schema)
+    cached = _validators.get(key)
+    if cached is None or cached[0] is not schema:
+        cached = (schema, SchemaValidator(schema))
+        _validators[key] = cached
+        if len(_validators) > VALIDATOR_CACHE_SIZE:
+            _validators.popitem(last=False)
+    _validators.move_to_end(key)
+    return cached[1]
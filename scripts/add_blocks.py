@@ -18,6 +18,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 import win32com.client
 from ea_automation.elements import create_element, add_attribute, add_operation
 from ea_automation.exceptions import EAError
+from ea_automation.index import get_repository_index, prefetch_features
 
 # Logging Setup
 logging.basicConfig(
@@ -176,37 +177,21 @@ def main():
         # Finde Ziel-Package
         logger.info(f"\nSuche Package: {args.package}")
         
-        # Versuche verschiedene Methoden das Package zu finden
+        # Ein Index über alle Packages statt Durchsuchen der Models
         target_package = None
-        
-        # Suche in Models
+        index = get_repository_index(repo)
         try:
-            models = repo.Models
-            for i in range(models.Count):
-                model = models.GetAt(i)
-                packages = model.Packages
-                for j in range(packages.Count):
-                    pkg = packages.GetAt(j)
-                    if pkg.Name == args.package:
-                        target_package = pkg
-                        logger.info(f"[OK] Package gefunden: {pkg.Name}")
-                        break
-                if target_package:
-                    break
+            target_package = index.find_package(args.package)
+            if target_package:
+                logger.info(f"[OK] Package gefunden: {target_package.Name}")
         except Exception as e:
-            logger.warning(f"Fehler beim Suchen in Models: {e}")
+            logger.warning(f"Fehler beim Suchen des Packages: {e}")
         
         if not target_package:
             logger.error(f"Package '{args.package}' nicht gefunden")
             logger.info("\nVerfügbare Packages:")
-            models = repo.Models
-            for i in range(models.Count):
-                model = models.GetAt(i)
-                logger.info(f"  Model: {model.Name}")
-                packages = model.Packages
-                for j in range(packages.Count):
-                    pkg = packages.GetAt(j)
-                    logger.info(f"    - {pkg.Name}")
+            for path in sorted(index.packages_by_path):
+                logger.info(f"  - {path}")
             repo.CloseFile()
             sys.exit(1)
         
@@ -216,13 +201,14 @@ def main():
         logger.info("-"*40)
         
         created_blocks = []
+        block_elements = {}
         for block_name in block_names:
             try:
                 logger.info(f"\nVerarbeite: {block_name}")
                 
                 # Erstelle Block-Element (idempotent)
                 notes = f"SysML Block für {block_name}\nAutomatisch erstellt via add_blocks.py"
-                element = create_element(
+                block_elements[block_name] = create_element(
                     target_package,
                     block_name,
                     args.mdg_type,
@@ -230,8 +216,20 @@ def main():
                     notes=notes
                 )
                 
-                created_blocks.append(block_name)
-                
+            except Exception as e:
+                logger.error(f"[FEHLER] Block '{block_name}': {str(e)}")
+                continue
+        
+        # Vorhandene Attribute/Operationen aller Blocks mit je einer SQL-Abfrage laden
+        if block_elements and (args.add_attributes or args.add_operations):
+            try:
+                prefetch_features(repo, list(block_elements.values()))
+            except Exception as e:
+                # Ohne Vorabladen wird jede Collection einmal beim ersten Zugriff gelesen
+                logger.warning(f"Vorabladen von Attributen/Operationen fehlgeschlagen: {e}")
+        
+        for block_name, element in block_elements.items():
+            try:
                 # Füge Attribute hinzu wenn gewünscht
                 if args.add_attributes:
                     add_standard_attributes(element, block_name)
@@ -240,6 +238,7 @@ def main():
                 if args.add_operations:
                     add_standard_operations(element, block_name)
                 
+                created_blocks.append(block_name)
                 logger.info(f"[OK] Block '{block_name}' verarbeitet")
                 
             except Exception as e:
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Benchmark für build_from_json mit synthetischen Spezifikationen.
+
+Erzeugt Spezifikationen nach MODEL_SPEC_SCHEMA (Packages, Elemente pro
+Package, Attribute/Operationen, Connector-Dichte, Diagrammgröße), führt den
+vollständigen ModelBuilder.build() gegen ein simuliertes Repository
+(ea_automation.fake) aus und schreibt Laufzeit, COM-Aufrufe je Phase und
+Spitzenspeicher als JSON. Jedes Szenario läuft in einem eigenen Prozess,
+damit der Spitzenspeicher vergleichbar bleibt.
+
+Verwendung:
+    python scripts/benchmark_build.py --scenario 1k --scenario 10k --output bench.json
+
+    # Eigene Größe
+    python scripts/benchmark_build.py --packages 20 --elements-per-package 250 --connector-density 2
+
+    # Mit simulierter COM-Latenz (200 µs pro Aufruf)
+    python scripts/benchmark_build.py --scenario 1k --latency 0.0002
+"""
+
+import argparse
+import json
+import logging
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Füge Parent-Directory zum Path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ea_automation.fake import open_fake_repository
+from ea_automation.repository import close_repository
+from scripts.build_from_json import ModelBuilder
+
+# Voreingestellte Szenarien (Gesamtzahl Elemente = packages * elements_per_package)
+SCENARIOS = {
+    "1k": {"packages": 10, "elements_per_package": 100},
+    "10k": {"packages": 50, "elements_per_package": 200},
+    "100k": {"packages": 200, "elements_per_package": 500},
+}
+
+DEFAULTS = {
+    "attributes": 2,
+    "operations": 1,
+    "connector_density": 1.0,
+    "diagram_size": 20,
+    "diagrams_per_package": 1,
+}
+
+# Phasen von ModelBuilder, deren COM-Aufrufe getrennt gezählt werden
+PHASES = ("make_plan", "ensure_root_model", "create_packages", "create_elements",
+          "create_connectors", "create_diagrams")
+
+CONNECTOR_TYPES = ("Association", "Composition", "Dependency", "Usage")
+
+
+def generate_spec(packages: int, elements_per_package: int, attributes: int = 2, operations: int = 1,
+                  connector_density: float = 1.0, diagram_size: int = 20,
+                  diagrams_per_package: int = 1) -> Dict:
+    """
+    Erzeugt eine synthetische Model-Spezifikation.
+
+    Args:
+        packages: Anzahl Packages
+        elements_per_package: Elemente je Package
+        attributes: Attribute je Element
+        operations: Operationen je Element
+        connector_density: Connectors je Element (auch < 1)
+        diagram_size: Elemente je Diagramm
+        diagrams_per_package: Diagramme je Package
+
+    Returns:
+        Spezifikation, die MODEL_SPEC_SCHEMA erfüllt (deterministisch)
+    """
+    package_names = [f"Package{p:04d}" for p in range(packages)]
+    elements = []
+    for p, package in enumerate(package_names):
+        for e in range(elements_per_package):
+            elements.append({
+                "package": package,
+                "name": f"Block{p:04d}_{e:05d}",
+                "type": "SysML1.4::Block" if e % 2 == 0 else "Class",
+                "notes": f"Synthetisches Element {e} in {package}",
+                "attributes": [{"name": f"attr{a}", "type": "Real" if a % 2 else "Integer"}
+                               for a in range(attributes)],
+                "operations": [{"name": f"op{o}", "returnType": "void"} for o in range(operations)]
+            })
+
+    total = len(elements)
+    connectors = []
+    seen = set()
+    for i in range(int(total * connector_density)):
+        # Deterministische Paare: Nachbar im Package bzw. Sprung über Packages
+        client = i % total
+        supplier = (client + 1 + (i // total) * elements_per_package) % total
+        conn_type = CONNECTOR_TYPES[i % len(CONNECTOR_TYPES)]
+        if client == supplier or (client, supplier, conn_type) in seen:
+            continue
+        seen.add((client, supplier, conn_type))
+        connectors.append({"type": conn_type, "client": elements[client]["name"],
+                           "supplier": elements[supplier]["name"]})
+
+    diagrams = []
+    for p, package in enumerate(package_names):
+        members = elements[p * elements_per_package:(p + 1) * elements_per_package]
+        for d in range(diagrams_per_package):
+            chunk = members[d * diagram_size:(d + 1) * diagram_size]
+            diagrams.append({"package": package, "name": f"BDD{d}", "type": "Class",
+                             "elements": [element["name"] for element in chunk]})
+
+    return {"model": "Benchmark", "packages": package_names, "elements": elements,
+            "connectors": connectors, "diagrams": diagrams}
+
+
+def _count_phases(builder: ModelBuilder, repo: Any, calls: Dict[str, int], seconds: Dict[str, float]) -> None:
+    """Umhüllt die Phasen-Methoden des Builders und summiert COM-Aufrufe und Zeit je Phase."""
+    for phase in PHASES:
+        method = getattr(builder, phase)
+
+        def counted(*args: Any, _phase: str = phase, _method: Callable = method, **kwargs: Any) -> Any:
+            before = repo.stats.total
+            start = time.perf_counter()
+            try:
+                return _method(*args, **kwargs)
+            finally:
+                seconds[_phase] = seconds.get(_phase, 0.0) + time.perf_counter() - start
+                calls[_phase] = calls.get(_phase, 0) + repo.stats.total - before
+        setattr(builder, phase, counted)
+
+
+def _run_build(repo: Any, spec: Dict) -> Dict:
+    calls: Dict[str, int] = {}
+    seconds: Dict[str, float] = {}
+    repo.stats.reset()
+    builder = ModelBuilder(":memory:", spec, backend="memory")
+    builder.repo = repo
+    _count_phases(builder, repo, calls, seconds)
+
+    start = time.perf_counter()
+    success = builder.build()
+    wall = time.perf_counter() - start
+
+    total = repo.stats.total
+    calls["other"] = total - sum(calls.values())
+    return {
+        "success": success and builder.failures == 0,
+        "wall_seconds": round(wall, 4),
+        "phase_seconds": {phase: round(value, 4) for phase, value in seconds.items()},
+        "com_calls": {"total": total, "phases": calls},
+        "simulated_com_seconds": round(repo.simulated_seconds, 4),
+        "top_call_keys": dict(repo.stats.calls.most_common(10)),  # CallStats-Schlüssel, keine Aufrufstellen
+    }
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KiB, macOS: Bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_scenario(name: str, params: Dict, latency: float = 0.0) -> Dict:
+    """
+    Führt ein Szenario aus: Erst-Build in ein leeres Repository, dann Rebuild ohne Änderungen.
+
+    Args:
+        name: Name des Szenarios
+        params: Parameter für generate_spec
+        latency: Simulierte Latenz pro COM-Aufruf in Sekunden
+
+    Returns:
+        Ergebnis-Dictionary (JSON-serialisierbar)
+    """
+    start = time.perf_counter()
+    spec = generate_spec(**params)
+    generate_seconds = time.perf_counter() - start
+
+    repo = open_fake_repository(latency=latency)
+    try:
+        build = _run_build(repo, spec)
+        rebuild = _run_build(repo, spec)
+    finally:
+        close_repository(repo)
+
+    return {
+        "scenario": name,
+        "params": params,
+        "latency": latency,
+        "size": {key: len(spec[key]) for key in ("packages", "elements", "connectors", "diagrams")},
+        "generate_seconds": round(generate_seconds, 4),
+        "build": build,
+        "rebuild": rebuild,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                cwd=str(Path(__file__).parent.parent), timeout=10)
+        return result.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def parse_arguments(argv: Optional[List[str]] = None):
+    """Parse Kommandozeilen-Argumente."""
+    parser = argparse.ArgumentParser(description='Benchmark für build_from_json')
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help='Voreingestelltes Szenario (mehrfach möglich, default: 1k und 10k)')
+    parser.add_argument('--packages', type=int, help='Eigenes Szenario: Anzahl Packages')
+    parser.add_argument('--elements-per-package', type=int, default=100,
+                        help='Eigenes Szenario: Elemente je Package (default: 100)')
+    parser.add_argument('--attributes', type=int, default=DEFAULTS["attributes"],
+                        help='Attribute je Element')
+    parser.add_argument('--operations', type=int, default=DEFAULTS["operations"],
+                        help='Operationen je Element')
+    parser.add_argument('--connector-density', type=float, default=DEFAULTS["connector_density"],
+                        help='Connectors je Element')
+    parser.add_argument('--diagram-size', type=int, default=DEFAULTS["diagram_size"],
+                        help='Elemente je Diagramm')
+    parser.add_argument('--diagrams-per-package', type=int, default=DEFAULTS["diagrams_per_package"],
+                        help='Diagramme je Package')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Simulierte Latenz pro COM-Aufruf in Sekunden (default: 0)')
+    parser.add_argument('--output', type=str, help='JSON-Ausgabedatei (default: stdout)')
+    parser.add_argument('--in-process', action='store_true',
+                        help='Szenarien im selben Prozess ausführen (peak_rss_mb dann kumulativ)')
+    parser.add_argument('--child', type=str, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Hauptfunktion."""
+    args = parse_arguments(argv)
+    logging.disable(logging.INFO)
+
+    # Kindprozess: ein Szenario ausführen und das Ergebnis als JSON ausgeben
+    if args.child:
+        job = json.loads(args.child)
+        print(json.dumps(run_scenario(job["name"], job["params"], job["latency"])))
+        return
+
+    shape = {key: getattr(args, key) for key in DEFAULTS}
+    jobs = []
+    for name in args.scenario or ([] if args.packages else ["1k", "10k"]):
+        jobs.append({"name": name, "params": dict(shape, **SCENARIOS[name]), "latency": args.latency})
+    if args.packages:
+        params = dict(shape, packages=args.packages, elements_per_package=args.elements_per_package)
+        jobs.append({"name": "custom", "params": params, "latency": args.latency})
+
+    results = []
+    for job in jobs:
+        print(f"Szenario {job['name']} ...", file=sys.stderr)
+        if args.in_process:
+            results.append(run_scenario(job["name"], job["params"], job["latency"]))
+            continue
+        process = subprocess.run([sys.executable, __file__, "--child", json.dumps(job)],
+                                 capture_output=True, text=True)
+        if process.returncode != 0:
+            print(process.stderr, file=sys.stderr)
+            sys.exit(1)
+        results.append(json.loads(process.stdout.strip().splitlines()[-1]))
+
+    report = {
+        "benchmark": "build_from_json",
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+        print(f"Ergebnis geschrieben: {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark der Schema-Validierung von Model-Spezifikationen.
+
+Vergleicht jsonschema.validate (neuer Validator pro Aufruf) mit dem
+kompilierten, gecachten Validator aus ea_automation.validation - für eine
+große Spezifikation und für viele kleine (Batch-Validierung).
+
+Verwendung:
+    python scripts/benchmark_validation.py --elements 100000 --specs 1000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Füge Parent-Directory zum Path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from jsonschema import validate
+from ea_automation.json_io import MODEL_SPEC_SCHEMA
+from ea_automation.validation import get_validator
+
+
+def generate_spec(elements: int) -> dict:
+    """Erzeugt eine Spezifikation mit Elementen, Attributen, Operationen und Connectors."""
+    return {
+        "model": "Benchmark",
+        "packages": [f"Package{i}" for i in range(max(1, elements // 1000))],
+        "elements": [
+            {
+                "package": f"Package{i // 1000}",
+                "name": f"Block{i}",
+                "type": "SysML1.4::Block",
+                "notes": "Generiertes Element",
+                "attributes": [{"name": "id", "type": "Integer"}, {"name": "value", "type": "Real"}],
+                "operations": [{"name": "update", "returnType": "void"}]
+            }
+            for i in range(elements)
+        ],
+        "connectors": [
+            {"type": "Composition", "client": f"Block{i}", "supplier": f"Block{i + 1}"}
+            for i in range(elements - 1)
+        ]
+    }
+
+
+def measure(label: str, func, repeat: int = 3) -> float:
+    """Führt func mehrfach aus und gibt die beste Zeit aus."""
+    best = min(_timed(func) for _ in range(repeat))
+    print(f"  {label:<40} {best:8.3f} s")
+    return best
+
+
+def _timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def parse_arguments():
+    """Parse Kommandozeilen-Argumente."""
+    parser = argparse.ArgumentParser(description='Benchmark der Schema-Validierung')
+    parser.add_argument('--elements', type=int, default=100000,
+                        help='Elemente der großen Spezifikation (default: 100000)')
+    parser.add_argument('--specs', type=int, default=1000,
+                        help='Anzahl kleiner Spezifikationen für die Batch-Validierung (default: 1000)')
+    parser.add_argument('--repeat', type=int, default=3, help='Wiederholungen (default: 3)')
+    return parser.parse_args()
+
+
+def main():
+    """Hauptfunktion."""
+    args = parse_arguments()
+
+    large = generate_spec(args.elements)
+    small = [generate_spec(20) for _ in range(args.specs)]
+    validator = get_validator(MODEL_SPEC_SCHEMA)
+
+    print(f"Große Spezifikation: {args.elements} Elemente, {args.elements - 1} Connectors")
+    baseline = measure("jsonschema.validate", lambda: validate(large, MODEL_SPEC_SCHEMA), args.repeat)
+    compiled = measure("kompilierter Validator", lambda: validator.validate(large), args.repeat)
+    print(f"  Faktor: {baseline / compiled:.1f}x")
+
+    print(f"\nBatch: {args.specs} Spezifikationen mit je 20 Elementen")
+    baseline = measure("jsonschema.validate",
+                       lambda: [validate(spec, MODEL_SPEC_SCHEMA) for spec in small], args.repeat)
+    compiled = measure("kompilierter Validator",
+                       lambda: [get_validator(MODEL_SPEC_SCHEMA).validate(spec) for spec in small],
+                       args.repeat)
+    print(f"  Faktor: {baseline / compiled:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,25 @@ Orchestrator zum Erstellen von EA-Modellen aus JSON-Spezifikationen.
 
 Verwendung:
     python scripts/build_from_json.py --repo "C:\\path\\to\\project.qea" --json "examples/coffee_machine.json"
+
+    # Ohne EA direkt in die (geschlossene) .qea-Datei schreiben
+    python scripts/build_from_json.py --repo project.qea --json model.json --offline
+
+    # Nur den Plan (Änderungen gegenüber dem Repository) ausgeben
+    python scripts/build_from_json.py --repo project.qea --json model.json --plan
+
+    # Inkrementell: unveränderte Einträge laut Zustandsdatei überspringen
+    python scripts/build_from_json.py --repo project.qea --json model.json --state model.state.json
+
+    # Sehr große Spezifikationen inkrementell lesen und sofort anwenden
+    python scripts/build_from_json.py --repo project.qea --json model.json --stream
+
+    # Nach Absturz bzw. "Internal Application Error" mit dem Journal fortsetzen
+    python scripts/build_from_json.py --repo project.qea --json model.json --journal model.journal --resume
+
+    # COM-Aufrufe unter Windows aufzeichnen und unter Linux mit den Originalzeiten abspielen
+    python scripts/build_from_json.py --repo project.qea --json model.json --record build.rec.gz
+    python scripts/build_from_json.py --repo build.rec.gz --json model.json --backend replay
 """
 
 import argparse
@@ -11,15 +30,24 @@ import sys
 import os
 from pathlib import Path
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Tuple
 
 # Füge Parent-Directory zum Path hinzu
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-import win32com.client
-from ea_automation.json_io import load_model_spec
+from ea_automation.json_io import iter_model_spec, load_model_spec
 from ea_automation.elements import create_element, add_attribute, add_operation
+from ea_automation.diagrams import place_many_on_diagram
 from ea_automation.exceptions import EAError
+from ea_automation.index import get_connector_index, get_repository_index
+from ea_automation.journal import BuildJournal
+from ea_automation.plan import ChangeSet, plan_model_spec
+from ea_automation.repository import close_repository, open_repository
+from ea_automation.qea_writer import GRID_CELL_H, GRID_CELL_W, GRID_COLS, GRID_MARGIN, write_model_spec
+from ea_automation.state import BuildState, connector_key, iter_spec_entries
+from ea_automation.backend import BACKENDS
+from ea_automation.replay import enable_recording
+from ea_automation.tracing import enable_tracing
 
 # Logging Setup
 logging.basicConfig(
@@ -28,35 +56,75 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Einträge pro Phasen-Aufruf im Streaming-Modus
+STREAM_BATCH_SIZE = 500
+
+# Abschnitte, die Elemente referenzieren
+ELEMENT_REFERENCES = ("connectors", "diagrams")
+
+
+def _defer_element_references(events: Iterable[Tuple[str, Any]]) -> Iterator[Tuple[str, Any]]:
+    """
+    Hält Connectors und Diagramme, die vor dem Abschnitt "elements" stehen,
+    zurück, bis alle Elemente gelesen sind (bzw. bis zum Ende ohne Elemente).
+    """
+    deferred: List[Tuple[str, Any]] = []
+    elements_done = False
+    section = None
+    for event, value in events:
+        if section == "elements" and event != "elements":
+            elements_done = True
+            yield from deferred
+            deferred = []
+        section = event
+        if event in ELEMENT_REFERENCES and not elements_done:
+            deferred.append((event, value))
+            continue
+        yield event, value
+    yield from deferred
+
 
 class ModelBuilder:
     """Orchestrator für den Aufbau von EA-Modellen aus JSON-Spezifikationen."""
     
-    def __init__(self, repo_path: str, spec: Dict):
+    def __init__(self, repo_path: str, spec: Dict, backend: str = "com",
+                 state_file: Optional[str] = None, journal_file: Optional[str] = None,
+                 resume: bool = False):
         """
         Initialisiert den ModelBuilder.
         
         Args:
             repo_path: Pfad zur EA Repository-Datei
             spec: Model-Spezifikation (aus JSON geladen)
+            backend: Repository-Backend für open_repository ("com", "sqlite", "memory", "replay")
+            state_file: Optionale Zustandsdatei für inkrementelle Builds
+            journal_file: Optionales Journal der angewendeten Operationen
+            resume: Build anhand des Journals fortsetzen
         """
         self.repo_path = repo_path
         self.spec = spec
+        self.backend = backend
+        self.state_file = state_file
+        self.journal_file = journal_file
+        self.resume = resume
+        self.journal = None  # BuildJournal, wird in build() geöffnet
+        self.failures = 0  # Fehlgeschlagene Operationen (bleiben für --resume offen)
+        self.failed_entries = set()  # (Art, Schlüssel) fehlgeschlagener Einträge, siehe _save_state
         self.repo = None
+        self.plan = None  # ChangeSet, wird in build() bzw. make_plan() erstellt
+        self.index = None  # RepositoryIndex, wird in build() geladen
+        self.model = None  # Root-Model der Spezifikation, siehe ensure_root_model
         self.created_packages = {}  # Package-Name -> EA Package Objekt
         self.created_elements = {}  # Element-Name -> EA Element Objekt
         self.created_connectors = []
+        self.journal_guids = {}  # (Art, Name) -> GUID aus dem Journal
+        self.element_packages = {}  # Element-Name -> Package-Name aus der vollständigen Spezifikation
         
     def connect(self) -> bool:
         """Verbindet mit dem EA Repository."""
         try:
-            logger.info(f"Verbinde mit Repository: {self.repo_path}")
-            self.repo = win32com.client.Dispatch("EA.Repository")
-            
-            if not self.repo.OpenFile(str(self.repo_path)):
-                logger.error("Konnte Repository nicht öffnen")
-                return False
-            
+            logger.info(f"Verbinde mit Repository: {self.repo_path} (Backend: {self.backend})")
+            self.repo = open_repository(str(self.repo_path), self.backend)
             logger.info("[OK] Repository geöffnet")
             return True
             
@@ -68,7 +136,7 @@ class ModelBuilder:
         """Trennt die Verbindung zum Repository."""
         if self.repo:
             try:
-                self.repo.CloseFile()
+                close_repository(self.repo)
                 logger.info("[OK] Repository geschlossen")
             except:
                 pass
@@ -85,20 +153,19 @@ class ModelBuilder:
         logger.info("-" * 40)
         
         try:
-            models = self.repo.Models
-            
             # Suche existierendes Model
-            for i in range(models.Count):
-                model = models.GetAt(i)
-                if model.Name == model_name:
-                    logger.info(f"[OK] Model existiert bereits: {model_name}")
-                    return model
+            model = self.index.find_child_package(0, model_name)
+            if model is not None:
+                logger.info(f"[OK] Model existiert bereits: {model_name}")
+                return model
             
             # Erstelle neues Model
             logger.info(f"Erstelle neues Model: {model_name}")
+            models = self.repo.Models
             new_model = models.AddNew(model_name, "Package")
             new_model.Update()
             models.Refresh()
+            self.index.add_package(new_model, 0, model_name)
             logger.info(f"[OK] Model erstellt: {model_name}")
             return new_model
             
@@ -106,14 +173,16 @@ class ModelBuilder:
             logger.error(f"Fehler beim Erstellen des Root-Models: {e}")
             raise EAError(f"Fehler beim Erstellen des Root-Models: {e}")
     
-    def create_packages(self, model: Any):
+    def create_packages(self, model: Any, packages: Optional[List[str]] = None):
         """
         Erstellt alle Packages aus der Spezifikation.
         
         Args:
             model: EA Model Objekt
+            packages: Package-Namen (Standard: aus self.spec)
         """
-        packages = self.spec.get('packages', [])
+        if packages is None:
+            packages = self.spec.get('packages', [])
         if not packages:
             logger.info("\n2. PACKAGES: Keine Packages definiert")
             return
@@ -122,35 +191,38 @@ class ModelBuilder:
         logger.info("-" * 40)
         
         model_packages = model.Packages
+        model_id = model.PackageID
         
         for package_name in packages:
             try:
                 # Prüfe ob Package existiert
-                exists = False
-                for i in range(model_packages.Count):
-                    pkg = model_packages.GetAt(i)
-                    if pkg.Name == package_name:
-                        logger.info(f"[EXISTS] Package: {package_name}")
-                        self.created_packages[package_name] = pkg
-                        exists = True
-                        break
-                
-                if not exists:
+                pkg = self.index.find_child_package(model_id, package_name)
+                if pkg is not None:
+                    logger.info(f"[EXISTS] Package: {package_name}")
+                    self.created_packages[package_name] = pkg
+                else:
                     # Erstelle neues Package
                     logger.info(f"[CREATE] Package: {package_name}")
                     new_pkg = model_packages.AddNew(package_name, "Package")
                     new_pkg.Update()
+                    self.index.add_package(new_pkg, model_id, package_name)
                     self.created_packages[package_name] = new_pkg
+                
+                if self.journal:
+                    self.journal.record("package", package_name,
+                                        self.created_packages[package_name].PackageGUID)
                     
             except Exception as e:
+                self._fail("package", package_name)
                 logger.error(f"[ERROR] Package '{package_name}': {e}")
         
         model_packages.Refresh()
         logger.info(f"[OK] {len(self.created_packages)} Packages verarbeitet")
     
-    def create_elements(self):
-        """Erstellt alle Elemente aus der Spezifikation."""
-        elements = self.spec.get('elements', [])
+    def create_elements(self, elements: Optional[List[Dict]] = None):
+        """Erstellt alle Elemente aus der Spezifikation (bzw. die übergebenen)."""
+        if elements is None:
+            elements = self.spec.get('elements', [])
         if not elements:
             logger.info("\n3. ELEMENTS: Keine Elemente definiert")
             return
@@ -169,6 +241,7 @@ class ModelBuilder:
                 # Finde Target-Package
                 target_package = self._find_or_create_package(package_name)
                 if not target_package:
+                    self._fail("element", f"{package_name}/{elem_name}")
                     logger.error(f"  Package '{package_name}' nicht gefunden")
                     continue
                 
@@ -193,16 +266,21 @@ class ModelBuilder:
                     add_operation(element, op['name'], op.get('returnType', 'void'))
                     logger.info(f"  [OP] {op['name']}")
                 
+                if self.journal:
+                    self.journal.record("element", f"{package_name}/{elem_name}", element.ElementGUID)
+                
                 logger.info(f"  [OK] Element erstellt/aktualisiert")
                 
             except Exception as e:
+                self._fail("element", f"{elem_spec.get('package')}/{elem_spec.get('name')}")
                 logger.error(f"  [ERROR] Element '{elem_spec.get('name', '?')}': {e}")
         
         logger.info(f"\n[OK] {len(self.created_elements)} Elemente verarbeitet")
     
-    def create_connectors(self):
-        """Erstellt alle Connectors aus der Spezifikation."""
-        connectors = self.spec.get('connectors', [])
+    def create_connectors(self, connectors: Optional[List[Dict]] = None):
+        """Erstellt alle Connectors aus der Spezifikation (bzw. die übergebenen)."""
+        if connectors is None:
+            connectors = self.spec.get('connectors', [])
         if not connectors:
             logger.info("\n4. CONNECTORS: Keine Connectors definiert")
             return
@@ -210,6 +288,9 @@ class ModelBuilder:
         logger.info(f"\n4. CONNECTORS: {len(connectors)} zu erstellen")
         logger.info("-" * 40)
         
+        # Vorhandene Connectors mit einer SQL-Abfrage statt Scan pro Client-Element
+        connector_index = get_connector_index(self.repo)
+        
         for conn_spec in connectors:
             try:
                 conn_type = conn_spec['type']
@@ -223,32 +304,30 @@ class ModelBuilder:
                 supplier_elem = self._find_element(supplier_name)
                 
                 if not client_elem:
+                    self._fail("connector", connector_key(conn_spec))
                     logger.error(f"  Client-Element '{client_name}' nicht gefunden")
                     continue
                     
                 if not supplier_elem:
+                    self._fail("connector", connector_key(conn_spec))
                     logger.error(f"  Supplier-Element '{supplier_name}' nicht gefunden")
                     continue
                 
                 # Prüfe ob Connector bereits existiert
-                connectors_collection = client_elem.Connectors
-                exists = False
+                client_id = client_elem.ElementID
+                supplier_id = supplier_elem.ElementID
                 
-                for i in range(connectors_collection.Count):
-                    conn = connectors_collection.GetAt(i)
-                    if (conn.Type == conn_type and 
-                        conn.SupplierID == supplier_elem.ElementID):
-                        logger.info(f"  [EXISTS] Connector existiert bereits")
-                        exists = True
-                        break
-                
-                if not exists:
+                if connector_index.exists(client_id, supplier_id, conn_type):
+                    logger.info(f"  [EXISTS] Connector existiert bereits")
+                    new_conn = None
+                else:
                     # Erstelle neuen Connector
+                    connectors_collection = client_elem.Connectors
                     new_conn = connectors_collection.AddNew(
                         conn_spec.get('name', ''),
                         conn_type
                     )
-                    new_conn.SupplierID = supplier_elem.ElementID
+                    new_conn.SupplierID = supplier_id
                     
                     if conn_spec.get('stereotype'):
                         new_conn.Stereotype = conn_spec['stereotype']
@@ -257,18 +336,26 @@ class ModelBuilder:
                     
                     new_conn.Update()
                     connectors_collection.Refresh()
+                    connector_index.add(new_conn, client_id, supplier_id, conn_type,
+                                        conn_spec.get('name', ''))
                     
                     self.created_connectors.append(new_conn)
                     logger.info(f"  [OK] Connector erstellt")
                 
+                if self.journal:
+                    self.journal.record("connector", connector_key(conn_spec),
+                                        new_conn.ConnectorGUID if new_conn is not None else None)
+                
             except Exception as e:
+                self._fail("connector", connector_key(conn_spec))
                 logger.error(f"  [ERROR] Connector: {e}")
         
         logger.info(f"\n[OK] {len(self.created_connectors)} Connectors verarbeitet")
     
-    def create_diagrams(self):
-        """Erstellt optionale Diagramme aus der Spezifikation."""
-        diagrams = self.spec.get('diagrams', [])
+    def create_diagrams(self, diagrams: Optional[List[Dict]] = None):
+        """Erstellt optionale Diagramme aus der Spezifikation (bzw. die übergebenen)."""
+        if diagrams is None:
+            diagrams = self.spec.get('diagrams', [])
         if not diagrams:
             logger.info("\n5. DIAGRAMS: Keine Diagramme definiert")
             return
@@ -287,34 +374,83 @@ class ModelBuilder:
                 # Finde Target-Package
                 target_package = self._find_or_create_package(package_name)
                 if not target_package:
+                    self._fail("diagram", f"{package_name}/{diag_name}")
                     logger.error(f"  Package '{package_name}' nicht gefunden")
                     continue
                 
-                # Erstelle Diagramm
                 diagrams_collection = target_package.Diagrams
-                diagram = diagrams_collection.AddNew(diag_name, diag_type)
-                diagram.Update()
-                
-                # Füge Elemente zum Diagramm hinzu
-                for elem_name in diag_spec.get('elements', []):
-                    element = self._find_element(elem_name)
-                    if element:
-                        diag_obj = diagram.DiagramObjects.AddNew("", "")
-                        diag_obj.ElementID = element.ElementID
-                        diag_obj.Update()
-                        logger.info(f"  [ADD] Element: {elem_name}")
-                    else:
-                        logger.warning(f"  [SKIP] Element nicht gefunden: {elem_name}")
-                
-                diagrams_collection.Refresh()
-                logger.info(f"  [OK] Diagramm erstellt")
+                diagram = self._find_diagram(diagrams_collection, diag_name)
+                if diagram is not None:
+                    # Vorhandenes Diagramm: nur fehlende Elemente ergänzen
+                    logger.info(f"  [EXISTS] Diagramm")
+                    self._add_missing_to_diagram(diagram, diag_spec.get('elements', []))
+                else:
+                    # Erstelle Diagramm
+                    diagram = diagrams_collection.AddNew(diag_name, diag_type)
+                    diagram.Update()
+                    
+                    # Füge Elemente zum Diagramm hinzu
+                    for elem_name in diag_spec.get('elements', []):
+                        element = self._find_element(elem_name)
+                        if element:
+                            diag_obj = diagram.DiagramObjects.AddNew("", "")
+                            diag_obj.ElementID = element.ElementID
+                            diag_obj.Update()
+                            logger.info(f"  [ADD] Element: {elem_name}")
+                        else:
+                            logger.warning(f"  [SKIP] Element nicht gefunden: {elem_name}")
+                    
+                    diagrams_collection.Refresh()
+                if self.journal:
+                    self.journal.record("diagram", f"{package_name}/{diag_name}", diagram.DiagramGUID)
+                logger.info(f"  [OK] Diagramm erstellt/aktualisiert")
                 
             except Exception as e:
+                self._fail("diagram", f"{diag_spec.get('package')}/{diag_spec.get('name')}")
                 logger.error(f"  [ERROR] Diagramm '{diag_spec.get('name', '?')}': {e}")
     
-    def _find_or_create_package(self, package_name: str) -> Optional[Any]:
+    def _find_diagram(self, diagrams_collection: Any, diag_name: str) -> Optional[Any]:
+        """Sucht ein vorhandenes Diagramm nach Name in der Diagrams-Collection eines Packages."""
+        for i in range(diagrams_collection.Count):
+            diagram = diagrams_collection.GetAt(i)
+            if diagram.Name == diag_name:
+                return diagram
+        return None
+    
+    def _add_missing_to_diagram(self, diagram: Any, element_names: List[str]):
         """
-        Findet ein Package oder erstellt es wenn nötig.
+        Platziert die Elemente, die noch nicht auf dem Diagramm sind, im Raster
+        von auto_place_grid hinter den vorhandenen (ein place_many_on_diagram).
+        """
+        diagram_objects = diagram.DiagramObjects
+        present = {diagram_objects.GetAt(i).ElementID for i in range(diagram_objects.Count)}
+        placements = []
+        for elem_name in element_names:
+            element = self._find_element(elem_name)
+            if element is None:
+                logger.warning(f"  [SKIP] Element nicht gefunden: {elem_name}")
+                continue
+            if element.ElementID in present:
+                continue
+            present.add(element.ElementID)
+            row, col = divmod(len(present) - 1, GRID_COLS)
+            left = GRID_MARGIN + col * GRID_CELL_W
+            top = -GRID_MARGIN - row * GRID_CELL_H
+            placements.append((element, left, top, left + GRID_CELL_W - GRID_MARGIN,
+                               top - (GRID_CELL_H - GRID_MARGIN)))
+            logger.info(f"  [ADD] Element: {elem_name}")
+        if placements:
+            place_many_on_diagram(diagram, placements)
+    
+    def _fail(self, kind: str, key: str):
+        """Zählt einen fehlgeschlagenen Eintrag; er wird nicht in der Zustandsdatei gespeichert."""
+        self.failures += 1
+        self.failed_entries.add((kind, key))
+    
+    def _find_package(self, package_name: str) -> Optional[Any]:
+        """
+        Sucht ein vorhandenes Package wie plan_model_spec: zuerst direkt unter
+        dem Model, dann in beliebiger Tiefe (flachstes Package gewinnt).
         
         Args:
             package_name: Name des Packages
@@ -326,25 +462,44 @@ class ModelBuilder:
         if package_name in self.created_packages:
             return self.created_packages[package_name]
         
-        # Suche in allen Models
+        pkg = None
+        guid = self.journal_guids.get(("package", package_name))
+        if guid:
+            pkg = self.index.package_by_guid(guid)
+        if pkg is None and self.model is not None:
+            pkg = self.index.find_child_package(self.model.PackageID, package_name)
+        if pkg is None:
+            pkg = self.index.find_package(package_name)
+        if pkg is not None:
+            self.created_packages[package_name] = pkg
+        return pkg
+    
+    def _find_or_create_package(self, package_name: str) -> Optional[Any]:
+        """
+        Findet ein Package oder erstellt es wenn nötig.
+        
+        Args:
+            package_name: Name des Packages
+        
+        Returns:
+            EA Package Objekt oder None
+        """
         try:
-            models = self.repo.Models
-            for i in range(models.Count):
-                model = models.GetAt(i)
-                packages = model.Packages
-                for j in range(packages.Count):
-                    pkg = packages.GetAt(j)
-                    if pkg.Name == package_name:
-                        self.created_packages[package_name] = pkg
-                        return pkg
+            pkg = self._find_package(package_name)
+            if pkg is not None:
+                return pkg
             
-            # Package nicht gefunden - erstelle es im ersten Model
-            if models.Count > 0:
+            # Package nicht gefunden - erstelle es im Model (ohne Model im ersten)
+            models = self.repo.Models
+            model = self.model
+            if model is None and models.Count > 0:
                 model = models.GetAt(0)
+            if model is not None:
                 logger.info(f"  [AUTO-CREATE] Package: {package_name}")
                 new_pkg = model.Packages.AddNew(package_name, "Package")
                 new_pkg.Update()
                 model.Packages.Refresh()
+                self.index.add_package(new_pkg, model.PackageID, package_name)
                 self.created_packages[package_name] = new_pkg
                 return new_pkg
                 
@@ -367,50 +522,256 @@ class ModelBuilder:
         if element_name in self.created_elements:
             return self.created_elements[element_name]
         
-        # Suche in allen Packages
-        for pkg in self.created_packages.values():
-            try:
-                elements = pkg.Elements
-                for i in range(elements.Count):
-                    elem = elements.GetAt(i)
-                    if elem.Name == element_name:
-                        self.created_elements[element_name] = elem
-                        return elem
-            except:
-                continue
+        # Suche im Repository-Index, bei --resume zuerst per Journal-GUID. Elemente
+        # der Spezifikation nur in ihrem Package (wie plan_model_spec), sonst in allen
+        try:
+            elem = None
+            guid = self.journal_guids.get(("element", element_name))
+            if guid:
+                elem = self.index.element_by_guid(guid)
+            if elem is None:
+                package_name = self.element_packages.get(element_name)
+                if package_name is None:
+                    elem = self.index.find_element(element_name)
+                else:
+                    package = self._find_package(package_name)
+                    if package is not None:
+                        elem = self.index.find_element(element_name, package=package)
+        except Exception as e:
+            logger.debug(f"Fehler bei der Suche nach Element '{element_name}': {e}")
+            elem = None
         
-        # Globale Suche als Fallback
-        logger.debug(f"Element '{element_name}' nicht in bekannten Packages - globale Suche...")
-        return None
+        if elem is not None:
+            self.created_elements[element_name] = elem
+        else:
+            logger.debug(f"Element '{element_name}' nicht im Repository gefunden")
+        return elem
+    
+    def make_plan(self) -> ChangeSet:
+        """
+        Vergleicht die Spezifikation mit dem Repository (wenige SQL-Abfragen).
+        
+        Returns:
+            ChangeSet mit Creates, Updates und No-ops
+        """
+        self.plan = plan_model_spec(self.repo, self.spec)
+        return self.plan
+    
+    def _apply_plan(self) -> bool:
+        """Erstellt den Plan und reduziert die Spezifikation auf das Delta."""
+        plan = self.make_plan()
+        if not plan.has_changes:
+            logger.info("[OK] Repository entspricht der Spezifikation - keine Änderungen")
+            return False
+        self.spec = plan.delta
+        return True
+    
+    def _run_phases(self):
+        """Führt alle Phasen für self.spec aus."""
+        # Index über alle Packages und Elemente (eine SQL-Abfrage je Tabelle)
+        self.index = get_repository_index(self.repo)
+        
+        # Journal-Flush nach jeder Phase, innerhalb der Phasen in Batches
+        flush = self.journal.flush if self.journal else (lambda: None)
+        
+        # 1. Root Model
+        self.model = self.ensure_root_model()
+        
+        # 2. Packages
+        self.create_packages(self.model)
+        flush()
+        
+        # 3. Elements
+        self.create_elements()
+        flush()
+        
+        # 4. Connectors
+        self.create_connectors()
+        flush()
+        
+        # 5. Diagrams (optional)
+        self.create_diagrams()
+        flush()
+    
+    def build_stream(self, events: Iterable[Tuple[str, Any]], batch_size: int = STREAM_BATCH_SIZE) -> bool:
+        """
+        Führt den Build für eine gestreamte Spezifikation aus (siehe iter_model_spec).
+        
+        Einträge werden in Batches an die Phasen übergeben, sobald sie gelesen
+        und validiert sind; die Spezifikation liegt nie komplett im Speicher.
+        Connectors und Diagramme vor dem Abschnitt "elements" werden bis nach
+        den Elementen zurückgehalten. Plan, Zustandsdatei und Journal benötigen
+        die ganze Spezifikation und werden hier nicht verwendet.
+        
+        Args:
+            events: (Abschnitt, Wert)-Paare aus iter_model_spec
+            batch_size: Einträge pro Phasen-Aufruf
+        
+        Returns:
+            True bei Erfolg, False bei Fehler (auch bei fehlgeschlagenen Einträgen)
+        """
+        try:
+            self.index = get_repository_index(self.repo)
+            phases = {
+                "packages": lambda batch: self.create_packages(self.model, batch),
+                "elements": self.create_elements,
+                "connectors": self.create_connectors,
+                "diagrams": self.create_diagrams,
+            }
+            section = None
+            batch: List[Any] = []
+            for event, value in _defer_element_references(events):
+                if event == "model":
+                    self.spec = {"model": value}
+                    self.model = self.ensure_root_model()
+                    continue
+                if (event != section or len(batch) >= batch_size) and batch:
+                    phases[section](batch)
+                    batch = []
+                section = event
+                batch.append(value)
+            if batch:
+                phases[section](batch)
+            if self.failures:
+                logger.error(f"{self.failures} Operationen fehlgeschlagen")
+                return False
+            return True
+            
+        except Exception as e:
+            logger.error(f"Build-Fehler: {e}")
+            return False
+    
+    def _entry_guid(self, kind: str, entry: Any, diagram_guids: Dict) -> Optional[str]:
+        """Ermittelt die GUID des EA-Objekts zu einem Spezifikations-Eintrag."""
+        try:
+            if kind == "package":
+                package = self._find_package(entry)
+                return package.PackageGUID if package is not None else None
+            if kind == "element":
+                package = self._find_package(entry['package'])
+                if package is None:
+                    return None
+                element = self.index.find_element(entry['name'], package=package)
+                return element.ElementGUID if element is not None else None
+            if kind == "connector":
+                client = self._find_element(entry['client'])
+                supplier = self._find_element(entry['supplier'])
+                if client is None or supplier is None:
+                    return None
+                connector = get_connector_index(self.repo).find(
+                    client.ElementID, supplier.ElementID, entry['type'], entry.get('name') or None)
+                return connector.ConnectorGUID if connector is not None else None
+            # Diagramme: einmal pro Package lesen
+            package_name = entry['package']
+            if package_name not in diagram_guids:
+                package = self._find_package(package_name)
+                diagram_guids[package_name] = {}
+                if package is not None:
+                    diagrams = package.Diagrams
+                    for i in range(diagrams.Count):
+                        diagram = diagrams.GetAt(i)
+                        diagram_guids[package_name].setdefault(diagram.Name, diagram.DiagramGUID)
+            return diagram_guids[package_name].get(entry['name'])
+        except Exception as e:
+            logger.debug(f"GUID für {kind} nicht ermittelbar: {e}")
+            return None
+    
+    def _open_journal(self, full_spec: Dict):
+        """
+        Öffnet das Journal; bei --resume wird es eingelesen und die Spezifikation
+        auf die noch nicht angewendeten Einträge reduziert.
+        """
+        self.journal = BuildJournal(self.journal_file)
+        done = self.journal.open(str(Path(self.repo_path).resolve()), full_spec, self.resume)
+        if not done:
+            return
+        # Replay: GUIDs der bereits angewendeten Packages und Elemente für die Auflösung merken
+        for kind, key in self.journal.completed:
+            guid = self.journal.completed[(kind, key)]
+            if guid and kind == "package":
+                self.journal_guids[("package", key)] = guid
+            elif guid and kind == "element":
+                self.journal_guids.setdefault(("element", key.rsplit('/', 1)[-1]), guid)
+        self.spec = self.journal.pending_spec(self.spec)
+        logger.info(f"[RESUME] {done} Operationen aus dem Journal übersprungen")
+    
+    def _save_state(self, state: BuildState, checked_spec: Dict, full_spec: Dict):
+        """
+        Speichert Hash und GUID aller geprüften Einträge in der Zustandsdatei.
+        
+        Fehlgeschlagene Einträge werden entfernt, damit der nächste Build sie erneut prüft.
+        """
+        if self.index is None:
+            self.index = get_repository_index(self.repo)
+        if self.model is None:
+            self.model = self.index.find_child_package(0, full_spec.get('model', 'Model'))
+        diagram_guids: Dict[str, Dict[str, str]] = {}
+        for kind, key, entry in iter_spec_entries(checked_spec):
+            if (kind, key) in self.failed_entries:
+                state.record(kind, key, entry, None)
+                continue
+            state.record(kind, key, entry, self._entry_guid(kind, entry, diagram_guids))
+        state.prune(full_spec)
+        state.save()
     
-    def build(self) -> bool:
+    def build(self, full: bool = False) -> bool:
         """
-        Führt den kompletten Build-Prozess aus.
+        Führt den Build-Prozess aus.
+        
+        Mit Zustandsdatei werden zuerst alle Einträge übersprungen, deren
+        Inhalts-Hash unverändert ist und deren GUID noch existiert. Für den
+        Rest wird ein Plan erstellt und nur das Delta angewendet; bei
+        unverändertem Modell passiert nichts weiter.
+        
+        Mit Journal wird jede abgeschlossene Operation protokolliert. Nach
+        einem Abbruch setzt resume den Build hinter der letzten geschriebenen
+        Operation fort; nach einem fehlerfreien Build wird das Journal gelöscht.
+        
+        Args:
+            full: Alle Phasen für die komplette Spezifikation ausführen
         
         Returns:
-            True bei Erfolg, False bei Fehler
+            True bei Erfolg, False bei Fehler (auch bei fehlgeschlagenen Einträgen)
         """
         try:
-            # 1. Root Model
-            model = self.ensure_root_model()
+            full_spec = self.spec
+            for elem_spec in full_spec.get('elements', []):
+                self.element_packages.setdefault(elem_spec['name'], elem_spec['package'])
+            state = None
+            if self.state_file:
+                state = BuildState.load(self.state_file, str(Path(self.repo_path).resolve()),
+                                        full_spec.get('model', 'Model'))
+                if not full:
+                    self.spec, _ = state.dirty_spec(self.repo, full_spec)
+            checked_spec = self.spec
             
-            # 2. Packages
-            self.create_packages(model)
+            if self.journal_file:
+                self._open_journal(full_spec)
             
-            # 3. Elements
-            self.create_elements()
+            if full or self._apply_plan():
+                self._run_phases()
             
-            # 4. Connectors
-            self.create_connectors()
+            if state is not None:
+                self._save_state(state, checked_spec, full_spec)
             
-            # 5. Diagrams (optional)
-            self.create_diagrams()
+            if self.journal:
+                if self.failures:
+                    logger.warning(f"{self.failures} Operationen fehlgeschlagen - "
+                                   f"Journal bleibt für --resume erhalten: {self.journal_file}")
+                self.journal.close(completed=not self.failures)
             
+            if self.failures:
+                logger.error(f"{self.failures} Operationen fehlgeschlagen")
+                return False
             return True
             
         except Exception as e:
             logger.error(f"Build-Fehler: {e}")
             return False
+        
+        finally:
+            if self.journal:
+                self.journal.close()
 
 
 def parse_arguments():
@@ -439,6 +800,73 @@ def parse_arguments():
         help='Aktiviert Debug-Logging'
     )
     
+    parser.add_argument(
+        '--backend',
+        choices=BACKENDS,
+        default='com',
+        help='Repository-Backend (default: com; replay: --repo ist eine Aufzeichnung von --record, '
+             'Wartezeiten skaliert mit EA_REPLAY_SPEED)'
+    )
+    
+    parser.add_argument(
+        '--plan',
+        action='store_true',
+        help='Zeigt die geplanten Änderungen, ohne sie anzuwenden'
+    )
+    
+    parser.add_argument(
+        '--full',
+        action='store_true',
+        help='Alle Phasen ohne Diff für die komplette Spezifikation ausführen'
+    )
+    
+    parser.add_argument(
+        '--state',
+        type=str,
+        help='Zustandsdatei (Hash + GUID je Eintrag); unveränderte Einträge werden übersprungen'
+    )
+    
+    parser.add_argument(
+        '--journal',
+        type=str,
+        help='Journal der angewendeten Operationen (Voraussetzung für --resume)'
+    )
+    
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Setzt einen abgebrochenen Build anhand des Journals fort'
+    )
+    
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Liest die Spezifikation inkrementell und wendet jeden Eintrag sofort an'
+    )
+    
+    parser.add_argument(
+        '--offline',
+        action='store_true',
+        help='Schreibt direkt per SQLite in die .qea-Datei (EA muss geschlossen sein)'
+    )
+    
+    parser.add_argument(
+        '--trace',
+        nargs='?',
+        const='',
+        metavar='REPORT',
+        help='Zeichnet alle COM-Aufrufe auf und gibt am Ende eine Rangliste aus '
+             '(ins Log oder nach REPORT, .json als JSON)'
+    )
+    
+    parser.add_argument(
+        '--record',
+        type=str,
+        metavar='FILE',
+        help='Zeichnet alle COM-Aufrufe mit Ergebnis und Dauer in FILE auf (.gz komprimiert), '
+             'abspielbar mit --backend replay'
+    )
+    
     parser.add_argument(
         '--dry-run',
         action='store_true',
@@ -448,6 +876,42 @@ def parse_arguments():
     return parser.parse_args()
 
 
+def run_stream(args):
+    """Streaming-Modus: Einträge gehen direkt vom Parser in die Phasen."""
+    if args.plan or args.state or args.journal or args.resume or args.offline or args.full:
+        raise EAError("--stream ist nicht mit --plan, --state, --journal, --resume, "
+                      "--offline oder --full kombinierbar")
+    
+    events = iter_model_spec(args.json)
+    if args.dry_run:
+        for _ in events:
+            pass
+        logger.info("\n[DRY-RUN] Spezifikation ist valide. Keine Änderungen vorgenommen.")
+        sys.exit(0)
+    
+    builder = ModelBuilder(args.repo, {}, args.backend)
+    if not builder.connect():
+        logger.error("Konnte nicht mit Repository verbinden")
+        sys.exit(1)
+    try:
+        success = builder.build_stream(events)
+    finally:
+        builder.disconnect()
+    
+    logger.info("\n" + "=" * 60)
+    logger.info("ZUSAMMENFASSUNG (STREAMING)")
+    logger.info("=" * 60)
+    if not success:
+        logger.error("\n[FEHLER] Build fehlgeschlagen")
+        sys.exit(1)
+    logger.info(f"✓ Model: {builder.spec.get('model', 'Model')}")
+    logger.info(f"✓ Packages: {len(builder.created_packages)}")
+    logger.info(f"✓ Elements: {len(builder.created_elements)}")
+    logger.info(f"✓ Connectors: {len(builder.created_connectors)}")
+    logger.info("\n[ERFOLG] Model erfolgreich erstellt!")
+    sys.exit(0)
+
+
 def main():
     """Hauptfunktion."""
     args = parse_arguments()
@@ -456,12 +920,21 @@ def main():
     if args.debug:
         logging.getLogger().setLevel(logging.DEBUG)
     
+    if args.trace is not None:
+        enable_tracing(args.trace or None)
+    
+    if args.record:
+        enable_recording(args.record)
+    
     # Header
     logger.info("=" * 60)
     logger.info("EA MODEL BUILDER")
     logger.info("=" * 60)
     
     try:
+        if args.stream:
+            run_stream(args)
+        
         # Lade und validiere Spezifikation
         logger.info(f"\nLade Spezifikation: {args.json}")
         spec = load_model_spec(args.json)
@@ -470,8 +943,23 @@ def main():
             logger.info("\n[DRY-RUN] Spezifikation ist valide. Keine Änderungen vorgenommen.")
             sys.exit(0)
         
+        if args.offline:
+            # Eine SQLite-Transaktion statt AddNew/Update pro Objekt
+            created = write_model_spec(args.repo, spec)
+            logger.info("\n" + "=" * 60)
+            logger.info("ZUSAMMENFASSUNG (OFFLINE)")
+            logger.info("=" * 60)
+            for kind, count in created.items():
+                logger.info(f"✓ {kind.capitalize()}: {count} neu")
+            logger.info("\n[ERFOLG] Model erfolgreich geschrieben!")
+            sys.exit(0)
+        
+        if args.resume and not args.journal:
+            raise EAError("--resume benötigt --journal")
+        
         # Initialisiere Builder
-        builder = ModelBuilder(args.repo, spec)
+        builder = ModelBuilder(args.repo, spec, args.backend, args.state,
+                               journal_file=args.journal, resume=args.resume)
         
         # Verbinde mit Repository
         if not builder.connect():
@@ -479,8 +967,12 @@ def main():
             sys.exit(1)
         
         try:
+            if args.plan:
+                print(builder.make_plan().format())
+                sys.exit(0)
+            
             # Führe Build aus
-            success = builder.build()
+            success = builder.build(full=args.full)
             
             # Zusammenfassung
             logger.info("\n" + "=" * 60)
@@ -19,6 +19,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 import win32com.client
 from ea_automation.diagrams import create_diagram, auto_place_grid, open_diagram_in_ea
 from ea_automation.exceptions import EAError
+from ea_automation.index import get_repository_index
 
 # Logging Setup
 logging.basicConfig(
@@ -45,7 +46,7 @@ def parse_arguments():
         '--package',
         type=str,
         required=True,
-        help='Name des Packages für das Diagramm (z.B. "02_Architecture")'
+        help='Name oder Pfad des Packages für das Diagramm (z.B. "02_Architecture" oder "Model/02_Architecture")'
     )
     
     parser.add_argument(
@@ -114,39 +115,17 @@ def parse_arguments():
 
 def find_package(repo: Any, package_name: str) -> Optional[Any]:
     """
-    Sucht ein Package im Repository.
+    Sucht ein Package im Repository (beliebige Tiefe).
     
     Args:
         repo: EA Repository Objekt
-        package_name: Name des Packages
+        package_name: Name oder Pfad des Packages (z.B. "Model/02_Architecture")
     
     Returns:
         EA Package Objekt oder None
     """
     try:
-        models = repo.Models
-        for i in range(models.Count):
-            model = models.GetAt(i)
-            
-            # Prüfe Model selbst
-            if model.Name == package_name:
-                return model
-            
-            # Suche in Sub-Packages
-            packages = model.Packages
-            for j in range(packages.Count):
-                pkg = packages.GetAt(j)
-                if pkg.Name == package_name:
-                    return pkg
-                
-                # Rekursive Suche in Sub-Sub-Packages (1 Ebene tief)
-                sub_packages = pkg.Packages
-                for k in range(sub_packages.Count):
-                    sub_pkg = sub_packages.GetAt(k)
-                    if sub_pkg.Name == package_name:
-                        return sub_pkg
-        
-        return None
+        return get_repository_index(repo).find_package(package_name)
         
     except Exception as e:
         logger.error(f"Fehler beim Suchen des Packages: {e}")
@@ -166,47 +145,32 @@ def find_elements(repo: Any, element_names: List[str], package: Optional[Any] =
         Liste von gefundenen EA Element Objekten
     """
     found_elements = []
+    index = get_repository_index(repo)
     
-    # Definiere Suchbereich
-    packages_to_search = []
-    if package:
-        packages_to_search.append(package)
-    else:
-        # Globale Suche - alle Packages
-        models = repo.Models
-        for i in range(models.Count):
-            model = models.GetAt(i)
-            packages = model.Packages
-            for j in range(packages.Count):
-                packages_to_search.append(packages.GetAt(j))
-    
-    # Suche Elemente
     for elem_name in element_names:
         elem_name = elem_name.strip()
-        found = False
-        
-        for pkg in packages_to_search:
-            try:
-                elements = pkg.Elements
-                for i in range(elements.Count):
-                    elem = elements.GetAt(i)
-                    if elem.Name == elem_name:
-                        found_elements.append(elem)
-                        logger.info(f"Element gefunden: {elem_name} (ID: {elem.ElementID})")
-                        found = True
-                        break
-            except:
-                continue
-            
-            if found:
-                break
+        try:
+            elem = index.find_element(elem_name, package)
+        except Exception as e:
+            logger.debug(f"Fehler beim Suchen von '{elem_name}': {e}")
+            elem = None
         
-        if not found:
+        if elem is not None:
+            found_elements.append(elem)
+            logger.info(f"Element gefunden: {elem_name} (ID: {elem.ElementID})")
+        else:
             logger.warning(f"Element nicht gefunden: {elem_name}")
     
     return found_elements
 
 
+def log_available_packages(repo: Any) -> None:
+    """Listet alle Packages mit qualifiziertem Namen auf."""
+    logger.info("\nVerfügbare Packages:")
+    for path in sorted(get_repository_index(repo).packages_by_path):
+        logger.info(f"  - {path}")
+
+
 def main():
     """Hauptfunktion."""
     args = parse_arguments()
@@ -256,16 +220,7 @@ def main():
         if not target_package:
             logger.error(f"Package '{args.package}' nicht gefunden")
             
-            # Liste verfügbare Packages
-            logger.info("\nVerfügbare Packages:")
-            models = repo.Models
-            for i in range(models.Count):
-                model = models.GetAt(i)
-                logger.info(f"  Model: {model.Name}")
-                packages = model.Packages
-                for j in range(packages.Count):
-                    pkg = packages.GetAt(j)
-                    logger.info(f"    - {pkg.Name}")
+            log_available_packages(repo)
             
             repo.CloseFile()
             sys.exit(1)
@@ -14,7 +14,7 @@ from typing import List, Any, Optional
 # Füge src zum Python-Pfad hinzu
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.repository import ensure_path
+from src.repository import PackagePathTrie, ensure_path
 
 # Logging Setup
 logging.basicConfig(
@@ -116,12 +116,15 @@ def create_project_structure(repo: Any, model_name: str, folders: List[str]) ->
     try:
         logger.info(f"Erstelle Projektstruktur in Model '{model_name}'...")
         
+        # Ein Trie für alle Pfade: jede Packages-Collection wird nur einmal gelesen
+        trie = PackagePathTrie(repo)
+        
         # Erstelle jeden Ordner als direktes Child des Models
         for folder_name in folders:
             path = [model_name, folder_name]
             logger.info(f"Erstelle Pfad: {' -> '.join(path)}")
             
-            package = ensure_path(repo, path)
+            package = ensure_path(repo, path, trie=trie)
             if package:
                 logger.info(f"✓ Package '{folder_name}' erstellt/gefunden (ID: {package.PackageID})")
             else:
@@ -142,7 +145,7 @@ def create_project_structure(repo: Any, model_name: str, folders: List[str]) ->
                     path = [model_name, parent_folder, sub_folder]
                     logger.info(f"Erstelle Unterpfad: {' -> '.join(path)}")
                     
-                    package = ensure_path(repo, path)
+                    package = ensure_path(repo, path, trie=trie)
                     if package:
                         logger.info(f"  ✓ Unter-Package '{sub_folder}' erstellt")
                         
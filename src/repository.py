@@ -4,7 +4,7 @@ Erweiterte Funktionen für Package-Verwaltung
 """
 
 import logging
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -46,37 +46,138 @@ def create_package(parent_pkg: Any, name: str) -> Any:
                 return pkg
         
         # Package existiert nicht, erstelle es
-        logger.info(f"Erstelle neues Package '{name}'...")
-        
-        # AddNew auf Packages Collection
-        new_package = packages.AddNew(name, "Package")
-        
-        if not new_package:
-            raise Exception(f"Konnte Package '{name}' nicht erstellen")
-        
-        # Update das neue Package
-        success = new_package.Update()
-        if not success:
-            # Versuche Fehler zu ermitteln
-            error_msg = "Update fehlgeschlagen"
-            if hasattr(parent_pkg, 'Repository'):
-                repo = parent_pkg.Repository
-                if hasattr(repo, 'GetLastError'):
-                    error_msg = repo.GetLastError()
-            raise Exception(f"Fehler beim Update des Package '{name}': {error_msg}")
-        
-        # Refresh der Collection
-        packages.Refresh()
-        
-        logger.info(f"Package '{name}' erfolgreich erstellt (ID: {new_package.PackageID})")
-        return new_package
+        return _add_package(parent_pkg, name)
         
     except Exception as e:
         logger.error(f"Fehler beim Erstellen des Package '{name}': {e}")
         raise
 
 
-def ensure_path(repo: Any, path: List[str]) -> Any:
+def _add_package(parent_pkg: Any, name: str) -> Any:
+    """
+    Legt ein Package ohne vorherige Existenzprüfung an (AddNew, Update, Refresh).
+    
+    Args:
+        parent_pkg: Parent-Package Objekt
+        name: Name des neuen Package
+        
+    Returns:
+        Das neu erstellte Package
+    """
+    logger.info(f"Erstelle neues Package '{name}'...")
+    packages = parent_pkg.Packages
+    
+    # AddNew auf Packages Collection
+    new_package = packages.AddNew(name, "Package")
+    
+    if not new_package:
+        raise Exception(f"Konnte Package '{name}' nicht erstellen")
+    
+    # Update das neue Package
+    success = new_package.Update()
+    if not success:
+        # Versuche Fehler zu ermitteln
+        error_msg = "Update fehlgeschlagen"
+        if hasattr(parent_pkg, 'Repository'):
+            repo = parent_pkg.Repository
+            if hasattr(repo, 'GetLastError'):
+                error_msg = repo.GetLastError()
+        raise Exception(f"Fehler beim Update des Package '{name}': {error_msg}")
+    
+    # Refresh der Collection
+    packages.Refresh()
+    
+    logger.info(f"Package '{name}' erfolgreich erstellt (ID: {new_package.PackageID})")
+    return new_package
+
+
+class PackageTrieNode:
+    """Knoten im Package-Trie: Package-Objekt und Kinder nach Name."""
+    
+    __slots__ = ('package', 'children')
+    
+    def __init__(self, package: Any = None, children: Optional[Dict[str, 'PackageTrieNode']] = None):
+        self.package = package
+        # None = Packages-Collection wurde noch nicht gelesen
+        self.children = children
+
+
+class PackagePathTrie:
+    """
+    Trie über die Package-Hierarchie eines Repositories.
+    
+    Jede Packages-Collection (bzw. repo.Models für die Wurzel) wird höchstens
+    einmal gelesen, und zwar erst, wenn ein Pfad durch diesen Knoten führt.
+    Danach ist jeder Pfad-Schritt ein Dictionary-Zugriff, d.h. eine Suche
+    kostet O(Tiefe). Über den Trie erstellte Packages werden direkt
+    eingetragen, sodass beim Anlegen vieler Pfade nichts erneut gelesen wird.
+    
+    Packages, die am Trie vorbei erstellt oder gelöscht werden, sieht der
+    Trie nicht; in dem Fall einen neuen Trie verwenden.
+    """
+    
+    def __init__(self, repo: Any):
+        if not repo:
+            raise ValueError("Repository-Objekt ist None")
+        self.repo = repo
+        self.root = PackageTrieNode()
+    
+    def _children(self, node: PackageTrieNode) -> Dict[str, PackageTrieNode]:
+        if node.children is None:
+            collection = self.repo.Models if node is self.root else node.package.Packages
+            children = {}
+            for i in range(collection.Count):
+                pkg = collection.GetAt(i)
+                # Wie beim linearen Scan gewinnt das erste Package gleichen Namens
+                children.setdefault(pkg.Name, PackageTrieNode(pkg))
+            node.children = children
+        return node.children
+    
+    def find(self, path: List[str]) -> Optional[Any]:
+        """
+        Sucht ein Package anhand eines Pfads.
+        
+        Args:
+            path: Liste von Package-Namen ab dem Root-Model
+            
+        Returns:
+            Das Package am Ende des Pfads oder None
+        """
+        node = self.root
+        for name in path:
+            node = self._children(node).get(name)
+            if node is None:
+                return None
+        return node.package
+    
+    def ensure(self, path: List[str]) -> Any:
+        """
+        Stellt sicher, dass der Pfad existiert, und erstellt fehlende Packages.
+        
+        Args:
+            path: Liste von (bereinigten) Package-Namen ab dem Root-Model
+            
+        Returns:
+            Das letzte Package im Pfad
+        """
+        node = self.root
+        for i, name in enumerate(path):
+            children = self._children(node)
+            child = children.get(name)
+            if child is None:
+                if node is self.root:
+                    from .packages import ensure_root_model
+                    package = ensure_root_model(self.repo, name)
+                else:
+                    logger.debug(f"Verarbeite Pfad-Element {i + 1}/{len(path)}: '{name}' (neu)")
+                    package = _add_package(node.package, name)
+                # Neues Package hat noch keine Kinder
+                child = children[name] = PackageTrieNode(package, {})
+            node = child
+        return node.package
+
+
+def ensure_path(repo: Any, path: List[str], trie: Optional[PackagePathTrie] = None) -> Any:
     """
     Stellt sicher, dass ein kompletter Pfad von verschachtelten Packages existiert.
     Erstellt fehlende Packages automatisch.
@@ -85,6 +186,8 @@ def ensure_path(repo: Any, path: List[str]) -> Any:
         repo: EA Repository Objekt
         path: Liste von Package-Namen die den Pfad bilden
               z.B. ["Model", "System", "Components"]
+        trie: Optionaler PackagePathTrie; beim Anlegen mehrerer Pfade
+              denselben Trie übergeben, damit nichts erneut gelesen wird
         
     Returns:
         Das letzte Package im Pfad
@@ -108,17 +211,9 @@ def ensure_path(repo: Any, path: List[str]) -> Any:
     logger.info(f"Stelle Pfad sicher: {' -> '.join(clean_path)}")
     
     try:
-        # Importiere packages Modul für ensure_root_model
-        from .packages import ensure_root_model
-        
-        # Erstes Element ist das Root-Model
-        root_name = clean_path[0]
-        current_pkg = ensure_root_model(repo, root_name)
-        
-        # Durchlaufe restlichen Pfad und erstelle Packages
-        for i, pkg_name in enumerate(clean_path[1:], 1):
-            logger.debug(f"Verarbeite Pfad-Element {i}/{len(clean_path)}: '{pkg_name}'")
-            current_pkg = create_package(current_pkg, pkg_name)
+        if trie is None:
+            trie = PackagePathTrie(repo)
+        current_pkg = trie.ensure(clean_path)
             
         logger.info(f"Pfad erfolgreich sichergestellt. Letztes Package: '{current_pkg.Name}' (ID: {current_pkg.PackageID})")
         return current_pkg
@@ -128,7 +223,7 @@ def ensure_path(repo: Any, path: List[str]) -> Any:
         raise
 
 
-def find_package_by_path(repo: Any, path: List[str]) -> Optional[Any]:
+def find_package_by_path(repo: Any, path: List[str], trie: Optional[PackagePathTrie] = None) -> Optional[Any]:
     """
     Sucht ein Package anhand eines Pfads.
     Gibt None zurück wenn der Pfad nicht vollständig existiert.
@@ -136,6 +231,7 @@ def find_package_by_path(repo: Any, path: List[str]) -> Optional[Any]:
     Args:
         repo: EA Repository Objekt
         path: Liste von Package-Namen die den Pfad bilden
+        trie: Optionaler PackagePathTrie für wiederholte Suchen
         
     Returns:
         Das Package am Ende des Pfads oder None
@@ -144,36 +240,10 @@ def find_package_by_path(repo: Any, path: List[str]) -> Optional[Any]:
         return None
         
     try:
-        # Erstes Element in Models suchen
-        models = repo.Models
-        current_pkg = None
-        
-        for i in range(models.Count):
-            model = models.GetAt(i)
-            if model.Name == path[0]:
-                current_pkg = model
-                break
-                
-        if not current_pkg:
-            return None
-            
-        # Restlichen Pfad durchlaufen
-        for pkg_name in path[1:]:
-            found = False
-            packages = current_pkg.Packages
-            
-            for i in range(packages.Count):
-                pkg = packages.GetAt(i)
-                if pkg.Name == pkg_name:
-                    current_pkg = pkg
-                    found = True
-                    break
-                    
-            if not found:
-                return None
-                
-        return current_pkg
+        if trie is None:
+            trie = PackagePathTrie(repo)
+        return trie.find(path)
         
     except Exception as e:
         logger.error(f"Fehler beim Suchen des Package-Pfads {path}: {e}")
-        return None
\ No newline at end of file
+        return None
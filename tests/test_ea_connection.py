@@ -295,4 +295,51 @@ class TestEAConnection:
         
         # Test ensure_path mit leeren Pfad-Elementen
         with pytest.raises(ValueError, match="Pfad enthält nur leere Elemente"):
-            ensure_path(mock_repo, ["", " ", None])
\ No newline at end of file
+            ensure_path(mock_repo, ["", " ", None])
+    
+    def test_package_trie_reads_each_collection_once(self):
+        """Test dass ensure_path mit gemeinsamem Trie jede Collection nur einmal liest"""
+        from src.repository import PackagePathTrie, ensure_path, find_package_by_path
+        
+        def make_collection(packages):
+            collection = Mock()
+            collection.Count = len(packages)
+            collection.GetAt = Mock(side_effect=lambda i: packages[i])
+            return collection
+        
+        def make_package(name, package_id, children=()):
+            pkg = Mock()
+            pkg.Name = name
+            pkg.PackageID = package_id
+            pkg.Packages = make_collection(list(children))
+            return pkg
+        
+        components = make_package("Components", 3)
+        architecture = make_package("02_Architecture", 2, [components])
+        model = make_package("Model", 1, [architecture])
+        
+        new_pkg = make_package("Interfaces", 4)
+        new_pkg.Update = Mock(return_value=True)
+        architecture.Packages.AddNew = Mock(return_value=new_pkg)
+        
+        mock_repo = Mock()
+        mock_repo.Models = make_collection([model])
+        
+        trie = PackagePathTrie(mock_repo)
+        for path in (["Model", "02_Architecture"],
+                     ["Model", "02_Architecture", "Components"],
+                     ["Model", "02_Architecture", "Interfaces"],
+                     ["Model", "02_Architecture", "Interfaces"]):
+            ensure_path(mock_repo, path, trie=trie)
+        
+        # Nur ein neues Package, jede Collection genau einmal durchlaufen
+        architecture.Packages.AddNew.assert_called_once_with("Interfaces", "Package")
+        assert mock_repo.Models.GetAt.call_count == 1
+        assert model.Packages.GetAt.call_count == 1
+        assert architecture.Packages.GetAt.call_count == 1
+        new_pkg.Packages.GetAt.assert_not_called()
+        
+        # Suche aus dem Trie ohne weitere COM-Zugriffe
+        assert find_package_by_path(mock_repo, ["Model", "02_Architecture", "Interfaces"], trie=trie) is new_pkg
+        assert find_package_by_path(mock_repo, ["Model", "Unknown"], trie=trie) is None
+        assert architecture.Packages.GetAt.call_count == 1
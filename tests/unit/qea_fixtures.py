@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Gemeinsame Test-Daten für die Tests mit .qea-Dateien
+(plan, state, journal, qea_writer, Backends, Streaming).
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+# Füge Parent-Directory zum Path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ea_automation.qea import create_schema
+
+# Basis-Spezifikation; Tests ändern nur Kopien (copy.deepcopy bzw. dict(SPEC, ...))
+SPEC = {
+    "model": "CoffeeMachine",
+    "packages": ["02_Architecture"],
+    "elements": [
+        {"package": "02_Architecture", "name": "Machine", "type": "SysML1.4::Block", "notes": "System",
+         "attributes": [{"name": "power", "type": "Real"}],
+         "operations": [{"name": "brew", "returnType": "Boolean"}]},
+        {"package": "02_Architecture", "name": "Pump", "type": "Class"}
+    ],
+    "connectors": [{"type": "Composition", "client": "Machine", "supplier": "Pump"}],
+    "diagrams": [{"package": "02_Architecture", "name": "BDD", "type": "Class", "elements": ["Machine"]}]
+}
+
+
+def make_empty_qea(tmpdir: str, name: str = "model.qea") -> Path:
+    """Erzeugt eine leere .qea-Datei mit EA-Schema im Verzeichnis tmpdir."""
+    path = Path(tmpdir) / name
+    connection = sqlite3.connect(str(path))
+    create_schema(connection)
+    connection.close()
+    return path
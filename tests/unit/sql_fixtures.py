@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""
+Gemeinsame Hilfen für Tests mit Repository.SQLQuery-Mocks (bulk, index).
+"""
+
+
+def sqlquery_xml(rows):
+    """Erzeugt ein SQLQuery-Ergebnis im EA-Format."""
+    body = "".join(
+        "<Row>" + "".join(f"<{k}>{v}</{k}>" for k, v in row.items()) + "</Row>"
+        for row in rows
+    )
+    return (
+        '<?xml version="1.0"?><EADATA version="1.0" exporter="Enterprise Architect">'
+        f"<Dataset_0><Data>{body}</Data></Dataset_0></EADATA>"
+    )
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Unit-Tests für die Backends (SQLite und In-Memory) hinter open_repository.
+"""
+
+import unittest
+import sys
+import tempfile
+from pathlib import Path
+
+# Füge Parent-Directory zum Path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ea_automation.repository import open_repository, close_repository
+from ea_automation.qea import open_qea
+from ea_automation.packages import Package
+from ea_automation.elements import create_element, add_attribute, add_operation
+from ea_automation.connectors import create_connector
+from ea_automation.diagrams import create_diagram, place_on_diagram
+from ea_automation.bulk import export_model_tree
+from ea_automation.exceptions import EAConnectionError
+from ea_automation.backend import as_ea_object
+from ea_automation.elements import Element
+from qea_fixtures import make_empty_qea
+
+
+def build_model(repo):
+    """Dieselbe Builder-Logik für jedes Backend."""
+    models = repo.Models
+    model = models.AddNew("Model", "Package")
+    model.Update()
+    models.Refresh()
+
+    architecture = Package(models.GetAt(0)).add_package("02_Architecture").ea_package
+    machine = create_element(architecture, "Machine", "SysML1.4::Block", notes="System")
+    pump = create_element(architecture, "Pump", "Class")
+    add_attribute(machine, "power", "Real")
+    add_attribute(machine, "power", "Integer")
+    add_operation(machine, "brew", "Boolean")
+    connector = create_connector(machine, pump, "Composition")
+    connector.set_target_role("pump", "1")
+    diagram = create_diagram(architecture, "BDD", "Class")
+    place_on_diagram(diagram, machine, 10, -10, 110, -80)
+    place_on_diagram(diagram, machine, 20, -20, 120, -90)
+    return machine
+
+
+class TestBackends(unittest.TestCase):
+    """Tests: Bibliotheksfunktionen über SQLite- und In-Memory-Backend."""
+
+    def setUp(self):
+        """Setup: Leere .qea-Datei mit EA-Schema."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = make_empty_qea(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def assert_model(self, repo):
+        model = export_model_tree(repo)[0]
+        architecture = model["packages"][0]
+        machine, pump = architecture["elements"]
+        self.assertEqual((machine["name"], machine["type"], machine["stereotype"]),
+                         ("Machine", "Class", "block"))
+        self.assertEqual(machine["notes"], "System")
+        self.assertEqual([(a["name"], a["type"]) for a in machine["attributes"]], [("power", "Integer")])
+        self.assertEqual(machine["methods"][0]["return_type"], "Boolean")
+        connector = architecture["connectors"][0]
+        self.assertEqual((connector["source_element_id"], connector["target_element_id"]),
+                         (machine["element_id"], pump["element_id"]))
+        self.assertEqual(connector["target_role"], {"name": "pump", "multiplicity": "1"})
+        diagram = architecture["diagrams"][0]
+        self.assertEqual(diagram["type"], "Logical")
+        self.assertEqual(diagram["objects"], [{"element_id": machine["element_id"], "left": 20,
+                                               "right": 120, "top": -20, "bottom": -90}])
+
+    def test_memory_backend(self):
+        """Test: In-Memory-Backend, Datei bleibt unverändert."""
+        repo = open_repository(str(self.path), backend="memory")
+        machine = build_model(repo)
+        self.assertEqual(machine.MetaType, "SysML1.4::Block")
+        self.assert_model(repo)
+        close_repository(repo)
+
+        reader = open_qea(str(self.path))
+        self.assertEqual(reader.Models.Count, 0)
+        reader.CloseFile()
+
+    def test_sqlite_backend_persists(self):
+        """Test: SQLite-Backend schreibt beim Schließen in die Datei."""
+        repo = open_repository(str(self.path), backend="sqlite")
+        build_model(repo)
+        close_repository(repo)
+
+        reader = open_qea(str(self.path))
+        try:
+            self.assert_model(reader)
+            self.assertEqual(reader.GetElementByID(2).MetaType, "SysML1.4::Block")
+        finally:
+            reader.CloseFile()
+
+    def test_wrappers_and_backend_objects_are_interchangeable(self):
+        """Test: as_ea_object entpackt Wrapper; Bibliotheksfunktionen akzeptieren beides."""
+        repo = open_repository(str(self.path), backend="memory")
+        try:
+            models = repo.Models
+            model = models.AddNew("Model", "Package")
+            model.Update()
+            models.Refresh()
+            package = Package(models.GetAt(0)).add_package("02_Architecture")
+
+            self.assertIs(as_ea_object(package), package.ea_package)
+            self.assertIs(as_ea_object(package.ea_package), package.ea_package)
+            pump = create_element(package, "Pump", "Class")
+            self.assertEqual(create_element(package.ea_package, "Pump", "Class").ElementID, pump.ElementID)
+            valve = Element(create_element(package, "Valve", "Class"))
+            self.assertEqual(create_connector(valve, pump, "Association").ea_connector.ClientID,
+                             valve.ea_element.ElementID)
+            diagram = create_diagram(package, "BDD", "Class")
+            self.assertEqual(place_on_diagram(diagram, pump, 10, -10, 110, -80).ElementID, pump.ElementID)
+        finally:
+            close_repository(repo)
+
+    def test_unknown_backend(self):
+        """Test: Unbekanntes Backend."""
+        with self.assertRaises(EAConnectionError):
+            open_repository(str(self.path), backend="odbc")
+
+
+if __name__ == "__main__":
+    unittest.main()
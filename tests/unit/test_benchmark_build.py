@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Unit-Tests für scripts/benchmark_build.py (synthetische Spezifikationen und Benchmark-Lauf).
+"""
+
+import json
+import unittest
+import sys
+from pathlib import Path
+
+# Füge Parent-Directory zum Path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ea_automation.json_io import MODEL_SPEC_SCHEMA, check_model_spec_logic, validate_json_against_schema
+from scripts.benchmark_build import generate_spec, run_scenario
+
+
+class TestBenchmarkBuild(unittest.TestCase):
+    """Tests für generate_spec und run_scenario."""
+
+    def test_generated_spec_is_valid(self):
+        """Test: Synthetische Spezifikation erfüllt Schema und logische Prüfung."""
+        spec = generate_spec(packages=3, elements_per_package=10, attributes=1, operations=2,
+                             connector_density=2.5, diagram_size=4, diagrams_per_package=2)
+
+        self.assertEqual(validate_json_against_schema(spec, MODEL_SPEC_SCHEMA), [])
+        self.assertEqual(check_model_spec_logic(spec), [])
+        self.assertEqual(len(spec["elements"]), 30)
+        self.assertEqual(len(spec["elements"][0]["operations"]), 2)
+        self.assertEqual(len(spec["diagrams"]), 6)
+        self.assertEqual(len(spec["diagrams"][0]["elements"]), 4)
+        self.assertGreater(len(spec["connectors"]), 30)
+        self.assertEqual(spec, generate_spec(packages=3, elements_per_package=10, attributes=1, operations=2,
+                                             connector_density=2.5, diagram_size=4, diagrams_per_package=2))
+
+    def test_run_scenario_reports_calls_per_phase(self):
+        """Test: Ergebnis enthält Laufzeit, COM-Aufrufe je Phase und einen Rebuild ohne Änderungen."""
+        result = run_scenario("tiny", {"packages": 2, "elements_per_package": 5})
+
+        json.dumps(result)
+        build = result["build"]
+        self.assertTrue(build["success"])
+        self.assertEqual(sum(build["com_calls"]["phases"].values()), build["com_calls"]["total"])
+        self.assertGreater(build["com_calls"]["phases"]["create_elements"], 0)
+        self.assertIn("Collection.AddNew()", build["top_call_keys"])
+        self.assertGreater(result["peak_rss_mb"], 0)
+        self.assertEqual(set(result["rebuild"]["com_calls"]["phases"]), {"make_plan", "other"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Unit-Tests für bulk.py (SQL-basierter Export des Package-Baums).
+"""
+
+import unittest
+from unittest.mock import Mock
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Füge Parent-Directory zum Path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ea_automation.bulk import export_model_tree
+from ea_automation.exceptions import EAError
+from ea_automation.json_io import export_package_structure
+from ea_automation.records import ConnectorRecord, DiagramRecord, ElementRecord, PackageRecord, SnapshotMixin
+from ea_automation.connectors import Connector
+from ea_automation.diagrams import Diagram
+from ea_automation.elements import Element
+from ea_automation.packages import Package
+from sql_fixtures import sqlquery_xml
+
+
+TABLES = {
+    "t_package": [
+        {"Package_ID": 1, "Parent_ID": 0, "Name": "Model", "ea_guid": "{P1}", "TPos": 0},
+        {"Package_ID": 3, "Parent_ID": 1, "Name": "Design", "ea_guid": "{P3}", "TPos": 2},
+        {"Package_ID": 2, "Parent_ID": 1, "Name": "Architecture", "ea_guid": "{P2}", "TPos": 1},
+    ],
+    "t_object": [
+        {"Object_ID": 10, "Package_ID": 2, "Name": "Pump", "Object_Type": "Class",
+         "Stereotype": "block", "Note": "Pumpe", "Status": "Proposed", "ea_guid": "{E10}"},
+        {"Object_ID": 11, "Package_ID": 2, "Name": "Boiler", "Object_Type": "Class",
+         "Status": "Proposed", "ea_guid": "{E11}"},
+    ],
+    "t_attribute": [
+        {"ID": 1, "Object_ID": 10, "Name": "pressure", "Type": "Double", "Scope": "Private", "Pos": 1},
+        {"ID": 2, "Object_ID": 10, "Name": "flowRate", "Type": "Double", "Scope": "Private", "Pos": 0},
+    ],
+    "t_operation": [
+        {"OperationID": 1, "Object_ID": 10, "Name": "start", "Type": "void", "Scope": "Public"},
+    ],
+    "t_connector": [
+        {"Connector_ID": 5, "Connector_Type": "Association", "Start_Object_ID": 10,
+         "End_Object_ID": 11, "Direction": "Source -&gt; Destination", "DestCard": "1",
+         "ea_guid": "{C5}"},
+    ],
+    "t_diagram": [
+        {"Diagram_ID": 7, "Package_ID": 2, "Name": "BDD", "Diagram_Type": "Logical", "ea_guid": "{D7}"},
+    ],
+    "t_diagramobjects": [
+        {"Diagram_ID": 7, "Object_ID": 10, "RectLeft": 50, "RectRight": 300,
+         "RectTop": -50, "RectBottom": -220, "Sequence": 1},
+    ],
+}
+
+
+class TestExportModelTree(unittest.TestCase):
+    """Tests für export_model_tree."""
+
+    def setUp(self):
+        """Setup: Repository-Mock, das SQL-Abfragen aus TABLES beantwortet."""
+        def sql_query(sql):
+            table = sql.split(" FROM ")[1].split()[0]
+            return sqlquery_xml(TABLES[table])
+
+        self.repo = Mock()
+        self.repo.SQLQuery.side_effect = sql_query
+
+    def test_nested_structure_matches_to_dict(self):
+        """Test: Package-Baum hat die Schlüssel von Package.to_dict."""
+        tree = export_model_tree(self.repo, include_contents=False)
+
+        self.assertEqual(len(tree), 1)
+        model = tree[0]
+        self.assertEqual(set(model.keys()), {"name", "guid", "package_id", "notes", "packages"})
+        self.assertEqual(model["name"], "Model")
+        # Sortierung nach TPos
+        self.assertEqual([p["name"] for p in model["packages"]], ["Architecture", "Design"])
+        self.repo.SQLQuery.assert_called_once()
+
+    def test_contents_loaded_with_few_queries(self):
+        """Test: Elemente, Attribute, Connectors und Diagramme aus sieben Abfragen."""
+        architecture = export_model_tree(self.repo, package_id=2)
+
+        self.assertEqual(self.repo.SQLQuery.call_count, 7)
+        # Ohne TPos wird nach Name sortiert
+        self.assertEqual([e["name"] for e in architecture["elements"]], ["Boiler", "Pump"])
+        pump = architecture["elements"][1]
+        self.assertEqual(pump["name"], "Pump")
+        self.assertEqual(pump["element_id"], 10)
+        self.assertEqual(pump["notes"], "Pumpe")
+        self.assertEqual([a["name"] for a in pump["attributes"]], ["flowRate", "pressure"])
+        self.assertEqual(pump["methods"][0]["return_type"], "void")
+        # NULL-Spalten werden zu leeren Strings
+        self.assertEqual(architecture["elements"][0]["stereotype"], "")
+
+        connector = architecture["connectors"][0]
+        self.assertEqual(connector["target_element_id"], 11)
+        self.assertEqual(connector["direction"], "Source -> Destination")
+        self.assertEqual(connector["target_role"]["multiplicity"], "1")
+
+        diagram = architecture["diagrams"][0]
+        self.assertEqual(diagram["objects"][0]["top"], -50)
+
+    def test_unknown_package_id(self):
+        """Test: Fehler bei unbekannter Package-ID."""
+        with self.assertRaises(EAError):
+            export_model_tree(self.repo, package_id=99)
+
+    def test_export_package_structure_with_repo(self):
+        """Test: export_package_structure liest mit repo den Teilbaum per SQL."""
+        package = Mock()
+        package.PackageID = 1
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "structure.json"
+            export_package_structure(package, str(path), repo=self.repo)
+            data = json.loads(path.read_text(encoding="utf-8"))
+
+        self.assertEqual([p["name"] for p in data["packages"]], ["Architecture", "Design"])
+        self.repo.SQLQuery.assert_called_once()
+        package.Packages.GetAt.assert_not_called()
+
+
+class TestRecordsFromRows(unittest.TestCase):
+    """Tests für die Records aus SQL-Zeilen und den gemeinsamen Snapshot-Modus."""
+
+    def test_wrappers_share_snapshot_mixin(self):
+        """Test: Alle Wrapper nutzen SnapshotMixin mit ihrem Record-Typ."""
+        for wrapper, record_type in ((Package, PackageRecord), (Element, ElementRecord),
+                                     (Connector, ConnectorRecord), (Diagram, DiagramRecord)):
+            self.assertTrue(issubclass(wrapper, SnapshotMixin))
+            self.assertIs(wrapper._record_type, record_type)
+            self.assertNotIn("snapshot", vars(wrapper))
+
+    def test_row_record_matches_com_record(self):
+        """Test: from_row und from_com liefern dasselbe Dictionary."""
+        row = {"object_id": "10", "name": "Pump", "ea_guid": "{E10}", "object_type": "Class",
+               "stereotype": "block", "note": "Pumpe", "status": "Proposed"}
+        ea_element = Mock(Name="Pump", ElementGUID="{E10}", ElementID=10, Type="Class",
+                          Stereotype="block", Notes="Pumpe", Status="Proposed")
+
+        self.assertEqual(ElementRecord.from_row(row).to_dict(),
+                         ElementRecord.from_com(ea_element).to_dict())
+
+
+if __name__ == "__main__":
+    unittest.main()
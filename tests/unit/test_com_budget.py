@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Regressionstests für die Zahl der COM-Round-Trips.
+
+Repräsentative Operationen laufen gegen das simulierte Repository aus
+ea_automation.fake; jede Operation hat eine Obergrenze an COM-Aufrufen
+(gemessener Wert plus Reserve). Ein wieder eingeführter Collection-Scan
+pro Element verletzt die Grenzen um Größenordnungen.
+"""
+
+import unittest
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+# Füge Parent-Directory zum Path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ea_automation.fake import open_fake_repository
+from ea_automation.elements import create_element
+from ea_automation.diagrams import auto_place_grid, create_diagram
+from ea_automation.index import (
+    invalidate_connector_index,
+    invalidate_element_index,
+    invalidate_feature_index,
+    invalidate_repository_index
+)
+from ea_automation.json_io import load_model_spec
+from ea_automation.packages import Package
+from ea_automation.repository import close_repository
+from scripts.build_from_json import ModelBuilder
+
+COFFEE_MACHINE = Path(__file__).parent.parent.parent / "examples" / "coffee_machine.json"
+
+
+class TestComBudget(unittest.TestCase):
+    """Obergrenzen für COM-Aufrufe repräsentativer Operationen."""
+
+    def setUp(self):
+        """Setup: Simuliertes Repository mit Model und Package, leere Index-Caches."""
+        invalidate_element_index()
+        invalidate_feature_index()
+        invalidate_repository_index()
+        invalidate_connector_index()
+        self.repo = open_fake_repository()
+        models = self.repo.Models
+        self.model = models.AddNew("Model", "Package")
+        self.model.Update()
+        models.Refresh()
+        self.package = self.model.Packages.AddNew("02_Architecture", "Package")
+        self.package.Update()
+
+    def tearDown(self):
+        close_repository(self.repo)
+
+    @contextmanager
+    def com_budget(self, max_calls: int, label: str):
+        """Zählt die COM-Aufrufe im Block und prüft die Obergrenze."""
+        self.repo.stats.reset()
+        yield
+        calls = self.repo.stats.total
+        self.assertLessEqual(calls, max_calls,
+                             f"{label}: {calls} COM-Aufrufe (Budget {max_calls})\n"
+                             f"{self.repo.stats.summary(10)}")
+
+    def test_create_element_in_large_package(self):
+        """Budget: create_element in ein Package mit 1000 Elementen."""
+        elements = [create_element(self.package, f"Block{i}", "SysML1.4::Block") for i in range(1000)]
+
+        with self.com_budget(100, "10 neue Elemente"):
+            for i in range(10):
+                create_element(self.package, f"New{i}", "SysML1.4::Block")
+        with self.com_budget(40, "10 vorhandene Elemente"):
+            for i in range(10):
+                create_element(self.package, f"Block{i}", "SysML1.4::Block")
+
+        # Index-Aufbau: einmal pro Package, nicht pro Element
+        invalidate_element_index()
+        with self.com_budget(5200, "Index-Aufbau für 1010 Elemente + 10 Lookups"):
+            for i in range(10):
+                create_element(self.package, f"Block{i}", "SysML1.4::Block")
+        self.assertEqual(len(elements), 1000)
+
+    def test_auto_place_grid(self):
+        """Budget: auto_place_grid mit 200 Elementen (Einfügen und Neu-Platzieren)."""
+        elements = [create_element(self.package, f"Block{i}", "Class") for i in range(200)]
+        diagram = create_diagram(self.package, "BDD", "Class")
+
+        with self.com_budget(2000, "auto_place_grid 200 neu"):
+            auto_place_grid(diagram, elements)
+        with self.com_budget(2500, "auto_place_grid 200 verschieben"):
+            auto_place_grid(diagram, elements, cols=5)
+
+    def test_package_to_dict_deep_tree(self):
+        """Budget: Package.to_dict auf einem Baum mit 341 Packages (Tiefe 4, Breite 4)."""
+        def add_children(parent, depth):
+            if depth == 0:
+                return
+            for i in range(4):
+                child = parent.Packages.AddNew(f"Package{depth}_{i}", "Package")
+                child.Update()
+                add_children(child, depth - 1)
+        add_children(self.package, 4)
+
+        with self.com_budget(8 * 342, "Package.to_dict"):
+            tree = Package(self.model).to_dict()
+        self.assertEqual(len(tree["packages"][0]["packages"]), 4)
+
+        # Mit Repository: eine SQL-Abfrage statt einem Durchgang pro Package
+        with self.com_budget(10, "Package.to_dict mit Repository"):
+            sql_tree = Package(self.model, repo=self.repo).to_dict()
+        self.assertEqual(sql_tree, tree)
+
+    def test_model_builder_coffee_machine(self):
+        """Budget: ModelBuilder.build für examples/coffee_machine.json (Erst-Build und Rebuild)."""
+        spec = load_model_spec(str(COFFEE_MACHINE))
+
+        with self.com_budget(650, "Build coffee_machine.json"):
+            builder = ModelBuilder(str(COFFEE_MACHINE), spec)
+            builder.repo = self.repo
+            self.assertTrue(builder.build())
+        self.assertEqual(builder.failures, 0)
+
+        with self.com_budget(10, "Rebuild coffee_machine.json ohne Änderungen"):
+            builder = ModelBuilder(str(COFFEE_MACHINE), spec)
+            builder.repo = self.repo
+            self.assertTrue(builder.build())
+
+
+if __name__ == '__main__':
+    unittest.main()
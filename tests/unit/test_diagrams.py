@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Unit-Tests für diagrams.py (Platzierung von Elementen).
+"""
+
+import unittest
+from unittest.mock import Mock
+import sys
+from pathlib import Path
+
+# Füge Parent-Directory zum Path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ea_automation.diagrams import auto_place_grid, place_many_on_diagram
+
+
+class TestBulkPlacement(unittest.TestCase):
+    """Tests für place_many_on_diagram und auto_place_grid."""
+
+    def setUp(self):
+        """Setup: Diagramm mit zwei vorhandenen Objekten."""
+        self.existing = []
+        for element_id in (1, 2):
+            obj = Mock()
+            obj.ElementID = element_id
+            self.existing.append(obj)
+
+        self.diagram = Mock()
+        objects = self.diagram.DiagramObjects
+        objects.Count = len(self.existing)
+        objects.GetAt.side_effect = lambda i: self.existing[i]
+        objects.AddNew.side_effect = lambda coords, type_: Mock()
+
+        self.elements = []
+        for element_id in range(1, 201):
+            element = Mock()
+            element.ElementID = element_id
+            element.Name = f"Block{element_id}"
+            self.elements.append(element)
+
+    def test_auto_place_grid_linear(self):
+        """Test: Collection einmal gelesen, ein Refresh, ein Diagramm-Update."""
+        placed = auto_place_grid(self.diagram, self.elements, cols=4)
+
+        objects = self.diagram.DiagramObjects
+        self.assertEqual(len(placed), 200)
+        self.assertEqual(objects.GetAt.call_count, 2)
+        self.assertEqual(objects.AddNew.call_count, 198)
+        objects.Refresh.assert_called_once()
+        self.diagram.Update.assert_called_once()
+        # Vorhandene Objekte werden verschoben statt neu eingefügt
+        self.assertIs(placed[1], self.existing[1])
+        self.assertEqual(self.existing[1].left, 350)
+        self.existing[1].Update.assert_called_once()
+
+    def test_duplicate_elements_inserted_once(self):
+        """Test: Ein Element mehrfach in der Liste wird nur einmal eingefügt."""
+        element = self.elements[10]
+        placed = place_many_on_diagram(self.diagram, [(element, 0, 0, 10, -10),
+                                                      (element, 50, 0, 60, -10)])
+
+        self.diagram.DiagramObjects.AddNew.assert_called_once()
+        self.assertIs(placed[0], placed[1])
+        self.assertEqual(placed[1].left, 50)
+
+    def test_failed_element_is_skipped(self):
+        """Test: Fehler bei einem Element brechen die Platzierung nicht ab."""
+        broken = Mock()
+        broken.Name = "Broken"
+        type(broken).ElementID = property(lambda self: (_ for _ in ()).throw(RuntimeError("COM")))
+
+        placed = place_many_on_diagram(self.diagram, [(broken, 0, 0, 1, 1),
+                                                      (self.elements[5], 0, 0, 1, 1)])
+
+        self.assertEqual(len(placed), 1)
+        self.diagram.DiagramObjects.Refresh.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
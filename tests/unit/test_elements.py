@@ -18,6 +18,9 @@ from ea_automation.elements import (
     Element
 )
 from ea_automation.exceptions import EAError
+from ea_automation.packages import Package
+from ea_automation.index import invalidate_element_index, invalidate_feature_index
+from ea_automation.utils import DeferredUpdateMixin, batch_refresh
 
 
 class TestCreateElement(unittest.TestCase):
@@ -25,9 +28,8 @@ class TestCreateElement(unittest.TestCase):
     
     def setUp(self):
         """Setup für jeden Test."""
-        # Mock Package
-        self.mock_package = Mock()
-        self.mock_package.ea_package = Mock()
+        # Package-Wrapper um ein Mock-Package
+        self.mock_package = Package(Mock())
         self.mock_package.ea_package.Elements = Mock()
         self.mock_elements = self.mock_package.ea_package.Elements
         # Setup Count property
@@ -151,6 +153,58 @@ class TestCreateElement(unittest.TestCase):
         self.assertIn("COM Error", str(context.exception))
     
 
+class TestElementIndex(unittest.TestCase):
+    """Tests für den Hash-Index der Idempotenz-Prüfung in create_element."""
+    
+    def setUp(self):
+        """Setup: Package mit 50 existierenden Elementen."""
+        invalidate_element_index()
+        self.existing = []
+        for i in range(50):
+            elem = Mock()
+            elem.Name = f"Element{i}"
+            elem.Type = "Class"
+            elem.Stereotype = ""
+            elem.ElementID = i
+            self.existing.append(elem)
+        
+        self.mock_package = Mock()
+        self.mock_package.PackageGUID = "{PKG-INDEX}"
+        self.mock_elements = self.mock_package.Elements
+        self.mock_elements.Count = len(self.existing)
+        self.mock_elements.GetAt.side_effect = lambda i: self.existing[i]
+    
+    def tearDown(self):
+        invalidate_element_index()
+    
+    def test_collection_scanned_once(self):
+        """Test: Die Elements-Collection wird nur einmal pro Package gelesen."""
+        for i in range(50):
+            result = create_element(self.mock_package, f"Element{i}", "Class")
+            self.assertIs(result, self.existing[i])
+        
+        self.assertEqual(self.mock_elements.GetAt.call_count, 50)
+        self.mock_elements.AddNew.assert_not_called()
+    
+    def test_new_element_added_to_index(self):
+        """Test: Neu erstellte Elemente werden ohne erneuten Scan gefunden."""
+        mock_new_element = Mock()
+        self.mock_elements.AddNew.return_value = mock_new_element
+        
+        first = create_element(self.mock_package, "Motor", "SysML1.4::Block")
+        second = create_element(self.mock_package, "Motor", "SysML1.4::Block")
+        
+        self.assertIs(first, mock_new_element)
+        self.assertIs(second, mock_new_element)
+        self.mock_elements.AddNew.assert_called_once_with("Motor", "Class")
+        self.assertEqual(self.mock_elements.GetAt.call_count, 50)
+    
+    def test_type_mismatch_creates_new_element(self):
+        """Test: Gleicher Name mit anderem Typ ist kein Treffer."""
+        create_element(self.mock_package, "Element0", "Component")
+        
+        self.mock_elements.AddNew.assert_called_once_with("Element0", "Component")
+
 
 class TestAddAttribute(unittest.TestCase):
     """Tests für die add_attribute Funktion."""
@@ -206,6 +260,19 @@ class TestAddAttribute(unittest.TestCase):
             add_attribute(self.mock_element, "failAttr", "String")
         
         self.assertIn("failAttr", str(context.exception))
+    
+    def test_repeated_adds_scan_collection_once(self):
+        """Test: Mehrere add_attribute-Aufrufe lesen die Collection nur einmal."""
+        existing = [Mock(Name=f"attr{i}", Type="String") for i in range(5)]
+        self.mock_element.Attributes.Count = len(existing)
+        self.mock_element.Attributes.GetAt.side_effect = lambda i: existing[i]
+        self.mock_element.Attributes.AddNew.side_effect = lambda name, type_: Mock(Name=name)
+        
+        for name in ["attr0", "attr3", "id", "status", "id"]:
+            add_attribute(self.mock_element, name, "String")
+        
+        self.assertEqual(self.mock_element.Attributes.GetAt.call_count, 5)
+        self.assertEqual(self.mock_element.Attributes.AddNew.call_count, 2)
 
 
 class TestAddOperation(unittest.TestCase):
@@ -320,6 +387,124 @@ class TestElementClass(unittest.TestCase):
         self.assertEqual(len(result["attributes"]), 0)
         self.assertEqual(len(result["methods"]), 0)
 
+    
+    def test_element_to_dict_reads_each_field_once(self):
+        """Test: to_dict liest jedes skalare Feld nur einmal über COM."""
+        mock_ea_element = Mock()
+        name_property = PropertyMock(return_value="TestClass")
+        type(mock_ea_element).Name = name_property
+        mock_ea_element.Attributes.Count = 0
+        mock_ea_element.Methods.Count = 0
+        
+        Element(mock_ea_element).to_dict()
+        
+        self.assertEqual(name_property.call_count, 1)
+    
+    def test_element_snapshot_serves_properties(self):
+        """Test: Nach snapshot() kommen Properties aus dem Record statt über COM."""
+        mock_ea_element = Mock()
+        name_property = PropertyMock(return_value="Snap")
+        type(mock_ea_element).Name = name_property
+        mock_ea_element.Notes = "Notes"
+        
+        element = Element(mock_ea_element).snapshot()
+        for _ in range(10):
+            self.assertEqual(element.name, "Snap")
+            self.assertEqual(element.notes, "Notes")
+        
+        self.assertEqual(name_property.call_count, 1)
+        
+        # Setter schreiben über COM und halten den Snapshot aktuell
+        element.notes = "Neu"
+        self.assertEqual(element.notes, "Neu")
+        self.assertEqual(mock_ea_element.Notes, "Neu")
+        mock_ea_element.Update.assert_called_once()
+    
+    def test_element_editing_single_update(self):
+        """Test: Mehrere Setter in editing() führen genau ein Update() aus."""
+        mock_ea_element = Mock()
+        element = Element(mock_ea_element)
+        
+        with element.editing():
+            element.name = "Neu"
+            element.notes = "Notizen"
+            element.stereotype = "block"
+            element.status = "Approved"
+            mock_ea_element.Update.assert_not_called()
+        
+        mock_ea_element.Update.assert_called_once()
+        self.assertEqual(mock_ea_element.Name, "Neu")
+        self.assertEqual(mock_ea_element.Status, "Approved")
+    
+    def test_element_editing_no_update_on_error(self):
+        """Test: Bei einer Exception in editing() wird kein Update() ausgeführt."""
+        mock_ea_element = Mock()
+        element = Element(mock_ea_element)
+        
+        with self.assertRaises(ValueError):
+            with element.editing():
+                element.notes = "Notizen"
+                raise ValueError("Abbruch")
+        
+        mock_ea_element.Update.assert_not_called()
+        
+        # Ohne Session schreibt jeder Setter sofort
+        element.notes = "Direkt"
+        mock_ea_element.Update.assert_called_once()
+    
+    def test_wrapper_without_ea_object_fails_on_instantiation(self):
+        """Test: Ein Wrapper ohne _ea_object() kann nicht instanziiert werden."""
+        class Incomplete(DeferredUpdateMixin):
+            pass
+        
+        with self.assertRaises(TypeError):
+            Incomplete()
+    
+    def test_element_add_attributes_single_refresh(self):
+        """Test: Bulk-Insert von Attributen aktualisiert die Collection nur einmal."""
+        mock_ea_element = Mock()
+        element = Element(mock_ea_element)
+        
+        created = element.add_attributes([(f"attr{i}", "String") for i in range(100)])
+        
+        self.assertEqual(len(created), 100)
+        self.assertEqual(mock_ea_element.Attributes.AddNew.call_count, 100)
+        mock_ea_element.Attributes.Refresh.assert_called_once()
+    
+    def test_element_bulk_inserts_update_feature_index(self):
+        """Test: Bulk-Inserts landen im gecachten Feature-Index; add_attribute/add_operation legen keine Duplikate an."""
+        invalidate_feature_index()
+        mock_ea_element = Mock()
+        mock_ea_element.ElementGUID = "{ELEMENT-1}"
+        mock_ea_element.Attributes.Count = 0
+        mock_ea_element.Methods.Count = 0
+        element = Element(mock_ea_element)
+        
+        # Index laden (leere Collections), dann per Bulk einfügen
+        add_attribute(mock_ea_element, "existing", "String")
+        add_operation(mock_ea_element, "existingOp", "void")
+        element.add_attributes([("power", "Real")])
+        element.add_methods([("start", "void")])
+        mock_ea_element.Attributes.AddNew.reset_mock()
+        mock_ea_element.Methods.AddNew.reset_mock()
+        
+        add_attribute(mock_ea_element, "power", "Real")
+        add_operation(mock_ea_element, "start", "void")
+        mock_ea_element.Attributes.AddNew.assert_not_called()
+        mock_ea_element.Methods.AddNew.assert_not_called()
+        invalidate_feature_index()
+    
+    def test_batch_refresh_defers_add_attribute(self):
+        """Test: add_attribute innerhalb von batch_refresh() refresht erst am Ende."""
+        mock_element = Mock()
+        mock_element.Attributes.Count = 0
+        
+        with batch_refresh():
+            for i in range(10):
+                add_attribute(mock_element, f"attr{i}", "String")
+            mock_element.Attributes.Refresh.assert_not_called()
+        
+        mock_element.Attributes.Refresh.assert_called_once()
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
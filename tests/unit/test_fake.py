@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Unit-Tests für fake.py (simuliertes EA-Objektmodell mit Latenz und Aufrufzählung).
+"""
+
+import time
+import unittest
+import sys
+from pathlib import Path
+
+# Füge Parent-Directory zum Path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ea_automation.fake import open_fake_repository
+from ea_automation.elements import add_attribute, create_element
+from ea_automation.diagrams import auto_place_grid, create_diagram
+from ea_automation.index import invalidate_element_index
+from ea_automation.repository import close_repository
+from ea_automation.utils import batch_refresh
+from scripts.build_from_json import ModelBuilder
+
+SPEC = {
+    "model": "CoffeeMachine",
+    "packages": ["02_Architecture"],
+    "elements": [
+        {"package": "02_Architecture", "name": "Machine", "type": "SysML1.4::Block",
+         "attributes": [{"name": "power", "type": "Real"}]},
+        {"package": "02_Architecture", "name": "Pump", "type": "Class"}
+    ],
+    "connectors": [{"type": "Composition", "client": "Machine", "supplier": "Pump"}],
+    "diagrams": [{"package": "02_Architecture", "name": "BDD", "type": "Class", "elements": ["Machine", "Pump"]}]
+}
+
+
+class TestFakeRepository(unittest.TestCase):
+    """Tests für FakeRepository."""
+
+    def setUp(self):
+        """Setup: Leeres simuliertes Repository mit Model und Package."""
+        self.repo = open_fake_repository()
+        models = self.repo.Models
+        model = models.AddNew("Model", "Package")
+        model.Update()
+        models.Refresh()
+        self.package = model.Packages.AddNew("02_Architecture", "Package")
+        self.package.Update()
+        self.repo.stats.reset()
+
+    def tearDown(self):
+        close_repository(self.repo)
+
+    def test_calls_are_counted(self):
+        """Test: Property-Zugriffe, Zuweisungen und Methodenaufrufe werden gezählt."""
+        elements = self.package.Elements
+        element = elements.AddNew("Pump", "Class")
+        element.Notes = "Wasserpumpe"
+        element.Update()
+        self.assertEqual(element.Name, "Pump")
+
+        calls = self.repo.stats.calls
+        self.assertEqual(calls["Package.Elements"], 1)
+        self.assertEqual(calls["Collection.AddNew()"], 1)
+        self.assertEqual(calls["Element.Notes="], 1)
+        self.assertEqual(calls["Element.Update()"], 1)
+        self.assertEqual(calls["Element.Name"], 1)
+        self.assertEqual(self.repo.stats.count("Element."), 3)
+        self.assertEqual(self.repo.stats.total, 5)
+
+    def test_latency_per_call(self):
+        """Test: Jeder Aufruf wartet die eingestellte Latenz ab."""
+        repo = open_fake_repository(latency=0.002)
+        try:
+            start = time.perf_counter()
+            for _ in range(10):
+                repo.Models.Count
+            elapsed = time.perf_counter() - start
+            self.assertEqual(repo.stats.total, 20)
+            self.assertGreaterEqual(elapsed, 20 * 0.002)
+            self.assertAlmostEqual(repo.simulated_seconds, 0.04)
+        finally:
+            close_repository(repo)
+
+    def test_create_element_and_auto_place_grid(self):
+        """Test: Bibliotheksfunktionen laufen auf dem simulierten Repository."""
+        invalidate_element_index()
+        elements = [create_element(self.package, f"Block{i}", "SysML1.4::Block") for i in range(4)]
+        self.assertEqual(create_element(self.package, "Block0", "SysML1.4::Block").ElementID,
+                         elements[0].ElementID)
+        diagram = create_diagram(self.package, "BDD", "Class")
+
+        placed = auto_place_grid(diagram, elements, cols=2)
+        self.assertEqual(len(placed), 4)
+        self.assertEqual(diagram.DiagramObjects.Count, 4)
+        self.assertGreater(self.repo.stats.count("Collection.AddNew()"), 0)
+
+    def test_batch_refresh_coalesces_new_collection_objects(self):
+        """Test: batch_refresh() fasst Collections trotz neuer COM-Objekte je Zugriff zusammen."""
+        invalidate_element_index()
+        with batch_refresh():
+            elements = [create_element(self.package, f"Block{i}", "Class") for i in range(20)]
+            for element in elements[:2]:
+                for i in range(5):
+                    add_attribute(element, f"attr{i}", "Real")
+            self.assertEqual(self.repo.stats.calls["Collection.Refresh()"], 0)
+
+        # Elements des Packages + Attributes der zwei Elemente
+        self.assertEqual(self.repo.stats.calls["Collection.Refresh()"], 3)
+        self.assertEqual(self.package.Elements.Count, 20)
+
+
+class TestFakeModelBuilder(unittest.TestCase):
+    """Tests: ModelBuilder gegen FakeRepository."""
+
+    def test_build_and_rebuild(self):
+        """Test: Zweiter Build ändert nichts und braucht nur wenige Aufrufe."""
+        repo = open_fake_repository()
+        try:
+            builder = ModelBuilder(":memory:", SPEC)
+            builder.repo = repo
+            self.assertTrue(builder.build())
+            self.assertEqual(len(builder.created_connectors), 1)
+            first = repo.stats.total
+
+            repo.stats.reset()
+            builder = ModelBuilder(":memory:", SPEC)
+            builder.repo = repo
+            self.assertTrue(builder.build())
+            self.assertFalse(builder.plan.has_changes)
+            self.assertLess(repo.stats.total, first)
+            self.assertGreater(repo.stats.calls["Repository.SQLQuery()"], 0)
+        finally:
+            close_repository(repo)
+
+
+if __name__ == '__main__':
+    unittest.main()
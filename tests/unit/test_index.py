@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Unit-Tests für index.py (Repository-Index aus SQL-Abfragen).
+"""
+
+import unittest
+from unittest.mock import Mock
+import sys
+from pathlib import Path
+
+# Füge Parent-Directory zum Path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ea_automation.index import (
+    get_connector_index,
+    get_repository_index,
+    invalidate_connector_index,
+    invalidate_feature_index,
+    prefetch_features,
+    invalidate_repository_index,
+    invalidate_element_index,
+    note_package_created
+)
+from ea_automation.elements import add_attribute, add_operation, create_element
+from ea_automation.connectors import create_connector
+from sql_fixtures import sqlquery_xml
+
+
+PACKAGES = [
+    {"Package_ID": 1, "Parent_ID": 0, "Name": "Model", "ea_guid": "{P1}"},
+    {"Package_ID": 2, "Parent_ID": 1, "Name": "02_Architecture", "ea_guid": "{P2}"},
+    {"Package_ID": 3, "Parent_ID": 2, "Name": "Subsystems", "ea_guid": "{P3}"},
+    {"Package_ID": 4, "Parent_ID": 3, "Name": "Hydraulics", "ea_guid": "{P4}"},
+    {"Package_ID": 5, "Parent_ID": 1, "Name": "Hydraulics", "ea_guid": "{P5}"},
+]
+ELEMENTS = [
+    {"Object_ID": 10, "Package_ID": 2, "Name": "CoffeeMachine", "Object_Type": "Class",
+     "Stereotype": "block", "ea_guid": "{E10}"},
+    {"Object_ID": 11, "Package_ID": 4, "Name": "Pump", "Object_Type": "Class", "ea_guid": "{E11}"},
+    {"Object_ID": 12, "Package_ID": 5, "Name": "Pump", "Object_Type": "Requirement", "ea_guid": "{E12}"},
+]
+
+
+class TestRepositoryIndex(unittest.TestCase):
+    """Tests für RepositoryIndex."""
+
+    def setUp(self):
+        """Setup: Repository-Mock mit SQLQuery und Get*ByID."""
+        invalidate_repository_index()
+        invalidate_element_index()
+
+        def sql_query(sql):
+            return sqlquery_xml(PACKAGES if "t_package" in sql else ELEMENTS)
+
+        def by_id(object_id):
+            obj = Mock()
+            obj.ObjectID = object_id
+            return obj
+
+        self.repo = Mock()
+        self.repo.SQLQuery.side_effect = sql_query
+        self.repo.GetPackageByID.side_effect = by_id
+        self.repo.GetElementByID.side_effect = by_id
+        self.index = get_repository_index(self.repo)
+
+    def tearDown(self):
+        invalidate_repository_index()
+        invalidate_element_index()
+
+    def test_single_pass_and_shared(self):
+        """Test: Zwei SQL-Abfragen, kein Durchlaufen der Collections, Index wird wiederverwendet."""
+        self.assertEqual(self.repo.SQLQuery.call_count, 2)
+        self.assertIs(get_repository_index(self.repo), self.index)
+        self.assertEqual(self.repo.SQLQuery.call_count, 2)
+        self.repo.Models.GetAt.assert_not_called()
+
+    def test_find_package_any_depth(self):
+        """Test: Packages nach Pfad und Name in beliebiger Tiefe."""
+        self.assertEqual(self.index.find_package("Model/02_Architecture/Subsystems").ObjectID, 3)
+        self.assertEqual(self.index.find_package("Subsystems").ObjectID, 3)
+        # Bei Namensgleichheit gewinnt das flachste Package
+        self.assertEqual(self.index.find_package("Hydraulics").ObjectID, 5)
+        self.assertEqual(self.index.find_package("Model/02_Architecture/Subsystems/Hydraulics").ObjectID, 4)
+        self.assertIsNone(self.index.find_package("Unknown"))
+        self.assertEqual(self.index.qualified_name(4), "Model/02_Architecture/Subsystems/Hydraulics")
+
+    def test_find_element(self):
+        """Test: Elemente nach Name, Pfad, Package, Typ, GUID und ID."""
+        self.assertEqual(self.index.find_element("Pump").ObjectID, 11)
+        self.assertEqual(self.index.find_element("Model/Hydraulics/Pump").ObjectID, 12)
+        self.assertEqual(self.index.find_element("Pump", package="Model/Hydraulics").ObjectID, 12)
+        self.assertEqual(self.index.find_element("Pump", element_type="Requirement").ObjectID, 12)
+        self.assertIsNone(self.index.find_element("CoffeeMachine", package="Hydraulics"))
+        self.assertEqual(self.index.element_by_guid("{E10}").ObjectID, 10)
+        self.assertEqual(self.index.package_by_id(2).ObjectID, 2)
+        # COM-Objekte werden zwischengespeichert
+        self.index.find_element("Pump")
+        self.assertEqual(self.repo.GetElementByID.call_count, 3)
+
+    def test_kept_up_to_date_on_create(self):
+        """Test: Von der Bibliothek erstellte Packages und Elemente landen im Index."""
+        parent = Mock()
+        parent.PackageGUID = "{P2}"
+        new_package = Mock(spec=["PackageID", "PackageGUID", "Elements"])
+        new_package.Elements = Mock()
+        new_package.PackageID = 6
+        new_package.PackageGUID = "{P6}"
+        note_package_created(parent, new_package, "Sensors")
+
+        self.assertIs(self.index.find_package("Model/02_Architecture/Sensors"), new_package)
+
+        new_package.Elements.Count = 0
+        new_element = Mock()
+        new_element.ElementID = 20
+        new_element.ElementGUID = "{E20}"
+        new_package.Elements.AddNew.return_value = new_element
+        create_element(new_package, "FlowSensor", "Class")
+
+        self.assertIs(self.index.find_element("FlowSensor"), new_element)
+        self.assertIs(self.index.find_element("Model/02_Architecture/Sensors/FlowSensor"), new_element)
+        self.assertIs(self.index.element_by_id(20), new_element)
+
+
+CONNECTORS = [
+    {"Connector_ID": 100, "Start_Object_ID": 10, "End_Object_ID": 11,
+     "Connector_Type": "Association", "Name": "supplies"},
+    {"Connector_ID": 101, "Start_Object_ID": 10, "End_Object_ID": 11, "Connector_Type": "Dependency"},
+]
+
+
+class TestConnectorIndex(unittest.TestCase):
+    """Tests für ConnectorIndex."""
+
+    def setUp(self):
+        """Setup: Repository-Mock mit t_connector."""
+        invalidate_connector_index()
+        self.repo = Mock()
+        self.repo.SQLQuery.return_value = sqlquery_xml(CONNECTORS)
+        self.index = get_connector_index(self.repo)
+
+    def tearDown(self):
+        invalidate_connector_index()
+
+    def test_lookup_by_key(self):
+        """Test: Existenzprüfung nach (Client, Supplier, Typ, Name) ohne COM-Zugriff."""
+        self.repo.SQLQuery.assert_called_once()
+        self.assertTrue(self.index.exists(10, 11, "Association"))
+        self.assertTrue(self.index.exists(10, 11, "Association", "supplies"))
+        self.assertFalse(self.index.exists(10, 11, "Association", "other"))
+        self.assertFalse(self.index.exists(11, 10, "Association"))
+        self.repo.GetConnectorByID.assert_not_called()
+
+        self.index.find(10, 11, "Dependency")
+        self.repo.GetConnectorByID.assert_called_once_with(101)
+
+    def test_create_connector_idempotent(self):
+        """Test: create_connector mit Index erstellt jeden Connector nur einmal."""
+        source = Mock(spec=["ElementID", "Name", "Connectors"])
+        source.ElementID = 10
+        source.Name = "CoffeeMachine"
+        source.Connectors = Mock()
+        target = Mock(spec=["ElementID", "Name"])
+        target.ElementID = 12
+        target.Name = "Grinder"
+        new_connector = Mock()
+        new_connector.ConnectorID = 102
+        source.Connectors.AddNew.return_value = new_connector
+
+        first = create_connector(source, target, "Association", connector_index=self.index)
+        second = create_connector(source, target, "Association", connector_index=self.index)
+
+        source.Connectors.AddNew.assert_called_once_with("", "Association")
+        self.assertIs(first.ea_connector, new_connector)
+        self.assertIs(second.ea_connector, new_connector)
+        self.assertTrue(self.index.exists(10, 12, "Association"))
+
+
+class TestPrefetchFeatures(unittest.TestCase):
+    """Tests für prefetch_features."""
+
+    def setUp(self):
+        """Setup: Repository-Mock mit t_attribute und t_operation."""
+        invalidate_feature_index()
+        attributes = [
+            {"ID": 1, "Object_ID": 10, "Name": "id", "Type": "String", "Pos": 0},
+            {"ID": 2, "Object_ID": 10, "Name": "status", "Type": "Integer", "Pos": 1},
+            {"ID": 3, "Object_ID": 11, "Name": "id", "Type": "String", "Pos": 0},
+        ]
+        operations = [
+            {"OperationID": 7, "Object_ID": 11, "Name": "reset", "Type": "void", "Pos": 0},
+        ]
+
+        def sql_query(sql):
+            return sqlquery_xml(attributes if "t_attribute" in sql else operations)
+
+        self.repo = Mock()
+        self.repo.SQLQuery.side_effect = sql_query
+        self.elements = []
+        for element_id in (10, 11):
+            element = Mock()
+            element.ElementID = element_id
+            element.ElementGUID = f"{{E{element_id}}}"
+            element.Name = f"Block{element_id}"
+            self.elements.append(element)
+
+    def tearDown(self):
+        invalidate_feature_index()
+
+    def test_bulk_loaded_maps_used_by_add_functions(self):
+        """Test: add_attribute/add_operation prüfen gegen vorab geladene Maps."""
+        prefetch_features(self.repo, self.elements)
+        self.assertEqual(self.repo.SQLQuery.call_count, 2)
+        self.assertIn("IN (10,11)", self.repo.SQLQuery.call_args_list[0][0][0])
+
+        block10, block11 = self.elements
+        add_attribute(block10, "id", "String")
+        add_attribute(block10, "timestamp", "DateTime")
+        add_attribute(block10, "timestamp", "DateTime")
+        add_attribute(block10, "status", "String")
+        add_operation(block11, "reset", "void")
+
+        # Keine Collection-Scans, nur ein neues Attribut
+        block10.Attributes.GetAt.assert_not_called()
+        block10.Attributes.AddNew.assert_called_once_with("timestamp", "DateTime")
+        block11.Methods.GetAt.assert_not_called()
+        block11.Methods.AddNew.assert_not_called()
+        # Vorhandene Attribute werden erst bei Bedarf über ihre ID geholt
+        self.assertEqual([c[0][0] for c in self.repo.GetAttributeByID.call_args_list], [1, 2])
+        self.repo.GetAttributeByID.return_value.Update.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Unit-Tests für journal.py (Journal und --resume für ModelBuilder).
+"""
+
+import json
+import unittest
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+# Füge Parent-Directory zum Path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ea_automation.journal import BuildJournal
+from ea_automation.qea import open_qea
+from ea_automation.bulk import export_model_tree
+from scripts import build_from_json
+from scripts.build_from_json import ModelBuilder
+from qea_fixtures import SPEC as BASE_SPEC, make_empty_qea
+
+# Sechs Elemente, damit ein Abbruch mitten in der Element-Phase möglich ist
+SPEC = dict(BASE_SPEC, elements=[
+    {"package": "02_Architecture", "name": f"Block{i}", "type": "Class",
+     "attributes": [{"name": "id", "type": "Integer"}]}
+    for i in range(6)
+], connectors=[{"type": "Composition", "client": "Block0", "supplier": "Block5"}], diagrams=[])
+
+
+class TestBuildJournal(unittest.TestCase):
+    """Tests für BuildJournal."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "model.journal"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def lines(self):
+        return self.path.read_text(encoding="utf-8").splitlines()
+
+    def test_records_are_flushed_in_batches(self):
+        """Test: Operationen werden erst bei voller Batch-Größe geschrieben."""
+        journal = BuildJournal(str(self.path), batch_size=3)
+        journal.open("repo.qea", SPEC)
+        journal.record("element", "02_Architecture/Block0", "{A}")
+        journal.record("element", "02_Architecture/Block1", "{B}")
+        self.assertEqual(len(self.lines()), 1)  # nur der Header
+
+        journal.record("element", "02_Architecture/Block2", "{C}")
+        self.assertEqual(len(self.lines()), 4)
+        journal.close()
+
+    def test_resume_ignores_truncated_line(self):
+        """Test: Eine abgebrochene letzte Zeile wird beim Fortsetzen ignoriert."""
+        journal = BuildJournal(str(self.path), batch_size=1)
+        journal.open("repo.qea", SPEC)
+        journal.record("package", "02_Architecture", "{P}")
+        journal.close()
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write('{"kind": "element", "key": "02_Arch')
+
+        resumed = BuildJournal(str(self.path))
+        self.assertEqual(resumed.open("repo.qea", SPEC, resume=True), 1)
+        self.assertTrue(resumed.is_done("package", "02_Architecture"))
+        pending = resumed.pending_spec(SPEC)
+        self.assertEqual(pending["packages"], [])
+        self.assertEqual(len(pending["elements"]), 6)
+        resumed.close()
+
+    def test_journal_of_other_spec_is_discarded(self):
+        """Test: Ein Journal einer anderen Spezifikation wird nicht fortgesetzt."""
+        journal = BuildJournal(str(self.path), batch_size=1)
+        journal.open("repo.qea", SPEC)
+        journal.record("package", "02_Architecture", "{P}")
+        journal.close()
+
+        resumed = BuildJournal(str(self.path))
+        self.assertEqual(resumed.open("repo.qea", dict(SPEC, model="Other"), resume=True), 0)
+        resumed.close()
+        self.assertEqual(len(self.lines()), 1)
+        self.assertEqual(json.loads(self.lines()[0])["repository"], "repo.qea")
+
+
+class TestResumeBuild(unittest.TestCase):
+    """Tests für ModelBuilder mit Journal und resume."""
+
+    def setUp(self):
+        """Setup: Leere .qea-Datei und Pfad des Journals."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = make_empty_qea(self.tmp.name)
+        self.journal_path = Path(self.tmp.name) / "model.journal"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build(self, resume=False, fail_on=None, crash_after=None):
+        """Build mit Journal; fail_on lässt ein Element scheitern, crash_after bricht ab."""
+        calls = []
+        create_element = build_from_json.create_element
+
+        def failing_create_element(package, name, *args, **kwargs):
+            calls.append(name)
+            if name == fail_on:
+                raise Exception("Internal Application Error (61704)")
+            if crash_after is not None and len(calls) > crash_after:
+                raise KeyboardInterrupt()
+            return create_element(package, name, *args, **kwargs)
+
+        builder = ModelBuilder(str(self.path), SPEC, backend="sqlite",
+                               journal_file=str(self.journal_path), resume=resume)
+        self.assertTrue(builder.connect())
+        try:
+            with patch.object(build_from_json, "create_element", side_effect=failing_create_element):
+                try:
+                    self.assertEqual(builder.build(full=True), fail_on is None)
+                except KeyboardInterrupt:
+                    pass
+        finally:
+            builder.disconnect()
+        return builder, calls
+
+    def _names(self, node):
+        for element in node.get("elements", []):
+            yield element["name"]
+        for package in node.get("packages", []):
+            yield from self._names(package)
+
+    def _names_in_repo(self):
+        repo = open_qea(str(self.path))
+        try:
+            return [name for model in export_model_tree(repo) for name in self._names(model)]
+        finally:
+            repo.CloseFile()
+
+    def test_resume_continues_after_crash(self):
+        """Test: Nach einem Abbruch werden nur die offenen Operationen ausgeführt."""
+        _, calls = self.build(crash_after=3)
+        self.assertEqual(calls, ["Block0", "Block1", "Block2", "Block3"])
+        self.assertTrue(self.journal_path.exists())
+
+        builder, calls = self.build(resume=True)
+        self.assertEqual(calls, ["Block3", "Block4", "Block5"])
+        self.assertEqual(len(builder.created_connectors), 1)
+        self.assertFalse(self.journal_path.exists())
+        self.assertEqual(sorted(self._names_in_repo()), [f"Block{i}" for i in range(6)])
+
+    def test_failed_operation_stays_open(self):
+        """Test: Fehlgeschlagene Elemente bleiben im Journal offen und werden wiederholt."""
+        builder, _ = self.build(fail_on="Block2")
+        self.assertEqual(builder.failures, 1)
+        self.assertTrue(self.journal_path.exists())
+
+        builder, calls = self.build(resume=True)
+        self.assertEqual(calls, ["Block2"])
+        self.assertEqual(builder.failures, 0)
+        self.assertFalse(self.journal_path.exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
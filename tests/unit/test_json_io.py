@@ -14,12 +14,18 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from ea_automation.json_io import (
+    ERROR,
+    WARNING,
+    check_model_spec_logic,
+    iter_model_spec,
     load_model_spec,
     validate_json_against_schema,
     MODEL_SPEC_SCHEMA,
     _validate_model_spec_logic
 )
 from ea_automation.exceptions import EAError
+from scripts.build_from_json import ModelBuilder
+from qea_fixtures import make_empty_qea
 
 
 class TestLoadModelSpec(unittest.TestCase):
@@ -278,6 +284,52 @@ class TestModelSpecLogicValidation(unittest.TestCase):
             _validate_model_spec_logic(spec)
         except EAError:
             self.fail("Should not raise exception for undefined package")
+    
+    def test_check_collects_all_issues(self):
+        """Test: Alle Fehler und Warnungen werden in einem Durchlauf gesammelt."""
+        spec = {
+            "model": "Test",
+            "packages": ["P1"],
+            "elements": [
+                {"package": "P1", "name": "A", "type": "Class"},
+                {"package": "P1", "name": "A", "type": "Class"},
+                {"package": "P2", "name": "B", "type": "Class"}
+            ],
+            "connectors": [
+                {"type": "Usage", "client": "X", "supplier": "Y"},
+                {"type": "Usage", "client": "A", "supplier": "B"}
+            ],
+            "diagrams": [{"package": "P1", "name": "D", "type": "Class", "elements": ["A", "Z"]}]
+        }
+        
+        issues = check_model_spec_logic(spec)
+        
+        self.assertEqual([(i.severity, i.path) for i in issues], [
+            (ERROR, "elements -> 1"),
+            (WARNING, "elements -> 2"),
+            (ERROR, "connectors -> 0 -> client"),
+            (ERROR, "connectors -> 0 -> supplier"),
+            (WARNING, "diagrams -> 0 -> elements -> 1"),
+        ])
+        self.assertIn("bereits in elements -> 0", issues[0].message)
+        
+        with self.assertRaises(EAError) as context:
+            _validate_model_spec_logic(spec)
+        message = str(context.exception)
+        self.assertTrue(message.startswith("Doppeltes Element 'A'"))
+        self.assertIn("und 2 weitere Fehler", message)
+        self.assertIn("undefiniertes Supplier-Element 'Y'", message)
+    
+    def test_check_consistent_spec(self):
+        """Test: Konsistente Spezifikation ergibt keine Probleme."""
+        spec = {
+            "model": "Test",
+            "packages": ["P1"],
+            "elements": [{"package": "P1", "name": "A", "type": "Class"}],
+            "connectors": [{"type": "Usage", "client": "A", "supplier": "A"}]
+        }
+        
+        self.assertEqual(check_model_spec_logic(spec), [])
 
 
 class TestValidateJsonAgainstSchema(unittest.TestCase):
@@ -363,5 +415,138 @@ class TestValidateJsonAgainstSchema(unittest.TestCase):
         self.assertEqual(len(errors), 0)
 
 
+class TestIterModelSpec(unittest.TestCase):
+    """Tests für iter_model_spec (Streaming-Modus)."""
+    
+    def setUp(self):
+        """Setup: Temporäres Verzeichnis für Spezifikationen."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "spec.json"
+        self.spec = {
+            "model": "TestModel",
+            "packages": ["P1"],
+            "elements": [
+                {"package": "P1", "name": f"E{i}", "type": "Class",
+                 "attributes": [{"name": "value", "type": "Real"}]}
+                for i in range(50)
+            ],
+            "connectors": [{"type": "Association", "client": "E1", "supplier": "E2"}],
+            "diagrams": [{"package": "P1", "name": "Overview", "type": "Class", "elements": ["E1"]}]
+        }
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def write(self, text):
+        self.path.write_text(text, encoding="utf-8")
+    
+    def test_items_match_load_model_spec(self):
+        """Test: Gestreamte Einträge entsprechen der geladenen Spezifikation (kleine Blöcke)."""
+        self.write(json.dumps(self.spec, indent=2))
+        events = list(iter_model_spec(str(self.path), chunk_size=7))
+        
+        self.assertEqual(events[0], ("model", "TestModel"))
+        spec = load_model_spec(str(self.path))
+        for section in ("packages", "elements", "connectors", "diagrams"):
+            self.assertEqual([value for key, value in events if key == section], spec[section])
+    
+    def test_items_are_yielded_before_file_is_read(self):
+        """Test: Die ersten Einträge kommen, bevor das Dokument zu Ende gelesen ist."""
+        self.write(json.dumps(self.spec)[:-20])  # abgeschnittenes Dokument
+        events = iter_model_spec(str(self.path), chunk_size=64)
+        
+        self.assertEqual(next(events), ("model", "TestModel"))
+        self.assertEqual(next(events), ("packages", "P1"))
+        self.assertEqual(next(events)[1]["name"], "E0")
+        with self.assertRaises(EAError) as context:
+            list(events)
+        self.assertIn("JSON-Syntaxfehler", str(context.exception))
+    
+    def test_item_is_validated_against_sub_schema(self):
+        """Test: Ungültiger Eintrag wird mit Pfad gemeldet."""
+        self.spec["connectors"][0]["type"] = "InvalidType"
+        self.write(json.dumps(self.spec))
+        
+        with self.assertRaises(EAError) as context:
+            list(iter_model_spec(str(self.path)))
+        self.assertIn("connectors -> 0 -> type", str(context.exception))
+    
+    def test_syntax_error_reports_line_and_column(self):
+        """Test: Syntaxfehler nennt Zeile und Spalte auch über Blockgrenzen."""
+        self.write('{"model": "M",\n "elements": [\n  {"package": "P", "name": "A" "type": "Class"}]}')
+        
+        with self.assertRaises(EAError) as context:
+            list(iter_model_spec(str(self.path), chunk_size=5))
+        self.assertIn("Zeile 3, Spalte 32", str(context.exception))
+    
+    def test_connector_before_elements_checked_at_end(self):
+        """Test: Connector-Referenzen vor den Elementen werden am Dateiende geprüft."""
+        spec = {"model": "M", "connectors": [{"type": "Usage", "client": "A", "supplier": "X"}],
+                "elements": [{"package": "P", "name": "A", "type": "Class"}]}
+        self.write(json.dumps(spec))
+        
+        with self.assertRaises(EAError) as context:
+            list(iter_model_spec(str(self.path)))
+        self.assertIn("Supplier-Element 'X'", str(context.exception))
+    
+    def test_model_must_precede_sections(self):
+        """Test: 'model' nach den Listen ist im Streaming-Modus ein Fehler."""
+        self.write(json.dumps({"packages": ["P1"], "model": "M"}))
+        
+        with self.assertRaises(EAError) as context:
+            list(iter_model_spec(str(self.path)))
+        self.assertIn("'model' muss vor 'packages'", str(context.exception))
+    
+    def connect_builder(self):
+        """Erstellt eine leere .qea-Datei und einen verbundenen ModelBuilder."""
+        repo_path = make_empty_qea(self.tmp.name)
+        builder = ModelBuilder(str(repo_path), {}, backend="sqlite")
+        self.assertTrue(builder.connect())
+        return builder
+    
+    def test_build_stream(self):
+        """Test: ModelBuilder.build_stream wendet die gestreamten Einträge in Batches an."""
+        self.write(json.dumps(self.spec))
+        builder = self.connect_builder()
+        try:
+            batches = []
+            create_elements = builder.create_elements
+            builder.create_elements = lambda batch: (batches.append(len(batch)), create_elements(batch))
+            self.assertTrue(builder.build_stream(iter_model_spec(str(self.path)), batch_size=20))
+        finally:
+            builder.disconnect()
+        
+        self.assertEqual(batches, [20, 20, 10])
+        self.assertEqual(builder.spec, {"model": "TestModel"})
+        self.assertEqual(len(builder.created_elements), 50)
+        self.assertEqual(len(builder.created_connectors), 1)
+    
+    def test_build_stream_connectors_before_elements(self):
+        """Test: Connectors und Diagramme vor den Elementen werden erst nach den Elementen angewendet."""
+        spec = {"model": "TestModel", "connectors": self.spec["connectors"],
+                "diagrams": self.spec["diagrams"], "packages": ["P1"], "elements": self.spec["elements"]}
+        self.write(json.dumps(spec))
+        builder = self.connect_builder()
+        try:
+            self.assertTrue(builder.build_stream(iter_model_spec(str(self.path)), batch_size=20))
+        finally:
+            builder.disconnect()
+        
+        self.assertEqual(builder.failures, 0)
+        self.assertEqual(len(builder.created_connectors), 1)
+    
+    def test_build_stream_fails_on_failed_entries(self):
+        """Test: build_stream liefert False, wenn Einträge fehlschlagen."""
+        events = [("model", "TestModel"),
+                  ("connectors", {"type": "Association", "client": "E1", "supplier": "E2"})]
+        builder = self.connect_builder()
+        try:
+            self.assertFalse(builder.build_stream(iter(events)))
+        finally:
+            builder.disconnect()
+        
+        self.assertEqual(builder.failures, 1)
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
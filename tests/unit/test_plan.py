@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Unit-Tests für plan.py (Diff zwischen Spezifikation und Repository).
+"""
+
+import copy
+import unittest
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+# Füge Parent-Directory zum Path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ea_automation.qea import open_qea
+from ea_automation.qea_writer import write_model_spec
+from ea_automation.plan import CREATE, NOOP, UPDATE, plan_model_spec
+from ea_automation.bulk import export_model_tree
+from scripts import build_from_json
+from scripts.build_from_json import ModelBuilder
+from qea_fixtures import SPEC, make_empty_qea
+
+
+class TestPlanModelSpec(unittest.TestCase):
+    """Tests für plan_model_spec und den Delta-Build."""
+
+    def setUp(self):
+        """Setup: .qea-Datei mit dem Stand von SPEC."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = make_empty_qea(self.tmp.name)
+        write_model_spec(str(self.path), SPEC)
+        self.repo = open_qea(str(self.path))
+
+    def tearDown(self):
+        self.repo.CloseFile()
+        self.tmp.cleanup()
+
+    def test_unchanged_spec_is_noop(self):
+        """Test: Unveränderte Spezifikation ergibt nur No-ops."""
+        plan = plan_model_spec(self.repo, SPEC)
+
+        self.assertFalse(plan.has_changes)
+        self.assertTrue(all(change.action == NOOP for change in plan.changes))
+        self.assertEqual(plan.delta["elements"], [])
+        self.assertEqual(plan.counts()["attribute"][NOOP], 1)
+
+    def test_delta(self):
+        """Test: Nur geänderte Teile landen im Delta."""
+        spec = copy.deepcopy(SPEC)
+        machine = spec["elements"][0]
+        machine["notes"] = "Kaffeemaschine"
+        machine["attributes"].append({"name": "mode"})
+        machine["operations"][0]["returnType"] = "void"
+        spec["elements"].append({"package": "03_Interfaces", "name": "IWater", "type": "Interface"})
+        spec["connectors"].append({"type": "Realization", "client": "Pump", "supplier": "IWater"})
+
+        plan = plan_model_spec(self.repo, spec)
+        actions = {(c.kind, c.name): c.action for c in plan.changes}
+
+        self.assertEqual(actions[("element", "02_Architecture/Machine")], UPDATE)
+        self.assertEqual(actions[("attribute", "Machine.power")], NOOP)
+        self.assertEqual(actions[("attribute", "Machine.mode")], CREATE)
+        self.assertEqual(actions[("operation", "Machine.brew()")], UPDATE)
+        self.assertEqual(actions[("element", "02_Architecture/Pump")], NOOP)
+        self.assertEqual(actions[("package", "03_Interfaces")], CREATE)
+        self.assertEqual(actions[("connector", "Machine --Composition--> Pump")], NOOP)
+
+        delta_machine = plan.delta["elements"][0]
+        self.assertEqual(delta_machine["notes"], "Kaffeemaschine")
+        self.assertEqual([a["name"] for a in delta_machine["attributes"]], ["mode"])
+        self.assertEqual([e["name"] for e in plan.delta["elements"]], ["Machine", "IWater"])
+        self.assertEqual(len(plan.delta["connectors"]), 1)
+        self.assertEqual(plan.delta["diagrams"], [])
+        self.assertIn("+ element 03_Interfaces/IWater (Interface)", plan.format())
+        self.assertNotIn("= element", plan.format())
+
+    def test_diagram_contents_are_compared(self):
+        """Test: Neue Elemente eines vorhandenen Diagramms werden geplant und ergänzt."""
+        spec = copy.deepcopy(SPEC)
+        spec["diagrams"][0]["elements"] += ["Pump", "Unknown"]
+
+        plan = plan_model_spec(self.repo, spec)
+        change = next(c for c in plan.changes if c.kind == "diagram")
+        self.assertEqual((change.action, change.details), (UPDATE, "+ Pump"))
+        self.assertEqual(plan.delta["diagrams"][0]["elements"], ["Pump"])
+
+        for _ in range(2):
+            builder = ModelBuilder(str(self.path), spec, backend="sqlite")
+            self.assertTrue(builder.connect())
+            try:
+                self.assertTrue(builder.build())
+            finally:
+                builder.disconnect()
+        self.assertFalse(builder.plan.has_changes)
+
+        reader = open_qea(str(self.path))
+        try:
+            diagrams = export_model_tree(reader)[0]["packages"][0]["diagrams"]
+            self.assertEqual(len(diagrams), 1)
+            self.assertEqual(len(diagrams[0]["objects"]), 2)
+        finally:
+            reader.CloseFile()
+
+    def test_builder_applies_only_delta(self):
+        """Test: ModelBuilder wendet nur das Delta an, ein zweiter Lauf ändert nichts."""
+        spec = copy.deepcopy(SPEC)
+        spec["elements"][1]["attributes"] = [{"name": "flow", "type": "Real"}]
+
+        builder = ModelBuilder(str(self.path), spec, backend="sqlite")
+        self.assertTrue(builder.connect())
+        try:
+            with patch.object(build_from_json, "create_element",
+                              wraps=build_from_json.create_element) as create:
+                self.assertTrue(builder.build())
+            # Nur Pump wird bearbeitet
+            self.assertEqual([c.args[1] for c in create.call_args_list], ["Pump"])
+        finally:
+            builder.disconnect()
+
+        builder = ModelBuilder(str(self.path), spec, backend="sqlite")
+        builder.connect()
+        try:
+            self.assertTrue(builder.build())
+            self.assertFalse(builder.plan.has_changes)
+        finally:
+            builder.disconnect()
+
+        reader = open_qea(str(self.path))
+        try:
+            architecture = export_model_tree(reader)[0]["packages"][0]
+            self.assertEqual(len(architecture["elements"]), 2)
+            self.assertEqual(architecture["elements"][1]["attributes"][0]["name"], "flow")
+            self.assertEqual(len(architecture["diagrams"]), 1)
+        finally:
+            reader.CloseFile()
+
+    def test_builder_resolves_packages_below_model(self):
+        """Test: Delta-Elemente landen im Package unter dem Model, nicht im gleichnamigen Package eines anderen Models."""
+        spec = copy.deepcopy(SPEC)
+        spec["model"] = "Heater"
+        write_model_spec(str(self.path), spec)
+        spec["elements"].append({"package": "02_Architecture", "name": "Valve", "type": "Class"})
+
+        for _ in range(2):
+            builder = ModelBuilder(str(self.path), spec, backend="sqlite")
+            self.assertTrue(builder.connect())
+            try:
+                self.assertTrue(builder.build())
+            finally:
+                builder.disconnect()
+        self.assertFalse(builder.plan.has_changes)
+
+        reader = open_qea(str(self.path))
+        try:
+            models = {m["name"]: m for m in export_model_tree(reader)}
+            self.assertIn("Valve", [e["name"] for e in models["Heater"]["packages"][0]["elements"]])
+            self.assertEqual(len(models["CoffeeMachine"]["packages"][0]["elements"]), 2)
+        finally:
+            reader.CloseFile()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Unit-Tests für qea.py (lesender Zugriff auf .qea-Dateien ohne EA).
+"""
+
+import unittest
+import sqlite3
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Füge Parent-Directory zum Path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ea_automation.qea import create_schema, open_qea
+from ea_automation.packages import Package, get_model_root
+from ea_automation.elements import Element
+from ea_automation.connectors import Connector
+from ea_automation.diagrams import Diagram
+from ea_automation.bulk import export_model_tree
+from ea_automation.index import get_repository_index, invalidate_repository_index
+from ea_automation.exceptions import EAConnectionError, EAError
+
+
+def build_sample_qea(path: Path) -> None:
+    """Erzeugt eine kleine .qea-Datei mit Model, Packages, Elementen, Connector und Diagramm."""
+    connection = sqlite3.connect(str(path))
+    create_schema(connection)
+    connection.executescript("""
+        INSERT INTO t_package (Package_ID, Name, Parent_ID, ea_guid, Notes, TPos) VALUES
+            (1, 'Model', 0, '{P1}', NULL, 0),
+            (2, '02_Architecture', 1, '{P2}', 'Architektur', 1),
+            (3, '01_Requirements', 1, '{P3}', NULL, 0);
+        INSERT INTO t_object (Object_ID, Object_Type, Name, Note, Package_ID, Stereotype, Status, ea_guid) VALUES
+            (10, 'Class', 'Pump', 'Pumpe & Motor', 2, 'block', 'Proposed', '{E10}'),
+            (11, 'Class', 'Boiler', NULL, 2, 'block', 'Proposed', '{E11}'),
+            (12, 'Package', '02_Architecture', NULL, 1, NULL, NULL, '{P2}');
+        INSERT INTO t_attribute (Object_ID, Name, Scope, Type, Pos) VALUES
+            (10, 'pressure', 'Private', 'Double', 1),
+            (10, 'flowRate', 'Private', 'Double', 0);
+        INSERT INTO t_operation (Object_ID, Name, Scope, Type, Pos) VALUES
+            (10, 'start', 'Public', 'Boolean', 0);
+        INSERT INTO t_connector (Connector_ID, Connector_Type, Direction, Start_Object_ID, End_Object_ID,
+                                 DestCard, ea_guid) VALUES
+            (5, 'Association', 'Source -> Destination', 10, 11, '1', '{C5}');
+        INSERT INTO t_diagram (Diagram_ID, Package_ID, Diagram_Type, Name, ea_guid) VALUES
+            (7, 2, 'Logical', 'BDD', '{D7}');
+        INSERT INTO t_diagramobjects (Diagram_ID, Object_ID, RectTop, RectLeft, RectRight, RectBottom, Sequence) VALUES
+            (7, 10, -50, 50, 300, -220, 1);
+    """)
+    connection.commit()
+    connection.close()
+
+
+class TestQeaRepository(unittest.TestCase):
+    """Tests für QeaRepository mit den bestehenden Wrapper-Klassen."""
+
+    def setUp(self):
+        """Setup: Beispiel-.qea in temporärem Verzeichnis."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "sample.qea"
+        build_sample_qea(self.path)
+        self.repo = open_qea(str(self.path))
+
+    def tearDown(self):
+        self.repo.CloseFile()
+        invalidate_repository_index()
+        self.tmp.cleanup()
+
+    def test_package_tree(self):
+        """Test: Package-Wrapper liest Baum, Sortierung nach TPos."""
+        model = get_model_root(self.repo)
+        self.assertEqual(model.name, "Model")
+        self.assertEqual([p.name for p in model.get_packages()], ["01_Requirements", "02_Architecture"])
+        self.assertEqual(model.to_dict()["packages"][1]["notes"], "Architektur")
+
+    def test_element_connector_diagram(self):
+        """Test: Elemente mit Attributen, Connectors und Diagrammobjekte."""
+        architecture = self.repo.GetPackageByGuid("{P2}")
+        elements = architecture.Elements
+        # Package-Objekte in t_object gehören nicht zu den Elementen
+        self.assertEqual(elements.Count, 2)
+
+        pump = Element(self.repo.GetElementByID(10)).to_dict()
+        self.assertEqual(pump["notes"], "Pumpe & Motor")
+        self.assertEqual([a["name"] for a in pump["attributes"]], ["flowRate", "pressure"])
+        self.assertEqual(pump["methods"][0]["return_type"], "Boolean")
+
+        boiler = self.repo.GetElementByID(11)
+        self.assertEqual(boiler.Notes, "")
+        self.assertEqual(boiler.Connectors.Count, 1)
+        connector = Connector(boiler.Connectors.GetAt(0)).to_dict()
+        self.assertEqual(connector["target_element_id"], 11)
+        self.assertEqual(connector["target_role"]["multiplicity"], "1")
+
+        diagram = Diagram(architecture.Diagrams.GetAt(0))
+        self.assertEqual(diagram.get_diagram_objects()[0]["top"], -50)
+
+    def test_sql_export_and_index(self):
+        """Test: SQLQuery liefert EA-XML für Export und Repository-Index."""
+        tree = export_model_tree(self.repo)
+        architecture = tree[0]["packages"][1]
+        self.assertEqual([e["name"] for e in architecture["elements"]], ["Boiler", "Pump"])
+        self.assertEqual(architecture["connectors"][0]["direction"], "Source -> Destination")
+
+        index = get_repository_index(self.repo)
+        self.assertEqual(index.find_element("Model/02_Architecture/Pump").ElementGUID, "{E10}")
+
+    def test_read_only(self):
+        """Test: Schreibende Aufrufe schlagen fehl."""
+        model = self.repo.Models.GetAt(0)
+        with self.assertRaises(EAError):
+            model.Packages.AddNew("New", "Package")
+        with self.assertRaises(EAError):
+            model.Name = "Renamed"
+        with self.assertRaises(EAError):
+            self.repo.GetElementByID(999)
+
+    def test_concurrent_readers(self):
+        """Test: Mehrere Leser auf derselben Datei, auch aus anderen Prozessen."""
+        second = open_qea(str(self.path))
+        try:
+            self.assertEqual(second.Models.GetAt(0).Name, self.repo.Models.GetAt(0).Name)
+        finally:
+            second.CloseFile()
+
+        code = ("import sys; sys.path.insert(0, sys.argv[1]); "
+                "from ea_automation.qea import open_qea; "
+                "print(open_qea(sys.argv[2]).GetElementByID(10).Name)")
+        result = subprocess.run(
+            [sys.executable, "-c", code, str(Path(__file__).parent.parent.parent), str(self.path)],
+            capture_output=True, text=True
+        )
+        self.assertEqual(result.stdout.strip(), "Pump", result.stderr)
+
+    def test_open_errors(self):
+        """Test: Fehlende Datei und Nicht-EA-Datenbank."""
+        with self.assertRaises(EAConnectionError):
+            open_qea(str(Path(self.tmp.name) / "missing.qea"))
+        empty = Path(self.tmp.name) / "empty.qea"
+        sqlite3.connect(str(empty)).close()
+        with self.assertRaises(EAConnectionError):
+            open_qea(str(empty))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Unit-Tests für qea_writer.py (Offline-Schreiben von Model-Spezifikationen).
+"""
+
+import copy
+import unittest
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+# Füge Parent-Directory zum Path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ea_automation.qea import open_qea
+from ea_automation.qea_writer import write_model_spec
+from ea_automation.bulk import export_model_tree
+from ea_automation.exceptions import EAError
+from ea_automation.plan import plan_model_spec
+from qea_fixtures import SPEC as BASE_SPEC, make_empty_qea
+
+machine, pump = copy.deepcopy(BASE_SPEC["elements"])
+machine["attributes"].append({"name": "mode"})  # ohne Typ: String
+SPEC = dict(BASE_SPEC, packages=["01_Requirements", "02_Architecture"], elements=[
+    machine,
+    pump,
+    {"package": "01_Requirements", "name": "REQ-001", "type": "Requirement", "stereotype": "functional"},
+    {"package": "03_Interfaces", "name": "IWater", "type": "Interface"}
+], connectors=BASE_SPEC["connectors"] + [
+    {"type": "Realization", "client": "Pump", "supplier": "IWater", "stereotype": "satisfy"}
+], diagrams=[dict(BASE_SPEC["diagrams"][0], elements=["Machine", "Pump", "Unknown"])])
+
+
+class TestWriteModelSpec(unittest.TestCase):
+    """Tests für write_model_spec."""
+
+    def setUp(self):
+        """Setup: Leere .qea-Datei mit EA-Schema."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = make_empty_qea(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_spec_written_and_readable(self):
+        """Test: Alle Objekte landen in der Datei und sind über die Lese-API sichtbar."""
+        created = write_model_spec(str(self.path), SPEC)
+        self.assertEqual(created, {"packages": 4, "elements": 4, "attributes": 2, "operations": 1,
+                                   "connectors": 2, "diagrams": 1})
+
+        repo = open_qea(str(self.path))
+        try:
+            model = export_model_tree(repo)[0]
+            self.assertEqual(model["name"], "CoffeeMachine")
+            self.assertEqual([p["name"] for p in model["packages"]],
+                             ["01_Requirements", "02_Architecture", "03_Interfaces"])
+            architecture = model["packages"][1]
+            machine = architecture["elements"][0]
+            self.assertEqual((machine["type"], machine["stereotype"]), ("Class", "block"))
+            self.assertEqual([a["name"] for a in machine["attributes"]], ["power", "mode"])
+            self.assertEqual(machine["attributes"][1]["type"], "String")
+            self.assertEqual(machine["methods"][0]["return_type"], "Boolean")
+            self.assertRegex(machine["guid"], r"^\{[0-9A-F]{8}(-[0-9A-F]{4}){3}-[0-9A-F]{12}\}$")
+            self.assertEqual(architecture["connectors"][0]["type"], "Composition")
+            # Nicht gefundene Elemente werden im Diagramm übersprungen
+            objects = architecture["diagrams"][0]["objects"]
+            self.assertEqual(architecture["diagrams"][0]["type"], "Logical")
+            self.assertEqual([(o["left"], o["top"]) for o in objects], [(50, -50), (350, -50)])
+
+            requirement = model["packages"][0]["elements"][0]
+            self.assertEqual(requirement["stereotype"], "functional")
+            # Packages unterhalb des Models haben eine t_object-Zeile mit derselben GUID
+            package_objects = repo.SQLQuery("SELECT ea_guid FROM t_object WHERE Object_Type = 'Package'")
+            self.assertIn(architecture["guid"], package_objects)
+            # MetaType wie bei create_element über t_xref
+            xref = repo.SQLQuery(f"SELECT Description FROM t_xref WHERE Client = '{machine['guid']}'")
+            self.assertIn("FQName=SysML1.4::Block", xref)
+        finally:
+            repo.CloseFile()
+
+    def test_idempotent(self):
+        """Test: Ein zweiter Lauf legt nichts doppelt an."""
+        write_model_spec(str(self.path), SPEC)
+        created = write_model_spec(str(self.path), SPEC)
+
+        self.assertEqual(sum(created.values()), 0)
+
+    def test_changed_notes_and_types_are_updated(self):
+        """Test: Geänderte Notes, Attribut- und Rückgabetypen werden wie im COM-Build übernommen."""
+        write_model_spec(str(self.path), SPEC)
+        spec = copy.deepcopy(SPEC)
+        changed = spec["elements"][0]
+        changed["notes"] = "Kaffeemaschine"
+        changed["attributes"][0]["type"] = "Integer"
+        changed["operations"][0]["returnType"] = "void"
+
+        created = write_model_spec(str(self.path), spec)
+
+        self.assertEqual(sum(created.values()), 0)
+        repo = open_qea(str(self.path))
+        try:
+            self.assertFalse(plan_model_spec(repo, spec).has_changes)
+            machine = export_model_tree(repo)[0]["packages"][1]["elements"][0]
+            self.assertEqual(machine["notes"], "Kaffeemaschine")
+            self.assertEqual(machine["attributes"][0]["type"], "Integer")
+            self.assertEqual(machine["methods"][0]["return_type"], "void")
+        finally:
+            repo.CloseFile()
+
+    def test_element_reuse_matches_type_or_stereotype(self):
+        """Test: Elemente werden wie bei create_element/plan_model_spec nur bei gleichem Typ bzw. Stereotype wiederverwendet."""
+        write_model_spec(str(self.path), SPEC)
+        spec = dict(SPEC, elements=[
+            {"package": "02_Architecture", "name": "Machine", "type": "Class"},
+            {"package": "02_Architecture", "name": "Pump", "type": "Interface"},
+            {"package": "01_Requirements", "name": "REQ-001", "type": "SysML1.4::Requirement"}
+        ], connectors=[], diagrams=[])
+
+        created = write_model_spec(str(self.path), spec)
+
+        self.assertEqual(created["elements"], 2)
+        repo = open_qea(str(self.path))
+        try:
+            self.assertFalse(plan_model_spec(repo, spec).has_changes)
+        finally:
+            repo.CloseFile()
+
+    def test_rollback_on_error(self):
+        """Test: Bei einem Fehler bleibt die Datei unverändert."""
+        connection = sqlite3.connect(str(self.path))
+        connection.execute("DROP TABLE t_xref")
+        connection.close()
+
+        with self.assertRaises(EAError):
+            write_model_spec(str(self.path), SPEC)
+
+        connection = sqlite3.connect(str(self.path))
+        self.assertEqual(connection.execute("SELECT COUNT(*) FROM t_object").fetchone()[0], 0)
+        connection.close()
+
+    def test_locked_or_missing_file(self):
+        """Test: Gesperrte und fehlende Dateien."""
+        with self.assertRaises(EAError):
+            write_model_spec(str(Path(self.tmp.name) / "missing.qea"), SPEC)
+
+        other = sqlite3.connect(str(self.path), isolation_level=None)
+        other.execute("BEGIN IMMEDIATE")
+        try:
+            with self.assertRaises(EAError):
+                write_model_spec(str(self.path), SPEC)
+        finally:
+            other.execute("ROLLBACK")
+            other.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Unit-Tests für replay.py (Aufzeichnen und Abspielen von COM-Aufrufen).
+"""
+
+import time
+import unittest
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+# Füge Parent-Directory zum Path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ea_automation.exceptions import EAReplayError
+from ea_automation.fake import open_fake_repository
+from ea_automation.index import (
+    invalidate_connector_index,
+    invalidate_element_index,
+    invalidate_feature_index,
+    invalidate_repository_index
+)
+from ea_automation.json_io import load_model_spec
+from ea_automation.qea import QeaCollection
+from ea_automation.replay import (
+    RecordedComError,
+    RecordingObject,
+    enable_recording,
+    open_replay_repository,
+    record_repository,
+    stop_recording
+)
+from ea_automation.repository import close_repository, open_repository
+from scripts.build_from_json import ModelBuilder
+
+COFFEE_MACHINE = Path(__file__).parent.parent.parent / "examples" / "coffee_machine.json"
+
+
+class ComError(Exception):
+    """Steht für pywintypes.com_error, das beim Abspielen nicht verfügbar ist."""
+
+
+def fail_add_new(self, name, type_):
+    raise ComError("Internal Application Error")
+
+
+def invalidate_indexes():
+    invalidate_element_index()
+    invalidate_feature_index()
+    invalidate_repository_index()
+    invalidate_connector_index()
+
+
+class TestReplay(unittest.TestCase):
+    """Tests für ComRecorder, ReplayPlayer und das Backend "replay"."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = str(Path(self.tmp.name) / "build.rec.gz")
+        invalidate_indexes()
+
+    def tearDown(self):
+        stop_recording()
+        invalidate_indexes()
+        self.tmp.cleanup()
+
+    def build(self, backend, path):
+        spec = load_model_spec(str(COFFEE_MACHINE))
+        builder = ModelBuilder(path, spec, backend)
+        self.assertTrue(builder.connect())
+        try:
+            self.assertTrue(builder.build())
+        finally:
+            builder.disconnect()
+        invalidate_indexes()
+        return builder
+
+    def test_build_replays_without_ea(self):
+        """Test: Ein aufgezeichneter Build läuft mit --backend replay identisch ab."""
+        recorder = enable_recording(self.path)
+        recorded = self.build("memory", "")
+        stop_recording()
+
+        self.assertIsInstance(recorded.repo, RecordingObject)
+        replayed = self.build("replay", self.path)
+        self.assertEqual(replayed.repo.player.remaining, 0)
+        self.assertEqual(replayed.repo.player.position, recorder.events)
+        self.assertEqual(sorted(replayed.created_elements), sorted(recorded.created_elements))
+
+    def test_deviation_raises(self):
+        """Test: Weicht die Aufrufreihenfolge ab, bricht das Abspielen mit EAReplayError ab."""
+        enable_recording(self.path)
+        repo = open_repository("", "memory")
+        models = repo.Models
+        model = models.AddNew("Model", "Package")
+        model.Update()
+        stop_recording()
+
+        repo = open_replay_repository(self.path, speed=0)
+        models = repo.Models
+        with self.assertRaises(EAReplayError):
+            models.AddNew("Other", "Package")
+        with self.assertRaises(EAReplayError):
+            repo.Models
+
+    def test_exceptions_are_replayed(self):
+        """Test: Aufgezeichnete Fehler (z.B. AddNew-Fehler von EA) werden beim Abspielen ausgelöst."""
+        enable_recording(self.path)
+        repo = open_repository("", "memory")
+        models = repo.Models
+        with self.assertRaises(AttributeError):
+            models.Unknown
+        with patch.object(QeaCollection, "AddNew", fail_add_new):
+            with self.assertRaises(ComError):
+                models.AddNew("Model", "Package")
+        close_repository(repo)
+        stop_recording()
+
+        repo = open_replay_repository(self.path, speed=0)
+        models = repo.Models
+        with self.assertRaises(AttributeError):
+            models.Unknown
+        with self.assertRaises(RecordedComError) as context:
+            models.AddNew("Model", "Package")
+        self.assertEqual(context.exception.class_name, "ComError")
+        close_repository(repo)
+        self.assertEqual(repo.player.remaining, 0)
+
+    def test_timing_profile(self):
+        """Test: Die aufgezeichneten Dauern werden mit speed skaliert abgewartet."""
+        recorder = enable_recording(self.path)
+        repo = record_repository(open_fake_repository(latency=0.002))
+        for _ in range(10):
+            repo.Models.Count
+        stop_recording()
+        self.assertEqual(recorder.events, 21)
+
+        repo = open_replay_repository(self.path, speed=1.0)
+        start = time.perf_counter()
+        for _ in range(10):
+            self.assertEqual(repo.Models.Count, 0)
+        elapsed = time.perf_counter() - start
+        self.assertGreaterEqual(repo.player.recorded_seconds, 0.04)
+        self.assertGreaterEqual(elapsed, repo.player.recorded_seconds * 0.9)
+
+        repo = open_replay_repository(self.path, speed=0)
+        start = time.perf_counter()
+        for _ in range(10):
+            repo.Models.Count
+        self.assertLess(time.perf_counter() - start, 0.04)
+        self.assertEqual(repo.player.simulated_seconds, 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Unit-Tests für sql.py (Streaming-Parser für SQLQuery-Ergebnisse).
+"""
+
+import unittest
+from unittest.mock import Mock
+import sys
+from pathlib import Path
+
+# Füge Parent-Directory zum Path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ea_automation.sql import (
+    iter_query_rows,
+    parse_query_result,
+    query_columns,
+    sql_query_rows
+)
+from ea_automation.exceptions import EAError
+
+FIXTURES = Path(__file__).parent.parent / "fixtures"
+
+
+class TestIterQueryRows(unittest.TestCase):
+    """Tests gegen aufgezeichnete SQLQuery-Ergebnisse."""
+
+    def setUp(self):
+        """Setup: Lade aufgezeichnetes XML."""
+        self.xml = (FIXTURES / "sqlquery_t_object.xml").read_text(encoding="utf-8")
+
+    def test_rows_from_recorded_xml(self):
+        """Test: Zeilen mit kleingeschriebenen Spaltennamen und entschlüsselten Entities."""
+        rows = parse_query_result(self.xml)
+
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]["name"], "CoffeeMachine")
+        self.assertEqual(rows[0]["object_id"], "42")
+        self.assertEqual(rows[1]["name"], "Boiler & Heater")
+        self.assertEqual(rows[1]["note"], "Heizt <Wasser> auf 95°C")
+        # Leeres Element -> leerer String, NULL-Spalte fehlt
+        self.assertEqual(rows[2]["note"], "")
+        self.assertNotIn("stereotype", rows[2])
+
+    def test_typed_rows(self):
+        """Test: Konverter werden pro Spalte angewendet, leere Werte werden None."""
+        rows = parse_query_result(self.xml, types={"object_id": int, "note": str.upper})
+
+        self.assertEqual(rows[0]["object_id"], 42)
+        self.assertEqual(rows[0]["note"], "MAIN COFFEE MACHINE SYSTEM BLOCK")
+        self.assertIsNone(rows[2]["note"])
+
+    def test_small_chunks_and_file_source(self):
+        """Test: Blockweises Parsen liefert dasselbe Ergebnis, auch aus einer Datei."""
+        expected = parse_query_result(self.xml)
+
+        self.assertEqual(list(iter_query_rows(self.xml, chunk_size=7)), expected)
+        with open(FIXTURES / "sqlquery_t_object.xml", "rb") as f:
+            self.assertEqual(list(iter_query_rows(f, chunk_size=64)), expected)
+
+    def test_column_arrays(self):
+        """Test: Spalten-Arrays mit None für NULL-Werte."""
+        columns = query_columns(self.xml, types={"object_id": int})
+
+        self.assertEqual(columns["object_id"], [42, 43, 44])
+        self.assertEqual(columns["stereotype"], ["block", "block", None])
+        self.assertTrue(all(len(values) == 3 for values in columns.values()))
+
+    def test_empty_result(self):
+        """Test: Leere Ergebnisse."""
+        empty = (FIXTURES / "sqlquery_empty.xml").read_text(encoding="utf-8")
+
+        self.assertEqual(parse_query_result(empty), [])
+        self.assertEqual(parse_query_result(""), [])
+        self.assertEqual(query_columns(empty), {})
+
+    def test_invalid_xml(self):
+        """Test: Fehler bei ungültigem XML und fehlgeschlagener Typumwandlung."""
+        with self.assertRaises(EAError):
+            parse_query_result("<EADATA><Row><Name>x</Row>")
+        with self.assertRaises(EAError):
+            parse_query_result(self.xml, types={"name": int})
+
+    def test_large_result_streams(self):
+        """Test: Große Ergebnisse werden zeilenweise geliefert."""
+        row = "<Row><Object_ID>{0}</Object_ID><Name>E{0}</Name></Row>"
+        xml = "<EADATA><Dataset_0><Data>" + "".join(row.format(i) for i in range(20000)) + \
+            "</Data></Dataset_0></EADATA>"
+
+        rows = iter_query_rows(xml, types={"object_id": int}, chunk_size=4096)
+        first = next(rows)
+
+        self.assertEqual(first, {"object_id": 0, "name": "E0"})
+        self.assertEqual(sum(1 for _ in rows), 19999)
+
+    def test_sql_query_rows_uses_repository(self):
+        """Test: sql_query_rows führt SQLQuery auf dem Repository aus."""
+        repo = Mock()
+        repo.SQLQuery.return_value = self.xml
+
+        rows = sql_query_rows(repo, "SELECT * FROM t_object", types={"object_id": int})
+
+        repo.SQLQuery.assert_called_once_with("SELECT * FROM t_object")
+        self.assertEqual([r["object_id"] for r in rows], [42, 43, 44])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Unit-Tests für state.py (Zustandsdatei für inkrementelle Builds).
+"""
+
+import copy
+import json
+import unittest
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+# Füge Parent-Directory zum Path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ea_automation.state import BuildState, entry_hash
+from scripts.build_from_json import ModelBuilder
+from qea_fixtures import SPEC, make_empty_qea
+
+
+class TestIncrementalBuild(unittest.TestCase):
+    """Tests für BuildState zusammen mit ModelBuilder."""
+
+    def setUp(self):
+        """Setup: Leere .qea-Datei und Pfad der Zustandsdatei."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = make_empty_qea(self.tmp.name)
+        self.state_path = Path(self.tmp.name) / "model.state.json"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build(self, spec, success=True):
+        builder = ModelBuilder(str(self.path), spec, backend="sqlite", state_file=str(self.state_path))
+        self.assertTrue(builder.connect())
+        try:
+            self.assertEqual(builder.build(), success)
+        finally:
+            builder.disconnect()
+        return builder
+
+    def test_state_records_hash_and_guid(self):
+        """Test: Nach dem ersten Build hat jeder Eintrag Hash und GUID."""
+        self.build(SPEC)
+
+        entries = json.loads(self.state_path.read_text(encoding="utf-8"))["entries"]
+        self.assertEqual(set(entries["element"]), {"02_Architecture/Machine", "02_Architecture/Pump"})
+        machine = entries["element"]["02_Architecture/Machine"]
+        self.assertEqual(machine["hash"], entry_hash(SPEC["elements"][0]))
+        self.assertTrue(machine["guid"].startswith("{"))
+        self.assertEqual(len(entries["package"]), 1)
+        self.assertEqual(len(entries["connector"]), 1)
+        self.assertEqual(len(entries["diagram"]), 1)
+
+    def test_only_dirty_entries_are_checked(self):
+        """Test: Unveränderte Einträge werden übersprungen, geänderte neu geprüft."""
+        self.build(SPEC)
+        self.assertEqual(self.build(SPEC).spec["elements"], [])
+
+        spec = copy.deepcopy(SPEC)
+        spec["elements"][1]["notes"] = "Wasserpumpe"
+        builder = self.build(spec)
+        self.assertEqual([e["name"] for e in builder.plan.delta["elements"]], ["Pump"])
+        self.assertEqual([c.kind for c in builder.plan.changes], ["model", "element"])
+
+        entries = json.loads(self.state_path.read_text(encoding="utf-8"))["entries"]
+        self.assertEqual(entries["element"]["02_Architecture/Pump"]["hash"], entry_hash(spec["elements"][1]))
+
+    def test_stale_guid_falls_back_to_full_check(self):
+        """Test: Fehlt die GUID im Repository, wird nur dieser Eintrag erneut geprüft."""
+        self.build(SPEC)
+        connection = sqlite3.connect(str(self.path))
+        connection.execute("DELETE FROM t_object WHERE Name = 'Pump'")
+        connection.commit()
+        connection.close()
+
+        builder = self.build(SPEC)
+
+        self.assertEqual([e["name"] for e in builder.plan.delta["elements"]], ["Pump"])
+        connection = sqlite3.connect(str(self.path))
+        self.assertEqual(connection.execute("SELECT COUNT(*) FROM t_object WHERE Name = 'Pump'").fetchone()[0], 1)
+        connection.close()
+
+    def test_failed_entries_are_retried(self):
+        """Test: Einträge mit Fehlern (z.B. beim Attribut) werden nicht gespeichert und erneut gebaut."""
+        with patch("scripts.build_from_json.add_attribute", side_effect=RuntimeError("COM-Fehler")):
+            builder = self.build(SPEC, success=False)
+        self.assertEqual(builder.failures, 1)
+        entries = json.loads(self.state_path.read_text(encoding="utf-8"))["entries"]
+        self.assertEqual(set(entries["element"]), {"02_Architecture/Pump"})
+
+        builder = self.build(SPEC)
+
+        self.assertEqual([e["name"] for e in builder.spec["elements"]], ["Machine"])
+        self.assertEqual(builder.failures, 0)
+        connection = sqlite3.connect(str(self.path))
+        self.assertEqual(connection.execute("SELECT Name FROM t_attribute").fetchall(), [("power",)])
+        connection.close()
+        entries = json.loads(self.state_path.read_text(encoding="utf-8"))["entries"]
+        self.assertIn("02_Architecture/Machine", entries["element"])
+
+    def test_foreign_state_is_ignored(self):
+        """Test: Zustandsdatei eines anderen Models wird ignoriert."""
+        self.build(SPEC)
+
+        state = BuildState.load(str(self.state_path), str(self.path.resolve()), "Other")
+
+        self.assertEqual(state.entries["element"], {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Unit-Tests für tracing.py (COM-Tracing mit Aufrufstellen und Latenz-Perzentilen).
+"""
+
+import json
+import os
+import unittest
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+# Füge Parent-Directory zum Path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ea_automation import tracing
+from ea_automation.elements import create_element
+from ea_automation.qea import QeaRepository
+from ea_automation.repository import close_repository, open_repository
+from ea_automation.tracing import TraceRecorder, TracedObject, disable_tracing, enable_tracing
+
+
+class TestTracing(unittest.TestCase):
+    """Tests für TracedObject, TraceRecorder und die Aktivierung in open_repository."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        disable_tracing()
+        self.tmp.cleanup()
+
+    def build(self, repo):
+        models = repo.Models
+        model = models.AddNew("Model", "Package")
+        model.Update()
+        models.Refresh()
+        package = model.Packages.AddNew("02_Architecture", "Package")
+        package.Update()
+        create_element(package, "Pump", "Class", notes="Wasserpumpe")
+
+    def test_disabled_returns_plain_repository(self):
+        """Test: Ohne Tracing liefert open_repository das unveränderte Backend-Objekt."""
+        with patch.dict(os.environ, {tracing.TRACE_ENV: ""}):
+            repo = open_repository("", "memory")
+        try:
+            self.assertIsInstance(repo, QeaRepository)
+        finally:
+            close_repository(repo)
+
+    def test_calls_are_recorded_with_call_site(self):
+        """Test: Aufrufe werden mit Python-Aufrufstelle aufgezeichnet; Ergebnis bleibt gleich."""
+        recorder = enable_tracing()
+        repo = open_repository("", "memory")
+        try:
+            self.assertIsInstance(repo, TracedObject)
+            self.build(repo)
+            rows = recorder.rows()
+            total_calls = recorder.total_calls
+        finally:
+            close_repository(repo)
+
+        calls = {row["call"] for row in rows}
+        self.assertIn("Collection.AddNew()", calls)
+        self.assertIn("Element.Notes=", calls)
+        sites = {row["site"] for row in rows if row["call"] == "Collection.AddNew()"}
+        self.assertTrue(any(site.startswith("ea_automation/elements.py:") for site in sites))
+        self.assertTrue(any("test_tracing.py" in site for site in sites))
+        self.assertEqual(sum(row["count"] for row in rows), total_calls)
+        self.assertTrue(all(row["p50_us"] <= row["p99_us"] for row in rows))
+
+    def test_env_variable_and_json_report(self):
+        """Test: EA_TRACE aktiviert das Tracing; Bericht mit .json wird als JSON geschrieben."""
+        report = Path(self.tmp.name) / "trace.json"
+        with patch.dict(os.environ, {tracing.TRACE_ENV: str(report)}):
+            repo = open_repository("", "memory")
+        try:
+            self.build(repo)
+        finally:
+            close_repository(repo)
+        tracing._dump_at_exit()
+
+        data = json.loads(report.read_text(encoding="utf-8"))
+        self.assertGreater(data["calls"], 0)
+        totals = [site["total_ms"] for site in data["sites"]]
+        self.assertEqual(totals, sorted(totals, reverse=True))
+
+    def test_report_ranks_by_total_time(self):
+        """Test: Textbericht sortiert nach Gesamtzeit und nennt Perzentile."""
+        recorder = TraceRecorder()
+        for _ in range(99):
+            recorder.record("Element.Update()", "ea_automation/elements.py:10 (f)", 0.001)
+        recorder.record("Element.Update()", "ea_automation/elements.py:10 (f)", 0.1)
+        recorder.record("Element.Name", "ea_automation/elements.py:20 (g)", 0.5)
+
+        rows = recorder.rows()
+        self.assertEqual([row["call"] for row in rows], ["Element.Name", "Element.Update()"])
+        self.assertAlmostEqual(rows[1]["p50_us"], 1000.0)
+        self.assertAlmostEqual(rows[1]["p99_us"], 1000.0)
+        self.assertIn("100      199.0", recorder.report())
+
+
+if __name__ == '__main__':
+    unittest.main()
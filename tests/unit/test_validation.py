@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Unit-Tests für validation.py (kompilierter, gecachter Schema-Validator).
+"""
+
+import copy
+import unittest
+import sys
+from pathlib import Path
+
+# Füge Parent-Directory zum Path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from jsonschema import Draft7Validator, ValidationError
+from ea_automation.json_io import MODEL_SPEC_SCHEMA
+from ea_automation import validation
+from ea_automation.validation import compile_schema, get_validator
+
+VALID_SPEC = {
+    "model": "TestModel",
+    "packages": ["P1", "P2"],
+    "elements": [
+        {"package": "P1", "name": "E1", "type": "Class", "stereotype": "entity", "notes": "Test",
+         "attributes": [{"name": "a", "type": "String"}], "operations": [{"name": "op"}]},
+        {"package": "P2", "name": "E2", "type": "SysML1.4::Block"}
+    ],
+    "connectors": [{"type": "Association", "client": "E1", "supplier": "E2", "name": "uses"}],
+    "diagrams": [{"package": "P1", "name": "Overview", "type": "Class", "elements": ["E1"]}]
+}
+
+
+def mutate(path, value):
+    """Kopie von VALID_SPEC mit geändertem Wert (value None: Schlüssel entfernen)."""
+    spec = copy.deepcopy(VALID_SPEC)
+    target = spec
+    for key in path[:-1]:
+        target = target[key]
+    if value is None:
+        del target[path[-1]]
+    else:
+        target[path[-1]] = value
+    return spec
+
+
+INVALID_SPECS = [
+    mutate(["model"], 123),
+    mutate(["model"], ""),
+    mutate(["model"], None),
+    mutate(["packages"], ["P1", "P1"]),
+    mutate(["packages", 0], ""),
+    mutate(["elements", 0, "name"], None),
+    mutate(["elements", 0, "unknown"], "x"),
+    mutate(["elements", 0, "attributes", 0], {"type": "String"}),
+    mutate(["elements", 1, "type"], True),
+    mutate(["connectors", 0, "type"], "InvalidType"),
+    mutate(["connectors", 0, "client"], ""),
+    mutate(["diagrams", 0, "type"], "Unknown"),
+    mutate(["diagrams", 0, "elements"], "E1"),
+    mutate(["extra"], {}),
+    [VALID_SPEC],
+]
+
+
+class TestCompiledValidator(unittest.TestCase):
+    """Tests für compile_schema und get_validator."""
+
+    def test_compiled_check_matches_jsonschema(self):
+        """Test: Kompilierte Prüfung entscheidet wie Draft7Validator."""
+        check = compile_schema(MODEL_SPEC_SCHEMA)
+        reference = Draft7Validator(MODEL_SPEC_SCHEMA)
+
+        self.assertIsNotNone(check)
+        self.assertTrue(check(VALID_SPEC))
+        for spec in INVALID_SPECS:
+            self.assertFalse(reference.is_valid(spec))
+            self.assertFalse(check(spec), spec)
+
+    def test_validator_is_cached(self):
+        """Test: Für dasselbe Schema wird derselbe Validator wiederverwendet."""
+        validator = get_validator(MODEL_SPEC_SCHEMA)
+
+        self.assertIs(get_validator(MODEL_SPEC_SCHEMA), validator)
+        self.assertIsNot(get_validator(copy.deepcopy(MODEL_SPEC_SCHEMA)), validator)
+
+    def test_validator_cache_is_bounded(self):
+        """Test: Beliebige Schemas füllen den Cache nicht unbegrenzt, zuletzt benutzte bleiben."""
+        validator = get_validator(MODEL_SPEC_SCHEMA)
+        for i in range(validation.VALIDATOR_CACHE_SIZE * 3):
+            get_validator({"type": "object", "title": f"Schema {i}"})
+            get_validator(MODEL_SPEC_SCHEMA)
+
+        self.assertEqual(len(validation._validators), validation.VALIDATOR_CACHE_SIZE)
+        self.assertIs(get_validator(MODEL_SPEC_SCHEMA), validator)
+
+    def test_errors_are_reported_by_jsonschema(self):
+        """Test: Fehler (Meldung und Pfad) entsprechen jsonschema."""
+        spec = mutate(["connectors", 0, "type"], "InvalidType")
+
+        with self.assertRaises(ValidationError) as context:
+            get_validator(MODEL_SPEC_SCHEMA).validate(spec)
+        self.assertEqual(list(context.exception.absolute_path), ["connectors", 0, "type"])
+        self.assertEqual(len(list(get_validator(MODEL_SPEC_SCHEMA).iter_errors(spec))), 1)
+        self.assertEqual(list(get_validator(MODEL_SPEC_SCHEMA).iter_errors(VALID_SPEC)), [])
+
+    def test_unsupported_schema_falls_back(self):
+        """Test: Nicht übersetzbare Schemas werden vollständig von jsonschema geprüft."""
+        schema = {"type": "object", "properties": {"count": {"type": "integer", "minimum": 1}}}
+
+        self.assertIsNone(compile_schema(schema))
+        validator = get_validator(schema)
+        self.assertTrue(validator.is_valid({"count": 2}))
+        self.assertFalse(validator.is_valid({"count": 0}))
+
+    def test_conservative_unique_items(self):
+        """Test: Bei nicht hashbaren Einträgen entscheidet jsonschema über uniqueItems."""
+        schema = {"type": "array", "uniqueItems": True}
+
+        self.assertFalse(compile_schema(schema)([{"a": 1}, {"a": 2}]))
+        self.assertTrue(get_validator(schema).is_valid([{"a": 1}, {"a": 2}]))
+        self.assertFalse(get_validator(schema).is_valid([{"a": 1}, {"a": 1}]))
+
+
+if __name__ == '__main__':
+    unittest.main()